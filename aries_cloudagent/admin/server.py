@@ -16,11 +16,14 @@ import aiohttp_cors
 
 from marshmallow import fields, Schema
 
+from ..cache.base import BaseCache
 from ..config.injection_context import InjectionContext
 from ..core.profile import Profile
 from ..core.plugin_registry import PluginRegistry
+from ..ledger.base import BaseLedger
 from ..ledger.error import LedgerConfigError, LedgerTransactionError
 from ..messaging.responder import BaseResponder
+from ..storage.instrumented import PROMETHEUS_CONTENT_TYPE, StorageMetrics
 from ..transport.queue.basic import BasicMessageQueue
 from ..transport.outbound.message import OutboundMessage
 from ..utils.stats import Collector
@@ -301,6 +304,7 @@ class AdminServer(BaseAdminServer):
                 web.get("/plugins", self.plugins_handler, allow_head=False),
                 web.get("/status", self.status_handler, allow_head=False),
                 web.post("/status/reset", self.status_reset_handler),
+                web.get("/status/metrics", self.metrics_handler, allow_head=False),
                 web.get("/status/live", self.liveliness_handler, allow_head=False),
                 web.get("/status/ready", self.readiness_handler, allow_head=False),
                 web.get("/shutdown", self.shutdown_handler, allow_head=False),
@@ -445,6 +449,15 @@ class AdminServer(BaseAdminServer):
         collector = self.context.inject(Collector, required=False)
         if collector:
             status["timing"] = collector.results
+        storage_metrics = self.context.inject(StorageMetrics, required=False)
+        if storage_metrics:
+            status["storage"] = storage_metrics.extract()
+        cache = self.context.inject(BaseCache, required=False)
+        if cache and cache.stats:
+            status["cache"] = cache.stats
+        ledger = self.context.inject(BaseLedger, required=False)
+        if ledger and ledger.stats:
+            status["ledger"] = ledger.stats
         if self.conductor_stats:
             status["conductor"] = await self.conductor_stats()
         return web.json_response(status)
@@ -465,8 +478,31 @@ class AdminServer(BaseAdminServer):
         collector = self.context.inject(Collector, required=False)
         if collector:
             collector.reset()
+        storage_metrics = self.context.inject(StorageMetrics, required=False)
+        if storage_metrics:
+            storage_metrics.reset()
         return web.json_response({})
 
+    @docs(tags=["server"], summary="Fetch storage metrics in Prometheus text format")
+    async def metrics_handler(self, request: web.BaseRequest):
+        """
+        Request handler for the Prometheus metrics.
+
+        Args:
+            request: aiohttp request object
+
+        Returns:
+            The web response
+
+        """
+        storage_metrics = self.context.inject(StorageMetrics, required=False)
+        if not storage_metrics:
+            raise web.HTTPNotFound(reason="Storage metrics are not enabled")
+        return web.Response(
+            body=storage_metrics.prometheus_text().encode("utf-8"),
+            headers={"Content-Type": PROMETHEUS_CONTENT_TYPE},
+        )
+
     async def redirect_handler(self, request: web.BaseRequest):
         """Perform redirect to documentation."""
         raise web.HTTPFound("/api/doc")
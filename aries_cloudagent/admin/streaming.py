@@ -0,0 +1,49 @@
+"""Helpers for streaming admin API responses."""
+
+import asyncio
+import json
+import logging
+
+from typing import AsyncIterator
+
+from aiohttp import web
+
+LOGGER = logging.getLogger(__name__)
+
+NDJSON_CONTENT_TYPE = "application/x-ndjson"
+
+
+async def ndjson_response(
+    request: web.BaseRequest, items: AsyncIterator[dict]
+) -> web.StreamResponse:
+    """
+    Stream JSON objects to the client as newline-delimited JSON.
+
+    If reading the items fails once the response has started, a final
+    `{"error": ...}` line is written and the connection is closed without
+    ending the response, so the client cannot mistake it for a complete list.
+
+    Args:
+        request: aiohttp request object
+        items: async iterator over the JSON-serializable objects to send
+
+    Returns:
+        The prepared and completed stream response
+
+    """
+    response = web.StreamResponse(headers={"Content-Type": NDJSON_CONTENT_TYPE})
+    await response.prepare(request)
+    try:
+        async for item in items:
+            await response.write(json.dumps(item).encode("utf-8") + b"\n")
+    except (asyncio.CancelledError, ConnectionError):
+        raise
+    except Exception as err:
+        LOGGER.exception("Error streaming response")
+        await response.write(json.dumps({"error": str(err)}).encode("utf-8") + b"\n")
+        response.force_close()
+        if request.transport:
+            request.transport.close()
+        return response
+    await response.write_eof()
+    return response
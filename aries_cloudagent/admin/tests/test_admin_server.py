@@ -4,10 +4,14 @@ from aiohttp.test_utils import unused_port
 from asynctest import TestCase as AsyncTestCase
 from asynctest import mock as async_mock
 
+from ...cache.base import BaseCache
+from ...cache.in_memory import InMemoryCache
 from ...config.default_context import DefaultContextBuilder
 from ...config.injection_context import InjectionContext
 from ...core.in_memory import InMemoryProfile
 from ...core.protocol_registry import ProtocolRegistry
+from ...ledger.base import BaseLedger
+from ...storage.instrumented import StorageMetrics
 from ...transport.outbound.message import OutboundMessage
 from ...utils.stats import Collector
 from ...utils.task_queue import TaskQueue
@@ -344,3 +348,65 @@ class TestAdminServer(AsyncTestCase):
         ) as response:
             assert response.status == 503
         await server.stop()
+
+    async def test_storage_metrics(self):
+        settings = {"admin.admin_insecure_mode": True}
+        server = self.get_admin_server(settings)
+        await server.start()
+
+        async with self.client_session.get(
+            f"http://127.0.0.1:{self.port}/status/metrics", headers={}
+        ) as response:
+            assert response.status == 404
+        await server.stop()
+
+        context = InjectionContext()
+        metrics = StorageMetrics()
+        metrics.observe("get", "connection", 0.002, 1)
+        context.injector.bind_instance(StorageMetrics, metrics)
+        context.injector.bind_instance(BaseCache, InMemoryCache())
+        server = self.get_admin_server(settings, context)
+        await server.start()
+
+        async with self.client_session.get(
+            f"http://127.0.0.1:{self.port}/status", headers={}
+        ) as response:
+            result = await response.json()
+            assert result["storage"]["connection"]["get"]["count"] == 1
+            assert result["cache"]["entries"] == 0
+
+        async with self.client_session.get(
+            f"http://127.0.0.1:{self.port}/status/metrics", headers={}
+        ) as response:
+            assert response.status == 200
+            assert response.headers["Content-Type"].startswith("text/plain")
+            text = await response.text()
+            assert (
+                'acapy_storage_operation_seconds_count{operation="get",'
+                'record_type="connection"} 1'
+            ) in text
+
+        async with self.client_session.post(
+            f"http://127.0.0.1:{self.port}/status/reset", headers={}
+        ) as response:
+            assert response.status == 200
+        assert not metrics.latency
+
+        await server.stop()
+
+    async def test_ledger_stats(self):
+        settings = {"admin.admin_insecure_mode": True}
+        context = InjectionContext()
+        ledger = async_mock.MagicMock(BaseLedger, autospec=True)
+        ledger.stats = {"pool": "default", "status": "ok"}
+        context.injector.bind_instance(BaseLedger, ledger)
+        server = self.get_admin_server(settings, context)
+        await server.start()
+
+        async with self.client_session.get(
+            f"http://127.0.0.1:{self.port}/status", headers={}
+        ) as response:
+            result = await response.json()
+            assert result["ledger"] == {"pool": "default", "status": "ok"}
+
+        await server.stop()
@@ -0,0 +1,59 @@
+from asynctest import TestCase as AsyncTestCase
+from asynctest import mock as async_mock
+
+from .. import streaming as test_module
+
+
+class TestStreaming(AsyncTestCase):
+    async def test_ndjson_response(self):
+        async def items():
+            yield {"a": 1}
+            yield {"b": 2}
+
+        with async_mock.patch.object(
+            test_module.web, "StreamResponse", autospec=True
+        ) as mock_response_cls:
+            mock_response = mock_response_cls.return_value
+            mock_response.prepare = async_mock.CoroutineMock()
+            mock_response.write = async_mock.CoroutineMock()
+            mock_response.write_eof = async_mock.CoroutineMock()
+            request = async_mock.MagicMock()
+
+            result = await test_module.ndjson_response(request, items())
+            assert result is mock_response
+            mock_response_cls.assert_called_once_with(
+                headers={"Content-Type": test_module.NDJSON_CONTENT_TYPE}
+            )
+            mock_response.prepare.assert_awaited_once_with(request)
+            assert [call[0][0] for call in mock_response.write.call_args_list] == [
+                b'{"a": 1}\n',
+                b'{"b": 2}\n',
+            ]
+            mock_response.write_eof.assert_awaited_once()
+
+    async def test_ndjson_response_x(self):
+        async def items():
+            yield {"a": 1}
+            raise KeyError("gone")
+
+        with async_mock.patch.object(
+            test_module.web, "StreamResponse", autospec=True
+        ) as mock_response_cls, async_mock.patch.object(
+            test_module.LOGGER, "exception", async_mock.MagicMock()
+        ):
+            mock_response = mock_response_cls.return_value
+            mock_response.prepare = async_mock.CoroutineMock()
+            mock_response.write = async_mock.CoroutineMock()
+            mock_response.write_eof = async_mock.CoroutineMock()
+            request = async_mock.MagicMock()
+
+            result = await test_module.ndjson_response(request, items())
+            assert result is mock_response
+            assert [call[0][0] for call in mock_response.write.call_args_list] == [
+                b'{"a": 1}\n',
+                b'{"error": "\'gone\'"}\n',
+            ]
+            # the response is not ended, and the connection is dropped
+            mock_response.write_eof.assert_not_awaited()
+            mock_response.force_close.assert_called_once_with()
+            request.transport.close.assert_called_once_with()
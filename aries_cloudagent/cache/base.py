@@ -2,7 +2,7 @@
 
 import asyncio
 from abc import ABC, abstractmethod
-from typing import Any, Sequence, Text, Union
+from typing import Any, Mapping, Sequence, Text, Union
 
 from ..core.error import BaseError
 
@@ -57,9 +57,69 @@ class BaseCache(ABC):
     async def flush(self):
         """Remove all items from the cache."""
 
+    async def get_many(self, keys: Sequence[Text]) -> Mapping[Text, Any]:
+        """
+        Get several items from the cache.
+
+        Args:
+            keys: the keys to retrieve items for
+
+        Returns:
+            A mapping from each key found to its value
+
+        """
+        found = {}
+        for key in keys:
+            value = await self.get(key)
+            if value is not None:
+                found[key] = value
+        return found
+
+    async def set_many(self, values: Mapping[Text, Any], ttl: int = None):
+        """
+        Add several items to the cache with an optional ttl.
+
+        Args:
+            values: a mapping from each key to the value to store for it
+            ttl: number of seconds that the records should persist
+
+        """
+        for key, value in values.items():
+            await self.set(key, value, ttl)
+
+    async def clear_many(self, keys: Sequence[Text]):
+        """
+        Remove several items from the cache, if present.
+
+        Args:
+            keys: the keys to remove
+
+        """
+        for key in keys:
+            await self.clear(key)
+
+    @property
+    def stats(self) -> Mapping[str, int]:
+        """Accessor for cache statistics, if the implementation collects them."""
+        return None
+
+    async def close(self):
+        """Release any connections or background tasks held by the cache."""
+
+    def create_key_lock(self, key: Text, cache: "BaseCache" = None) -> "CacheKeyLock":
+        """
+        Create a lock on a given cache key.
+
+        Args:
+            key: the key to lock
+            cache: the cache used to look up and store the result, if not this one
+
+        """
+        return CacheKeyLock(cache or self, key)
+
     def acquire(self, key: Text):
         """Acquire a lock on a given cache key."""
-        result = CacheKeyLock(self, key)
+        result = self.create_key_lock(key)
         first = self._key_locks.setdefault(key, result)
         if first is not result:
             result.parent = first
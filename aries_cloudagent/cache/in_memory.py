@@ -1,29 +1,62 @@
 """Basic in-memory cache implementation."""
 
+import heapq
 import time
-from typing import Any, Sequence, Text, Union
+from collections import OrderedDict
+from itertools import count
+from typing import Any, Iterable, Mapping, Sequence, Text, Tuple, Union
 
 from .base import BaseCache
 
 
 class InMemoryCache(BaseCache):
-    """Basic in-memory cache class."""
+    """
+    Basic in-memory cache class.
 
-    def __init__(self):
-        """Initialize a `InMemoryCache` instance."""
+    Entries are kept in least-recently-used order and expiry times are tracked
+    in a heap, so lookups and updates take constant (amortised) time.
+    """
+
+    def __init__(self, max_entries: int = None):
+        """
+        Initialize a `InMemoryCache` instance.
+
+        Args:
+            max_entries: the maximum number of entries to retain, evicting the
+                least recently used entries first
+
+        """
         super().__init__()
         # looks like { "key": { "expires": <epoch timestamp>, "value": <val> } }
-        self._cache = {}
+        self._cache = OrderedDict()
+        self._expiry = []  # heap of (expires, sequence, key)
+        self._sequence = count()
+        self.max_entries = max_entries or None
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
 
     def _remove_expired_cache_items(self):
         """Remove all expired items from cache."""
-        for key, val in self._cache.copy().items():  # iterate copy, del from original
-            cache_item_expiry = val["expires"]
-            if cache_item_expiry is None:
-                continue
-            now = time.perf_counter()
-            if now >= cache_item_expiry:
+        now = time.perf_counter()
+        expiry = self._expiry
+        while expiry and expiry[0][0] <= now:
+            expires, _, key = heapq.heappop(expiry)
+            entry = self._cache.get(key)
+            # skip heap entries left behind by an overwrite or removal
+            if entry and entry["expires"] == expires:
                 del self._cache[key]
+                self.expirations += 1
+
+    def _compact_expiry(self):
+        """Drop heap entries for keys that were overwritten or removed."""
+        self._expiry = [
+            item
+            for item in self._expiry
+            if item[2] in self._cache and self._cache[item[2]]["expires"] == item[0]
+        ]
+        heapq.heapify(self._expiry)
 
     async def get(self, key: Text):
         """
@@ -37,7 +70,13 @@ class InMemoryCache(BaseCache):
 
         """
         self._remove_expired_cache_items()
-        return self._cache.get(key)["value"] if self._cache.get(key) else None
+        entry = self._cache.get(key)
+        if not entry:
+            self.misses += 1
+            return None
+        self._cache.move_to_end(key)
+        self.hits += 1
+        return entry["value"]
 
     async def set(self, keys: Union[Text, Sequence[Text]], value: Any, ttl: int = None):
         """
@@ -51,10 +90,59 @@ class InMemoryCache(BaseCache):
             ttl: number of seconds that the record should persist
 
         """
+        keys = [keys] if isinstance(keys, Text) else keys
+        self._store(((key, value) for key in keys), ttl)
+
+    def _store(self, items: Iterable[Tuple[Text, Any]], ttl: int = None):
+        """Add key and value pairs, evicting entries beyond the size limit."""
         self._remove_expired_cache_items()
         expires_ts = time.perf_counter() + ttl if ttl else None
-        for key in [keys] if isinstance(keys, Text) else keys:
+        for key, value in items:
             self._cache[key] = {"expires": expires_ts, "value": value}
+            self._cache.move_to_end(key)
+            if expires_ts is not None:
+                heapq.heappush(self._expiry, (expires_ts, next(self._sequence), key))
+        if self.max_entries:
+            while len(self._cache) > self.max_entries:
+                self._cache.popitem(last=False)
+                self.evictions += 1
+        if len(self._expiry) > 2 * len(self._cache) + 64:
+            self._compact_expiry()
+
+    async def get_many(self, keys: Sequence[Text]) -> Mapping[Text, Any]:
+        """
+        Get several items from the cache.
+
+        Args:
+            keys: the keys to retrieve items for
+
+        Returns:
+            A mapping from each key found to its value
+
+        """
+        self._remove_expired_cache_items()
+        found = {}
+        for key in keys:
+            entry = self._cache.get(key)
+            if entry:
+                self._cache.move_to_end(key)
+                found[key] = entry["value"]
+        self.hits += len(found)
+        self.misses += len(keys) - len(found)
+        return found
+
+    async def set_many(self, values: Mapping[Text, Any], ttl: int = None):
+        """
+        Add several items to the cache with an optional ttl.
+
+        Overwrites existing cache entries.
+
+        Args:
+            values: a mapping from each key to the value to store for it
+            ttl: number of seconds that the records should persist
+
+        """
+        self._store(values.items(), ttl)
 
     async def clear(self, key: Text):
         """
@@ -67,7 +155,31 @@ class InMemoryCache(BaseCache):
         if key in self._cache:
             del self._cache[key]
 
+    async def clear_many(self, keys: Sequence[Text]):
+        """
+        Remove several items from the cache, if present.
+
+        Args:
+            keys: the keys to remove
+
+        """
+        for key in keys:
+            self._cache.pop(key, None)
+
     async def flush(self):
         """Remove all items from the cache."""
 
-        self._cache = {}
+        self._cache = OrderedDict()
+        self._expiry = []
+
+    @property
+    def stats(self) -> Mapping[str, int]:
+        """Accessor for the cache size and hit, miss and eviction counters."""
+        return {
+            "entries": len(self._cache),
+            "max_entries": self.max_entries,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "expirations": self.expirations,
+        }
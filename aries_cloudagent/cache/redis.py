@@ -0,0 +1,455 @@
+"""Shared cache implementation speaking the Redis protocol."""
+
+import asyncio
+import json
+import logging
+import time
+
+from typing import Any, AsyncIterator, Callable, Mapping, Sequence, Text, Union
+from urllib.parse import unquote, urlparse
+from uuid import uuid4
+
+from .base import BaseCache, CacheError, CacheKeyLock
+from .tiered import CacheInvalidation
+
+LOGGER = logging.getLogger(__name__)
+
+DEFAULT_POOL_SIZE = 8
+DEFAULT_PREFIX = "acapy:"
+
+# delete a lock key only while it still holds the owner's token
+RELEASE_SCRIPT = (
+    "if redis.call('get', KEYS[1]) == ARGV[1] then "
+    "return redis.call('del', KEYS[1]) else return 0 end"
+)
+
+
+class RedisError(CacheError):
+    """Error reply or connection failure from the Redis server."""
+
+
+class RedisConnection:
+    """A single connection speaking the Redis serialization protocol (RESP)."""
+
+    def __init__(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        """Initialize the connection."""
+        self.reader = reader
+        self.writer = writer
+
+    @classmethod
+    async def open(
+        cls, host: str, port: int, *, password: str = None, db: int = 0
+    ) -> "RedisConnection":
+        """Open a new connection, authenticating and selecting the database."""
+        try:
+            reader, writer = await asyncio.open_connection(host, port)
+        except OSError as err:
+            raise RedisError(f"Cannot connect to Redis at {host}:{port}") from err
+        conn = cls(reader, writer)
+        if password:
+            await conn.execute("AUTH", password)
+        if db:
+            await conn.execute("SELECT", db)
+        return conn
+
+    @staticmethod
+    def encode(args: Sequence) -> bytes:
+        """Encode a command as a RESP array of bulk strings."""
+        parts = [b"*%d\r\n" % len(args)]
+        for arg in args:
+            if not isinstance(arg, bytes):
+                arg = str(arg).encode("utf-8")
+            parts.append(b"$%d\r\n%s\r\n" % (len(arg), arg))
+        return b"".join(parts)
+
+    async def read_reply(self):
+        """Read a single reply from the server."""
+        line = await self.reader.readline()
+        if not line.endswith(b"\r\n"):
+            raise RedisError("Connection closed by Redis server")
+        kind, body = line[:1], line[1:-2]
+        if kind == b"+":
+            return body.decode("utf-8")
+        if kind == b"-":
+            return RedisError(body.decode("utf-8"))
+        if kind == b":":
+            return int(body)
+        if kind == b"$":
+            size = int(body)
+            if size < 0:
+                return None
+            data = await self.reader.readexactly(size + 2)
+            return data[:-2]
+        if kind == b"*":
+            size = int(body)
+            if size < 0:
+                return None
+            return [await self.read_reply() for _ in range(size)]
+        raise RedisError(f"Unexpected reply from Redis server: {line!r}")
+
+    async def pipeline(self, commands: Sequence[Sequence]) -> Sequence:
+        """Send several commands at once and collect their replies in order."""
+        self.writer.write(b"".join(self.encode(cmd) for cmd in commands))
+        await self.writer.drain()
+        replies = [await self.read_reply() for _ in commands]
+        for reply in replies:
+            if isinstance(reply, RedisError):
+                raise reply
+        return replies
+
+    async def execute(self, *args):
+        """Send a command and return its reply."""
+        return (await self.pipeline([args]))[0]
+
+    def close(self):
+        """Close the connection."""
+        self.writer.close()
+
+
+class RedisConnectionPool:
+    """A bounded pool of Redis connections."""
+
+    def __init__(self, url: str, size: int = DEFAULT_POOL_SIZE):
+        """
+        Initialize the connection pool.
+
+        Args:
+            url: The server URL, as `redis://[:password@]host[:port][/db]`
+            size: The maximum number of open connections
+
+        """
+        parsed = urlparse(url)
+        if parsed.scheme != "redis":
+            raise CacheError(f"Unsupported cache URL: {url}")
+        self.host = parsed.hostname or "localhost"
+        self.port = parsed.port or 6379
+        self.password = unquote(parsed.password) if parsed.password else None
+        path = parsed.path.strip("/")
+        self.db = int(path) if path else 0
+        self.size = max(size or DEFAULT_POOL_SIZE, 1)
+        self._idle = []
+        self._limit = None
+
+    async def connect(self) -> RedisConnection:
+        """Open a new connection outside of the pool."""
+        return await RedisConnection.open(
+            self.host, self.port, password=self.password, db=self.db
+        )
+
+    async def acquire(self) -> RedisConnection:
+        """Wait for an available connection."""
+        if not self._limit:
+            self._limit = asyncio.Semaphore(self.size)
+        await self._limit.acquire()
+        if self._idle:
+            return self._idle.pop()
+        try:
+            return await self.connect()
+        except BaseException:
+            self._limit.release()
+            raise
+
+    def release(self, conn: RedisConnection, discard: bool = False):
+        """Return a connection to the pool, or close it if it is unusable."""
+        if discard:
+            conn.close()
+        else:
+            self._idle.append(conn)
+        self._limit.release()
+
+    async def pipeline(self, commands: Sequence[Sequence]) -> Sequence:
+        """Run a set of pipelined commands on a pooled connection."""
+        conn = await self.acquire()
+        discard = True
+        try:
+            replies = await conn.pipeline(commands)
+            discard = False
+        except RedisError as err:
+            # error replies leave the connection usable
+            discard = "Connection closed" in str(err)
+            raise
+        except (OSError, asyncio.IncompleteReadError) as err:
+            raise RedisError("Redis connection failed") from err
+        finally:
+            self.release(conn, discard)
+        return replies
+
+    async def execute(self, *args):
+        """Run a single command on a pooled connection."""
+        return (await self.pipeline([args]))[0]
+
+    async def close(self):
+        """Close all idle connections."""
+        while self._idle:
+            self._idle.pop().close()
+
+
+class RedisCache(BaseCache):
+    """Cache shared between agent instances through a Redis server."""
+
+    def __init__(
+        self,
+        pool: RedisConnectionPool,
+        *,
+        prefix: str = DEFAULT_PREFIX,
+        lock_ttl: float = 30,
+        lock_poll: float = 0.05,
+    ):
+        """
+        Initialize a `RedisCache` instance.
+
+        Args:
+            pool: The connection pool to use
+            prefix: A prefix applied to all keys written by this cache
+            lock_ttl: The number of seconds after which a key lock held by
+                another process is considered abandoned
+            lock_poll: The interval in seconds between checks for a result
+                while another process holds a key lock
+
+        """
+        super().__init__()
+        self.pool = pool
+        self.prefix = prefix
+        self.lock_ttl = lock_ttl
+        self.lock_poll = lock_poll
+
+    def _key(self, key: Text) -> str:
+        """Apply the key prefix."""
+        return self.prefix + key
+
+    def _lock_key(self, key: Text) -> str:
+        """Get the name of the cross-process lock for a key."""
+        return self.prefix + "lock:" + key
+
+    async def get(self, key: Text):
+        """
+        Get an item from the cache.
+
+        Args:
+            key: the key to retrieve an item for
+
+        Returns:
+            The record found or `None`
+
+        """
+        value = await self.pool.execute("GET", self._key(key))
+        return None if value is None else json.loads(value)
+
+    async def set(self, keys: Union[Text, Sequence[Text]], value: Any, ttl: int = None):
+        """
+        Add an item to the cache with an optional ttl.
+
+        Overwrites existing cache entries. Multiple keys are written in a
+        single pipelined round trip.
+
+        Args:
+            keys: the key or keys for which to set an item
+            value: the value to store in the cache
+            ttl: number of seconds that the record should persist
+
+        """
+        data = self._encode(value)
+        keys = [keys] if isinstance(keys, Text) else keys
+        await self.pool.pipeline([self._set_command(key, data, ttl) for key in keys])
+
+    @staticmethod
+    def _encode(value: Any) -> str:
+        """Serialize a value for storage."""
+        try:
+            return json.dumps(value)
+        except TypeError as err:
+            raise CacheError("Cache value is not JSON serializable") from err
+
+    def _set_command(self, key: Text, data: str, ttl: int = None) -> tuple:
+        """Build the command storing serialized data under a key."""
+        expiry = ("PX", max(int(ttl * 1000), 1)) if ttl else ()
+        return ("SET", self._key(key), data) + expiry
+
+    async def clear(self, key: Text):
+        """
+        Remove an item from the cache, if present.
+
+        Args:
+            key: the key to remove
+
+        """
+        await self.pool.execute("DEL", self._key(key))
+
+    async def get_many(self, keys: Sequence[Text]) -> Mapping[Text, Any]:
+        """
+        Get several items from the cache in a single round trip.
+
+        Args:
+            keys: the keys to retrieve items for
+
+        Returns:
+            A mapping from each key found to its value
+
+        """
+        if not keys:
+            return {}
+        values = await self.pool.execute("MGET", *(self._key(key) for key in keys))
+        return {
+            key: json.loads(value)
+            for key, value in zip(keys, values)
+            if value is not None
+        }
+
+    async def set_many(self, values: Mapping[Text, Any], ttl: int = None):
+        """
+        Add several items to the cache in a single pipelined round trip.
+
+        Args:
+            values: a mapping from each key to the value to store for it
+            ttl: number of seconds that the records should persist
+
+        """
+        if values:
+            await self.pool.pipeline(
+                [
+                    self._set_command(key, self._encode(value), ttl)
+                    for key, value in values.items()
+                ]
+            )
+
+    async def clear_many(self, keys: Sequence[Text]):
+        """
+        Remove several items from the cache, if present.
+
+        Args:
+            keys: the keys to remove
+
+        """
+        if keys:
+            await self.pool.execute("DEL", *(self._key(key) for key in keys))
+
+    async def flush(self):
+        """Remove all items written with this cache's prefix."""
+        cursor = "0"
+        while True:
+            cursor, keys = await self.pool.execute(
+                "SCAN", cursor, "MATCH", self.prefix + "*", "COUNT", 500
+            )
+            cursor = cursor.decode("utf-8")
+            if keys:
+                await self.pool.execute("DEL", *keys)
+            if cursor == "0":
+                break
+
+    def create_key_lock(
+        self, key: Text, cache: BaseCache = None
+    ) -> "RedisCacheKeyLock":
+        """Create a lock on a given cache key, shared with other processes."""
+        return RedisCacheKeyLock(cache or self, key, self)
+
+    async def close(self):
+        """Close the pooled connections."""
+        await self.pool.close()
+
+    async def lock(self, key: Text, token: str) -> bool:
+        """Try to take the cross-process lock for a key."""
+        reply = await self.pool.execute(
+            "SET",
+            self._lock_key(key),
+            token,
+            "NX",
+            "PX",
+            max(int(self.lock_ttl * 1000), 1),
+        )
+        return reply == "OK"
+
+    async def unlock(self, key: Text, token: str):
+        """Release the cross-process lock for a key, if still held."""
+        await self.pool.execute("EVAL", RELEASE_SCRIPT, 1, self._lock_key(key), token)
+
+    def __repr__(self) -> str:
+        """Human readable representation of `RedisCache`."""
+        return "<{}(host={}, port={}, db={})>".format(
+            self.__class__.__name__, self.pool.host, self.pool.port, self.pool.db
+        )
+
+
+class RedisCacheKeyLock(CacheKeyLock):
+    """
+    A lock on a cache key, held across all processes sharing the cache.
+
+    Waiters in this process are handled as by `CacheKeyLock`. Only one process
+    at a time produces the value; the others wait for it to appear in the cache.
+    """
+
+    def __init__(self, cache: BaseCache, key: Text, shared: RedisCache):
+        """
+        Initialize the key lock.
+
+        Args:
+            cache: the cache used to look up and store the result
+            key: the key to lock
+            shared: the cache holding the cross-process lock
+
+        """
+        super().__init__(cache, key)
+        self.shared = shared
+        self.token = None
+
+    async def __aenter__(self):
+        """Async context manager entry."""
+        await super().__aenter__()
+        if self.done:
+            return self
+
+        token = uuid4().hex
+        deadline = time.perf_counter() + self.shared.lock_ttl
+        while not await self.shared.lock(self.key, token):
+            await asyncio.sleep(self.shared.lock_poll)
+            found = await self.cache.get(self.key)
+            if found:
+                self._future.set_result(found)
+                return self
+            if time.perf_counter() > deadline:
+                LOGGER.warning("Timed out waiting for cache key lock: %s", self.key)
+                return self
+        self.token = token
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        """Async context manager exit, releasing the cross-process lock."""
+        await super().__aexit__(exc_type, exc_val, exc_tb)
+        if self.token:
+            token, self.token = self.token, None
+            await self.shared.unlock(self.key, token)
+
+
+class RedisCacheInvalidation(CacheInvalidation):
+    """Broadcast cache invalidations between agent instances via Redis pub/sub."""
+
+    def __init__(self, pool: RedisConnectionPool, channel: str = None):
+        """
+        Initialize the invalidation channel.
+
+        Args:
+            pool: The connection pool used for publishing
+            channel: The name of the pub/sub channel
+
+        """
+        self.pool = pool
+        self.channel = channel or (DEFAULT_PREFIX + "invalidate")
+
+    async def publish(self, message: str):
+        """Send a message to all subscribers."""
+        await self.pool.execute("PUBLISH", self.channel, message)
+
+    async def listen(self, on_subscribed: Callable = None) -> AsyncIterator[str]:
+        """Subscribe on a dedicated connection and yield incoming messages."""
+        conn = await self.pool.connect()
+        try:
+            await conn.execute("SUBSCRIBE", self.channel)
+            if on_subscribed:
+                on_subscribed()
+            while True:
+                reply = await conn.read_reply()
+                if isinstance(reply, list) and reply[0] == b"message":
+                    yield reply[2].decode("utf-8")
+        except (OSError, asyncio.IncompleteReadError) as err:
+            raise RedisError("Redis subscription failed") from err
+        finally:
+            conn.close()
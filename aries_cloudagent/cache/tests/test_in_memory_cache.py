@@ -66,6 +66,29 @@ class TestBasicCache:
             item = await cache.get(key)
             assert item is None
 
+    @pytest.mark.asyncio
+    async def test_get_many(self, cache):
+        await cache.set("expired", "value", 0.01)
+        await sleep(0.02)
+        found = await cache.get_many(["valid key", "missing", "expired"])
+        assert found == {"valid key": "value"}
+        assert (cache.hits, cache.misses) == (1, 2)
+
+    @pytest.mark.asyncio
+    async def test_set_many(self, cache):
+        cache.max_entries = 2
+        await cache.set_many({"key1": "value1", "key2": "value2"}, 0.05)
+        assert list(cache._cache) == ["key1", "key2"]
+        assert cache.evictions == 1
+        await sleep(0.05)
+        assert await cache.get_many(["key1", "key2"]) == {}
+
+    @pytest.mark.asyncio
+    async def test_clear_many(self, cache):
+        await cache.set_many({"key1": "value1", "key2": "value2"})
+        await cache.clear_many(["key1", "valid key", "missing"])
+        assert list(cache._cache) == ["key2"]
+
     @pytest.mark.asyncio
     async def test_flush(self, cache):
         await cache.flush()
@@ -165,3 +188,37 @@ class TestBasicCache:
     @pytest.mark.asyncio
     async def test_repr(self, cache):
         assert isinstance(repr(cache), str)
+
+    @pytest.mark.asyncio
+    async def test_lru_eviction(self):
+        cache = InMemoryCache(max_entries=3)
+        await cache.set(["a", "b", "c"], "value")
+        assert await cache.get("a") == "value"  # "a" becomes most recent
+        await cache.set("d", "value")
+        assert list(cache._cache) == ["c", "a", "d"]
+        assert await cache.get("b") is None
+        assert cache.stats == {
+            "entries": 3,
+            "max_entries": 3,
+            "hits": 1,
+            "misses": 1,
+            "evictions": 1,
+            "expirations": 0,
+        }
+
+    @pytest.mark.asyncio
+    async def test_expiry_heap(self, cache):
+        await cache.set("key", "value", 0.05)
+        await cache.set("key", "value", 10)  # overwrite leaves a stale heap entry
+        await cache.set("other", "value", 0.05)
+        await sleep(0.05)
+        assert await cache.get("key") == "value"
+        assert await cache.get("other") is None
+        assert cache.expirations == 1
+
+        for i in range(200):
+            await cache.set("key", "value", 10)
+        assert len(cache._expiry) <= 2 * len(cache._cache) + 64
+
+        await cache.flush()
+        assert not cache._expiry
@@ -0,0 +1,329 @@
+import asyncio
+import fnmatch
+import time
+
+from asyncio import ensure_future, sleep, wait_for
+
+import pytest
+
+from ..base import CacheError
+from ..redis import (
+    RELEASE_SCRIPT,
+    RedisCache,
+    RedisConnection,
+    RedisConnectionPool,
+    RedisError,
+)
+
+
+class StubRedisServer:
+    """In-process stand-in for a Redis server, supporting the commands in use."""
+
+    def __init__(self):
+        self.data = {}
+        self.expires = {}
+        self.commands = []
+        self.connections = 0
+        self.subscribers = {}
+        self.server = None
+
+    async def start(self) -> str:
+        self.server = await asyncio.start_server(self.handle, "127.0.0.1", 0)
+        port = self.server.sockets[0].getsockname()[1]
+        return f"redis://127.0.0.1:{port}/0"
+
+    async def stop(self):
+        self.server.close()
+        await self.server.wait_closed()
+
+    async def handle(self, reader, writer):
+        self.connections += 1
+        try:
+            while True:
+                line = await reader.readline()
+                if not line:
+                    break
+                args = []
+                for _ in range(int(line[1:])):
+                    size = int((await reader.readline())[1:])
+                    args.append((await reader.readexactly(size + 2))[:-2])
+                self.commands.append(args[0].decode().upper())
+                if self.commands[-1] == "SUBSCRIBE":
+                    self.subscribers.setdefault(args[1], set()).add(writer)
+                    reply = RedisConnection.encode([b"subscribe", args[1]])
+                    writer.write(b"*3" + reply[2:] + b":1\r\n")
+                else:
+                    writer.write(self.reply(args))
+                await writer.drain()
+        finally:
+            for writers in self.subscribers.values():
+                writers.discard(writer)
+            writer.close()
+
+    def lookup(self, key):
+        if key in self.expires and self.expires[key] <= time.perf_counter():
+            del self.expires[key]
+            del self.data[key]
+        return self.data.get(key)
+
+    def reply(self, args) -> bytes:
+        cmd = args[0].decode().upper()
+        if cmd in ("PING", "SELECT"):
+            return b"+OK\r\n"
+        if cmd == "GET":
+            value = self.lookup(args[1])
+            if value is None:
+                return b"$-1\r\n"
+            return b"$%d\r\n%s\r\n" % (len(value), value)
+        if cmd == "MGET":
+            values = [self.lookup(key) for key in args[1:]]
+            return b"*%d\r\n" % len(values) + b"".join(
+                b"$-1\r\n" if value is None else RedisConnection.encode([value])[4:]
+                for value in values
+            )
+        if cmd == "SET":
+            key, value = args[1], args[2]
+            opts = [arg.decode().upper() for arg in args[3:]]
+            if "NX" in opts and self.lookup(key) is not None:
+                return b"$-1\r\n"
+            self.data[key] = value
+            self.expires.pop(key, None)
+            if "PX" in opts:
+                ms = int(opts[opts.index("PX") + 1])
+                self.expires[key] = time.perf_counter() + ms / 1000
+            return b"+OK\r\n"
+        if cmd == "DEL":
+            count = 0
+            for key in args[1:]:
+                if self.lookup(key) is not None:
+                    del self.data[key]
+                    self.expires.pop(key, None)
+                    count += 1
+            return b":%d\r\n" % count
+        if cmd == "EVAL" and args[1].decode() == RELEASE_SCRIPT:
+            key, token = args[3], args[4]
+            if self.lookup(key) == token:
+                del self.data[key]
+                self.expires.pop(key, None)
+                return b":1\r\n"
+            return b":0\r\n"
+        if cmd == "SCAN":
+            pattern = args[args.index(b"MATCH") + 1].decode()
+            keys = [
+                key
+                for key in list(self.data)
+                if self.lookup(key) is not None
+                and fnmatch.fnmatchcase(key.decode(), pattern)
+            ]
+            return b"*2\r\n$1\r\n0\r\n" + RedisConnection.encode(keys)
+        if cmd == "PUBLISH":
+            writers = self.subscribers.get(args[1], ())
+            for writer in writers:
+                writer.write(RedisConnection.encode([b"message", args[1], args[2]]))
+            return b":%d\r\n" % len(writers)
+        return b"-ERR unknown command '%s'\r\n" % cmd.encode()
+
+
+@pytest.fixture()
+async def server():
+    server = StubRedisServer()
+    server.url = await server.start()
+    yield server
+    await server.stop()
+
+
+@pytest.fixture()
+async def cache(server):
+    cache = RedisCache(RedisConnectionPool(server.url, 2), lock_poll=0.01)
+    await cache.set("valid key", "value")
+    yield cache
+    await cache.pool.close()
+
+
+class TestRedisCache:
+    @pytest.mark.asyncio
+    async def test_get_none(self, cache):
+        item = await cache.get("doesn't exist")
+        assert item is None
+
+    @pytest.mark.asyncio
+    async def test_get_valid(self, cache, server):
+        item = await cache.get("valid key")
+        assert item == "value"
+        assert server.data[b"acapy:valid key"] == b'"value"'
+
+    @pytest.mark.asyncio
+    async def test_set_dict(self, cache):
+        await cache.set("key", {"dictkey": "dval"})
+        assert await cache.get("key") == {"dictkey": "dval"}
+
+    @pytest.mark.asyncio
+    async def test_set_not_serializable(self, cache):
+        with pytest.raises(CacheError):
+            await cache.set("key", object())
+
+    @pytest.mark.asyncio
+    async def test_set_multi_pipelined(self, cache, server):
+        connections = server.connections
+        await cache.set([f"key{i}" for i in range(4)], {"dictkey": "dval"})
+        for key in [f"key{i}" for i in range(4)]:
+            assert await cache.get(key) == {"dictkey": "dval"}
+        assert server.commands.count("SET") == 5
+        assert server.connections == connections  # pooled connection reused
+
+    @pytest.mark.asyncio
+    async def test_set_expires_multi(self, cache):
+        await cache.set([f"key{i}" for i in range(4)], {"dictkey": "dval"}, 0.05)
+        assert await cache.get("key0") == {"dictkey": "dval"}
+
+        await sleep(0.06)
+
+        for key in [f"key{i}" for i in range(4)]:
+            item = await cache.get(key)
+            assert item is None
+
+    @pytest.mark.asyncio
+    async def test_clear(self, cache):
+        await cache.set("key", "value")
+        await cache.clear("key")
+        item = await cache.get("key")
+        assert item is None
+
+    @pytest.mark.asyncio
+    async def test_get_many(self, cache, server):
+        assert await cache.get_many([]) == {}
+        found = await cache.get_many(["valid key", "missing"])
+        assert found == {"valid key": "value"}
+        assert server.commands.count("MGET") == 1
+        assert "GET" not in server.commands
+
+    @pytest.mark.asyncio
+    async def test_set_many(self, cache, server):
+        await cache.set_many({"key1": {"dictkey": "dval"}, "key2": "value2"}, 0.05)
+        assert server.commands.count("SET") == 3
+        found = await cache.get_many(["key1", "key2"])
+        assert found == {"key1": {"dictkey": "dval"}, "key2": "value2"}
+        await sleep(0.06)
+        assert await cache.get_many(["key1", "key2"]) == {}
+
+    @pytest.mark.asyncio
+    async def test_clear_many(self, cache, server):
+        await cache.set_many({"key1": "value1", "key2": "value2"})
+        await cache.clear_many(["key1", "key2", "valid key"])
+        assert server.commands.count("DEL") == 1
+        assert await cache.get_many(["key1", "key2", "valid key"]) == {}
+
+    @pytest.mark.asyncio
+    async def test_flush(self, cache, server):
+        server.data[b"other:key"] = b'"value"'
+        await cache.set(["key1", "key2"], "value")
+        await cache.flush()
+        assert await cache.get("key1") is None
+        assert await cache.get("valid key") is None
+        assert list(server.data) == [b"other:key"]
+
+    @pytest.mark.asyncio
+    async def test_error_reply(self, cache):
+        with pytest.raises(RedisError):
+            await cache.pool.execute("UNKNOWN")
+        assert await cache.get("valid key") == "value"  # connection still usable
+
+    @pytest.mark.asyncio
+    async def test_pool_limit(self, cache, server):
+        await asyncio.gather(*(cache.get(f"key{i}") for i in range(10)))
+        assert server.connections <= 2
+
+    @pytest.mark.asyncio
+    async def test_connect_error(self, server):
+        await server.stop()
+        cache = RedisCache(RedisConnectionPool(server.url))
+        with pytest.raises(RedisError):
+            await cache.get("key")
+
+    def test_bad_url(self):
+        with pytest.raises(CacheError):
+            RedisConnectionPool("http://localhost")
+
+    @pytest.mark.asyncio
+    async def test_acquire_release(self, cache, server):
+        test_key = "test_key"
+        lock = cache.acquire(test_key)
+        await lock.__aenter__()
+        assert test_key in cache._key_locks
+        assert b"acapy:lock:test_key" in server.data
+        await lock.__aexit__(None, None, None)
+        assert test_key not in cache._key_locks
+        assert b"acapy:lock:test_key" not in server.data
+        assert await cache.get(test_key) is None
+
+    @pytest.mark.asyncio
+    async def test_acquire_release_with_waiter(self, cache):
+        test_key = "test_key"
+        test_result = "test_result"
+        lock = cache.acquire(test_key)
+        await lock.__aenter__()
+
+        lock2 = cache.acquire(test_key)
+        assert lock2.parent is lock
+        await lock.set_result(test_result)
+        await lock.__aexit__(None, None, None)
+
+        assert await cache.get(test_key) == test_result
+        assert await wait_for(lock2, 1) == test_result
+
+    @pytest.mark.asyncio
+    async def test_acquire_across_processes(self, cache, server):
+        other = RedisCache(RedisConnectionPool(server.url), lock_poll=0.01)
+        test_key = "test_key"
+        test_result = {"value": "test_result"}
+
+        lock = cache.acquire(test_key)
+        await lock.__aenter__()
+        assert not lock.done
+
+        other_lock = other.acquire(test_key)
+        waiter = ensure_future(other_lock.__aenter__())
+        await sleep(0.03)
+        assert not waiter.done()  # blocked on the shared lock
+
+        await lock.set_result(test_result)
+        await lock.__aexit__(None, None, None)
+        await wait_for(waiter, 1)
+        assert other_lock.done
+        assert other_lock.result == test_result
+        assert other_lock.token is None
+        await other_lock.__aexit__(None, None, None)
+        await other.pool.close()
+
+    @pytest.mark.asyncio
+    async def test_acquire_after_remote_failure(self, cache, server):
+        other = RedisCache(RedisConnectionPool(server.url), lock_poll=0.01)
+        lock = cache.acquire("test_key")
+        await lock.__aenter__()
+
+        other_lock = other.acquire("test_key")
+        waiter = ensure_future(other_lock.__aenter__())
+        await sleep(0.03)
+        await lock.__aexit__(ValueError, ValueError(), None)
+
+        await wait_for(waiter, 1)
+        assert not other_lock.done  # lock taken over to produce the value
+        assert other_lock.token
+        await other_lock.__aexit__(None, None, None)
+        assert not server.data.get(b"acapy:lock:test_key")
+        await other.pool.close()
+
+    @pytest.mark.asyncio
+    async def test_acquire_timeout(self, cache, server):
+        cache.lock_ttl = 0.05
+        server.data[b"acapy:lock:test_key"] = b"other"
+        lock = cache.acquire("test_key")
+        await wait_for(lock.__aenter__(), 1)
+        assert not lock.done
+        assert lock.token is None
+        await lock.__aexit__(None, None, None)
+        assert server.data[b"acapy:lock:test_key"] == b"other"
+
+    @pytest.mark.asyncio
+    async def test_repr(self, cache):
+        assert isinstance(repr(cache), str)
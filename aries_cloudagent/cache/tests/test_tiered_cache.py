@@ -0,0 +1,176 @@
+from asyncio import sleep, wait_for
+
+import pytest
+
+from ..in_memory import InMemoryCache
+from ..redis import RedisCache, RedisCacheInvalidation, RedisConnectionPool
+from ..tiered import TieredCache
+
+from .test_redis_cache import StubRedisServer
+
+
+async def subscribed(cache: TieredCache):
+    cache._ensure_listener()
+    while not cache._subscribed:
+        await sleep(0.01)
+
+
+async def replica(server: StubRedisServer) -> TieredCache:
+    pool = RedisConnectionPool(server.url)
+    cache = TieredCache(
+        RedisCache(pool), max_entries=10, invalidation=RedisCacheInvalidation(pool)
+    )
+    await wait_for(subscribed(cache), 1)
+    return cache
+
+
+@pytest.fixture()
+async def server():
+    server = StubRedisServer()
+    server.url = await server.start()
+    yield server
+    await server.stop()
+
+
+@pytest.fixture()
+async def replicas(server):
+    caches = [await replica(server), await replica(server)]
+    yield caches
+    for cache in caches:
+        await cache.close()
+
+
+class TestTieredCache:
+    @pytest.mark.asyncio
+    async def test_near_hit(self):
+        remote = InMemoryCache()
+        cache = TieredCache(remote)
+        await remote.set("key", "value")
+        assert await cache.get("key") == "value"
+        assert await cache.get("key") == "value"
+        assert await cache.get("missing") is None
+        assert remote.hits == 1  # second lookup served locally
+        stats = cache.stats
+        assert stats["near"]["hits"] == 1
+        assert stats["near"]["misses"] == 2
+        assert stats["remote"] == {"hits": 1, "misses": 1, "hit_rate": 0.5}
+
+    @pytest.mark.asyncio
+    async def test_get_many(self):
+        remote = InMemoryCache()
+        cache = TieredCache(remote)
+        await cache.set("near", "value")
+        await remote.set("far", "value")
+        found = await cache.get_many(["near", "far", "missing"])
+        assert found == {"near": "value", "far": "value"}
+        assert "far" in cache.local._cache
+        assert cache.stats["remote"] == {"hits": 1, "misses": 1, "hit_rate": 0.5}
+        assert await cache.get_many(["near", "far"]) == found
+        assert remote.hits == 1
+
+    @pytest.mark.asyncio
+    async def test_near_ttl(self):
+        cache = TieredCache(InMemoryCache(), near_ttl=0.05)
+        await cache.set("key", "value", 10)
+        await cache.remote.set("key", "changed")
+        assert await cache.get("key") == "value"
+        await sleep(0.06)
+        assert await cache.get("key") == "changed"
+
+    @pytest.mark.asyncio
+    async def test_max_entries(self):
+        cache = TieredCache(InMemoryCache(), max_entries=2)
+        await cache.set(["a", "b", "c"], "value")
+        assert list(cache.local._cache) == ["b", "c"]
+        assert await cache.get("a") == "value"
+
+    @pytest.mark.asyncio
+    async def test_clear_broadcast(self, replicas, server):
+        first, second = replicas
+        await first.set("connection_target::abc", {"endpoint": "old"})
+        assert await second.get("connection_target::abc") == {"endpoint": "old"}
+        assert "connection_target::abc" in second.local._cache
+
+        await first.clear("connection_target::abc")
+        await wait_for(self.dropped(second, "connection_target::abc"), 1)
+        assert await second.get("connection_target::abc") is None
+        assert second.invalidations == 2  # set, then clear
+        assert first.invalidations == 0  # own messages are ignored
+
+    @pytest.mark.asyncio
+    async def test_set_broadcast(self, replicas):
+        first, second = replicas
+        await first.set("key", "old")
+        assert await second.get("key") == "old"
+        await first.set("key", "new")
+        await wait_for(self.dropped(second, "key"), 1)
+        assert await second.get("key") == "new"
+        assert await first.get("key") == "new"
+
+    @pytest.mark.asyncio
+    async def test_many_broadcast(self, replicas):
+        first, second = replicas
+        await first.set_many({"a": "old", "b": "old"})
+        assert await second.get_many(["a", "b"]) == {"a": "old", "b": "old"}
+        await first.set_many({"a": "new", "b": "new"})
+        await wait_for(self.dropped(second, "b"), 1)
+        assert await second.get_many(["a", "b"]) == {"a": "new", "b": "new"}
+        await first.clear_many(["a", "b"])
+        await wait_for(self.dropped(second, "a"), 1)
+        assert await second.get_many(["a", "b"]) == {}
+
+    @pytest.mark.asyncio
+    async def test_flush_broadcast(self, replicas):
+        first, second = replicas
+        await second.set(["a", "b"], "value")
+        await first.flush()
+        await wait_for(self.dropped(second, "a"), 1)
+        assert await second.get("b") is None
+
+    @pytest.mark.asyncio
+    async def test_subscription_lost(self, replicas, server):
+        first, second = replicas
+        await first.set("key", "value")
+        assert await second.get("key") == "value"
+        for writers in list(server.subscribers.values()):
+            for writer in list(writers):
+                writer.close()
+        await wait_for(self.unsubscribed(second), 1)
+        assert not second.local._cache
+        assert second.stats["subscribed"] is False
+        assert await second.get("key") == "value"
+        assert not second.local._cache  # not cached locally until resubscribed
+
+    @pytest.mark.asyncio
+    async def test_acquire_shared_lock(self, replicas, server):
+        first, second = replicas
+        lock = first.acquire("key")
+        async with lock:
+            assert b"acapy:lock:key" in server.data
+            await lock.set_result("value")
+        assert await second.get("key") == "value"
+        assert "key" in first.local._cache
+
+        async with second.acquire("key") as entry:
+            assert entry.result == "value"
+        assert second.stats["near"]["hits"] == 1
+
+    @staticmethod
+    async def dropped(cache: TieredCache, key: str):
+        while key in cache.local._cache:
+            await sleep(0.01)
+
+    @staticmethod
+    async def unsubscribed(cache: TieredCache):
+        while cache._subscribed:
+            await sleep(0.01)
+
+    @pytest.mark.asyncio
+    async def test_close(self, server):
+        cache = await replica(server)
+        await cache.set("key", "value")
+        assert cache.remote.pool._idle
+
+        await cache.close()
+        assert cache._listener is None
+        assert not cache.remote.pool._idle
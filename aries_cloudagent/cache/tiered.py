@@ -0,0 +1,292 @@
+"""Two-tier cache keeping a local near cache in front of a shared cache."""
+
+import asyncio
+import json
+import logging
+
+from abc import ABC, abstractmethod
+from typing import Any, AsyncIterator, Callable, Mapping, Sequence, Text, Union
+from uuid import uuid4
+
+from .base import BaseCache, CacheError, CacheKeyLock
+from .in_memory import InMemoryCache
+
+LOGGER = logging.getLogger(__name__)
+
+DEFAULT_NEAR_TTL = 30
+RESUBSCRIBE_INTERVAL = 1.0
+
+
+class CacheInvalidation(ABC):
+    """Channel used to tell other agent instances to drop cached entries."""
+
+    @abstractmethod
+    async def publish(self, message: str):
+        """Send a message to all subscribers."""
+
+    @abstractmethod
+    def listen(self, on_subscribed: Callable = None) -> AsyncIterator[str]:
+        """
+        Subscribe to the channel and yield incoming messages.
+
+        Args:
+            on_subscribed: called once the subscription is active
+
+        """
+
+
+def _hit_rate(hits: int, misses: int) -> float:
+    """Calculate the ratio of hits to lookups."""
+    total = hits + misses
+    return round(hits / total, 4) if total else None
+
+
+class TieredCache(BaseCache):
+    """
+    Cache serving entries from a local LRU before falling back to a shared cache.
+
+    Writes go to both tiers. When an invalidation channel is provided, every
+    write and removal is broadcast so that other instances drop their local
+    copy. Local entries are only served while the channel subscription is
+    active, and are kept at most `near_ttl` seconds in any case.
+    """
+
+    def __init__(
+        self,
+        remote: BaseCache,
+        *,
+        max_entries: int = None,
+        near_ttl: float = DEFAULT_NEAR_TTL,
+        invalidation: CacheInvalidation = None,
+    ):
+        """
+        Initialize a `TieredCache` instance.
+
+        Args:
+            remote: The shared cache
+            max_entries: The maximum number of entries held locally
+            near_ttl: The maximum number of seconds to keep a local entry
+            invalidation: The channel used to broadcast invalidations
+
+        """
+        super().__init__()
+        self.local = InMemoryCache(max_entries=max_entries)
+        self.remote = remote
+        self.near_ttl = near_ttl
+        self.invalidation = invalidation
+        self.origin = uuid4().hex
+        self.remote_hits = 0
+        self.remote_misses = 0
+        self.invalidations = 0
+        self._generation = 0
+        self._listener: asyncio.Task = None
+        self._subscribed = invalidation is None
+
+    def _ensure_listener(self):
+        """Start listening for invalidations from other instances."""
+        if self.invalidation and not self._listener:
+            self._listener = asyncio.ensure_future(self._listen())
+
+    def _on_subscribed(self):
+        """Resume serving local entries once invalidations are received."""
+        self._subscribed = True
+
+    async def _listen(self):
+        """Apply invalidation messages, resubscribing after failures."""
+        while True:
+            try:
+                async for message in self.invalidation.listen(self._on_subscribed):
+                    await self._apply(message)
+            except CacheError as err:
+                LOGGER.warning("Cache invalidation subscription lost: %s", err)
+            # messages may have been missed while disconnected
+            self._subscribed = False
+            await self._drop_local()
+            await asyncio.sleep(RESUBSCRIBE_INTERVAL)
+
+    async def _apply(self, message: str):
+        """Drop local entries named by an invalidation message."""
+        try:
+            data = json.loads(message)
+        except ValueError:
+            LOGGER.warning("Ignoring invalid cache invalidation: %s", message[:80])
+            return
+        if data.get("origin") == self.origin:
+            return
+        self.invalidations += 1
+        self._generation += 1
+        if data.get("flush"):
+            await self.local.flush()
+        else:
+            for key in data.get("keys") or ():
+                await self.local.clear(key)
+
+    async def _drop_local(self):
+        """Discard all local entries."""
+        self._generation += 1
+        await self.local.flush()
+
+    async def _broadcast(self, keys: Sequence[Text] = None):
+        """Tell other instances to drop local copies of the given keys, or all."""
+        if not self.invalidation:
+            return
+        message = {"origin": self.origin}
+        if keys is None:
+            message["flush"] = True
+        else:
+            message["keys"] = list(keys)
+        await self.invalidation.publish(json.dumps(message))
+
+    def _near_ttl(self, ttl: float = None) -> float:
+        """Get the time to keep an entry locally."""
+        return min(ttl, self.near_ttl) if ttl else self.near_ttl
+
+    async def get(self, key: Text):
+        """
+        Get an item from the cache.
+
+        Args:
+            key: the key to retrieve an item for
+
+        Returns:
+            The record found or `None`
+
+        """
+        self._ensure_listener()
+        if self._subscribed:
+            value = await self.local.get(key)
+            if value is not None:
+                return value
+        generation = self._generation
+        value = await self.remote.get(key)
+        if value is None:
+            self.remote_misses += 1
+        else:
+            self.remote_hits += 1
+            # skip if an invalidation arrived during the remote lookup
+            if self._subscribed and generation == self._generation:
+                await self.local.set(key, value, self.near_ttl)
+        return value
+
+    async def set(self, keys: Union[Text, Sequence[Text]], value: Any, ttl: int = None):
+        """
+        Add an item to both tiers with an optional ttl.
+
+        Args:
+            keys: the key or keys for which to set an item
+            value: the value to store in the cache
+            ttl: number of seconds that the record should persist
+
+        """
+        self._ensure_listener()
+        keys = [keys] if isinstance(keys, Text) else list(keys)
+        await self.remote.set(keys, value, ttl)
+        if self._subscribed:
+            await self.local.set(keys, value, self._near_ttl(ttl))
+        await self._broadcast(keys)
+
+    async def clear(self, key: Text):
+        """
+        Remove an item from both tiers and from other instances' local tier.
+
+        Args:
+            key: the key to remove
+
+        """
+        self._ensure_listener()
+        await self.local.clear(key)
+        await self.remote.clear(key)
+        await self._broadcast([key])
+
+    async def get_many(self, keys: Sequence[Text]) -> Mapping[Text, Any]:
+        """
+        Get several items, looking up local misses in one remote request.
+
+        Args:
+            keys: the keys to retrieve items for
+
+        Returns:
+            A mapping from each key found to its value
+
+        """
+        self._ensure_listener()
+        found = await self.local.get_many(keys) if self._subscribed else {}
+        missing = [key for key in keys if key not in found]
+        if not missing:
+            return found
+        generation = self._generation
+        remote = await self.remote.get_many(missing)
+        self.remote_hits += len(remote)
+        self.remote_misses += len(missing) - len(remote)
+        if remote and self._subscribed and generation == self._generation:
+            await self.local.set_many(remote, self.near_ttl)
+        found.update(remote)
+        return found
+
+    async def set_many(self, values: Mapping[Text, Any], ttl: int = None):
+        """
+        Add several items to both tiers with an optional ttl.
+
+        Args:
+            values: a mapping from each key to the value to store for it
+            ttl: number of seconds that the records should persist
+
+        """
+        self._ensure_listener()
+        await self.remote.set_many(values, ttl)
+        if self._subscribed:
+            await self.local.set_many(values, self._near_ttl(ttl))
+        await self._broadcast(list(values))
+
+    async def clear_many(self, keys: Sequence[Text]):
+        """
+        Remove several items from both tiers and from other instances.
+
+        Args:
+            keys: the keys to remove
+
+        """
+        self._ensure_listener()
+        await self.local.clear_many(keys)
+        await self.remote.clear_many(keys)
+        await self._broadcast(keys)
+
+    async def flush(self):
+        """Remove all items from both tiers and from other instances."""
+        await self.local.flush()
+        await self.remote.flush()
+        await self._broadcast()
+
+    def create_key_lock(self, key: Text, cache: BaseCache = None) -> CacheKeyLock:
+        """Create a lock on a given cache key, using the shared cache's locking."""
+        return self.remote.create_key_lock(key, cache or self)
+
+    async def close(self):
+        """Stop listening for invalidations and close the shared cache."""
+        if self._listener:
+            self._listener.cancel()
+            try:
+                await self._listener
+            except asyncio.CancelledError:
+                pass
+            self._listener = None
+            self._subscribed = self.invalidation is None
+        await self.remote.close()
+
+    @property
+    def stats(self) -> Mapping[str, Any]:
+        """Accessor for the hit rates of each tier."""
+        near = dict(self.local.stats)
+        near["hit_rate"] = _hit_rate(near["hits"], near["misses"])
+        remote = {"hits": self.remote_hits, "misses": self.remote_misses}
+        remote["hit_rate"] = _hit_rate(self.remote_hits, self.remote_misses)
+        return {
+            "near": near,
+            "remote": remote,
+            "invalidations": self.invalidations,
+            "subscribed": self._subscribed,
+        }
+
+    def __repr__(self) -> str:
+        """Human readable representation of `TieredCache`."""
+        return "<{}(remote={!r})>".format(self.__class__.__name__, self.remote)
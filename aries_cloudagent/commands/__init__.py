@@ -7,7 +7,17 @@ from typing import Sequence
 def available_commands():
     """Index available commands."""
     return [
+        {
+            "name": "export",
+            "summary": "Export wallet storage records as NDJSON",
+            "module": f"{__package__}.export_records",
+        },
         {"name": "help", "summary": "Print available commands"},
+        {
+            "name": "import",
+            "summary": "Import wallet storage records from NDJSON",
+            "module": f"{__package__}.import_records",
+        },
         {"name": "provision", "summary": "Provision an agent"},
         {"name": "start", "summary": "Start a new agent process"},
     ]
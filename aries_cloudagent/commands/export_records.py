@@ -0,0 +1,80 @@
+"""Export command for dumping storage records from a wallet."""
+
+import asyncio
+import sys
+
+from configargparse import ArgumentParser
+from typing import Sequence
+
+from ..config import argparse as arg
+from ..config.default_context import DefaultContextBuilder
+from ..config.base import BaseError
+from ..config.error import ArgsParseError
+from ..config.util import common_config
+from ..config.wallet import wallet_config
+from ..storage.bulk import export_records
+
+
+class RecordExportError(BaseError):
+    """Base exception for record export errors."""
+
+
+def init_argument_parser(parser: ArgumentParser):
+    """Initialize an argument parser with the module's arguments."""
+    return arg.load_argument_groups(parser, *arg.group.get_registered(arg.CAT_RECORDS))
+
+
+async def export_file(settings: dict):
+    """Export records to the file named in the settings."""
+    context_builder = DefaultContextBuilder(settings)
+    context = await context_builder.build_context()
+
+    path = context.settings.get("records.file") or "-"
+    try:
+        root_profile, _ = await wallet_config(context)
+        try:
+            out_file = sys.stdout if path == "-" else open(path, "w")
+            try:
+                stats = await export_records(
+                    root_profile,
+                    context.settings.get("records.types"),
+                    out_file,
+                    batch_size=context.settings.get("records.batch_size"),
+                )
+            finally:
+                if out_file is sys.stdout:
+                    out_file.flush()
+                else:
+                    out_file.close()
+        finally:
+            await root_profile.close()
+    except (BaseError, OSError) as e:
+        raise RecordExportError("Error during record export") from e
+
+    print(stats.report("Exported"), file=sys.stderr)
+    return stats
+
+
+def execute(argv: Sequence[str] = None):
+    """Entrypoint."""
+    parser = arg.create_argument_parser()
+    parser.prog += " export"
+    get_settings = init_argument_parser(parser)
+    args = parser.parse_args(argv)
+    settings = get_settings(args)
+    if not settings.get("records.types"):
+        parser.print_help()
+        raise ArgsParseError("--record-type is required for export")
+    common_config(settings)
+
+    loop = asyncio.get_event_loop()
+    loop.run_until_complete(export_file(settings))
+
+
+def main():
+    """Execute the main line."""
+    if __name__ == "__main__":
+        execute()
+
+
+main()
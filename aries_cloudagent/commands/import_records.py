@@ -0,0 +1,74 @@
+"""Import command for bulk loading storage records into a wallet."""
+
+import asyncio
+import sys
+
+from configargparse import ArgumentParser
+from typing import Sequence
+
+from ..config import argparse as arg
+from ..config.default_context import DefaultContextBuilder
+from ..config.base import BaseError
+from ..config.util import common_config
+from ..config.wallet import wallet_config
+from ..storage.bulk import import_records, read_records
+
+
+class RecordImportError(BaseError):
+    """Base exception for record import errors."""
+
+
+def init_argument_parser(parser: ArgumentParser):
+    """Initialize an argument parser with the module's arguments."""
+    return arg.load_argument_groups(parser, *arg.group.get_registered(arg.CAT_RECORDS))
+
+
+async def import_file(settings: dict):
+    """Import the records file named in the settings."""
+    context_builder = DefaultContextBuilder(settings)
+    context = await context_builder.build_context()
+
+    path = context.settings.get("records.file") or "-"
+    try:
+        root_profile, _ = await wallet_config(context)
+        try:
+            in_file = sys.stdin if path == "-" else open(path, "r")
+            try:
+                stats = await import_records(
+                    root_profile,
+                    read_records(in_file, context.settings.get("records.types")),
+                    batch_size=context.settings.get("records.batch_size"),
+                    concurrency=context.settings.get("records.concurrency"),
+                )
+            finally:
+                if in_file is not sys.stdin:
+                    in_file.close()
+        finally:
+            await root_profile.close()
+    except (BaseError, OSError) as e:
+        raise RecordImportError("Error during record import") from e
+
+    print(stats.report("Imported"), file=sys.stderr)
+    return stats
+
+
+def execute(argv: Sequence[str] = None):
+    """Entrypoint."""
+    parser = arg.create_argument_parser()
+    parser.prog += " import"
+    get_settings = init_argument_parser(parser)
+    args = parser.parse_args(argv)
+    settings = get_settings(args)
+    common_config(settings)
+
+    loop = asyncio.get_event_loop()
+    loop.run_until_complete(import_file(settings))
+
+
+def main():
+    """Execute the main line."""
+    if __name__ == "__main__":
+        execute()
+
+
+main()
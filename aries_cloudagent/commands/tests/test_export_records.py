@@ -0,0 +1,69 @@
+from asynctest import TestCase as AsyncTestCase
+from asynctest import mock as async_mock
+
+from ...config.base import ConfigError
+from ...config.error import ArgsParseError
+from ...core.in_memory import InMemoryProfile
+from ...storage.base import BaseStorage
+from ...storage.bulk import read_records
+from ...storage.record import StorageRecord
+from .. import export_records as test_module
+
+
+class TestExportRecords(AsyncTestCase):
+    def test_bad_calls(self):
+        with self.assertRaises(ArgsParseError):
+            test_module.execute([])
+
+        with self.assertRaises(SystemExit):
+            test_module.execute(["bad"])
+
+    def test_execute(self):
+        with async_mock.patch.object(
+            test_module, "export_file", async_mock.CoroutineMock()
+        ) as mock_export:
+            test_module.execute(
+                ["--record-type", "connection", "--record-type", "forward_route"]
+            )
+            settings = mock_export.call_args[0][0]
+            assert settings["records.file"] == "-"
+            assert settings["records.types"] == ["connection", "forward_route"]
+
+    async def test_export_file(self):
+        profile = InMemoryProfile.test_profile()
+        profile.close = async_mock.CoroutineMock()
+        records = [StorageRecord("connection", "{}", id=str(n)) for n in range(3)]
+        async with profile.session() as session:
+            await session.inject(BaseStorage).add_records(records)
+
+        mock_stdout = async_mock.MagicMock()
+        with async_mock.patch.object(
+            test_module,
+            "wallet_config",
+            async_mock.CoroutineMock(return_value=(profile, None)),
+        ), async_mock.patch.object(test_module.sys, "stdout", mock_stdout):
+            stats = await test_module.export_file(
+                {"records.types": ["connection"], "records.batch_size": 2}
+            )
+        profile.close.assert_awaited_once()
+        mock_stdout.flush.assert_called_once()
+        assert stats.count == 3
+        written = "".join(call[0][0] for call in mock_stdout.write.call_args_list)
+        assert list(read_records(written.splitlines())) == records
+
+    async def test_export_file_x(self):
+        with async_mock.patch.object(
+            test_module, "wallet_config", async_mock.CoroutineMock()
+        ) as mock_wallet_config:
+            mock_wallet_config.side_effect = ConfigError("oops")
+            with self.assertRaises(test_module.RecordExportError):
+                await test_module.export_file({})
+
+    def test_main(self):
+        with async_mock.patch.object(
+            test_module, "__name__", "__main__"
+        ) as mock_name, async_mock.patch.object(
+            test_module, "execute", async_mock.MagicMock()
+        ) as mock_execute:
+            test_module.main()
+            mock_execute.assert_called_once()
@@ -0,0 +1,72 @@
+from asynctest import TestCase as AsyncTestCase
+from asynctest import mock as async_mock
+
+from ...config.base import ConfigError
+from ...config.error import ArgsParseError
+from ...core.in_memory import InMemoryProfile
+from ...storage.base import BaseStorage
+from ...storage.bulk import record_to_json
+from ...storage.record import StorageRecord
+from .. import import_records as test_module
+
+
+class TestImportRecords(AsyncTestCase):
+    def test_bad_calls(self):
+        with self.assertRaises(SystemExit):
+            test_module.execute(["bad"])
+
+        with self.assertRaises(ArgsParseError):
+            test_module.execute(["--records-batch-size", "0"])
+
+    def test_execute(self):
+        with async_mock.patch.object(
+            test_module, "import_file", async_mock.CoroutineMock()
+        ) as mock_import:
+            test_module.execute(["--records-file", "in.ndjson"])
+            settings = mock_import.call_args[0][0]
+            assert settings["records.file"] == "in.ndjson"
+            assert settings["records.batch_size"] == 500
+
+    async def test_import_file(self):
+        profile = InMemoryProfile.test_profile()
+        profile.close = async_mock.CoroutineMock()
+        path = self.id() + ".ndjson"
+        records = [StorageRecord("connection", "{}", id=str(n)) for n in range(3)]
+        mock_open = async_mock.mock_open(
+            read_data="\n".join(record_to_json(rec) for rec in records)
+        )
+        with async_mock.patch.object(
+            test_module,
+            "wallet_config",
+            async_mock.CoroutineMock(return_value=(profile, None)),
+        ), async_mock.patch.object(test_module, "open", mock_open, create=True):
+            stats = await test_module.import_file(
+                {
+                    "records.file": path,
+                    "records.batch_size": 2,
+                    "records.concurrency": 2,
+                }
+            )
+        mock_open.assert_called_once_with(path, "r")
+        profile.close.assert_awaited_once()
+        assert stats.count == 3
+        async with profile.session() as session:
+            found = await session.inject(BaseStorage).get_record("connection", "2")
+            assert found == records[2]
+
+    async def test_import_file_x(self):
+        with async_mock.patch.object(
+            test_module, "wallet_config", async_mock.CoroutineMock()
+        ) as mock_wallet_config:
+            mock_wallet_config.side_effect = ConfigError("oops")
+            with self.assertRaises(test_module.RecordImportError):
+                await test_module.import_file({})
+
+    def test_main(self):
+        with async_mock.patch.object(
+            test_module, "__name__", "__main__"
+        ) as mock_name, async_mock.patch.object(
+            test_module, "execute", async_mock.MagicMock()
+        ) as mock_execute:
+            test_module.main()
+            mock_execute.assert_called_once()
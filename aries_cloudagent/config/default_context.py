@@ -6,9 +6,12 @@ from .provider import CachedProvider, ClassProvider
 
 from ..cache.base import BaseCache
 from ..cache.in_memory import InMemoryCache
+from ..cache.redis import RedisCache, RedisCacheInvalidation, RedisConnectionPool
+from ..cache.tiered import DEFAULT_NEAR_TTL, TieredCache
 from ..core.plugin_registry import PluginRegistry
 from ..core.profile import ProfileManager, ProfileManagerProvider
 from ..core.protocol_registry import ProtocolRegistry
+from ..storage.instrumented import StorageMetrics
 from ..tails.base import BaseTailsServer
 
 from ..protocols.actionmenu.v1_0.base_service import BaseMenuService
@@ -17,6 +20,8 @@ from ..protocols.didcomm_prefix import DIDCommPrefix
 from ..protocols.introduction.v0_1.base_service import BaseIntroductionService
 from ..protocols.introduction.v0_1.demo_service import DemoIntroductionService
 
+from ..transport.queue.sqlite_store import SqliteQueueStore
+from ..transport.queue.store import BaseQueueStore
 from ..transport.wire_format import BaseWireFormat
 from ..utils.stats import Collector
 
@@ -33,9 +38,36 @@ class DefaultContextBuilder(ContextBuilder):
             timing_log = context.settings.get("timing.log_file")
             collector = Collector(log_path=timing_log)
             context.injector.bind_instance(Collector, collector)
-
-        # Shared in-memory cache
-        context.injector.bind_instance(BaseCache, InMemoryCache())
+            context.injector.bind_instance(StorageMetrics, StorageMetrics())
+
+        # Shared cache, in-memory unless a cache server is configured
+        cache_url = context.settings.get("cache.url")
+        if cache_url:
+            pool = RedisConnectionPool(
+                cache_url, context.settings.get("cache.pool_size")
+            )
+            cache = RedisCache(pool)
+            near_entries = context.settings.get("cache.near.max_entries")
+            if near_entries:
+                cache = TieredCache(
+                    cache,
+                    max_entries=near_entries,
+                    near_ttl=context.settings.get("cache.near.ttl") or DEFAULT_NEAR_TTL,
+                    invalidation=RedisCacheInvalidation(pool),
+                )
+        else:
+            cache = InMemoryCache(max_entries=context.settings.get("cache.max_entries"))
+        context.injector.bind_instance(BaseCache, cache)
+
+        # Durable store for messages awaiting delivery
+        queue_path = context.settings.get("transport.queue_path")
+        if queue_path:
+            context.injector.bind_instance(
+                BaseQueueStore,
+                SqliteQueueStore(
+                    queue_path, context.settings.get("transport.queue_commit_delay")
+                ),
+            )
 
         # Global protocol registry
         context.injector.bind_instance(ProtocolRegistry, ProtocolRegistry())
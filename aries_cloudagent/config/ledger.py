@@ -15,6 +15,7 @@ from ..core.profile import Profile
 from ..ledger.base import BaseLedger
 from ..ledger.endpoint_type import EndpointType
 from ..ledger.error import LedgerError
+from ..messaging.valid import IndyCredDefId, IndyRevRegId, IndySchemaId
 from ..utils.http import fetch, FetchError
 from ..wallet.base import BaseWallet
 
@@ -69,6 +70,10 @@ async def ledger_config(
         return False
 
     async with ledger:
+        prewarm_path = session.settings.get("ledger.cache_prewarm")
+        if prewarm_path:
+            await prewarm_ledger_cache(ledger, prewarm_path)
+
         # Check transaction author agreement acceptance
         if not ledger.read_only:
             taa_info = await ledger.get_txn_author_agreement()
@@ -100,6 +105,48 @@ async def ledger_config(
     return True
 
 
+async def prewarm_ledger_cache(ledger: BaseLedger, path: str):
+    """Fetch the ledger artefacts listed in a file into the ledger cache."""
+    try:
+        with open(path, "r") as ids_file:
+            idents = [line.strip() for line in ids_file]
+    except IOError as e:
+        raise ConfigError("Error reading ledger cache prewarm file") from e
+
+    schema_ids, cred_def_ids, rev_reg_ids = [], [], []
+    for ident in idents:
+        if not ident or ident.startswith("#"):
+            continue
+        if re.match(IndyRevRegId.PATTERN, ident):
+            rev_reg_ids.append(ident)
+        elif re.match(IndyCredDefId.PATTERN, ident):
+            cred_def_ids.append(ident)
+        elif re.match(IndySchemaId.PATTERN, ident):
+            schema_ids.append(ident)
+        else:
+            LOGGER.warning("Skipping unrecognized ledger identifier: %s", ident)
+
+    LOGGER.info(
+        "Prewarming ledger cache with %d schemas, %d credential definitions "
+        "and %d revocation registry definitions",
+        len(schema_ids),
+        len(cred_def_ids),
+        len(rev_reg_ids),
+    )
+    try:
+        found = dict(await ledger.get_schemas(schema_ids))
+        found.update(await ledger.get_credential_definitions(cred_def_ids))
+        for rev_reg_id in rev_reg_ids:
+            found[rev_reg_id] = await ledger.get_revoc_reg_def(rev_reg_id)
+    except Exception:
+        # a cold cache only costs ledger reads later on
+        LOGGER.warning("Failed to prewarm ledger cache", exc_info=True)
+        return
+    for ident, value in found.items():
+        if value is None:
+            LOGGER.warning("Ledger artefact not found: %s", ident)
+
+
 async def accept_taa(ledger: BaseLedger, taa_info, provision: bool = False) -> bool:
     """Perform TAA acceptance."""
 
@@ -42,6 +42,29 @@ class TestArgParse(AsyncTestCase):
                 "http",
                 "--max-outbound-retry",
                 "5",
+                "--outbound-retry-backoff",
+                "2.5",
+                "--outbound-circuit-threshold",
+                "0",
+                "--outbound-queue-path",
+                "queue.db",
+                "--outbound-webhook-concurrency",
+                "10",
+                "--outbound-host-concurrency",
+                "0",
+                "--outbound-endpoint-weight",
+                "https://mediator.example:8443=2.5",
+                "--outbound-http-host-connection-limit",
+                "20",
+                "--outbound-http-dns-ttl",
+                "0",
+                "--outbound-http-keepalive",
+                "30",
+                "--outbound-http-timeout",
+                "60",
+                "--outbound-http2",
+                "--outbound-http-prewarm",
+                "5",
             ]
         )
 
@@ -53,6 +76,41 @@ class TestArgParse(AsyncTestCase):
         assert settings.get("transport.inbound_configs") == [["http", "0.0.0.0", "80"]]
         assert settings.get("transport.outbound_configs") == ["http"]
         assert result.max_outbound_retry == 5
+        assert settings.get("transport.outbound_retry_backoff") == 2.5
+        assert settings.get("transport.outbound_circuit_threshold") == 0
+        assert "transport.outbound_circuit_timeout" not in settings
+        assert settings.get("transport.queue_path") == "queue.db"
+        assert "transport.queue_commit_delay" not in settings
+        assert settings.get("transport.outbound_webhook_limit") == 10
+        assert settings.get("transport.outbound_host_limit") == 0
+        assert "transport.outbound_message_limit" not in settings
+        assert settings.get("transport.outbound_endpoint_weights") == {
+            "https://mediator.example:8443": 2.5
+        }
+        assert "transport.http_limit" not in settings
+        assert settings.get("transport.http_host_limit") == 20
+        assert settings.get("transport.http_dns_ttl") == 0
+        assert settings.get("transport.http_keepalive_timeout") == 30
+        assert settings.get("transport.http_timeout") == 60
+        assert "transport.http_connect_timeout" not in settings
+        assert settings.get("transport.http2") is True
+        assert settings.get("transport.http_prewarm") == 5
+
+        for weight in ("http://host", "=2", "http://host=0", "http://host=x"):
+            result = parser.parse_args(
+                [
+                    "--inbound-transport",
+                    "http",
+                    "0.0.0.0",
+                    "80",
+                    "--outbound-transport",
+                    "http",
+                    "--outbound-endpoint-weight",
+                    weight,
+                ]
+            )
+            with self.assertRaises(argparse.ArgsParseError):
+                group.get_settings(result)
 
     async def test_general_settings_file(self):
         """Test file argument parsing."""
@@ -60,6 +118,8 @@ class TestArgParse(AsyncTestCase):
         parser = argparse.create_argument_parser()
         group = argparse.GeneralGroup()
         group.add_arguments(parser)
+        storage_group = argparse.StorageGroup()
+        storage_group.add_arguments(parser)
 
         with async_mock.patch.object(parser, "exit") as exit_parser:
             parser.parse_args(["-h"])
@@ -76,9 +136,53 @@ class TestArgParse(AsyncTestCase):
         assert result.storage_type == "bar"
 
         settings = group.get_settings(result)
+        settings.update(storage_group.get_settings(result))
 
         assert settings.get("external_plugins") == ["foo"]
-        assert settings.get("storage_type") == "bar"
+        assert settings.get("storage.type") == "bar"
+
+    async def test_record_cache(self):
+        """Test the record cache is only enabled on request."""
+
+        parser = argparse.create_argument_parser()
+        group = argparse.GeneralGroup()
+        group.add_arguments(parser)
+
+        args = ["--endpoint", "localhost"]
+        settings = group.get_settings(parser.parse_args(args))
+        assert "cache.records" not in settings
+        settings = group.get_settings(parser.parse_args(args + ["--cache-records"]))
+        assert settings.get("cache.records") is True
+
+    async def test_records_storage(self):
+        """Test the records commands accept the internal storage settings."""
+
+        assert argparse.StorageGroup in argparse.group.get_registered(
+            argparse.CAT_RECORDS
+        )
+
+        parser = argparse.create_argument_parser()
+        group = argparse.StorageGroup()
+        group.add_arguments(parser)
+
+        result = parser.parse_args(
+            [
+                "--storage-type",
+                "sqlite",
+                "--storage-path",
+                "records.db",
+                "--storage-url",
+                "postgresql://localhost/acapy",
+                "--storage-pool-size",
+                "2",
+            ]
+        )
+        settings = group.get_settings(result)
+
+        assert settings.get("storage.type") == "sqlite"
+        assert settings.get("storage.path") == "records.db"
+        assert settings.get("storage.url") == "postgresql://localhost/acapy"
+        assert settings.get("storage.pool_size") == 2
 
     async def test_transport_settings_file(self):
         """Test file argument parsing."""
@@ -101,6 +205,73 @@ class TestArgParse(AsyncTestCase):
         )
         # no asserts, just testing that the parser doesn't fail
 
+    async def test_ledger_cache_policy(self):
+        """Test ledger cache policy parsing."""
+
+        parser = argparse.create_argument_parser()
+        group = argparse.LedgerGroup()
+        group.add_arguments(parser)
+
+        result = parser.parse_args(
+            [
+                "--genesis-url",
+                "http://localhost:9000/genesis",
+                "--ledger-cache-policy",
+                "schema=none,0,300",
+                "--ledger-cache-policy",
+                "did_verkey=60,120",
+                "--ledger-cache-policy",
+                "revocation_registry_delta=30",
+                "--ledger-revocation-state-ttl",
+                "0",
+                "--ledger-cache-path",
+                "~/.indy_client/ledger_cache.db",
+                "--ledger-cache-prewarm",
+                "ledger_ids.txt",
+                "--ledger-max-concurrent-requests",
+                "4",
+                "--ledger-keep-warm",
+                "30",
+                "--ledger-write-queue",
+                "--ledger-write-rate",
+                "0.5",
+            ]
+        )
+        settings = group.get_settings(result)
+
+        assert settings.get("ledger.max_concurrent_requests") == 4
+        assert settings.get("ledger.keep_warm") == 30
+        assert settings.get("ledger.write_queue") is True
+        assert settings.get("ledger.write_rate") == 0.5
+        assert settings.get("ledger.revocation_state_ttl") == 0
+
+        assert settings.get("ledger.cache_path") == "~/.indy_client/ledger_cache.db"
+        assert settings.get("ledger.cache_prewarm") == "ledger_ids.txt"
+
+        assert settings.get("ledger.cache_policies") == {
+            "schema": {"ttl": None, "stale_ttl": 0, "negative_ttl": 300},
+            "did_verkey": {"ttl": 60, "stale_ttl": 120, "negative_ttl": 0},
+            "revocation_registry_delta": {"ttl": 30, "stale_ttl": 0, "negative_ttl": 0},
+        }
+
+        for policy in (
+            "schema",
+            "=60",
+            "schema=soon",
+            "schema=1,2,3,4",
+            "schemas=60",
+        ):
+            result = parser.parse_args(
+                [
+                    "--genesis-url",
+                    "http://localhost:9000/genesis",
+                    "--ledger-cache-policy",
+                    policy,
+                ]
+            )
+            with self.assertRaises(argparse.ArgsParseError):
+                group.get_settings(result)
+
     def test_bytesize(self):
         bs = ByteSize()
         with self.assertRaises(ArgumentTypeError):
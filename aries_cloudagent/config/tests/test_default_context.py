@@ -3,8 +3,12 @@ from tempfile import NamedTemporaryFile
 from asynctest import TestCase as AsyncTestCase
 
 from ...cache.base import BaseCache
+from ...cache.redis import RedisCache
+from ...cache.tiered import TieredCache
 from ...core.profile import ProfileManager
 from ...core.protocol_registry import ProtocolRegistry
+from ...transport.queue.sqlite_store import SqliteQueueStore
+from ...transport.queue.store import BaseQueueStore
 from ...transport.wire_format import BaseWireFormat
 
 from ..default_context import DefaultContextBuilder
@@ -35,3 +39,41 @@ class TestDefaultContext(AsyncTestCase):
         )
         result = await builder.build_context()
         assert isinstance(result, InjectionContext)
+
+    async def test_build_context_cache_url(self):
+        """Test context init with a cache server."""
+
+        builder = DefaultContextBuilder(
+            settings={"cache.url": "redis://localhost:6380/1", "cache.pool_size": 2}
+        )
+        result = await builder.build_context()
+        cache = result.inject(BaseCache)
+        assert isinstance(cache, RedisCache)
+        assert (cache.pool.port, cache.pool.db, cache.pool.size) == (6380, 1, 2)
+
+        builder = DefaultContextBuilder(
+            settings={"cache.url": "redis://localhost", "cache.near.max_entries": 100}
+        )
+        result = await builder.build_context()
+        cache = result.inject(BaseCache)
+        assert isinstance(cache, TieredCache)
+        assert isinstance(cache.remote, RedisCache)
+        assert cache.local.max_entries == 100
+
+    async def test_build_context_queue_path(self):
+        """Test context init with a durable outbound queue."""
+
+        builder = DefaultContextBuilder(
+            settings={
+                "transport.queue_path": "~/queue.db",
+                "transport.queue_commit_delay": 0.01,
+            }
+        )
+        result = await builder.build_context()
+        store = result.inject(BaseQueueStore)
+        assert isinstance(store, SqliteQueueStore)
+        assert store.db_path.endswith("queue.db")
+        assert store.commit_delay == 0.01
+
+        result = await DefaultContextBuilder().build_context()
+        assert result.inject(BaseQueueStore, required=False) is None
@@ -69,6 +69,38 @@ class TestLedgerConfig(AsyncTestCase):
             with self.assertRaises(test_module.ConfigError):
                 await test_module.get_genesis_transactions(settings)
 
+    async def test_prewarm_ledger_cache(self):
+        schema_id = "55GkHamhTU1ZbTbV2ab9DE:2:schema_name:1.0"
+        cred_def_id = "55GkHamhTU1ZbTbV2ab9DE:3:CL:18:tag"
+        rev_reg_id = (
+            "55GkHamhTU1ZbTbV2ab9DE:4:55GkHamhTU1ZbTbV2ab9DE:3:CL:18:tag:CL_ACCUM:0"
+        )
+        mock_ledger = async_mock.MagicMock(
+            get_schemas=async_mock.CoroutineMock(return_value={schema_id: None}),
+            get_credential_definitions=async_mock.CoroutineMock(
+                return_value={cred_def_id: {"id": cred_def_id}}
+            ),
+            get_revoc_reg_def=async_mock.CoroutineMock(return_value={"id": rev_reg_id}),
+        )
+
+        with NamedTemporaryFile("w", delete=False) as ids_file:
+            ids_file.write(
+                f"# artefacts\n{schema_id}\n\n{cred_def_id}\n{rev_reg_id}\nbogus\n"
+            )
+        try:
+            await test_module.prewarm_ledger_cache(mock_ledger, ids_file.name)
+            mock_ledger.get_revoc_reg_def.side_effect = test_module.LedgerError()
+            await test_module.prewarm_ledger_cache(mock_ledger, ids_file.name)
+        finally:
+            remove(ids_file.name)
+
+        mock_ledger.get_schemas.assert_awaited_with([schema_id])
+        mock_ledger.get_credential_definitions.assert_awaited_with([cred_def_id])
+        mock_ledger.get_revoc_reg_def.assert_awaited_with(rev_reg_id)
+
+        with self.assertRaises(test_module.ConfigError):
+            await test_module.prewarm_ledger_cache(mock_ledger, ids_file.name)
+
     async def test_ledger_config_no_taa_accept(self):
         settings = {
             "ledger.genesis_transactions": TEST_GENESIS,
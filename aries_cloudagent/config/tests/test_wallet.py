@@ -1,6 +1,8 @@
 from asynctest import TestCase as AsyncTestCase, mock as async_mock
 
 from ...core.profile import Profile, ProfileManager, ProfileSession
+from ...storage.base import BaseStorage
+from ...storage.sql import PostgresConnectionPool, SqlStorage
 from ...wallet.base import BaseWallet
 
 from ..injector import Injector
@@ -170,3 +172,31 @@ class TestWalletConfig(AsyncTestCase):
             mock_seed_to_did.return_value = "XXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXX"
 
             await test_module.wallet_config(self.context, provision=True)
+
+    async def test_wallet_config_sqlite_storage(self):
+        self.context.update_settings({"storage.type": "sqlite", "storage.pool_size": 2})
+        mock_wallet = async_mock.MagicMock(
+            get_public_did=async_mock.CoroutineMock(return_value=None),
+        )
+        self.injector.bind_instance(BaseWallet, mock_wallet)
+        self.profile.context = InjectionContext()
+
+        await test_module.wallet_config(self.context)
+        storage = self.profile.context.inject(BaseStorage)
+        assert isinstance(storage, SqlStorage)
+        assert storage.pool.size == 1  # in-memory database
+        assert self.context.inject(BaseStorage) is storage
+
+    async def test_wallet_config_postgres_storage(self):
+        self.context.update_settings(
+            {"storage.type": "postgres", "storage.url": "postgresql://localhost/acapy"}
+        )
+        mock_wallet = async_mock.MagicMock(
+            get_public_did=async_mock.CoroutineMock(return_value=None),
+        )
+        self.injector.bind_instance(BaseWallet, mock_wallet)
+
+        await test_module.wallet_config(self.context)
+        storage = self.context.inject(BaseStorage)
+        assert isinstance(storage.pool, PostgresConnectionPool)
+        assert storage.pool.url == "postgresql://localhost/acapy"
@@ -4,11 +4,15 @@ import logging
 
 from ..core.error import ProfileNotFoundError
 from ..core.profile import Profile, ProfileManager
+from ..storage.base import BaseStorage
+from ..storage.instrumented import StorageMetricsProvider
+from ..storage.sql import PostgresConnectionPool, SqliteConnectionPool, SqlStorage
 from ..wallet.base import BaseWallet, DIDInfo
 from ..wallet.crypto import seed_to_did
 
 from .base import ConfigError
 from .injection_context import InjectionContext
+from .provider import InstanceProvider
 
 LOGGER = logging.getLogger(__name__)
 
@@ -44,6 +48,23 @@ async def wallet_config(
             else:
                 raise
 
+    storage_type = settings.get("storage.type")
+    if storage_type in ("sqlite", "postgres"):
+        if storage_type == "postgres":
+            pool = PostgresConnectionPool(
+                settings.get("storage.url"), settings.get("storage.pool_size")
+            )
+        else:
+            pool = SqliteConnectionPool(
+                settings.get("storage.path"), settings.get("storage.pool_size")
+            )
+        storage = StorageMetricsProvider(InstanceProvider(SqlStorage(pool)))
+        # bind on the base context too, so sessions and commands that inject
+        # from it share the same SQL store as the root profile
+        context.injector.bind_provider(BaseStorage, storage)
+        if root_profile.context is not context:
+            root_profile.context.injector.bind_provider(BaseStorage, storage)
+
     if provision:
         if root_profile.created:
             print("Created new profile")
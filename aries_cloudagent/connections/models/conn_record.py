@@ -3,7 +3,7 @@
 import json
 
 from enum import Enum
-from typing import Any, Union
+from typing import Any, Sequence, Union
 
 from marshmallow import fields, validate
 
@@ -258,6 +258,91 @@ class ConnRecord(BaseRecord):
         tag_filter = {"request_id": request_id}
         return await cls.retrieve_by_tag_filter(session, tag_filter)
 
+    @classmethod
+    async def query(
+        cls,
+        session: ProfileSession,
+        tag_filter: dict = None,
+        *,
+        post_filter_positive: dict = None,
+        post_filter_negative: dict = None,
+        alt: bool = False,
+        limit: int = None,
+        offset: int = None,
+        order_by_state: bool = False,
+    ) -> Sequence["ConnRecord"]:
+        """Query stored connection records.
+
+        With `order_by_state`, active connections come first, then invitations,
+        then abandoned connections, each in storage order. Every state group is
+        read separately, so a page is taken without loading and sorting every
+        match: groups before the page are only counted.
+
+        Args:
+            session: The profile session to use
+            tag_filter: An optional dictionary of tag filter clauses
+            post_filter_positive: Additional value filters to apply matching positively
+            post_filter_negative: Additional value filters to apply matching negatively
+            alt: set to match any (positive=True) value or miss all (positive=False)
+                values in post_filter; required to order by state
+            limit: The maximum number of records to return
+            offset: The number of matching records to skip
+            order_by_state: Whether to order the records by state group
+        """
+        if not order_by_state or "state" in (post_filter_positive or {}):
+            return await super().query(
+                session,
+                tag_filter,
+                post_filter_positive=post_filter_positive,
+                post_filter_negative=post_filter_negative,
+                alt=alt,
+                limit=limit,
+                offset=offset,
+            )
+        if not alt:
+            raise ValueError("Connections are only ordered by state with alt filters")
+
+        last = list(cls.State.INVITATION.value) + list(cls.State.ABANDONED.value)
+        negative = dict(post_filter_negative or {})
+        negative["state"] = list(negative.get("state", ())) + last
+        groups = [(post_filter_positive, negative)] + [
+            (
+                {**(post_filter_positive or {}), "state": list(state.value)},
+                post_filter_negative,
+            )
+            for state in (cls.State.INVITATION, cls.State.ABANDONED)
+        ]
+
+        results = []
+        skip = offset or 0
+        for positive, negative in groups:
+            if limit is not None and len(results) >= limit:
+                break
+            if skip:
+                found = await cls.count(
+                    session,
+                    tag_filter,
+                    post_filter_positive=positive,
+                    post_filter_negative=negative,
+                    alt=True,
+                )
+                if found <= skip:
+                    skip -= found
+                    continue
+            results.extend(
+                await super().query(
+                    session,
+                    tag_filter,
+                    post_filter_positive=positive,
+                    post_filter_negative=negative,
+                    alt=True,
+                    limit=None if limit is None else limit - len(results),
+                    offset=skip,
+                )
+            )
+            skip = 0
+        return results
+
     async def attach_invitation(
         self,
         session: ProfileSession,
@@ -141,6 +141,46 @@ class TestConnRecord(AsyncTestCase):
         )
         assert result == record
 
+    async def test_query_order_by_state(self):
+        states = [
+            ConnRecord.State.ABANDONED,
+            ConnRecord.State.COMPLETED,
+            ConnRecord.State.INVITATION,
+            ConnRecord.State.REQUEST,
+            ConnRecord.State.ABANDONED,
+            ConnRecord.State.INVITATION,
+        ]
+        records = []
+        for state in states:
+            record = ConnRecord(state=state.rfc160, their_label="a")
+            await record.save(self.session)
+            records.append(record)
+        ordered = [records[i] for i in (1, 3, 2, 5, 0, 4)]
+
+        async def page(limit=None, offset=None, **post_filter):
+            return await ConnRecord.query(
+                self.session,
+                post_filter_positive=post_filter,
+                alt=True,
+                limit=limit,
+                offset=offset,
+                order_by_state=True,
+            )
+
+        assert await page() == ordered
+        for offset in range(7):
+            assert await page(2, offset) == ordered[offset : offset + 2]
+        assert await page(offset=3) == ordered[3:]
+        assert await page(0) == []
+        assert await page(state=list(ConnRecord.State.INVITATION.value)) == [
+            records[2],
+            records[5],
+        ]
+        assert await page(their_label=["b"]) == []
+
+        with self.assertRaises(ValueError):
+            await ConnRecord.query(self.session, order_by_state=True)
+
     async def test_completed_is_ready(self):
         record = ConnRecord(my_did=self.test_did, state=ConnRecord.State.COMPLETED)
         connection_id = await record.save(self.session)
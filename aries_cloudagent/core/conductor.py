@@ -13,6 +13,7 @@ import logging
 
 from ..admin.base_server import BaseAdminServer
 from ..admin.server import AdminServer
+from ..cache.base import BaseCache
 from ..config.default_context import ContextBuilder
 from ..config.injection_context import InjectionContext
 from ..config.ledger import get_genesis_transactions, ledger_config
@@ -30,8 +31,9 @@ from ..protocols.out_of_band.v1_0.messages.invitation import InvitationMessage
 from ..transport.inbound.manager import InboundTransportManager
 from ..transport.inbound.message import InboundMessage
 from ..transport.outbound.base import OutboundDeliveryError
-from ..transport.outbound.manager import OutboundTransportManager, QueuedOutboundMessage
+from ..transport.outbound.manager import OutboundTransportManager
 from ..transport.outbound.message import OutboundMessage
+from ..transport.queue.store import BaseQueueStore
 from ..transport.wire_format import BaseWireFormat
 from ..wallet.base import DIDInfo
 from ..utils.task_queue import CompletedTask, TaskQueue
@@ -253,6 +255,16 @@ class Conductor:
         if self.root_profile:
             shutdown.run(self.root_profile.close())
         await shutdown.complete(timeout)
+        queue_store = self.root_profile and self.root_profile.inject(
+            BaseQueueStore, required=False
+        )
+        if queue_store:
+            await queue_store.close()
+        cache = self.root_profile and self.root_profile.inject(
+            BaseCache, required=False
+        )
+        if cache:
+            await cache.close()
 
     def inbound_message_router(
         self, message: InboundMessage, can_respond: bool = False
@@ -314,20 +326,22 @@ class Conductor:
 
     async def get_stats(self) -> dict:
         """Get the current stats tracked by the conductor."""
+        depths = self.outbound_transport_manager.queue_depths
         stats = {
             "in_sessions": len(self.inbound_transport_manager.sessions),
-            "out_encode": 0,
-            "out_deliver": 0,
+            "out_encode": depths["encoding"],
+            "out_deliver": depths["delivering"],
+            "out_encode_ready": depths["encode_ready"],
+            "out_deliver_ready": depths["deliver_ready"],
+            "out_retry_wait": depths["retry_wait"],
+            "out_parked": depths["parked"],
+            "out_circuits": self.outbound_transport_manager.endpoint_circuits,
+            "out_lanes": self.outbound_transport_manager.lane_stats,
             "task_active": self.dispatcher.task_queue.current_active,
             "task_done": self.dispatcher.task_queue.total_done,
             "task_failed": self.dispatcher.task_queue.total_failed,
             "task_pending": self.dispatcher.task_queue.current_pending,
         }
-        for m in self.outbound_transport_manager.outbound_buffer:
-            if m.state == QueuedOutboundMessage.STATE_ENCODE:
-                stats["out_encode"] += 1
-            if m.state == QueuedOutboundMessage.STATE_DELIVER:
-                stats["out_deliver"] += 1
         return stats
 
     async def outbound_message_router(
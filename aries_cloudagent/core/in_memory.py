@@ -4,7 +4,9 @@ from collections import OrderedDict
 from typing import Any, Mapping, Type
 
 from ..config.injection_context import InjectionContext
+from ..config.provider import InstanceProvider
 from ..storage.base import BaseStorage
+from ..storage.instrumented import StorageMetricsProvider
 from ..utils.classloader import DeferLoad
 from ..wallet.base import BaseWallet
 
@@ -32,6 +34,8 @@ class InMemoryProfile(Profile):
         self.local_dids = {}
         self.pair_dids = {}
         self.records = OrderedDict()
+        self.records_by_type = {}
+        self.records_by_tag = {}
 
     def session(self, context: InjectionContext = None) -> "ProfileSession":
         """Start a new interactive session with no transaction support requested."""
@@ -91,7 +95,12 @@ class InMemoryProfileSession(ProfileSession):
 
     def _init_context(self):
         """Initialize the session context."""
-        self._context.injector.bind_instance(BaseStorage, STORAGE_CLASS(self.profile))
+        # a storage implementation bound on the profile takes precedence
+        if not self.profile.context.injector.get_provider(BaseStorage):
+            self._context.injector.bind_provider(
+                BaseStorage,
+                StorageMetricsProvider(InstanceProvider(STORAGE_CLASS(self.profile))),
+            )
         self._context.injector.bind_instance(BaseWallet, WALLET_CLASS(self.profile))
 
     @property
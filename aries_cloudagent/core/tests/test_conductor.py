@@ -3,6 +3,8 @@ from asynctest import TestCase as AsyncTestCase
 from asynctest import mock as async_mock
 
 from ...admin.base_server import BaseAdminServer
+from ...cache.base import BaseCache
+from ...cache.in_memory import InMemoryCache
 from ...config.base_context import ContextBuilder
 from ...config.injection_context import InjectionContext
 from ...connections.models.connection_target import ConnectionTarget
@@ -18,7 +20,6 @@ from ...core.protocol_registry import ProtocolRegistry
 from ...transport.inbound.message import InboundMessage
 from ...transport.inbound.receipt import MessageReceipt
 from ...transport.outbound.base import OutboundDeliveryError
-from ...transport.outbound.manager import QueuedOutboundMessage
 from ...transport.outbound.message import OutboundMessage
 from ...transport.wire_format import BaseWireFormat
 from ...transport.pack_format import PackWireFormat
@@ -117,10 +118,14 @@ class TestConductor(AsyncTestCase, Config, TestDIDs):
 
             mock_logger.print_banner.assert_called_once()
 
+            cache = InMemoryCache()
+            cache.close = async_mock.CoroutineMock()
+            conductor.root_profile.context.injector.bind_instance(BaseCache, cache)
             await conductor.stop()
 
             mock_inbound_mgr.return_value.stop.assert_awaited_once_with()
             mock_outbound_mgr.return_value.stop.assert_awaited_once_with()
+            cache.close.assert_awaited_once_with()
 
     async def test_startup_no_public_did(self):
         builder: ContextBuilder = StubContextBuilder(self.test_settings)
@@ -168,10 +173,21 @@ class TestConductor(AsyncTestCase, Config, TestDIDs):
         ) as mock_logger:
 
             mock_inbound_mgr.return_value.sessions = ["dummy"]
-            mock_outbound_mgr.return_value.outbound_buffer = [
-                async_mock.MagicMock(state=QueuedOutboundMessage.STATE_ENCODE),
-                async_mock.MagicMock(state=QueuedOutboundMessage.STATE_DELIVER),
-            ]
+            mock_outbound_mgr.return_value.queue_depths = {
+                "encode_ready": 0,
+                "encoding": 1,
+                "deliver_ready": 3,
+                "delivering": 1,
+                "retry_wait": 2,
+                "parked": 4,
+            }
+            mock_outbound_mgr.return_value.endpoint_circuits = {
+                "http://down": {"state": "open", "failures": 5, "parked": 4}
+            }
+            mock_outbound_mgr.return_value.lane_stats = {
+                "message": {"active": 1, "ready": 2},
+                "webhook": {"active": 0, "ready": 1},
+            }
 
             await conductor.setup()
 
@@ -188,6 +204,10 @@ class TestConductor(AsyncTestCase, Config, TestDIDs):
                     "task_pending",
                 ]
             )
+            assert stats["out_deliver_ready"] == 3
+            assert stats["out_retry_wait"] == 2
+            assert stats["out_circuits"]["http://down"]["state"] == "open"
+            assert stats["out_lanes"]["webhook"]["ready"] == 1
 
     async def test_setup_x(self):
         builder: ContextBuilder = StubContextBuilder(self.test_settings)
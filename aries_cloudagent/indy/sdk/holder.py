@@ -9,6 +9,7 @@ from typing import Sequence, Tuple, Union
 import indy.anoncreds
 from indy.error import ErrorCode, IndyError
 
+from ...cache.base import BaseCache
 from ...indy.sdk.wallet_setup import IndyOpenWallet
 from ...ledger.base import BaseLedger
 from ...storage.indy import IndySdkStorage
@@ -17,25 +18,42 @@ from ...storage.record import StorageRecord
 from ...wallet.error import WalletNotFoundError
 
 from ..holder import IndyHolder, IndyHolderError
+from ..util import diff_rev_reg_deltas
 
 from .error import IndyErrorHandler
 from .util import create_tails_reader
 
 LOGGER = logging.getLogger(__name__)
 
+DEFAULT_REVOCATION_STATE_TTL = 3600
+
 
 class IndySdkHolder(IndyHolder):
     """Indy-SDK holder implementation."""
 
-    def __init__(self, wallet: IndyOpenWallet):
+    def __init__(
+        self,
+        wallet: IndyOpenWallet,
+        cache: BaseCache = None,
+        revocation_state_ttl: int = None,
+    ):
         """
         Initialize an IndyHolder instance.
 
         Args:
             wallet: IndyOpenWallet instance
+            cache: The cache in which to keep computed revocation states
+            revocation_state_ttl: Seconds to keep a computed revocation state;
+                0 disables caching
 
         """
         self.wallet = wallet
+        self.cache = cache
+        self.revocation_state_ttl = (
+            DEFAULT_REVOCATION_STATE_TTL
+            if revocation_state_ttl is None
+            else revocation_state_ttl
+        )
 
     async def create_credential_request(
         self, credential_offer: dict, credential_definition: dict, holder_did: str
@@ -418,6 +436,10 @@ class IndySdkHolder(IndyHolder):
         """
         Create current revocation state for a received credential.
 
+        When given a delta from the creation of the registry, the state is cached
+        and later states for the credential are advanced from it by the
+        difference between the deltas, rather than computed from scratch.
+
         Args:
             cred_rev_id: credential revocation id in revocation registry
             rev_reg_def: revocation registry definition
@@ -428,17 +450,50 @@ class IndySdkHolder(IndyHolder):
             the revocation state
 
         """
+        cache_key = None
+        cached = None
+        if (
+            self.cache
+            and self.revocation_state_ttl
+            and rev_reg_def.get("id")
+            and "prevAccum" not in rev_reg_delta.get("value", {})
+        ):
+            cache_key = f"revocation_state::{rev_reg_def['id']}::{cred_rev_id}"
+            cached = await self.cache.get(cache_key)
+            if cached and cached["timestamp"] == timestamp:
+                return cached["state"]
+            if cached and cached["timestamp"] > timestamp:
+                cache_key = cached = None  # keep the later state
 
         with IndyErrorHandler(
             "Error when constructing revocation state", IndyHolderError
         ):
             tails_file_reader = await create_tails_reader(tails_file_path)
-            rev_state_json = await indy.anoncreds.create_revocation_state(
-                tails_file_reader,
-                rev_reg_def_json=json.dumps(rev_reg_def),
-                cred_rev_id=cred_rev_id,
-                rev_reg_delta_json=json.dumps(rev_reg_delta),
-                timestamp=timestamp,
-            )
+            if cached:
+                rev_state_json = await indy.anoncreds.update_revocation_state(
+                    tails_file_reader,
+                    rev_state_json=cached["state"],
+                    rev_reg_def_json=json.dumps(rev_reg_def),
+                    rev_reg_delta_json=json.dumps(
+                        diff_rev_reg_deltas(cached["delta"], rev_reg_delta)
+                    ),
+                    timestamp=timestamp,
+                    cred_rev_id=cred_rev_id,
+                )
+            else:
+                rev_state_json = await indy.anoncreds.create_revocation_state(
+                    tails_file_reader,
+                    rev_reg_def_json=json.dumps(rev_reg_def),
+                    cred_rev_id=cred_rev_id,
+                    rev_reg_delta_json=json.dumps(rev_reg_delta),
+                    timestamp=timestamp,
+                )
 
+        if cache_key:
+            cached = {
+                "timestamp": timestamp,
+                "state": rev_state_json,
+                "delta": rev_reg_delta,
+            }
+            await self.cache.set(cache_key, cached, self.revocation_state_ttl)
         return rev_state_json
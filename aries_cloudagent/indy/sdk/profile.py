@@ -11,7 +11,9 @@ from ...config.provider import ClassProvider
 from ...core.profile import Profile, ProfileManager, ProfileSession
 from ...ledger.base import BaseLedger
 from ...ledger.indy import IndySdkLedger, IndySdkLedgerPool
+from ...ledger.write_queue import LedgerWriteQueue
 from ...storage.base import BaseStorage
+from ...storage.instrumented import StorageMetricsProvider
 from ...wallet.base import BaseWallet
 from ...wallet.indy import IndySdkWallet
 
@@ -34,6 +36,7 @@ class IndySdkProfile(Profile):
         super().__init__(context=context, name=opened.name, created=opened.created)
         self.opened = opened
         self.ledger_pool: IndySdkLedgerPool = None
+        self.ledger_write_queue: LedgerWriteQueue = None
         self.init_ledger_pool()
         self.bind_providers()
 
@@ -64,8 +67,13 @@ class IndySdkProfile(Profile):
             pool_name,
             keepalive=keepalive,
             cache=cache,
+            cache_policies=self.settings.get("ledger.cache_policies"),
+            cache_path=self.settings.get("ledger.cache_path"),
             genesis_transactions=genesis_transactions,
             read_only=read_only,
+            max_concurrent_requests=self.settings.get("ledger.max_concurrent_requests"),
+            rev_reg_delta_bucket=self.settings.get("ledger.rev_reg_delta_bucket"),
+            keep_warm=self.settings.get("ledger.keep_warm"),
         )
 
     def bind_providers(self):
@@ -74,7 +82,10 @@ class IndySdkProfile(Profile):
         injector.bind_provider(
             IndyHolder,
             ClassProvider(
-                "aries_cloudagent.indy.sdk.holder.IndySdkHolder", self.opened
+                "aries_cloudagent.indy.sdk.holder.IndySdkHolder",
+                self.opened,
+                injector.inject(BaseCache, required=False),
+                self.settings.get("ledger.revocation_state_ttl"),
             ),
         )
         injector.bind_provider(
@@ -86,6 +97,11 @@ class IndySdkProfile(Profile):
             ledger = IndySdkLedger(self.ledger_pool, IndySdkWallet(self.opened))
 
             injector.bind_instance(BaseLedger, ledger)
+            if self.settings.get("ledger.write_queue"):
+                self.ledger_write_queue = LedgerWriteQueue(
+                    self, rate=self.settings.get("ledger.write_rate")
+                )
+                injector.bind_instance(LedgerWriteQueue, self.ledger_write_queue)
             injector.bind_provider(
                 IndyVerifier,
                 ClassProvider(
@@ -109,9 +125,13 @@ class IndySdkProfile(Profile):
 
     async def close(self):
         """Close the profile instance."""
+        if self.ledger_write_queue:
+            await self.ledger_write_queue.close()
         if self.opened:
             await self.opened.close()
             self.opened = None
+        if self.ledger_pool:
+            await self.ledger_pool.shutdown()
 
 
 class IndySdkProfileSession(ProfileSession):
@@ -134,12 +154,17 @@ class IndySdkProfileSession(ProfileSession):
         injector.bind_provider(
             BaseWallet, ClassProvider(IndySdkWallet, self.profile.opened)
         )
-        injector.bind_provider(
-            BaseStorage,
-            ClassProvider(
-                "aries_cloudagent.storage.indy.IndySdkStorage", self.profile.opened
-            ),
-        )
+        # a storage implementation bound on the profile takes precedence
+        if not self.profile.context.injector.get_provider(BaseStorage):
+            injector.bind_provider(
+                BaseStorage,
+                StorageMetricsProvider(
+                    ClassProvider(
+                        "aries_cloudagent.storage.indy.IndySdkStorage",
+                        self.profile.opened,
+                    )
+                ),
+            )
 
 
 class IndySdkProfileManager(ProfileManager):
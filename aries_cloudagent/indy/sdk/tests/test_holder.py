@@ -8,6 +8,8 @@ from asynctest import mock as async_mock
 import indy.anoncreds
 from indy.error import IndyError, ErrorCode
 
+from ....cache.in_memory import InMemoryCache
+
 from ...holder import IndyHolder
 
 from .. import holder as test_module
@@ -537,3 +539,86 @@ class TestIndySdkHolder(AsyncTestCase):
                 rev_reg_delta_json=json.dumps(rev_reg_delta),
                 timestamp=timestamp,
             )
+
+    async def test_create_revocation_state_cached(self):
+        holder = test_module.IndySdkHolder("wallet", InMemoryCache())
+        rev_reg_def = {"id": "rev-reg-id"}
+        delta_1 = {"ver": "1.0", "value": {"accum": "1", "issued": [], "revoked": [2]}}
+        delta_2 = {
+            "ver": "1.0",
+            "value": {"accum": "2", "issued": [], "revoked": [2, 3]},
+        }
+
+        with async_mock.patch.object(
+            test_module, "create_tails_reader", async_mock.CoroutineMock()
+        ) as mock_create_tails_reader, async_mock.patch.object(
+            indy.anoncreds,
+            "create_revocation_state",
+            async_mock.CoroutineMock(return_value="state-1"),
+        ) as mock_create_rr_state, async_mock.patch.object(
+            indy.anoncreds,
+            "update_revocation_state",
+            async_mock.CoroutineMock(return_value="state-2"),
+        ) as mock_update_rr_state:
+            for _ in range(2):
+                assert (
+                    await holder.create_revocation_state(
+                        "1", rev_reg_def, delta_1, 100, "/tmp/some.tails"
+                    )
+                    == "state-1"
+                )
+            mock_create_rr_state.assert_awaited_once()
+
+            assert (
+                await holder.create_revocation_state(
+                    "1", rev_reg_def, delta_2, 200, "/tmp/some.tails"
+                )
+                == "state-2"
+            )
+            mock_update_rr_state.assert_awaited_once_with(
+                mock_create_tails_reader.return_value,
+                rev_state_json="state-1",
+                rev_reg_def_json=json.dumps(rev_reg_def),
+                rev_reg_delta_json=json.dumps(
+                    {
+                        "ver": "1.0",
+                        "value": {
+                            "prevAccum": "1",
+                            "accum": "2",
+                            "issued": [],
+                            "revoked": [3],
+                        },
+                    }
+                ),
+                timestamp=200,
+                cred_rev_id="1",
+            )
+
+            # an earlier state does not replace the cached one
+            await holder.create_revocation_state(
+                "1", rev_reg_def, delta_1, 100, "/tmp/some.tails"
+            )
+            assert mock_create_rr_state.await_count == 2
+            assert (
+                await holder.create_revocation_state(
+                    "1", rev_reg_def, delta_2, 200, "/tmp/some.tails"
+                )
+                == "state-2"
+            )
+
+    async def test_create_revocation_state_cache_disabled(self):
+        holder = test_module.IndySdkHolder("wallet", InMemoryCache(), 0)
+        delta = {"ver": "1.0", "value": {"accum": "1", "issued": [], "revoked": []}}
+
+        with async_mock.patch.object(
+            test_module, "create_tails_reader", async_mock.CoroutineMock()
+        ), async_mock.patch.object(
+            indy.anoncreds,
+            "create_revocation_state",
+            async_mock.CoroutineMock(return_value="state-1"),
+        ) as mock_create_rr_state:
+            for _ in range(2):
+                await holder.create_revocation_state(
+                    "1", {"id": "rev-reg-id"}, delta, 100, "/tmp/some.tails"
+                )
+            assert mock_create_rr_state.await_count == 2
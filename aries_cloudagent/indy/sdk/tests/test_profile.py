@@ -1,6 +1,8 @@
 import pytest
 import time
 
+from asynctest import mock as async_mock
+
 from ..profile import IndySdkProfile
 from ..wallet_setup import IndyWalletConfig, IndyOpenWallet
 
@@ -29,4 +31,14 @@ class TestIndySdkProfile:
         assert profile.wallet.created
         assert profile.wallet.master_secret_id == "master-secret"
 
+    @pytest.mark.asyncio
+    async def test_close(self, profile):
+        opened = async_mock.MagicMock(close=async_mock.CoroutineMock())
+        profile.opened = opened
+        profile.ledger_pool = async_mock.MagicMock(shutdown=async_mock.CoroutineMock())
+        await profile.close()
+        opened.close.assert_awaited_once_with()
+        profile.ledger_pool.shutdown.assert_awaited_once_with()
+        assert profile.opened is None
+
     # FIXME needs more coverage
@@ -286,27 +286,29 @@ INDY_PROOF_PRED_NAMES = {
 @pytest.mark.indy
 class TestIndySdkVerifier(AsyncTestCase):
     def setUp(self):
-        mock_ledger = async_mock.MagicMock(
-            get_credential_definition=async_mock.CoroutineMock(
-                return_value={
-                    "...": "...",
-                    "value": {
-                        "revocation": {
-                            "g": "1 ...",
-                            "g_dash": "1 ...",
-                            "h": "1 ...",
-                            "h0": "1 ...",
-                            "h1": "1 ...",
-                            "h2": "1 ...",
-                            "htilde": "1 ...",
-                            "h_cap": "1 ...",
-                            "u": "1 ...",
-                            "pk": "1 ...",
-                            "y": "1 ...",
-                        }
-                    },
+        cred_def = {
+            "...": "...",
+            "value": {
+                "revocation": {
+                    "g": "1 ...",
+                    "g_dash": "1 ...",
+                    "h": "1 ...",
+                    "h0": "1 ...",
+                    "h1": "1 ...",
+                    "h2": "1 ...",
+                    "htilde": "1 ...",
+                    "h_cap": "1 ...",
+                    "u": "1 ...",
+                    "pk": "1 ...",
+                    "y": "1 ...",
                 }
-            )
+            },
+        }
+        mock_ledger = async_mock.MagicMock(
+            get_credential_definition=async_mock.CoroutineMock(return_value=cred_def),
+            get_credential_definitions=async_mock.CoroutineMock(
+                side_effect=lambda ids: {cred_def_id: cred_def for cred_def_id in ids}
+            ),
         )
         self.verifier = IndySdkVerifier(mock_ledger)
         assert repr(self.verifier) == "<IndySdkVerifier>"
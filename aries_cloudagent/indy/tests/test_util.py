@@ -0,0 +1,43 @@
+from ..util import diff_rev_reg_deltas, merge_rev_reg_deltas
+
+
+class TestRevRegDeltas:
+    def test_merge(self):
+        delta = {
+            "ver": "1.0",
+            "value": {"accum": "1", "issued": [1], "revoked": [2, 3]},
+        }
+        update = {
+            "ver": "1.0",
+            "value": {"prevAccum": "1", "accum": "2", "issued": [3], "revoked": [4]},
+        }
+        assert merge_rev_reg_deltas(delta, update) == {
+            "ver": "1.0",
+            "value": {"accum": "2", "issued": [1, 3], "revoked": [2, 4]},
+        }
+
+    def test_merge_revoke_issued(self):
+        delta = {"ver": "1.0", "value": {"accum": "1", "issued": [1], "revoked": []}}
+        update = {"ver": "1.0", "value": {"accum": "2", "revoked": [1]}}
+        assert merge_rev_reg_deltas(delta, update)["value"] == {
+            "accum": "2",
+            "issued": [],
+            "revoked": [1],
+        }
+
+    def test_diff(self):
+        delta = {"ver": "1.0", "value": {"accum": "1", "issued": [], "revoked": [2]}}
+        later = {"ver": "1.0", "value": {"accum": "2", "issued": [2], "revoked": [3]}}
+        assert diff_rev_reg_deltas(delta, later) == {
+            "ver": "1.0",
+            "value": {"prevAccum": "1", "accum": "2", "issued": [2], "revoked": [3]},
+        }
+
+    def test_diff_merge_roundtrip(self):
+        delta = {"ver": "1.0", "value": {"accum": "1", "issued": [], "revoked": [2]}}
+        later = {
+            "ver": "1.0",
+            "value": {"accum": "2", "issued": [], "revoked": [2, 5, 6]},
+        }
+        merged = merge_rev_reg_deltas(delta, diff_rev_reg_deltas(delta, later))
+        assert merged == later
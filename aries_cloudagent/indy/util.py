@@ -51,3 +51,59 @@ def tails_path(rev_reg_id: str) -> str:
         return None
 
     return join(tails_dir, content[0])
+
+
+def merge_rev_reg_deltas(delta: dict, update: dict) -> dict:
+    """
+    Advance a revocation registry delta by a later delta.
+
+    Args:
+        delta: A delta from the creation of the registry to some time
+        update: A delta from that time onward
+
+    Returns:
+        The delta from the creation of the registry to the end of `update`
+
+    """
+    value = delta["value"]
+    later = update["value"]
+    issued = set(later.get("issued") or [])
+    revoked = set(later.get("revoked") or [])
+    return {
+        **delta,
+        "value": {
+            **value,
+            "accum": later["accum"],
+            "issued": sorted(set(value.get("issued") or []) - revoked | issued),
+            "revoked": sorted(set(value.get("revoked") or []) - issued | revoked),
+        },
+    }
+
+
+def diff_rev_reg_deltas(delta: dict, later: dict) -> dict:
+    """
+    Compute the delta between two deltas from the creation of a registry.
+
+    Args:
+        delta: A delta from the creation of the registry to some time
+        later: A delta from the creation of the registry to a later time
+
+    Returns:
+        The delta from the end of `delta` to the end of `later`
+
+    """
+    value = delta["value"]
+    later_value = later["value"]
+    return {
+        **later,
+        "value": {
+            "prevAccum": value["accum"],
+            "accum": later_value["accum"],
+            "issued": sorted(
+                set(later_value.get("issued") or []) - set(value.get("issued") or [])
+            ),
+            "revoked": sorted(
+                set(later_value.get("revoked") or []) - set(value.get("revoked") or [])
+            ),
+        },
+    }
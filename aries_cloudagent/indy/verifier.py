@@ -119,19 +119,25 @@ class IndyVerifier(ABC, metaclass=ABCMeta):
         if "proof" not in pres:
             return (PreVerifyResult.INCOMPLETE, "Missing 'proof'")
 
-        async with self.ledger:
-            for (index, ident) in enumerate(pres["identifiers"]):
-                if not ident.get("timestamp"):
-                    cred_def_id = ident["cred_def_id"]
-                    cred_def = await self.ledger.get_credential_definition(cred_def_id)
-                    if cred_def["value"].get("revocation"):
-                        return (
-                            PreVerifyResult.INCOMPLETE,
-                            (
-                                f"Missing timestamp in presentation identifier "
-                                f"#{index} for cred def id {cred_def_id}"
-                            ),
-                        )
+        untimed = [
+            (index, ident["cred_def_id"])
+            for (index, ident) in enumerate(pres["identifiers"])
+            if not ident.get("timestamp")
+        ]
+        if untimed:
+            async with self.ledger:
+                cred_defs = await self.ledger.get_credential_definitions(
+                    [cred_def_id for (_, cred_def_id) in untimed]
+                )
+            for (index, cred_def_id) in untimed:
+                if cred_defs[cred_def_id]["value"].get("revocation"):
+                    return (
+                        PreVerifyResult.INCOMPLETE,
+                        (
+                            f"Missing timestamp in presentation identifier "
+                            f"#{index} for cred def id {cred_def_id}"
+                        ),
+                    )
 
         for (uuid, req_pred) in pres_req["requested_predicates"].items():
             try:
@@ -4,7 +4,7 @@ import re
 
 from abc import ABC, abstractmethod, ABCMeta
 from enum import Enum
-from typing import Sequence, Tuple, Union
+from typing import Mapping, Sequence, Tuple, Union
 
 from ..indy.issuer import IndyIssuer
 
@@ -39,6 +39,11 @@ class BaseLedger(ABC, metaclass=ABCMeta):
     def read_only(self) -> bool:
         """Accessor for the ledger read-only flag."""
 
+    @property
+    def stats(self) -> dict:
+        """Accessor for ledger health and latency statistics, if collected."""
+        return None
+
     @abstractmethod
     async def get_key_for_did(self, did: str) -> str:
         """Fetch the verkey for a ledger DID.
@@ -202,6 +207,24 @@ class BaseLedger(ABC, metaclass=ABCMeta):
 
         """
 
+    async def get_credential_definitions(
+        self, credential_definition_ids: Sequence[str]
+    ) -> Mapping[str, dict]:
+        """
+        Get several credential definitions, from the cache where available.
+
+        Args:
+            credential_definition_ids: The ids of the cred defs to fetch
+
+        Returns:
+            A mapping from each cred def id to its cred def
+
+        """
+        return {
+            cred_def_id: await self.get_credential_definition(cred_def_id)
+            for cred_def_id in dict.fromkeys(credential_definition_ids)
+        }
+
     @abstractmethod
     async def get_revoc_reg_delta(
         self, revoc_reg_id: str, timestamp_from=0, timestamp_to=None
@@ -218,6 +241,22 @@ class BaseLedger(ABC, metaclass=ABCMeta):
 
         """
 
+    async def get_schemas(self, schema_ids: Sequence[str]) -> Mapping[str, dict]:
+        """
+        Get several schemas, from the cache where available.
+
+        Args:
+            schema_ids: The schema ids (or stringified sequence numbers) to retrieve
+
+        Returns:
+            A mapping from each schema id to its schema
+
+        """
+        return {
+            schema_id: await self.get_schema(schema_id)
+            for schema_id in dict.fromkeys(schema_ids)
+        }
+
     @abstractmethod
     async def get_revoc_reg_entry(self, revoc_reg_id: str, timestamp: int):
         """Get revocation registry entry by revocation registry ID and timestamp."""
@@ -0,0 +1,285 @@
+"""Caching of ledger reads with per-artefact policies."""
+
+import asyncio
+import logging
+import time
+
+from typing import Any, Awaitable, Callable, Mapping, Sequence, Text, Tuple, Union
+
+from ..cache.base import BaseCache
+
+from .persistent_cache import PersistentLedgerCache
+
+LOGGER = logging.getLogger(__name__)
+
+DEFAULT_NEGATIVE_TTL = 30
+REFRESH_LOCK_TTL = 10
+
+SCHEMA = "schema"
+CRED_DEF = "credential_definition"
+REV_REG_DEF = "revocation_registry_definition"
+REV_REG_DELTA = "revocation_registry_delta"
+REV_REG_ENTRY = "revocation_registry_entry"
+DID_VERKEY = "did_verkey"
+DID_ENDPOINTS = "did_endpoints"
+
+CACHE_KINDS = (
+    SCHEMA,
+    CRED_DEF,
+    REV_REG_DEF,
+    REV_REG_DELTA,
+    REV_REG_ENTRY,
+    DID_VERKEY,
+    DID_ENDPOINTS,
+)
+
+
+class LedgerCachePolicy:
+    """Rules for caching reads of one kind of ledger artefact."""
+
+    def __init__(self, ttl: int = None, stale_ttl: int = 0, negative_ttl: int = 0):
+        """
+        Initialize the cache policy.
+
+        Args:
+            ttl: Seconds an entry is considered fresh, or `None` to keep it
+                without expiry (suitable for immutable artefacts)
+            stale_ttl: Seconds past `ttl` during which an entry is still returned
+                while it is refreshed in the background
+            negative_ttl: Seconds to remember that an artefact was not found;
+                0 disables negative caching
+
+        """
+        self.ttl = ttl
+        self.stale_ttl = stale_ttl or 0
+        self.negative_ttl = negative_ttl or 0
+
+    @classmethod
+    def deserialize(cls, value: Mapping[str, int]) -> "LedgerCachePolicy":
+        """Create a policy from its settings representation."""
+        return cls(value.get("ttl"), value.get("stale_ttl"), value.get("negative_ttl"))
+
+    def __eq__(self, other) -> bool:
+        """Compare two policies."""
+        return isinstance(other, LedgerCachePolicy) and vars(self) == vars(other)
+
+    def __repr__(self) -> str:
+        """Human readable representation of `LedgerCachePolicy`."""
+        return "<{}(ttl={}, stale_ttl={}, negative_ttl={})>".format(
+            self.__class__.__name__, self.ttl, self.stale_ttl, self.negative_ttl
+        )
+
+
+def default_policies(cache_duration: int) -> Mapping[str, LedgerCachePolicy]:
+    """Get the cache policy for each kind of artefact."""
+    return {
+        SCHEMA: LedgerCachePolicy(negative_ttl=DEFAULT_NEGATIVE_TTL),
+        CRED_DEF: LedgerCachePolicy(negative_ttl=DEFAULT_NEGATIVE_TTL),
+        REV_REG_DEF: LedgerCachePolicy(negative_ttl=DEFAULT_NEGATIVE_TTL),
+        # registry states at past times do not change, but there are many of them
+        REV_REG_DELTA: LedgerCachePolicy(cache_duration),
+        REV_REG_ENTRY: LedgerCachePolicy(cache_duration),
+        DID_VERKEY: LedgerCachePolicy(
+            cache_duration, cache_duration, DEFAULT_NEGATIVE_TTL
+        ),
+        DID_ENDPOINTS: LedgerCachePolicy(
+            cache_duration, cache_duration, DEFAULT_NEGATIVE_TTL
+        ),
+    }
+
+
+class LedgerCache:
+    """
+    Cache ledger reads according to a policy for each kind of artefact.
+
+    Entries are stored as `{"value": ..., "stale_at": ...}` under keys of the
+    form `<kind>::<id>`. Once `stale_at` has passed, the value is still served
+    while a single refresh runs in the background under a cache key lock, so
+    that callers do not wait on the ledger.
+
+    Artefacts whose policy has no `ttl` are immutable; if a persistent cache is
+    provided they are also written to it, and read back from it on a miss.
+    """
+
+    def __init__(
+        self,
+        cache: BaseCache,
+        policies: Mapping[str, Union[LedgerCachePolicy, Mapping]] = None,
+        cache_duration: int = 600,
+        persistent: PersistentLedgerCache = None,
+    ):
+        """
+        Initialize the ledger cache.
+
+        Args:
+            cache: The cache instance to use
+            policies: Policies by artefact kind, overriding the defaults
+            cache_duration: The TTL for artefacts without an immutable default
+            persistent: The on-disk cache for immutable artefacts, if any
+
+        """
+        self.cache = cache
+        self.persistent = persistent
+        self.policies = dict(default_policies(cache_duration))
+        self.default_policy = LedgerCachePolicy(cache_duration)
+        for kind, policy in (policies or {}).items():
+            if not isinstance(policy, LedgerCachePolicy):
+                policy = LedgerCachePolicy.deserialize(policy)
+            self.policies[kind] = policy
+        self._refreshing = {}
+
+    def policy(self, kind: str) -> LedgerCachePolicy:
+        """Get the cache policy for an artefact kind."""
+        return self.policies.get(kind, self.default_policy)
+
+    @staticmethod
+    def key(kind: str, ident: Text) -> str:
+        """Get the cache key for an artefact."""
+        return f"{kind}::{ident}"
+
+    async def store(self, kind: str, idents: Union[Text, Sequence[Text]], value: Any):
+        """
+        Cache an artefact, or record that it was not found if `value` is `None`.
+
+        Args:
+            kind: The kind of artefact
+            idents: The identifier or identifiers under which to store it
+            value: The artefact
+
+        """
+        policy = self.policy(kind)
+        idents = [idents] if isinstance(idents, Text) else idents
+        keys = [self.key(kind, ident) for ident in idents]
+        if value is None:
+            if policy.negative_ttl:
+                await self.cache.set(keys, {"value": None}, policy.negative_ttl)
+            return
+        if policy.ttl:
+            stale_at = time.time() + policy.ttl
+            ttl = policy.ttl + policy.stale_ttl
+        else:
+            stale_at = ttl = None
+            if self.persistent:
+                await self.persistent.put(kind, idents, value)
+        await self.cache.set(keys, {"value": value, "stale_at": stale_at}, ttl)
+
+    async def clear(self, kind: str, ident: Text):
+        """Drop a cached artefact, such as after it has been written."""
+        await self.cache.clear(self.key(kind, ident))
+        if self.persistent and not self.policy(kind).ttl:
+            await self.persistent.clear(kind, ident)
+
+    async def peek(self, kind: str, ident: Text) -> Any:
+        """Get a cached artefact without fetching it, or `None` if not cached."""
+        entry = await self.cache.get(self.key(kind, ident))
+        return entry and entry["value"]
+
+    async def _load(self, kind: str, idents: Sequence[Text]) -> Mapping[Text, Any]:
+        """Read immutable artefacts missing from the cache from the persistent cache."""
+        if not (self.persistent and idents) or self.policy(kind).ttl:
+            return {}
+        found = await self.persistent.get_many(kind, idents)
+        if found:
+            await self.cache.set_many(
+                {
+                    self.key(kind, ident): {"value": value, "stale_at": None}
+                    for ident, value in found.items()
+                }
+            )
+        return found
+
+    async def get(
+        self,
+        kind: str,
+        ident: Text,
+        fetch: Callable[[], Awaitable],
+        refresh: Callable[[], Awaitable] = None,
+    ) -> Any:
+        """
+        Get an artefact from the cache, or fetch it.
+
+        Artefacts that are not found are remembered according to the policy's
+        `negative_ttl`.
+
+        Args:
+            kind: The kind of artefact
+            ident: The artefact identifier
+            fetch: Reads the artefact from the ledger, storing it if found
+            refresh: Reads the artefact from the ledger in a background task,
+                if different from `fetch`
+
+        Returns:
+            The artefact, or `None` if not found
+
+        """
+        entry = await self.cache.get(self.key(kind, ident))
+        if entry is not None:
+            if self._is_stale(entry):
+                self._revalidate(kind, ident, refresh or fetch)
+            return entry["value"]
+        loaded = await self._load(kind, [ident])
+        if ident in loaded:
+            return loaded[ident]
+        value = await fetch()
+        if value is None:
+            await self.store(kind, ident, None)
+        return value
+
+    async def get_many(
+        self,
+        kind: str,
+        idents: Sequence[Text],
+        refresh: Callable[[Text], Awaitable],
+    ) -> Tuple[Mapping[Text, Any], Sequence[Text]]:
+        """
+        Look up several artefacts in the cache.
+
+        Args:
+            kind: The kind of artefact
+            idents: The artefact identifiers
+            refresh: Reads an artefact from the ledger in a background task,
+                storing it if found
+
+        Returns:
+            The artefacts found by identifier, and the identifiers not found
+
+        """
+        cached = await self.cache.get_many([self.key(kind, ident) for ident in idents])
+        found = {}
+        for ident in idents:
+            entry = cached.get(self.key(kind, ident))
+            if entry is not None:
+                if self._is_stale(entry):
+                    self._revalidate(kind, ident, lambda i=ident: refresh(i))
+                found[ident] = entry["value"]
+        found.update(
+            await self._load(kind, [ident for ident in idents if ident not in found])
+        )
+        return found, [ident for ident in idents if ident not in found]
+
+    @staticmethod
+    def _is_stale(entry: Mapping) -> bool:
+        """Check whether a cached entry is due for a refresh."""
+        stale_at = entry.get("stale_at")
+        return bool(stale_at) and stale_at <= time.time()
+
+    def _revalidate(self, kind: str, ident: Text, refresh: Callable[[], Awaitable]):
+        """Start a background refresh of an entry, unless one is running."""
+        key = self.key(kind, ident)
+        if key not in self._refreshing:
+            task = asyncio.ensure_future(self._refresh(kind, ident, refresh))
+            self._refreshing[key] = task
+            task.add_done_callback(lambda _: self._refreshing.pop(key, None))
+
+    async def _refresh(self, kind: str, ident: Text, refresh: Callable[[], Awaitable]):
+        """Fetch a fresh copy of an entry, at most once across all waiters."""
+        try:
+            async with self.cache.acquire(self.key(kind, ident) + "::refresh") as lock:
+                if lock.result:
+                    return  # refreshed recently by another task or instance
+                await refresh()
+                await lock.set_result(True, REFRESH_LOCK_TTL)
+        except Exception:
+            LOGGER.warning(
+                "Failed to refresh cached ledger %s %s", kind, ident, exc_info=True
+            )
@@ -21,3 +21,7 @@ class ClosedPoolError(LedgerError):
 
 class LedgerTransactionError(LedgerError):
     """The ledger rejected the transaction."""
+
+
+class LedgerRejectedError(LedgerTransactionError):
+    """The ledger refused the transaction as invalid or unauthorized."""
@@ -8,8 +8,8 @@ import tempfile
 from datetime import datetime, date
 from hashlib import sha256
 from os import path
-from time import time
-from typing import Sequence, Tuple
+from time import perf_counter, time
+from typing import Any, Awaitable, Callable, Mapping, Sequence, Tuple, Union
 
 import indy.ledger
 import indy.pool
@@ -18,6 +18,7 @@ from indy.error import IndyError, ErrorCode
 from ..cache.base import BaseCache
 from ..indy.issuer import IndyIssuer, IndyIssuerError, DEFAULT_CRED_DEF_TAG
 from ..indy.sdk.error import IndyErrorHandler
+from ..indy.util import merge_rev_reg_deltas
 from ..messaging.credential_definitions.util import CRED_DEF_SENT_RECORD_TYPE
 from ..messaging.schemas.util import SCHEMA_SENT_RECORD_TYPE
 from ..storage.base import StorageRecord
@@ -29,14 +30,29 @@ from ..wallet.util import full_verkey
 from ..wallet.did_posture import DIDPosture
 
 from .base import BaseLedger, Role
+from .cache import (
+    CRED_DEF,
+    DID_ENDPOINTS,
+    DID_VERKEY,
+    REV_REG_DEF,
+    REV_REG_DELTA,
+    REV_REG_ENTRY,
+    SCHEMA,
+    LedgerCache,
+    LedgerCachePolicy,
+)
 from .endpoint_type import EndpointType
 from .error import (
     BadLedgerRequestError,
     ClosedPoolError,
     LedgerConfigError,
     LedgerError,
+    LedgerRejectedError,
     LedgerTransactionError,
 )
+from .monitor import LedgerPoolMonitor, request_kind
+from .persistent_cache import PersistentLedgerCache
+from .scheduler import DEFAULT_MAX_CONCURRENT_REQUESTS, LedgerReadScheduler
 from .util import TAA_ACCEPTED_RECORD_TYPE
 
 LOGGER = logging.getLogger(__name__)
@@ -58,8 +74,13 @@ class IndySdkLedgerPool:
         keepalive: int = 0,
         cache: BaseCache = None,
         cache_duration: int = 600,
+        cache_policies: Mapping[str, Union[LedgerCachePolicy, Mapping]] = None,
+        cache_path: str = None,
         genesis_transactions: str = None,
         read_only: bool = False,
+        max_concurrent_requests: int = DEFAULT_MAX_CONCURRENT_REQUESTS,
+        rev_reg_delta_bucket: int = 0,
+        keep_warm: int = 0,
     ):
         """
         Initialize an IndySdkLedgerPool instance.
@@ -69,8 +90,15 @@ class IndySdkLedgerPool:
             keepalive: How many seconds to keep the ledger open
             cache: The cache instance to use
             cache_duration: The TTL for ledger cache entries
+            cache_policies: Cache policies by artefact kind, overriding the defaults
+            cache_path: The file in which to persist immutable ledger artefacts
             genesis_transactions: The ledger genesis transaction as a string
             read_only: Prevent any ledger write operations
+            max_concurrent_requests: The maximum number of ledger requests in flight
+            rev_reg_delta_bucket: Round the end of cached revocation registry delta
+                intervals down to a multiple of this many seconds
+            keep_warm: Keep the pool open once opened, checking its health at this
+                interval in seconds
         """
         self.checked = checked
         self.opened = False
@@ -80,7 +108,23 @@ class IndySdkLedgerPool:
         self.close_task: asyncio.Future = None
         self.cache = cache
         self.cache_duration = cache_duration
+        self.ledger_cache = (
+            LedgerCache(
+                cache,
+                cache_policies,
+                cache_duration,
+                PersistentLedgerCache(cache_path) if cache_path else None,
+            )
+            if cache
+            else None
+        )
         self.genesis_transactions = genesis_transactions
+        self.read_scheduler = LedgerReadScheduler(max_concurrent_requests)
+        self.rev_reg_delta_bucket = rev_reg_delta_bucket or 0
+        self.keep_warm = keep_warm or 0
+        self.keep_warm_task: asyncio.Future = None
+        self.monitor = LedgerPoolMonitor()
+        self.nodes = []
         self.handle = None
         self.name = name
         self.taa_cache = None
@@ -97,6 +141,7 @@ class IndySdkLedgerPool:
         with open(txn_path, "w") as genesis_file:
             genesis_file.write(genesis_transactions)
         pool_config = json.dumps({"genesis_txn": txn_path})
+        self.nodes = node_aliases(genesis_transactions)
 
         if await self.check_pool_config():
             if recreate:
@@ -141,6 +186,8 @@ class IndySdkLedgerPool:
         ):
             self.handle = await indy.pool.open_pool_ledger(self.name, "{}")
         self.opened = True
+        if self.keep_warm and not self.keep_warm_task:
+            self.keep_warm_task = asyncio.ensure_future(self._keep_warm())
 
     async def close(self):
         """Close the pool ledger."""
@@ -156,6 +203,7 @@ class IndySdkLedgerPool:
 
                 self.handle = None
                 self.opened = False
+                self.stop_keep_warm()
                 exc = None
                 break
 
@@ -190,12 +238,90 @@ class IndySdkLedgerPool:
 
         async with self.ref_lock:
             self.ref_count -= 1
-            if not self.ref_count:
+            if not self.ref_count and not self.keep_warm:
                 if self.keepalive:
                     self.close_task = asyncio.ensure_future(closer(self.keepalive))
                 else:
                     await self.close()
 
+    async def check_health(self):
+        """Send a lightweight read to each node of the pool and time its response."""
+        with IndyErrorHandler("Exception building health check request", LedgerError):
+            request_json = await indy.ledger.build_get_txn_request(None, "POOL", 1)
+
+        async def probe(node: str = None) -> Tuple[bool, str]:
+            start = perf_counter()
+            try:
+                async with self.read_scheduler.limit():
+                    if node:
+                        reply = json.loads(
+                            await indy.ledger.submit_action(
+                                self.handle, request_json, json.dumps([node]), None
+                            )
+                        ).get(node)
+                        reply = reply and reply != "timeout" and json.loads(reply)
+                    else:
+                        reply = json.loads(
+                            await indy.ledger.submit_request(self.handle, request_json)
+                        )
+                ok = bool(reply) and reply.get("op") == "REPLY"
+                error = None if ok else f"No valid reply from {node or 'pool'}"
+            except (IndyError, ValueError) as err:
+                ok = False
+                error = f"{node or 'pool'}: {err}"
+            self.monitor.observe_node(node or "pool", perf_counter() - start, not ok)
+            return ok, error
+
+        results = await asyncio.gather(*(probe(node) for node in self.nodes or [None]))
+        errors = [error for ok, error in results if error]
+        self.monitor.check_complete(
+            sum(ok for ok, _ in results), len(results), errors[-1] if errors else None
+        )
+        if errors:
+            LOGGER.warning("Ledger pool health check: %s", "; ".join(errors))
+
+    async def _keep_warm(self):
+        """Check the health of the open pool periodically."""
+        while self.opened:
+            try:
+                await self.check_health()
+            except Exception:
+                LOGGER.exception("Ledger pool health check failed")
+            await asyncio.sleep(self.keep_warm)
+
+    def stop_keep_warm(self):
+        """Stop checking the health of the pool."""
+        if self.keep_warm_task:
+            self.keep_warm_task.cancel()
+            self.keep_warm_task = None
+
+    async def shutdown(self):
+        """Close the pool ledger regardless of active references or keep-warm."""
+        self.stop_keep_warm()
+        async with self.ref_lock:
+            if self.close_task:
+                self.close_task.cancel()
+                self.close_task = None
+            await self.close()
+
+    @property
+    def stats(self) -> dict:
+        """Accessor for the pool health and request latency statistics."""
+        return dict(self.monitor.extract(), pool=self.name, opened=self.opened)
+
+
+def node_aliases(genesis_transactions: str) -> Sequence[str]:
+    """Get the aliases of the validator nodes in the genesis transactions."""
+    aliases = []
+    for line in genesis_transactions.splitlines():
+        try:
+            alias = json.loads(line)["txn"]["data"]["data"]["alias"]
+        except (ValueError, KeyError, TypeError):
+            continue
+        if alias not in aliases:
+            aliases.append(alias)
+    return aliases
+
 
 class IndySdkLedger(BaseLedger):
     """Indy ledger class."""
@@ -232,6 +358,11 @@ class IndySdkLedger(BaseLedger):
         """Accessor for the ledger read-only flag."""
         return self.pool.read_only
 
+    @property
+    def stats(self) -> dict:
+        """Accessor for the pool health and request latency statistics."""
+        return self.pool.stats
+
     async def __aenter__(self) -> "IndySdkLedger":
         """
         Context manager entry.
@@ -272,6 +403,7 @@ class IndySdkLedger(BaseLedger):
                 f"Cannot sign and submit request to closed pool '{self.pool.name}'"
             )
 
+        kind = request_kind(request_json)
         if sign is None or sign:
             if sign_did is sentinel:
                 sign_did = await self.wallet.get_public_did()
@@ -303,17 +435,24 @@ class IndySdkLedger(BaseLedger):
         else:
             submit_op = indy.ledger.submit_request(self.pool.handle, request_json)
 
-        with IndyErrorHandler(
-            "Exception raised by ledger transaction", LedgerTransactionError
-        ):
-            request_result_json = await submit_op
+        async with self.pool.read_scheduler.limit():
+            start = perf_counter()
+            try:
+                with IndyErrorHandler(
+                    "Exception raised by ledger transaction", LedgerTransactionError
+                ):
+                    request_result_json = await submit_op
+            except LedgerTransactionError:
+                self.pool.monitor.observe(kind, perf_counter() - start, True)
+                raise
+            self.pool.monitor.observe(kind, perf_counter() - start)
 
         request_result = json.loads(request_result_json)
 
         operation = request_result.get("op", "")
 
         if operation in ("REQNACK", "REJECT"):
-            raise LedgerTransactionError(
+            raise LedgerRejectedError(
                 f"Ledger rejected transaction request: {request_result['reason']}"
             )
 
@@ -325,6 +464,74 @@ class IndySdkLedger(BaseLedger):
                 f"Unexpected operation code from ledger: {operation}"
             )
 
+    async def _cached(
+        self, kind: str, ident: str, fetch: Callable[[str], Awaitable]
+    ) -> Any:
+        """
+        Read a ledger object through the ledger cache, if any.
+
+        Args:
+            kind: The kind of ledger object
+            ident: The identifier of the object to retrieve
+            fetch: Fetches a single object from the ledger, caching the result
+
+        Returns:
+            The object, or `None` if not found
+
+        """
+        if not self.pool.ledger_cache:
+            return await self._read(kind, ident, fetch)
+        return await self.pool.ledger_cache.get(
+            kind,
+            ident,
+            lambda: self._read(kind, ident, fetch),
+            lambda: self._refetch(fetch, ident),
+        )
+
+    async def _cached_many(
+        self, kind: str, idents: Sequence[str], fetch: Callable[[str], Awaitable]
+    ) -> Mapping[str, Any]:
+        """
+        Read several ledger objects through the ledger cache, fetching the rest.
+
+        Args:
+            kind: The kind of ledger object
+            idents: The identifiers of the objects to retrieve
+            fetch: Fetches a single object from the ledger, caching the result
+
+        Returns:
+            A mapping from each identifier to its object
+
+        """
+        idents = list(dict.fromkeys(idents))
+        ledger_cache = self.pool.ledger_cache
+        if ledger_cache:
+            found, missing = await ledger_cache.get_many(
+                kind, idents, lambda ident: self._refetch(fetch, ident)
+            )
+        else:
+            found, missing = {}, idents
+        if missing:
+            fetched = await asyncio.gather(
+                *(self._read(kind, ident, fetch) for ident in missing)
+            )
+            for ident, value in zip(missing, fetched):
+                found[ident] = value
+                if value is None and ledger_cache:
+                    await ledger_cache.store(kind, ident, None)
+        return {ident: found[ident] for ident in idents}
+
+    async def _read(
+        self, kind: str, ident: str, fetch: Callable[[str], Awaitable]
+    ) -> Any:
+        """Fetch a ledger object, sharing the result with concurrent readers."""
+        return await self.pool.read_scheduler.run((kind, ident), lambda: fetch(ident))
+
+    async def _refetch(self, fetch: Callable[[str], Awaitable], ident: str) -> Any:
+        """Fetch a ledger object outside of the caller's ledger context."""
+        async with self:
+            return await fetch(ident)
+
     async def create_and_send_schema(
         self,
         issuer: IndyIssuer,
@@ -405,6 +612,10 @@ class IndySdkLedger(BaseLedger):
                 else:
                     raise
 
+            if self.pool.ledger_cache:
+                # drop any record of the schema not being found
+                await self.pool.ledger_cache.clear(SCHEMA, schema_id)
+
             schema_id_parts = schema_id.split(":")
             schema_tags = {
                 "schema_id": schema_id,
@@ -449,16 +660,28 @@ class IndySdkLedger(BaseLedger):
             schema_id: The schema id (or stringified sequence number) to retrieve
 
         """
-        if self.pool.cache:
-            result = await self.pool.cache.get(f"schema::{schema_id}")
-            if result:
-                return result
+        return await self._cached(SCHEMA, schema_id, self._fetch_schema)
 
+    async def _fetch_schema(self, schema_id: str) -> dict:
+        """Fetch a schema from the ledger by id or stringified sequence number."""
         if schema_id.isdigit():
             return await self.fetch_schema_by_seq_no(int(schema_id))
         else:
             return await self.fetch_schema_by_id(schema_id)
 
+    async def get_schemas(self, schema_ids: Sequence[str]) -> Mapping[str, dict]:
+        """
+        Get several schemas, fetching those not cached from the ledger concurrently.
+
+        Args:
+            schema_ids: The schema ids (or stringified sequence numbers) to retrieve
+
+        Returns:
+            A mapping from each schema id to its schema
+
+        """
+        return await self._cached_many(SCHEMA, schema_ids, self._fetch_schema)
+
     async def fetch_schema_by_id(self, schema_id: str) -> dict:
         """
         Get schema from ledger.
@@ -491,11 +714,11 @@ class IndySdkLedger(BaseLedger):
             )
 
         parsed_response = json.loads(parsed_schema_json)
-        if parsed_response and self.pool.cache:
-            await self.pool.cache.set(
-                [f"schema::{schema_id}", f"schema::{response['result']['seqNo']}"],
+        if parsed_response and self.pool.ledger_cache:
+            await self.pool.ledger_cache.store(
+                SCHEMA,
+                [schema_id, str(response["result"]["seqNo"])],
                 parsed_response,
-                self.pool.cache_duration,
             )
 
         return parsed_response
@@ -633,6 +856,8 @@ class IndySdkLedger(BaseLedger):
                     public_info.did, credential_definition_json
                 )
             await self._submit(request_json, True, sign_did=public_info)
+            if self.pool.ledger_cache:
+                await self.pool.ledger_cache.clear(CRED_DEF, credential_definition_id)
 
             # Add non-secrets record
             storage = self.get_indy_storage()
@@ -661,14 +886,26 @@ class IndySdkLedger(BaseLedger):
             credential_definition_id: The schema id of the schema to fetch cred def for
 
         """
-        if self.pool.cache:
-            result = await self.pool.cache.get(
-                f"credential_definition::{credential_definition_id}"
-            )
-            if result:
-                return result
+        return await self._cached(
+            CRED_DEF, credential_definition_id, self.fetch_credential_definition
+        )
+
+    async def get_credential_definitions(
+        self, credential_definition_ids: Sequence[str]
+    ) -> Mapping[str, dict]:
+        """
+        Get several cred defs, fetching those not cached from the ledger concurrently.
+
+        Args:
+            credential_definition_ids: The ids of the cred defs to fetch
 
-        return await self.fetch_credential_definition(credential_definition_id)
+        Returns:
+            A mapping from each cred def id to its cred def
+
+        """
+        return await self._cached_many(
+            CRED_DEF, credential_definition_ids, self.fetch_credential_definition
+        )
 
     async def fetch_credential_definition(self, credential_definition_id: str) -> dict:
         """
@@ -702,11 +939,9 @@ class IndySdkLedger(BaseLedger):
                 else:
                     raise
 
-        if parsed_response and self.pool.cache:
-            await self.pool.cache.set(
-                f"credential_definition::{credential_definition_id}",
-                parsed_response,
-                self.pool.cache_duration,
+        if parsed_response and self.pool.ledger_cache:
+            await self.pool.ledger_cache.store(
+                CRED_DEF, credential_definition_id, parsed_response
             )
 
         return parsed_response
@@ -735,6 +970,16 @@ class IndySdkLedger(BaseLedger):
         Args:
             did: The DID to look up on the ledger or in the cache
         """
+        return await self._cached(
+            DID_VERKEY, self.did_to_nym(did), self.fetch_key_for_did
+        )
+
+    async def fetch_key_for_did(self, did: str) -> str:
+        """Fetch the verkey for a ledger DID from the ledger.
+
+        Args:
+            did: The DID to look up on the ledger
+        """
         nym = self.did_to_nym(did)
         public_info = await self.wallet.get_public_did()
         public_did = public_info.did if public_info else None
@@ -742,7 +987,12 @@ class IndySdkLedger(BaseLedger):
             request_json = await indy.ledger.build_get_nym_request(public_did, nym)
         response_json = await self._submit(request_json, sign_did=public_info)
         data_json = (json.loads(response_json))["result"]["data"]
-        return full_verkey(did, json.loads(data_json)["verkey"]) if data_json else None
+        if not data_json:
+            return None
+        verkey = full_verkey(did, json.loads(data_json)["verkey"])
+        if self.pool.ledger_cache:
+            await self.pool.ledger_cache.store(DID_VERKEY, nym, verkey)
+        return verkey
 
     async def get_all_endpoints_for_did(self, did: str) -> dict:
         """Fetch all endpoints for a ledger DID.
@@ -750,6 +1000,16 @@ class IndySdkLedger(BaseLedger):
         Args:
             did: The DID to look up on the ledger or in the cache
         """
+        return await self._cached(
+            DID_ENDPOINTS, self.did_to_nym(did), self.fetch_all_endpoints_for_did
+        )
+
+    async def fetch_all_endpoints_for_did(self, did: str) -> dict:
+        """Fetch all endpoints for a ledger DID from the ledger.
+
+        Args:
+            did: The DID to look up on the ledger
+        """
         nym = self.did_to_nym(did)
         public_info = await self.wallet.get_public_did()
         public_did = public_info.did if public_info else None
@@ -765,6 +1025,8 @@ class IndySdkLedger(BaseLedger):
         else:
             endpoints = None
 
+        if endpoints and self.pool.ledger_cache:
+            await self.pool.ledger_cache.store(DID_ENDPOINTS, nym, endpoints)
         return endpoints
 
     async def get_endpoint_for_did(
@@ -779,22 +1041,8 @@ class IndySdkLedger(BaseLedger):
 
         if not endpoint_type:
             endpoint_type = EndpointType.ENDPOINT
-        nym = self.did_to_nym(did)
-        public_info = await self.wallet.get_public_did()
-        public_did = public_info.did if public_info else None
-        with IndyErrorHandler("Exception building attribute request", LedgerError):
-            request_json = await indy.ledger.build_get_attrib_request(
-                public_did, nym, "endpoint", None, None
-            )
-        response_json = await self._submit(request_json, sign_did=public_info)
-        data_json = json.loads(response_json)["result"]["data"]
-        if data_json:
-            endpoint = json.loads(data_json).get("endpoint", None)
-            address = endpoint.get(endpoint_type.indy, None) if endpoint else None
-        else:
-            address = None
-
-        return address
+        endpoints = await self.get_all_endpoints_for_did(did)
+        return endpoints.get(endpoint_type.indy, None) if endpoints else None
 
     async def update_endpoint_for_did(
         self, did: str, endpoint: str, endpoint_type: EndpointType = None
@@ -809,7 +1057,7 @@ class IndySdkLedger(BaseLedger):
         if not endpoint_type:
             endpoint_type = EndpointType.ENDPOINT
 
-        all_exist_endpoints = await self.get_all_endpoints_for_did(did)
+        all_exist_endpoints = await self.fetch_all_endpoints_for_did(did)
         exist_endpoint_of_type = (
             all_exist_endpoints.get(endpoint_type.indy, None)
             if all_exist_endpoints
@@ -835,6 +1083,8 @@ class IndySdkLedger(BaseLedger):
                     nym, nym, None, attr_json, None
                 )
             await self._submit(request_json, True, True)
+            if self.pool.ledger_cache:
+                await self.pool.ledger_cache.clear(DID_ENDPOINTS, nym)
             return True
         return False
 
@@ -863,6 +1113,8 @@ class IndySdkLedger(BaseLedger):
             )
 
         await self._submit(request_json)
+        if self.pool.ledger_cache:
+            await self.pool.ledger_cache.clear(DID_VERKEY, self.did_to_nym(did))
 
         did_info = await self.wallet.get_local_did(did)
         metadata = {**did_info.metadata, **DIDPosture.POSTED.metadata}
@@ -1039,6 +1291,10 @@ class IndySdkLedger(BaseLedger):
 
     async def get_revoc_reg_def(self, revoc_reg_id: str) -> dict:
         """Get revocation registry definition by ID."""
+        return await self._cached(REV_REG_DEF, revoc_reg_id, self.fetch_revoc_reg_def)
+
+    async def fetch_revoc_reg_def(self, revoc_reg_id: str) -> dict:
+        """Get revocation registry definition by ID from the ledger."""
         public_info = await self.wallet.get_public_did()
         try:
             fetch_req = await indy.ledger.build_get_revoc_reg_def_request(
@@ -1057,10 +1313,29 @@ class IndySdkLedger(BaseLedger):
             raise e
 
         assert found_id == revoc_reg_id
-        return json.loads(found_def_json)
+        revoc_reg_def = json.loads(found_def_json)
+        if self.pool.ledger_cache:
+            await self.pool.ledger_cache.store(REV_REG_DEF, revoc_reg_id, revoc_reg_def)
+        return revoc_reg_def
 
     async def get_revoc_reg_entry(self, revoc_reg_id: str, timestamp: int):
         """Get revocation registry entry by revocation registry ID and timestamp."""
+        ledger_cache = self.pool.ledger_cache
+        if not ledger_cache or timestamp > time():
+            # the registry may still change before a future timestamp
+            return await self.fetch_revoc_reg_entry(revoc_reg_id, timestamp)
+
+        async def fetch(ident: str) -> list:
+            entry = list(await self.fetch_revoc_reg_entry(revoc_reg_id, timestamp))
+            await ledger_cache.store(REV_REG_ENTRY, ident, entry)
+            return entry
+
+        return tuple(
+            await self._cached(REV_REG_ENTRY, f"{revoc_reg_id}:{timestamp}", fetch)
+        )
+
+    async def fetch_revoc_reg_entry(self, revoc_reg_id: str, timestamp: int):
+        """Fetch revocation registry entry by ID and timestamp from the ledger."""
         public_info = await self.wallet.get_public_did()
         with IndyErrorHandler("Exception fetching rev reg entry", LedgerError):
             try:
@@ -1096,6 +1371,62 @@ class IndySdkLedger(BaseLedger):
         """
         if timestamp_to is None:
             timestamp_to = int(time())
+        ledger_cache = self.pool.ledger_cache
+        if not ledger_cache:
+            return await self.fetch_revoc_reg_delta(
+                revoc_reg_id, timestamp_from, timestamp_to
+            )
+        bucket = self.pool.rev_reg_delta_bucket
+        if bucket:
+            timestamp_to = max(timestamp_to - timestamp_to % bucket, timestamp_from)
+
+        async def fetch(ident: str) -> list:
+            if timestamp_from:
+                delta = await self.fetch_revoc_reg_delta(
+                    revoc_reg_id, timestamp_from, timestamp_to
+                )
+            else:
+                delta = await self._advance_revoc_reg_delta(revoc_reg_id, timestamp_to)
+            await ledger_cache.store(REV_REG_DELTA, ident, list(delta))
+            return list(delta)
+
+        return tuple(
+            await self._cached(
+                REV_REG_DELTA, f"{revoc_reg_id}:{timestamp_from}:{timestamp_to}", fetch
+            )
+        )
+
+    async def _advance_revoc_reg_delta(
+        self, revoc_reg_id: str, timestamp_to: int
+    ) -> Tuple[dict, int]:
+        """Fetch a delta from registry creation, building on the latest one cached."""
+        ledger_cache = self.pool.ledger_cache
+        latest_id = f"{revoc_reg_id}:latest"
+        latest = await ledger_cache.peek(REV_REG_DELTA, latest_id)
+        # the latest delta is only known to be complete up to the time of the last
+        # registry entry the ledger returned: an entry written later may still
+        # carry an earlier timestamp than the one requested
+        if latest and latest["timestamp"] <= timestamp_to:
+            (update, delta_timestamp) = await self.fetch_revoc_reg_delta(
+                revoc_reg_id, latest["timestamp"], timestamp_to
+            )
+            delta = merge_rev_reg_deltas(latest["delta"], update)
+        else:
+            (delta, delta_timestamp) = await self.fetch_revoc_reg_delta(
+                revoc_reg_id, 0, timestamp_to
+            )
+        if not latest or latest["timestamp"] < delta_timestamp:
+            await ledger_cache.store(
+                REV_REG_DELTA,
+                latest_id,
+                {"delta": delta, "timestamp": delta_timestamp},
+            )
+        return delta, delta_timestamp
+
+    async def fetch_revoc_reg_delta(
+        self, revoc_reg_id: str, timestamp_from: int, timestamp_to: int
+    ) -> Tuple[dict, int]:
+        """Fetch a revocation registry delta from the ledger."""
         public_info = await self.wallet.get_public_did()
         with IndyErrorHandler("Exception building rev reg delta request", LedgerError):
             fetch_req = await indy.ledger.build_get_revoc_reg_delta_request(
@@ -1136,6 +1467,8 @@ class IndySdkLedger(BaseLedger):
                 did_info.did, json.dumps(revoc_reg_def)
             )
         await self._submit(request_json, True, True, did_info)
+        if self.pool.ledger_cache and revoc_reg_def.get("id"):
+            await self.pool.ledger_cache.clear(REV_REG_DEF, revoc_reg_def["id"])
 
     async def send_revoc_reg_entry(
         self,
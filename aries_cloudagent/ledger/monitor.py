@@ -0,0 +1,95 @@
+"""Latency statistics and health of a ledger pool."""
+
+import json
+import time
+
+from typing import Sequence
+
+from ..utils.stats import Histogram
+
+READ = "read"
+WRITE = "write"
+
+# GET_TXN, GET_TXN_AUTHR_AGRMT(_AML), GET_ATTR, GET_NYM, GET_SCHEMA, GET_CLAIM_DEF,
+# GET_REVOC_REG_DEF, GET_REVOC_REG, GET_REVOC_REG_DELTA, GET_AUTH_RULE
+READ_TXN_TYPES = {"3", "6", "7", "104", "105", "107", "108", "115", "116", "117", "121"}
+
+STATUS_OK = "ok"
+STATUS_DEGRADED = "degraded"
+STATUS_DOWN = "down"
+
+
+def request_kind(request_json: str) -> str:
+    """Classify a ledger request as a read or a write by its transaction type."""
+    try:
+        txn_type = json.loads(request_json)["operation"]["type"]
+    except (ValueError, KeyError, TypeError):
+        return WRITE
+    return READ if str(txn_type) in READ_TXN_TYPES else WRITE
+
+
+class LedgerPoolMonitor:
+    """Request latency histograms and the results of pool health checks."""
+
+    def __init__(self, buckets: Sequence[float] = None):
+        """Initialize the LedgerPoolMonitor instance."""
+        self.buckets = buckets
+        self.reset()
+
+    def reset(self):
+        """Clear all collected statistics."""
+        self.latency = {}
+        self.errors = {}
+        self.node_latency = {}
+        self.node_errors = {}
+        self.status = None
+        self.last_check = None
+        self.last_error = None
+
+    def observe(self, kind: str, duration: float, error: bool = False):
+        """Log a completed ledger request."""
+        self._observe(self.latency, self.errors, kind, duration, error)
+
+    def observe_node(self, node: str, duration: float, error: bool = False):
+        """Log the response of a single node to a health check."""
+        self._observe(self.node_latency, self.node_errors, node, duration, error)
+
+    def _observe(
+        self, latency: dict, errors: dict, key: str, duration: float, error: bool
+    ):
+        """Add an observation to a histogram and error count."""
+        hist = latency.get(key)
+        if not hist:
+            hist = latency[key] = Histogram(self.buckets)
+            errors[key] = 0
+        hist.observe(duration)
+        if error:
+            errors[key] += 1
+
+    def check_complete(self, responding: int, total: int, error: str = None):
+        """Record the outcome of a health check of the pool."""
+        if not responding:
+            self.status = STATUS_DOWN
+        elif responding < total:
+            self.status = STATUS_DEGRADED
+        else:
+            self.status = STATUS_OK
+        self.last_check = time.time()
+        if error:
+            self.last_error = error
+
+    def extract(self) -> dict:
+        """Summarize the statistics."""
+        result = {
+            "status": self.status,
+            "last_check": self.last_check,
+            "last_error": self.last_error,
+        }
+        for kind, hist in sorted(self.latency.items()):
+            result[kind] = dict(hist.extract(), errors=self.errors[kind])
+        if self.node_latency:
+            result["nodes"] = {
+                node: dict(hist.extract(), errors=self.node_errors[node])
+                for node, hist in sorted(self.node_latency.items())
+            }
+        return result
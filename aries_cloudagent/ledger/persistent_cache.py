@@ -0,0 +1,164 @@
+"""Persistent on-disk cache of immutable ledger artefacts, backed by SQLite."""
+
+import asyncio
+import json
+import logging
+import sqlite3
+
+from hashlib import sha256
+from os import makedirs, path
+from typing import Any, Mapping, Sequence, Text
+
+LOGGER = logging.getLogger(__name__)
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS artefacts (
+    digest TEXT PRIMARY KEY,
+    value TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS artefact_ids (
+    kind TEXT NOT NULL,
+    ident TEXT NOT NULL,
+    digest TEXT NOT NULL REFERENCES artefacts (digest),
+    PRIMARY KEY (kind, ident)
+);
+"""
+
+# stay below the default SQLITE_MAX_VARIABLE_NUMBER of older SQLite releases
+MAX_PARAMS = 500
+
+
+class PersistentLedgerCache:
+    """
+    Content-addressed store of ledger artefacts that survives restarts.
+
+    Each artefact is stored once under the SHA-256 digest of its JSON form and
+    indexed by every identifier it was fetched under, such as a schema's id and
+    its sequence number. The database is opened on first use. Errors are logged
+    and treated as cache misses, so a damaged or unwritable file only costs
+    ledger reads.
+    """
+
+    def __init__(self, db_path: str):
+        """
+        Initialize a `PersistentLedgerCache` instance.
+
+        Args:
+            db_path: The path of the SQLite database file
+
+        """
+        self.db_path = path.expanduser(db_path)
+        self._conn: sqlite3.Connection = None
+        self._lock: asyncio.Lock = None
+
+    def _connect(self) -> sqlite3.Connection:
+        """Open the database, creating it if needed."""
+        parent = path.dirname(self.db_path)
+        if parent:
+            makedirs(parent, exist_ok=True)
+        conn = sqlite3.connect(
+            self.db_path, timeout=30, isolation_level=None, check_same_thread=False
+        )
+        conn.execute("PRAGMA journal_mode = WAL")
+        conn.executescript(SCHEMA)
+        return conn
+
+    async def _run(self, fn, *args):
+        """Run a blocking database function in a worker thread."""
+        if not self._lock:
+            self._lock = asyncio.Lock()
+        loop = asyncio.get_event_loop()
+        async with self._lock:
+            try:
+                if not self._conn:
+                    self._conn = await loop.run_in_executor(None, self._connect)
+                return await loop.run_in_executor(None, fn, self._conn, *args)
+            except (OSError, sqlite3.Error) as err:
+                LOGGER.warning("Persistent ledger cache unavailable: %s", err)
+                return None
+
+    async def get_many(self, kind: str, idents: Sequence[Text]) -> Mapping[Text, Any]:
+        """
+        Look up several artefacts.
+
+        Args:
+            kind: The kind of artefact
+            idents: The artefact identifiers
+
+        Returns:
+            A mapping from each identifier found to its artefact
+
+        """
+        if not idents:
+            return {}
+        return await self._run(_select, kind, list(idents)) or {}
+
+    async def put(self, kind: str, idents: Sequence[Text], value: Any):
+        """
+        Store an artefact under one or more identifiers.
+
+        Args:
+            kind: The kind of artefact
+            idents: The identifiers under which to store it
+            value: The artefact
+
+        """
+        data = json.dumps(value, sort_keys=True, separators=(",", ":"))
+        digest = sha256(data.encode("utf-8")).hexdigest()
+        await self._run(_insert, kind, list(idents), digest, data)
+
+    async def clear(self, kind: str, ident: Text):
+        """Drop the identifier of an artefact."""
+        await self._run(_delete, kind, ident)
+
+    async def close(self):
+        """Close the database."""
+        if self._conn:
+            self._conn.close()
+            self._conn = None
+
+    def __repr__(self) -> str:
+        """Human readable representation of `PersistentLedgerCache`."""
+        return "<{}(db_path={})>".format(self.__class__.__name__, self.db_path)
+
+
+def _select(conn: sqlite3.Connection, kind: str, idents: Sequence[Text]) -> dict:
+    """Fetch the artefacts for a list of identifiers."""
+    found = {}
+    for start in range(0, len(idents), MAX_PARAMS):
+        end = start + MAX_PARAMS
+        batch = idents[start:end]
+        rows = conn.execute(
+            "SELECT i.ident, a.value FROM artefact_ids i "
+            "JOIN artefacts a ON a.digest = i.digest "
+            "WHERE i.kind = ? AND i.ident IN ({})".format(",".join("?" * len(batch))),
+            [kind, *batch],
+        )
+        found.update((ident, json.loads(value)) for ident, value in rows)
+    return found
+
+
+def _insert(
+    conn: sqlite3.Connection, kind: str, idents: Sequence[Text], digest: str, data: str
+):
+    """Store an artefact and point its identifiers at it."""
+    conn.execute("BEGIN IMMEDIATE")
+    try:
+        conn.execute(
+            "INSERT OR IGNORE INTO artefacts (digest, value) VALUES (?, ?)",
+            (digest, data),
+        )
+        conn.executemany(
+            "INSERT OR REPLACE INTO artefact_ids (kind, ident, digest) "
+            "VALUES (?, ?, ?)",
+            [(kind, ident, digest) for ident in idents],
+        )
+    except BaseException:
+        conn.execute("ROLLBACK")
+        raise
+    conn.execute("COMMIT")
+
+
+def _delete(conn: sqlite3.Connection, kind: str, ident: Text):
+    """Remove an identifier."""
+    conn.execute("DELETE FROM artefact_ids WHERE kind = ? AND ident = ?", (kind, ident))
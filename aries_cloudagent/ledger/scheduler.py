@@ -0,0 +1,68 @@
+"""Scheduling of concurrent ledger requests."""
+
+import asyncio
+
+from typing import Any, Awaitable, Callable, Hashable
+
+DEFAULT_MAX_CONCURRENT_REQUESTS = 10
+
+
+class LedgerReadScheduler:
+    """
+    Coalesce identical ledger reads and bound the number of requests in flight.
+
+    Callers reading the same artefact while a read of it is pending share its
+    result instead of issuing another request. Independent reads run
+    concurrently, up to `max_concurrent` requests at a time.
+    """
+
+    def __init__(self, max_concurrent: int = DEFAULT_MAX_CONCURRENT_REQUESTS):
+        """
+        Initialize a `LedgerReadScheduler` instance.
+
+        Args:
+            max_concurrent: The maximum number of ledger requests in flight
+
+        """
+        self.max_concurrent = max_concurrent or DEFAULT_MAX_CONCURRENT_REQUESTS
+        self._pending = {}
+        self._semaphore: asyncio.Semaphore = None
+
+    @property
+    def pending(self) -> int:
+        """Accessor for the number of distinct reads in progress."""
+        return len(self._pending)
+
+    async def run(self, key: Hashable, read: Callable[[], Awaitable]) -> Any:
+        """
+        Perform a read, or wait for an identical read already in progress.
+
+        The read runs in its own task, so that a caller being cancelled does not
+        fail the other callers waiting on it.
+
+        Args:
+            key: Identifies the artefact being read
+            read: Performs the read
+
+        Returns:
+            The result of the read
+
+        """
+        task = self._pending.get(key)
+        if not task:
+            task = asyncio.ensure_future(read())
+            self._pending[key] = task
+            task.add_done_callback(lambda _: self._pending.pop(key, None))
+        return await asyncio.shield(task)
+
+    def limit(self) -> asyncio.Semaphore:
+        """Get the semaphore to hold while a request is sent to the ledger."""
+        if not self._semaphore:
+            self._semaphore = asyncio.Semaphore(self.max_concurrent)
+        return self._semaphore
+
+    def __repr__(self) -> str:
+        """Human readable representation of `LedgerReadScheduler`."""
+        return "<{}(max_concurrent={}, pending={})>".format(
+            self.__class__.__name__, self.max_concurrent, self.pending
+        )
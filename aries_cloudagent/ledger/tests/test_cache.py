@@ -0,0 +1,184 @@
+from asyncio import Event, sleep, wait_for
+
+import pytest
+
+from ...cache.in_memory import InMemoryCache
+from ..cache import (
+    CRED_DEF,
+    DEFAULT_NEGATIVE_TTL,
+    DID_VERKEY,
+    SCHEMA,
+    LedgerCache,
+    LedgerCachePolicy,
+)
+from ..persistent_cache import PersistentLedgerCache
+
+
+class Fetcher:
+    def __init__(self, ledger_cache: LedgerCache, kind: str, value="value"):
+        self.ledger_cache = ledger_cache
+        self.kind = kind
+        self.value = value
+        self.calls = 0
+        self.done = Event()
+
+    async def __call__(self, ident: str = "id"):
+        self.calls += 1
+        await sleep(0)
+        if self.value is not None:
+            await self.ledger_cache.store(self.kind, ident, self.value)
+        self.done.set()
+        return self.value
+
+
+class TestLedgerCache:
+    def test_policies(self):
+        ledger_cache = LedgerCache(
+            InMemoryCache(),
+            {SCHEMA: {"ttl": 60}, "other": LedgerCachePolicy(5, 5)},
+            cache_duration=100,
+        )
+        assert ledger_cache.policy(SCHEMA) == LedgerCachePolicy(60)
+        assert ledger_cache.policy(CRED_DEF) == LedgerCachePolicy(
+            negative_ttl=DEFAULT_NEGATIVE_TTL
+        )
+        assert ledger_cache.policy(DID_VERKEY) == LedgerCachePolicy(
+            100, 100, DEFAULT_NEGATIVE_TTL
+        )
+        assert ledger_cache.policy("other") == LedgerCachePolicy(5, 5)
+        assert ledger_cache.policy("unknown") == LedgerCachePolicy(100)
+        assert repr(ledger_cache.policy("other")) == (
+            "<LedgerCachePolicy(ttl=5, stale_ttl=5, negative_ttl=0)>"
+        )
+
+    @pytest.mark.asyncio
+    async def test_immutable(self):
+        cache = InMemoryCache()
+        ledger_cache = LedgerCache(cache)
+        fetch = Fetcher(ledger_cache, SCHEMA)
+        assert await ledger_cache.get(SCHEMA, "id", fetch) == "value"
+        assert await ledger_cache.get(SCHEMA, "id", fetch) == "value"
+        assert fetch.calls == 1
+        assert cache._cache["schema::id"]["expires"] is None
+
+    @pytest.mark.asyncio
+    async def test_negative(self):
+        ledger_cache = LedgerCache(
+            InMemoryCache(), {SCHEMA: LedgerCachePolicy(negative_ttl=0.05)}
+        )
+        fetch = Fetcher(ledger_cache, SCHEMA, None)
+        assert await ledger_cache.get(SCHEMA, "id", fetch) is None
+        assert await ledger_cache.get(SCHEMA, "id", fetch) is None
+        assert fetch.calls == 1
+
+        await sleep(0.06)
+        fetch.value = "value"
+        assert await ledger_cache.get(SCHEMA, "id", fetch) == "value"
+        assert fetch.calls == 2
+
+    @pytest.mark.asyncio
+    async def test_negative_disabled(self):
+        ledger_cache = LedgerCache(InMemoryCache(), {SCHEMA: LedgerCachePolicy()})
+        fetch = Fetcher(ledger_cache, SCHEMA, None)
+        assert await ledger_cache.get(SCHEMA, "id", fetch) is None
+        assert await ledger_cache.get(SCHEMA, "id", fetch) is None
+        assert fetch.calls == 2
+
+    @pytest.mark.asyncio
+    async def test_stale_while_revalidate(self):
+        ledger_cache = LedgerCache(
+            InMemoryCache(), {DID_VERKEY: LedgerCachePolicy(0.05, 10)}
+        )
+        fetch = Fetcher(ledger_cache, DID_VERKEY, "old")
+        assert await ledger_cache.get(DID_VERKEY, "id", fetch) == "old"
+
+        await sleep(0.06)
+        fetch.value = "new"
+        fetch.done.clear()
+        refresh = Fetcher(ledger_cache, DID_VERKEY, "new")
+        results = [
+            await ledger_cache.get(DID_VERKEY, "id", fetch, refresh) for _ in range(3)
+        ]
+        assert results == ["old"] * 3  # served without waiting
+        await wait_for(refresh.done.wait(), 1)
+        assert refresh.calls == 1
+        assert fetch.calls == 1
+        assert await ledger_cache.get(DID_VERKEY, "id", fetch, refresh) == "new"
+
+    @pytest.mark.asyncio
+    async def test_refresh_deduplicated(self):
+        ledger_cache = LedgerCache(
+            InMemoryCache(), {DID_VERKEY: LedgerCachePolicy(0.01, 10)}
+        )
+        await ledger_cache.store(DID_VERKEY, "id", "old")
+        await sleep(0.02)
+
+        refresh = Fetcher(ledger_cache, DID_VERKEY, "new")
+        await ledger_cache.get(DID_VERKEY, "id", refresh)
+        await wait_for(refresh.done.wait(), 1)
+        await sleep(0.02)  # stale again, but refreshed recently
+
+        await ledger_cache.get(DID_VERKEY, "id", refresh)
+        await sleep(0.01)
+        assert refresh.calls == 1
+
+    @pytest.mark.asyncio
+    async def test_refresh_error(self):
+        ledger_cache = LedgerCache(
+            InMemoryCache(), {DID_VERKEY: LedgerCachePolicy(0.01, 10)}
+        )
+        await ledger_cache.store(DID_VERKEY, "id", "old")
+        await sleep(0.02)
+
+        async def refresh():
+            raise ValueError("ledger unavailable")
+
+        assert await ledger_cache.get(DID_VERKEY, "id", refresh) == "old"
+        await sleep(0.01)
+        assert not ledger_cache._refreshing
+        assert await ledger_cache.get(DID_VERKEY, "id", refresh) == "old"
+
+    @pytest.mark.asyncio
+    async def test_get_many(self):
+        ledger_cache = LedgerCache(InMemoryCache())
+        await ledger_cache.store(SCHEMA, ["a", "1"], "value")
+        await ledger_cache.store(SCHEMA, "b", None)
+        refresh = Fetcher(ledger_cache, SCHEMA)
+        found, missing = await ledger_cache.get_many(SCHEMA, ["a", "b", "c"], refresh)
+        assert found == {"a": "value", "b": None}
+        assert missing == ["c"]
+        assert refresh.calls == 0
+
+        await ledger_cache.clear(SCHEMA, "a")
+        found, missing = await ledger_cache.get_many(SCHEMA, ["a", "1"], refresh)
+        assert found == {"1": "value"}
+        assert missing == ["a"]
+
+    @pytest.mark.asyncio
+    async def test_persistent(self, tmp_path):
+        persistent = PersistentLedgerCache(str(tmp_path / "cache.db"))
+        ledger_cache = LedgerCache(InMemoryCache(), persistent=persistent)
+        await ledger_cache.store(SCHEMA, ["id", "1"], "value")
+        await ledger_cache.store(DID_VERKEY, "did", "verkey")
+        await ledger_cache.store(CRED_DEF, "missing", None)
+        assert await persistent.get_many(DID_VERKEY, ["did"]) == {}
+        assert await persistent.get_many(CRED_DEF, ["missing"]) == {}
+
+        # a fresh in-memory cache is warmed from disk
+        ledger_cache = LedgerCache(InMemoryCache(), persistent=persistent)
+        fetch = Fetcher(ledger_cache, SCHEMA, "fetched")
+        assert await ledger_cache.get(SCHEMA, "id", fetch) == "value"
+        found, missing = await ledger_cache.get_many(SCHEMA, ["1", "2"], fetch)
+        assert found == {"1": "value"}
+        assert missing == ["2"]
+        assert fetch.calls == 0
+        assert await ledger_cache.cache.get("schema::1") == {
+            "value": "value",
+            "stale_at": None,
+        }
+
+        await ledger_cache.clear(SCHEMA, "id")
+        assert await persistent.get_many(SCHEMA, ["id"]) == {}
+        assert await ledger_cache.get(SCHEMA, "id", fetch) == "fetched"
+        assert fetch.calls == 1
+        await persistent.close()
@@ -20,6 +20,7 @@ from ...ledger.indy import (
     LedgerConfigError,
     LedgerError,
     LedgerTransactionError,
+    node_aliases,
     Role,
     TAA_ACCEPTED_RECORD_TYPE,
 )
@@ -179,6 +180,55 @@ class TestIndySdkLedger(AsyncTestCase):
         mock_close_pool.assert_called_once()
         assert ledger.pool_handle == None
 
+    @async_mock.patch("indy.pool.set_protocol_version")
+    @async_mock.patch("indy.pool.open_pool_ledger")
+    @async_mock.patch("indy.pool.close_pool_ledger")
+    @async_mock.patch("indy.ledger.build_get_txn_request")
+    @async_mock.patch("indy.ledger.submit_action")
+    async def test_keep_warm(
+        self,
+        mock_submit_action,
+        mock_build_get_txn_req,
+        mock_close_pool,
+        mock_open_ledger,
+        mock_set_proto,
+    ):
+        replies = {
+            "Node1": json.dumps({"Node1": json.dumps({"op": "REPLY"})}),
+            "Node2": json.dumps({"Node2": "timeout"}),
+        }
+        mock_submit_action.side_effect = lambda handle, req, nodes, timeout: replies[
+            json.loads(nodes)[0]
+        ]
+        pool = IndySdkLedgerPool("name", checked=True, keep_warm=60)
+        pool.nodes = ["Node1", "Node2"]
+        ledger = IndySdkLedger(pool, async_mock.MagicMock())
+
+        async with ledger:
+            pass
+        await asyncio.sleep(0.01)
+
+        mock_close_pool.assert_not_called()
+        assert ledger.pool_handle
+        stats = ledger.stats
+        assert stats["pool"] == "name"
+        assert stats["status"] == "degraded"
+        assert stats["nodes"]["Node1"]["errors"] == 0
+        assert stats["nodes"]["Node2"]["errors"] == 1
+        assert "Node2" in stats["last_error"]
+
+        await pool.shutdown()
+        mock_close_pool.assert_called_once()
+        assert not pool.opened
+        assert not pool.keep_warm_task
+
+    def test_node_aliases(self):
+        genesis = "\n".join(
+            json.dumps({"txn": {"data": {"data": {"alias": alias}}}})
+            for alias in ("Node1", "Node2", "Node1")
+        )
+        assert node_aliases(genesis + "\nnot json\n") == ["Node1", "Node2"]
+
     @async_mock.patch("indy.pool.set_protocol_version")
     @async_mock.patch("indy.pool.open_pool_ledger")
     @async_mock.patch("indy.pool.close_pool_ledger")
@@ -1649,6 +1699,48 @@ class TestIndySdkLedger(AsyncTestCase):
             )
             assert response == json.loads(mock_parse_get_cred_def_resp.return_value[1])
 
+    @async_mock.patch("aries_cloudagent.ledger.indy.IndySdkLedgerPool.context_open")
+    @async_mock.patch("aries_cloudagent.ledger.indy.IndySdkLedgerPool.context_close")
+    @async_mock.patch("aries_cloudagent.ledger.indy.IndySdkLedger._submit")
+    @async_mock.patch("indy.ledger.build_get_cred_def_request")
+    @async_mock.patch("indy.ledger.parse_get_cred_def_response")
+    async def test_get_credential_definitions(
+        self,
+        mock_parse_get_cred_def_resp,
+        mock_build_get_cred_def_req,
+        mock_submit,
+        mock_close,
+        mock_open,
+    ):
+        mock_wallet = async_mock.MagicMock()
+        mock_wallet.get_public_did = async_mock.CoroutineMock()
+
+        mock_parse_get_cred_def_resp.return_value = (
+            None,
+            json.dumps({"result": {"seqNo": 1}}),
+        )
+
+        cache = InMemoryCache()
+        await cache.set("credential_definition::cached_id", {"value": {"cached": True}})
+        ledger = IndySdkLedger(
+            IndySdkLedgerPool("name", checked=True, cache=cache), mock_wallet
+        )
+
+        async with ledger:
+            response = await ledger.get_credential_definitions(
+                ["cached_id", "cred_def_id", "cached_id"]
+            )
+
+            assert response == {
+                "cached_id": {"cached": True},
+                "cred_def_id": {"result": {"seqNo": 1}},
+            }
+            mock_build_get_cred_def_req.assert_called_once_with(
+                mock_wallet.get_public_did.return_value.did, "cred_def_id"
+            )
+            cached = await cache.get("credential_definition::cred_def_id")
+            assert cached["value"] == {"result": {"seqNo": 1}}
+
     @async_mock.patch("aries_cloudagent.ledger.indy.IndySdkLedgerPool.context_open")
     @async_mock.patch("aries_cloudagent.ledger.indy.IndySdkLedgerPool.context_close")
     @async_mock.patch("aries_cloudagent.ledger.indy.IndySdkLedger._submit")
@@ -1998,7 +2090,7 @@ class TestIndySdkLedger(AsyncTestCase):
 
         async with ledger:
             with async_mock.patch.object(
-                ledger, "get_all_endpoints_for_did", async_mock.CoroutineMock()
+                ledger, "fetch_all_endpoints_for_did", async_mock.CoroutineMock()
             ) as mock_get_all:
                 mock_get_all.return_value = None
                 mock_wallet.get_public_did = async_mock.CoroutineMock(
@@ -2573,6 +2665,41 @@ class TestIndySdkLedger(AsyncTestCase):
             (result, _) = await ledger.get_revoc_reg_delta("rr-id")
             assert result == {"hello": "world"}
 
+    @async_mock.patch("aries_cloudagent.ledger.indy.IndySdkLedgerPool.context_open")
+    @async_mock.patch("aries_cloudagent.ledger.indy.IndySdkLedgerPool.context_close")
+    async def test_get_revoc_reg_delta_cached(self, mock_close, mock_open):
+        ledger = IndySdkLedger(
+            IndySdkLedgerPool(
+                "name",
+                checked=True,
+                read_only=True,
+                cache=InMemoryCache(),
+                rev_reg_delta_bucket=100,
+            ),
+            async_mock.MagicMock(),
+        )
+
+        with async_mock.patch.object(
+            ledger, "fetch_revoc_reg_delta", async_mock.CoroutineMock()
+        ) as mock_fetch:
+            mock_fetch.side_effect = [
+                ({"ver": "1.0", "value": {"accum": "1", "revoked": [1]}}, 950),
+                ({"ver": "1.0", "value": {"accum": "2", "revoked": [2]}}, 1500),
+            ]
+            first = await ledger.get_revoc_reg_delta("rr-id", 0, 1050)
+            assert first == await ledger.get_revoc_reg_delta("rr-id", 0, 1099)
+            mock_fetch.assert_awaited_once_with("rr-id", 0, 1000)
+
+            # advances from the last entry seen on the ledger, not from the
+            # requested time, so entries timestamped in between are not missed
+            (delta, timestamp) = await ledger.get_revoc_reg_delta("rr-id", 0, 2000)
+            mock_fetch.assert_awaited_with("rr-id", 950, 2000)
+            assert delta == {
+                "ver": "1.0",
+                "value": {"accum": "2", "issued": [], "revoked": [1, 2]},
+            }
+            assert timestamp == 1500
+
     @async_mock.patch("aries_cloudagent.ledger.indy.IndySdkLedgerPool.context_open")
     @async_mock.patch("aries_cloudagent.ledger.indy.IndySdkLedgerPool.context_close")
     @async_mock.patch("aries_cloudagent.ledger.indy.IndySdkLedger._submit")
@@ -0,0 +1,50 @@
+import json
+
+from ..monitor import (
+    READ,
+    STATUS_DEGRADED,
+    STATUS_DOWN,
+    STATUS_OK,
+    WRITE,
+    LedgerPoolMonitor,
+    request_kind,
+)
+
+
+class TestLedgerPoolMonitor:
+    def test_request_kind(self):
+        assert request_kind(json.dumps({"operation": {"type": "105"}})) == READ
+        assert request_kind(json.dumps({"operation": {"type": "101"}})) == WRITE
+        assert request_kind("not json") == WRITE
+        assert request_kind(json.dumps({"operation": None})) == WRITE
+
+    def test_observe(self):
+        monitor = LedgerPoolMonitor()
+        monitor.observe(READ, 0.01)
+        monitor.observe(READ, 0.03, True)
+        monitor.observe(WRITE, 0.5)
+        monitor.observe_node("Node1", 0.02)
+        result = monitor.extract()
+        assert result["status"] is None
+        assert result["read"]["count"] == 2
+        assert result["read"]["errors"] == 1
+        assert result["write"]["max"] == 0.5
+        assert result["nodes"]["Node1"]["count"] == 1
+
+        monitor.reset()
+        assert monitor.extract() == {
+            "status": None,
+            "last_check": None,
+            "last_error": None,
+        }
+
+    def test_check_complete(self):
+        monitor = LedgerPoolMonitor()
+        monitor.check_complete(4, 4)
+        assert monitor.status == STATUS_OK
+        assert monitor.last_check
+        monitor.check_complete(3, 4, "Node4: timeout")
+        assert monitor.status == STATUS_DEGRADED
+        assert monitor.last_error == "Node4: timeout"
+        monitor.check_complete(0, 4, "Node1: timeout")
+        assert monitor.status == STATUS_DOWN
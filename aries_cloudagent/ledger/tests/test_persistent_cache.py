@@ -0,0 +1,55 @@
+import pytest
+
+from ..persistent_cache import PersistentLedgerCache
+
+
+@pytest.fixture
+def db_path(tmp_path):
+    yield str(tmp_path / "ledger" / "cache.db")
+
+
+class TestPersistentLedgerCache:
+    @pytest.mark.asyncio
+    async def test_put_get(self, db_path):
+        store = PersistentLedgerCache(db_path)
+        await store.put("schema", ["id", "1"], {"name": "schema"})
+        await store.put("schema", ["other"], {"name": "schema"})
+        assert await store.get_many("schema", ["id", "1", "other", "none"]) == {
+            "id": {"name": "schema"},
+            "1": {"name": "schema"},
+            "other": {"name": "schema"},
+        }
+        assert await store.get_many("credential_definition", ["id"]) == {}
+        assert await store.get_many("schema", []) == {}
+        rows = store._conn.execute("SELECT COUNT(*) FROM artefacts").fetchone()
+        assert rows[0] == 1
+        await store.close()
+
+        reopened = PersistentLedgerCache(db_path)
+        assert await reopened.get_many("schema", ["1"]) == {"1": {"name": "schema"}}
+        await reopened.close()
+
+    @pytest.mark.asyncio
+    async def test_clear(self, db_path):
+        store = PersistentLedgerCache(db_path)
+        await store.put("schema", ["id", "1"], "value")
+        await store.clear("schema", "id")
+        assert await store.get_many("schema", ["id", "1"]) == {"1": "value"}
+        await store.close()
+
+    @pytest.mark.asyncio
+    async def test_many_idents(self, db_path):
+        store = PersistentLedgerCache(db_path)
+        idents = [str(i) for i in range(1200)]
+        await store.put("schema", idents, "value")
+        assert len(await store.get_many("schema", idents)) == 1200
+        await store.close()
+
+    @pytest.mark.asyncio
+    async def test_unavailable(self, tmp_path):
+        blocker = tmp_path / "file"
+        blocker.write_text("")
+        store = PersistentLedgerCache(str(blocker / "cache.db"))
+        await store.put("schema", ["id"], "value")
+        assert await store.get_many("schema", ["id"]) == {}
+        assert repr(store).startswith("<PersistentLedgerCache(db_path=")
@@ -0,0 +1,82 @@
+from asyncio import CancelledError, ensure_future, gather, sleep, wait_for
+
+import pytest
+
+from ..scheduler import DEFAULT_MAX_CONCURRENT_REQUESTS, LedgerReadScheduler
+
+
+class TestLedgerReadScheduler:
+    @pytest.mark.asyncio
+    async def test_coalesce(self):
+        scheduler = LedgerReadScheduler()
+        calls = []
+
+        async def read(ident):
+            calls.append(ident)
+            await sleep(0.01)
+            return ident.upper()
+
+        results = await gather(
+            scheduler.run("a", lambda: read("a")),
+            scheduler.run("a", lambda: read("a")),
+            scheduler.run("b", lambda: read("b")),
+        )
+        assert results == ["A", "A", "B"]
+        assert calls == ["a", "b"]
+        assert scheduler.pending == 0
+
+        # completed reads are not reused
+        assert await scheduler.run("a", lambda: read("a")) == "A"
+        assert calls == ["a", "b", "a"]
+
+    @pytest.mark.asyncio
+    async def test_error(self):
+        scheduler = LedgerReadScheduler()
+
+        async def read():
+            await sleep(0.01)
+            raise ValueError("ledger unavailable")
+
+        results = await gather(
+            scheduler.run("a", read), scheduler.run("a", read), return_exceptions=True
+        )
+        assert all(isinstance(result, ValueError) for result in results)
+        assert scheduler.pending == 0
+
+    @pytest.mark.asyncio
+    async def test_cancel_waiter(self):
+        scheduler = LedgerReadScheduler()
+
+        async def read():
+            await sleep(0.02)
+            return "value"
+
+        first = ensure_future(scheduler.run("a", read))
+        second = ensure_future(scheduler.run("a", read))
+        await sleep(0.005)
+        first.cancel()
+        with pytest.raises(CancelledError):
+            await first
+        assert await wait_for(second, 1) == "value"
+
+    @pytest.mark.asyncio
+    async def test_limit(self):
+        scheduler = LedgerReadScheduler(2)
+        assert repr(scheduler) == "<LedgerReadScheduler(max_concurrent=2, pending=0)>"
+        active = []
+        peak = []
+
+        async def request():
+            async with scheduler.limit():
+                active.append(1)
+                peak.append(len(active))
+                await sleep(0.01)
+                active.pop()
+
+        await gather(*(request() for _ in range(5)))
+        assert max(peak) == 2
+
+    def test_default_limit(self):
+        assert (
+            LedgerReadScheduler(None).max_concurrent == DEFAULT_MAX_CONCURRENT_REQUESTS
+        )
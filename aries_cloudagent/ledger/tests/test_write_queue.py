@@ -0,0 +1,141 @@
+from asyncio import sleep
+from time import perf_counter
+
+import pytest
+
+from ...core.in_memory import InMemoryProfile
+from ...indy.util import merge_rev_reg_deltas
+from ...messaging.responder import BaseResponder, MockResponder
+
+from ..error import LedgerRejectedError, LedgerTransactionError
+from ..write_queue import (
+    STATE_COMPLETE,
+    STATE_FAILED,
+    LedgerWriteQueue,
+    is_transient,
+)
+
+
+@pytest.fixture()
+def responder():
+    yield MockResponder()
+
+
+@pytest.fixture()
+def profile(responder):
+    profile = InMemoryProfile.test_profile()
+    profile.context.injector.bind_instance(BaseResponder, responder)
+    yield profile
+
+
+class TestLedgerWriteQueue:
+    def test_is_transient(self):
+        assert is_transient(LedgerTransactionError("timeout"))
+        assert not is_transient(LedgerRejectedError("rejected"))
+        assert not is_transient(ValueError())
+
+    @pytest.mark.asyncio
+    async def test_submit(self, profile, responder):
+        queue = LedgerWriteQueue(profile)
+        sent = []
+
+        async def send(session, payload):
+            sent.append(payload)
+
+        first = queue.enqueue("schema", "a", send, 1)
+        second = queue.enqueue("schema", "b", send, 2)
+        assert queue.pending == 2
+        await second.done
+
+        assert sent == [1, 2]
+        assert first.state == second.state == STATE_COMPLETE
+        assert [topic for topic, _ in responder.webhooks] == [
+            LedgerWriteQueue.WEBHOOK_TOPIC
+        ] * 2
+        assert responder.webhooks[0][1]["write_id"] == first.write_id
+
+    @pytest.mark.asyncio
+    async def test_merge(self, profile):
+        queue = LedgerWriteQueue(profile)
+        sent = []
+
+        async def send(session, payload):
+            await sleep(0.01)
+            sent.append(payload)
+
+        # the first write is sent as soon as the queue runs, so cannot be merged
+        queue.enqueue("entry", "rr", send, {"value": {"accum": "1", "revoked": [1]}})
+        await sleep(0)
+        second = queue.enqueue(
+            "entry",
+            "rr",
+            send,
+            {"value": {"prevAccum": "1", "accum": "2", "revoked": [2]}},
+            merge=merge_rev_reg_deltas,
+        )
+        third = queue.enqueue(
+            "entry",
+            "rr",
+            send,
+            {"value": {"prevAccum": "2", "accum": "3", "revoked": [3]}},
+            merge=merge_rev_reg_deltas,
+        )
+        assert third is second
+        assert second.merged == 2
+        await second.done
+
+        assert sent[1] == {
+            "value": {"prevAccum": "1", "accum": "3", "issued": [], "revoked": [2, 3]}
+        }
+        assert len(sent) == 2
+
+    @pytest.mark.asyncio
+    async def test_retry(self, profile, responder):
+        queue = LedgerWriteQueue(profile, max_retries=2, retry_backoff=0.001)
+        attempts = []
+
+        async def send(session, payload):
+            attempts.append(payload)
+            if len(attempts) < 3:
+                raise LedgerTransactionError("timeout")
+
+        write = queue.enqueue("schema", "a", send, 1)
+        await write.done
+        assert write.state == STATE_COMPLETE
+        assert write.attempts == 3
+
+        async def reject(session, payload):
+            raise LedgerRejectedError("invalid")
+
+        write = queue.enqueue("schema", "b", reject, 2)
+        await write.done
+        assert write.state == STATE_FAILED
+        assert write.attempts == 1
+        assert responder.webhooks[-1][1]["error"] == "invalid"
+
+    @pytest.mark.asyncio
+    async def test_rate(self, profile):
+        queue = LedgerWriteQueue(profile, rate=50)
+
+        async def send(session, payload):
+            pass
+
+        start = perf_counter()
+        writes = [queue.enqueue("schema", str(n), send, n) for n in range(3)]
+        await writes[-1].done
+        assert perf_counter() - start >= 0.04
+
+    @pytest.mark.asyncio
+    async def test_close(self, profile):
+        queue = LedgerWriteQueue(profile)
+
+        async def send(session, payload):
+            await sleep(1)
+
+        writes = [queue.enqueue("schema", str(n), send, n) for n in range(2)]
+        await sleep(0)
+        await queue.close()
+        assert queue.pending == 0
+        for write in writes:
+            assert write.done.done()
+            assert write.state == STATE_FAILED
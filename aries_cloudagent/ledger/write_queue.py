@@ -0,0 +1,260 @@
+"""Queued, rate-limited submission of ledger writes."""
+
+import asyncio
+import logging
+import time
+
+from collections import deque
+from typing import Any, Awaitable, Callable
+from uuid import uuid4
+
+from ..core.profile import Profile, ProfileSession
+from ..messaging.responder import BaseResponder
+
+from .error import (
+    BadLedgerRequestError,
+    LedgerConfigError,
+    LedgerError,
+    LedgerRejectedError,
+)
+
+LOGGER = logging.getLogger(__name__)
+
+DEFAULT_MAX_RETRIES = 5
+DEFAULT_RETRY_BACKOFF = 1.0
+
+STATE_QUEUED = "queued"
+STATE_SENDING = "sending"
+STATE_COMPLETE = "complete"
+STATE_FAILED = "failed"
+
+
+def is_transient(err: Exception) -> bool:
+    """Determine whether a failed ledger write may succeed if it is retried."""
+    return isinstance(err, LedgerError) and not isinstance(
+        err, (BadLedgerRequestError, LedgerConfigError, LedgerRejectedError)
+    )
+
+
+class LedgerWrite:
+    """A ledger write awaiting submission."""
+
+    def __init__(
+        self,
+        kind: str,
+        ident: str,
+        send: Callable[[ProfileSession, Any], Awaitable],
+        payload: Any = None,
+        merge: Callable[[Any, Any], Any] = None,
+    ):
+        """
+        Initialize a `LedgerWrite` instance.
+
+        Args:
+            kind: The kind of artefact written
+            ident: The identifier of the artefact written
+            send: Submits the payload to the ledger within a profile session
+            payload: The content to write
+            merge: Combines the payload of a later write into this one
+
+        """
+        self.write_id = str(uuid4())
+        self.kind = kind
+        self.ident = ident
+        self.send = send
+        self.payload = payload
+        self.merge = merge
+        self.merged = 1
+        self.attempts = 0
+        self.state = STATE_QUEUED
+        self.error: str = None
+        self.created = time.time()
+        self.done = asyncio.get_event_loop().create_future()
+
+    def serialize(self) -> dict:
+        """Summarize the write for a webhook."""
+        return {
+            "write_id": self.write_id,
+            "kind": self.kind,
+            "ident": self.ident,
+            "state": self.state,
+            "attempts": self.attempts,
+            "merged": self.merged,
+            "error": self.error,
+            "created": self.created,
+        }
+
+    def __repr__(self) -> str:
+        """Human readable representation of `LedgerWrite`."""
+        return "<{}(kind={}, ident={}, state={})>".format(
+            self.__class__.__name__, self.kind, self.ident, self.state
+        )
+
+
+class LedgerWriteQueue:
+    """
+    Submit ledger writes in the background, one at a time and at a bounded rate.
+
+    Writes are sent in the order they are queued. Failures the ledger may recover
+    from are retried with exponential backoff, and the outcome of each write is
+    reported on the `ledger_write` webhook topic. A write queued with a `merge`
+    function is combined with an unsent write of the same kind and identifier,
+    so that both are published in a single transaction.
+    """
+
+    WEBHOOK_TOPIC = "ledger_write"
+
+    def __init__(
+        self,
+        profile: Profile,
+        *,
+        rate: float = 0,
+        max_retries: int = DEFAULT_MAX_RETRIES,
+        retry_backoff: float = DEFAULT_RETRY_BACKOFF,
+    ):
+        """
+        Initialize a `LedgerWriteQueue` instance.
+
+        Args:
+            profile: The profile in which to open sessions for each write
+            rate: The maximum number of transactions to send per second,
+                or 0 for no limit
+            max_retries: The number of times to retry a transient failure
+            retry_backoff: The delay in seconds before the first retry, doubled
+                for each subsequent retry
+
+        """
+        self.profile = profile
+        self.rate = rate or 0
+        self.max_retries = DEFAULT_MAX_RETRIES if max_retries is None else max_retries
+        self.retry_backoff = retry_backoff
+        self._queue = deque()
+        self._task: asyncio.Future = None
+        self._sending: LedgerWrite = None
+        self._last_sent: float = None
+
+    @property
+    def pending(self) -> int:
+        """Accessor for the number of writes waiting to be sent."""
+        return len(self._queue)
+
+    def enqueue(
+        self,
+        kind: str,
+        ident: str,
+        send: Callable[[ProfileSession, Any], Awaitable],
+        payload: Any = None,
+        merge: Callable[[Any, Any], Any] = None,
+    ) -> LedgerWrite:
+        """
+        Queue a write for submission.
+
+        Args:
+            kind: The kind of artefact written
+            ident: The identifier of the artefact written
+            send: Submits the payload to the ledger within a profile session
+            payload: The content to write
+            merge: Combines the payload of a later write into an earlier one
+
+        Returns:
+            The queued write, which may be an earlier write this one was merged into
+
+        """
+        if merge:
+            for write in self._queue:
+                if write.merge and write.kind == kind and write.ident == ident:
+                    write.payload = write.merge(write.payload, payload)
+                    write.merged += 1
+                    return write
+
+        write = LedgerWrite(kind, ident, send, payload, merge)
+        self._queue.append(write)
+        if not self._task or self._task.done():
+            self._task = asyncio.ensure_future(self._run())
+        return write
+
+    async def _run(self):
+        """Send queued writes until the queue is empty."""
+        while self._queue:
+            self._sending = self._queue.popleft()
+            await self._submit(self._sending)
+            self._sending = None
+
+    async def _throttle(self):
+        """Wait until another transaction may be sent within the configured rate."""
+        if self.rate and self._last_sent is not None:
+            delay = self._last_sent + 1 / self.rate - time.perf_counter()
+            if delay > 0:
+                await asyncio.sleep(delay)
+        self._last_sent = time.perf_counter()
+
+    async def _submit(self, write: LedgerWrite):
+        """Send a write, retrying transient failures, and report its outcome."""
+        write.state = STATE_SENDING
+        while True:
+            await self._throttle()
+            write.attempts += 1
+            try:
+                async with self.profile.session() as session:
+                    await write.send(session, write.payload)
+            except asyncio.CancelledError:
+                raise
+            except Exception as err:
+                if is_transient(err) and write.attempts <= self.max_retries:
+                    delay = self.retry_backoff * 2 ** (write.attempts - 1)
+                    LOGGER.warning(
+                        "Ledger write of %s %s failed, retrying in %.1fs: %s",
+                        write.kind,
+                        write.ident,
+                        delay,
+                        err,
+                    )
+                    await asyncio.sleep(delay)
+                    continue
+                if isinstance(err, LedgerError):
+                    LOGGER.error(
+                        "Ledger write of %s %s failed: %s", write.kind, write.ident, err
+                    )
+                else:
+                    LOGGER.exception(
+                        "Error sending ledger write of %s %s", write.kind, write.ident
+                    )
+                write.state = STATE_FAILED
+                write.error = str(err)
+            else:
+                write.state = STATE_COMPLETE
+            break
+
+        await self._notify(write)
+        write.done.set_result(write)
+
+    async def _notify(self, write: LedgerWrite):
+        """Send a webhook reporting the outcome of a write."""
+        responder = self.profile.inject(BaseResponder, required=False)
+        if responder:
+            try:
+                await responder.send_webhook(self.WEBHOOK_TOPIC, write.serialize())
+            except Exception:
+                LOGGER.exception("Error sending ledger write webhook")
+
+    async def close(self):
+        """Stop sending writes, failing any which remain queued."""
+        if self._task:
+            self._task.cancel()
+            self._task = None
+        if self._sending and not self._sending.done.done():
+            self._queue.appendleft(self._sending)
+        self._sending = None
+        if self._queue:
+            LOGGER.warning("Discarding %d queued ledger writes", len(self._queue))
+        while self._queue:
+            write = self._queue.popleft()
+            write.state = STATE_FAILED
+            write.error = "Ledger write queue closed"
+            write.done.set_result(write)
+
+    def __repr__(self) -> str:
+        """Human readable representation of `LedgerWriteQueue`."""
+        return "<{}(rate={}, pending={})>".format(
+            self.__class__.__name__, self.rate, self.pending
+        )
@@ -5,7 +5,7 @@ import sys
 import uuid
 
 from datetime import datetime
-from typing import Any, Mapping, Sequence, Union
+from typing import Any, AsyncIterator, Mapping, Sequence, Tuple, Union
 
 from marshmallow import fields
 
@@ -13,6 +13,7 @@ from ...cache.base import BaseCache
 from ...core.profile import ProfileSession
 from ...storage.base import BaseStorage, StorageDuplicateError, StorageNotFoundError
 from ...storage.record import StorageRecord
+from ...utils.stats import Collector, Timer
 
 from .base import BaseModel, BaseModelSchema
 from ..responder import BaseResponder
@@ -59,6 +60,7 @@ class BaseRecord(BaseModel):
     class Meta:
         """BaseRecord metadata."""
 
+    CACHE_ENABLED = False
     DEFAULT_CACHE_TTL = 60
     RECORD_ID_NAME = "id"
     RECORD_TYPE = None
@@ -66,6 +68,10 @@ class BaseRecord(BaseModel):
     LOG_STATE_FLAG = None
     TAG_NAMES = {"state"}
 
+    # the cached storage representation is kept out of the instance __dict__
+    # so that it does not show in the record repr
+    __slots__ = ("_storage_values",)
+
     def __init__(
         self,
         id: str = None,
@@ -105,14 +111,39 @@ class BaseRecord(BaseModel):
     @classmethod
     def get_tag_map(cls) -> Mapping[str, str]:
         """Accessor for the set of defined tags."""
-        return {tag.lstrip("~"): tag for tag in cls.TAG_NAMES or ()}
+        cached = cls.__dict__.get("_tag_map")
+        if not cached or cached[0] is not cls.TAG_NAMES:
+            cached = (
+                cls.TAG_NAMES,
+                {tag.lstrip("~"): tag for tag in cls.TAG_NAMES or ()},
+            )
+            cls._tag_map = cached
+        return cached[1]
+
+    def __setattr__(self, name: str, value: Any):
+        """Set a record field, discarding the cached storage representation."""
+        super().__setattr__(name, value)
+        if name != "_storage_values":
+            super().__setattr__("_storage_values", None)
+
+    def _get_storage_values(self) -> Tuple[dict, dict]:
+        """Compute the record tags and value, cached until a field is assigned.
+
+        Changes made in place to a field, such as updating a nested dict, are
+        not detected. Saving the record always assigns `updated_at`, so the
+        stored representation is current.
+        """
+        values = getattr(self, "_storage_values", None)
+        if values is None:
+            tags = self.record_tags
+            values = self._storage_values = (tags, self._value_with_tags(tags))
+        return values
 
     @property
     def storage_record(self) -> StorageRecord:
         """Accessor for a `StorageRecord` representing this record."""
-        return StorageRecord(
-            self.RECORD_TYPE, json.dumps(self.value), self.tags, self._id
-        )
+        tags, value = self._get_storage_values()
+        return StorageRecord(self.RECORD_TYPE, json.dumps(value), dict(tags), self._id)
 
     @property
     def record_value(self) -> dict:
@@ -122,7 +153,11 @@ class BaseRecord(BaseModel):
     @property
     def value(self) -> dict:
         """Accessor for the JSON record value generated for this record."""
-        ret = self.strip_tag_prefix(self.tags)
+        return dict(self._get_storage_values()[1])
+
+    def _value_with_tags(self, tags: dict) -> dict:
+        """Build the JSON record value from precomputed record tags."""
+        ret = self.strip_tag_prefix(tags)
         ret.update({"created_at": self.created_at, "updated_at": self.updated_at})
         ret.update(self.record_value)
         return ret
@@ -139,8 +174,7 @@ class BaseRecord(BaseModel):
     @property
     def tags(self) -> dict:
         """Accessor for the record tags generated for this record."""
-        tags = self.record_tags
-        return tags
+        return dict(self._get_storage_values()[0])
 
     @classmethod
     async def get_cached_key(cls, session: ProfileSession, cache_key: str):
@@ -188,23 +222,168 @@ class BaseRecord(BaseModel):
         if cache:
             await cache.clear(cache_key)
 
+    @classmethod
+    def record_cache_key(cls, session: ProfileSession, record_id: str) -> str:
+        """Accessor for the cache key of a stored record, if caching is enabled.
+
+        Records are only cached for classes with `CACHE_ENABLED`, and when the
+        `cache.records` setting is enabled.
+
+        Args:
+            session: The profile session to use
+            record_id: The ID of the record
+        """
+        if (
+            cls.CACHE_ENABLED
+            and record_id
+            and session.settings.get_bool("cache.records")
+        ):
+            return f"{cls.RECORD_TYPE}::{record_id}"
+
+    async def clear_cached_record(self, session: ProfileSession):
+        """Clear the cached copy of this record after it is written.
+
+        The version kept in the cache for the record is replaced first, so that
+        a read which started before the write, in this agent instance or another
+        sharing the cache, cannot put the previous value back.
+
+        Args:
+            session: The profile session to use
+        """
+        cache_key = self.record_cache_key(session, self._id)
+        cache = cache_key and session.inject(BaseCache, required=False)
+        if cache:
+            # outlives any entry cached under the previous version
+            await cache.set(
+                f"{cache_key}::version", uuid.uuid4().hex, 2 * self.DEFAULT_CACHE_TTL
+            )
+            await cache.clear(cache_key)
+
     @classmethod
     async def retrieve_by_id(
         cls, session: ProfileSession, record_id: str
     ) -> "BaseRecord":
         """Retrieve a stored record by ID.
 
+        Record classes with `CACHE_ENABLED` read through the injected `BaseCache`
+        when the `cache.records` setting is enabled.
+
         Args:
             session: The profile session to use
             record_id: The ID of the record to find
         """
-        storage = session.inject(BaseStorage)
-        result = await storage.get_record(
-            cls.RECORD_TYPE, record_id, {"retrieveTags": False}
-        )
-        vals = json.loads(result.value)
+        cache_key = cls.record_cache_key(session, record_id)
+        cache = cache_key and session.inject(BaseCache, required=False)
+        start = Timer.now()
+        value = None
+        if cache:
+            # an entry is only used while it matches the current record version
+            version_key = f"{cache_key}::version"
+            found = await cache.get_many([cache_key, version_key])
+            version = found.get(version_key)
+            entry = found.get(cache_key)
+            if entry and entry.get("version") == version:
+                value = entry["value"]
+        cache_hit = bool(value)
+        if not cache_hit:
+            storage = session.inject(BaseStorage)
+            result = await storage.get_record(
+                cls.RECORD_TYPE, record_id, {"retrieveTags": False}
+            )
+            value = result.value
+            if cache:
+                await cache.set(
+                    cache_key,
+                    {"version": version, "value": value},
+                    cls.DEFAULT_CACHE_TTL,
+                )
+        if cache_key:
+            collector = session.inject(Collector, required=False)
+            if collector:
+                collector.log(
+                    "{}.retrieve_by_id.cache_{}".format(
+                        cls.__name__, "hit" if cache_hit else "miss"
+                    ),
+                    Timer.now() - start,
+                    start,
+                )
+        vals = json.loads(value)
         return cls.from_storage(record_id, vals)
 
+    @classmethod
+    def plan_query(
+        cls,
+        tag_filter: dict = None,
+        post_filter_positive: dict = None,
+        post_filter_negative: dict = None,
+        alt: bool = False,
+    ) -> Tuple[dict, dict, dict]:
+        """Rewrite post-filter criteria on tagged fields into tag filter clauses.
+
+        Criteria on fields named in `TAG_NAMES` with string values are sent to
+        storage as part of the tag query; the rest remain as residual post-filters.
+
+        Args:
+            tag_filter: An optional dictionary of tag filter clauses
+            post_filter_positive: Additional value filters to apply matching positively
+            post_filter_negative: Additional value filters to apply matching negatively
+            alt: set to match any (positive=True) value or miss all (positive=False)
+                values in post_filter
+
+        Returns:
+            Tuple with the tag filter, residual positive and negative post-filters
+
+        """
+        tag_map = cls.get_tag_map()
+
+        def eligible(key, value) -> bool:
+            if key not in tag_map:
+                return False
+            if alt:
+                return isinstance(value, (list, tuple, set)) and all(
+                    isinstance(alt_value, str) for alt_value in value
+                )
+            return isinstance(value, str)
+
+        def clause(value):
+            return {"$in": list(value)} if alt else value
+
+        clauses = []
+        residual_pos = {}
+        for key, value in (post_filter_positive or {}).items():
+            if eligible(key, value):
+                clauses.append({key: clause(value)})
+            else:
+                residual_pos[key] = value
+
+        residual_neg = {}
+        if post_filter_negative:
+            if alt:
+                for key, value in post_filter_negative.items():
+                    if eligible(key, value):
+                        clauses.append({"$not": {key: clause(value)}})
+                    else:
+                        residual_neg[key] = value
+            elif all(eligible(k, v) for k, v in post_filter_negative.items()):
+                clauses.append({"$not": dict(post_filter_negative)})
+            else:
+                residual_neg = post_filter_negative
+
+        if not clauses:
+            return (tag_filter, post_filter_positive, post_filter_negative)
+
+        planned = dict(tag_filter or {})
+        extra = []
+        for item in clauses:
+            ((key, value),) = item.items()
+            if key in planned:
+                extra.append(item)
+            else:
+                planned[key] = value
+        if extra:
+            planned = {"$and": [planned] + extra}
+        return (planned, residual_pos or None, residual_neg or None)
+
     @classmethod
     async def retrieve_by_tag_filter(
         cls, session: ProfileSession, tag_filter: dict, post_filter: dict = None
@@ -217,17 +396,18 @@ class BaseRecord(BaseModel):
             post_filter: Additional value filters to apply matching positively,
                 with sequence values specifying alternatives to match (hit any)
         """
+        (query_filter, residual, _) = cls.plan_query(tag_filter, post_filter)
         storage = session.inject(BaseStorage)
         query = storage.search_records(
             cls.RECORD_TYPE,
-            cls.prefix_tag_filter(tag_filter),
+            cls.prefix_tag_filter(query_filter),
             None,
             {"retrieveTags": False},
         )
         found = None
         async for record in query:
             vals = json.loads(record.value)
-            if match_post_filter(vals, post_filter, alt=False):
+            if match_post_filter(vals, residual, alt=False):
                 if found:
                     raise StorageDuplicateError(
                         "Multiple {} records located for {}{}".format(
@@ -245,6 +425,59 @@ class BaseRecord(BaseModel):
             )
         return found
 
+    @classmethod
+    async def iter_query(
+        cls,
+        session: ProfileSession,
+        tag_filter: dict = None,
+        *,
+        post_filter_positive: dict = None,
+        post_filter_negative: dict = None,
+        alt: bool = False,
+        page_size: int = None,
+    ) -> AsyncIterator["BaseRecord"]:
+        """Iterate over stored records, fetching them from storage page by page.
+
+        Args:
+            session: The profile session to use
+            tag_filter: An optional dictionary of tag filter clauses
+            post_filter_positive: Additional value filters to apply matching positively
+            post_filter_negative: Additional value filters to apply matching negatively
+            alt: set to match any (positive=True) value or miss all (positive=False)
+                values in post_filter
+            page_size: The number of records to fetch from storage at a time
+        """
+        (tag_filter, post_filter_positive, post_filter_negative) = cls.plan_query(
+            tag_filter, post_filter_positive, post_filter_negative, alt
+        )
+        storage = session.inject(BaseStorage)
+        query = storage.search_records(
+            cls.RECORD_TYPE,
+            cls.prefix_tag_filter(tag_filter),
+            page_size,
+            {"retrieveTags": False},
+        )
+        complete = False
+        try:
+            async for record in query:
+                vals = json.loads(record.value)
+                if match_post_filter(
+                    vals,
+                    post_filter_positive,
+                    positive=True,
+                    alt=alt,
+                ) and match_post_filter(
+                    vals,
+                    post_filter_negative,
+                    positive=False,
+                    alt=alt,
+                ):
+                    yield cls.from_storage(record.id, vals)
+            complete = True
+        finally:
+            if not complete:
+                await query.close()
+
     @classmethod
     async def query(
         cls,
@@ -254,6 +487,8 @@ class BaseRecord(BaseModel):
         post_filter_positive: dict = None,
         post_filter_negative: dict = None,
         alt: bool = False,
+        limit: int = None,
+        offset: int = None,
     ) -> Sequence["BaseRecord"]:
         """Query stored records.
 
@@ -264,7 +499,55 @@ class BaseRecord(BaseModel):
             post_filter_negative: Additional value filters to apply matching negatively
             alt: set to match any (positive=True) value or miss all (positive=False)
                 values in post_filter
+            limit: The maximum number of records to return
+            offset: The number of matching records to skip
         """
+        result = []
+        if limit is not None and limit <= 0:
+            return result
+        skip = offset or 0
+        records = cls.iter_query(
+            session,
+            tag_filter,
+            post_filter_positive=post_filter_positive,
+            post_filter_negative=post_filter_negative,
+            alt=alt,
+        )
+        try:
+            async for record in records:
+                if skip:
+                    skip -= 1
+                    continue
+                result.append(record)
+                if limit is not None and len(result) >= limit:
+                    break
+        finally:
+            await records.aclose()
+        return result
+
+    @classmethod
+    async def count(
+        cls,
+        session: ProfileSession,
+        tag_filter: dict = None,
+        *,
+        post_filter_positive: dict = None,
+        post_filter_negative: dict = None,
+        alt: bool = False,
+    ) -> int:
+        """Count stored records matching a query, without instantiating them.
+
+        Args:
+            session: The profile session to use
+            tag_filter: An optional dictionary of tag filter clauses
+            post_filter_positive: Additional value filters to apply matching positively
+            post_filter_negative: Additional value filters to apply matching negatively
+            alt: set to match any (positive=True) value or miss all (positive=False)
+                values in post_filter
+        """
+        (tag_filter, post_filter_positive, post_filter_negative) = cls.plan_query(
+            tag_filter, post_filter_positive, post_filter_negative, alt
+        )
         storage = session.inject(BaseStorage)
         query = storage.search_records(
             cls.RECORD_TYPE,
@@ -272,21 +555,20 @@ class BaseRecord(BaseModel):
             None,
             {"retrieveTags": False},
         )
-        result = []
+        result = 0
         async for record in query:
-            vals = json.loads(record.value)
-            if match_post_filter(
-                vals,
-                post_filter_positive,
-                positive=True,
-                alt=alt,
-            ) and match_post_filter(
-                vals,
-                post_filter_negative,
-                positive=False,
-                alt=alt,
-            ):
-                result.append(cls.from_storage(record.id, vals))
+            if post_filter_positive or post_filter_negative:
+                vals = json.loads(record.value)
+                if not (
+                    match_post_filter(
+                        vals, post_filter_positive, positive=True, alt=alt
+                    )
+                    and match_post_filter(
+                        vals, post_filter_negative, positive=False, alt=alt
+                    )
+                ):
+                    continue
+            result += 1
         return result
 
     async def save(
@@ -314,6 +596,7 @@ class BaseRecord(BaseModel):
             if self._id:
                 record = self.storage_record
                 await storage.update_record(record, record.value, record.tags)
+                await self.clear_cached_record(session)
                 new_record = False
             else:
                 self._id = str(uuid.uuid4())
@@ -321,12 +604,13 @@ class BaseRecord(BaseModel):
                 await storage.add_record(self.storage_record)
                 new_record = True
         finally:
-            params = {self.RECORD_TYPE: self.serialize()}
-            if log_params:
-                params.update(log_params)
-            if new_record is None:
-                log_reason = f"FAILED: {log_reason}"
-            self.log_state(session, log_reason, params, override=log_override)
+            if self.log_state_enabled(session, log_override):
+                params = {self.RECORD_TYPE: self.serialize()}
+                if log_params:
+                    params.update(log_params)
+                if new_record is None:
+                    log_reason = f"FAILED: {log_reason}"
+                self.log_state(session, log_reason, params, override=log_override)
 
         await self.post_save(session, new_record, self._last_state, webhook)
         self._last_state = self.state
@@ -365,6 +649,7 @@ class BaseRecord(BaseModel):
         if self._id:
             storage = session.inject(BaseStorage)
             await storage.delete_record(self.storage_record)
+            await self.clear_cached_record(session)
         # FIXME - update state and send webhook?
 
     @property
@@ -397,6 +682,14 @@ class BaseRecord(BaseModel):
         if responder:
             await responder.send_webhook(topic, payload)
 
+    @classmethod
+    def log_state_enabled(cls, session: ProfileSession, override: bool = False):
+        """Determine whether state messages are logged for this record class."""
+        return bool(
+            override
+            or (cls.LOG_STATE_FLAG and session.context.settings.get(cls.LOG_STATE_FLAG))
+        )
+
     @classmethod
     def log_state(
         cls,
@@ -406,9 +699,7 @@ class BaseRecord(BaseModel):
         override: bool = False,
     ):
         """Print a message with increased visibility (for testing)."""
-        if override or (
-            cls.LOG_STATE_FLAG and session.context.settings.get(cls.LOG_STATE_FLAG)
-        ):
+        if cls.log_state_enabled(session, override):
             out = msg + "\n"
             if params:
                 for k, v in params.items():
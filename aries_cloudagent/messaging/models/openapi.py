@@ -1,6 +1,16 @@
 """Base class for OpenAPI artifact schema."""
 
-from marshmallow import Schema, EXCLUDE
+from typing import Tuple
+
+from marshmallow import (
+    EXCLUDE,
+    Schema,
+    ValidationError,
+    fields,
+    validates_schema,
+)
+
+from ..valid import NUM_STR_NATURAL, NUM_STR_WHOLE
 
 
 class OpenAPISchema(Schema):
@@ -11,3 +21,66 @@ class OpenAPISchema(Schema):
 
         model_class = None
         unknown = EXCLUDE
+
+
+class PaginatedQuerySchema(OpenAPISchema):
+    """Parameters for paging through a record list query."""
+
+    limit = fields.Str(
+        description="Maximum number of records to retrieve",
+        required=False,
+        **NUM_STR_NATURAL,
+    )
+    offset = fields.Str(
+        description="Number of matching records to skip",
+        required=False,
+        **NUM_STR_WHOLE,
+    )
+    stream = fields.Boolean(
+        description=(
+            "Stream all matching records as newline-delimited JSON, in storage "
+            "order rather than the order of the list; "
+            "cannot be combined with limit or offset"
+        ),
+        required=False,
+    )
+    count = fields.Boolean(
+        description="Include the total number of matching records as total",
+        required=False,
+    )
+
+    @validates_schema
+    def validate_fields(self, data, **kwargs):
+        """
+        Validate schema fields - streaming returns every record, so no paging.
+
+        Args:
+            data: The data to validate
+
+        Raises:
+            ValidationError: if stream is set along with limit or offset
+
+        """
+        if data.get("stream") and (
+            data.get("limit") is not None or data.get("offset") is not None
+        ):
+            raise ValidationError(
+                "Cannot page a streamed record list", ("limit", "offset")
+            )
+
+
+def get_paging_params(query) -> Tuple[int, int]:
+    """Parse limit and offset paging parameters from a request query string."""
+    limit = query.get("limit")
+    offset = query.get("offset")
+    return (int(limit) if limit else None, int(offset) if offset else None)
+
+
+def get_count_param(request) -> bool:
+    """Read the count flag from a request validated against its query schema."""
+    return bool(request["data"].get("count"))
+
+
+def get_stream_param(request) -> bool:
+    """Read the stream flag from a request validated against its query schema."""
+    return bool(request["data"].get("stream"))
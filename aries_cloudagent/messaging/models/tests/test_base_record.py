@@ -4,8 +4,10 @@ from asynctest import TestCase as AsyncTestCase, mock as async_mock
 from marshmallow import EXCLUDE, fields
 
 from ....cache.base import BaseCache
+from ....cache.in_memory import InMemoryCache
 from ....core.in_memory import InMemoryProfile
 from ....storage.base import BaseStorage, StorageDuplicateError, StorageRecord
+from ....utils.stats import Collector
 
 from ...responder import BaseResponder, MockResponder
 from ...util import time_now
@@ -127,6 +129,96 @@ class TestBaseRecord(AsyncTestCase):
         await record.clear_cached_key(session, cache_key)
         mock_cache.clear.assert_awaited_once_with(cache_key)
 
+    async def test_retrieve_by_id_cached(self):
+        session = InMemoryProfile.test_session({"cache.records": True})
+        session.context.injector.bind_instance(BaseCache, InMemoryCache())
+        collector = Collector()
+        session.context.injector.bind_instance(Collector, collector)
+        storage = session.inject(BaseStorage)
+
+        with async_mock.patch.object(ARecordImpl, "CACHE_ENABLED", True):
+            record = ARecordImpl(a="1", b="2")
+            record_id = await record.save(session)
+            cache_key = ARecordImpl.record_cache_key(session, record_id)
+            assert cache_key == f"{ARecordImpl.RECORD_TYPE}::{record_id}"
+
+            with async_mock.patch.object(
+                storage, "get_record", wraps=storage.get_record
+            ) as mock_get:
+                first = await ARecordImpl.retrieve_by_id(session, record_id)
+                second = await ARecordImpl.retrieve_by_id(session, record_id)
+                assert first.a == second.a == "1"
+                assert first is not second
+                mock_get.assert_awaited_once()
+
+                second.a = "3"
+                await second.save(session)
+                assert not await ARecordImpl.get_cached_key(session, cache_key)
+                third = await ARecordImpl.retrieve_by_id(session, record_id)
+                assert third.a == "3"
+                assert mock_get.await_count == 2
+
+            await third.delete_record(session)
+            assert not await ARecordImpl.get_cached_key(session, cache_key)
+
+            # off unless enabled in the settings
+            assert not ARecordImpl.record_cache_key(
+                InMemoryProfile.test_session(), record_id
+            )
+
+        counts = collector.results["count"]
+        assert counts["ARecordImpl.retrieve_by_id.cache_hit"] == 1
+        assert counts["ARecordImpl.retrieve_by_id.cache_miss"] == 2
+        assert ARecordImpl.record_cache_key(session, record_id) is None
+
+    async def test_retrieve_by_id_cached_write_race(self):
+        session = InMemoryProfile.test_session({"cache.records": True})
+        session.context.injector.bind_instance(BaseCache, InMemoryCache())
+        storage = session.inject(BaseStorage)
+
+        with async_mock.patch.object(ARecordImpl, "CACHE_ENABLED", True):
+            record = ARecordImpl(a="1", b="2")
+            record_id = await record.save(session)
+            get_record = storage.get_record
+
+            async def read_then_save(*args, **kwargs):
+                # the record is updated while the reader holds the old value
+                result = await get_record(*args, **kwargs)
+                record.a = "3"
+                await record.save(session)
+                return result
+
+            with async_mock.patch.object(
+                storage, "get_record", side_effect=read_then_save
+            ):
+                stale = await ARecordImpl.retrieve_by_id(session, record_id)
+            assert stale.a == "1"
+            # the stale value is cached under the version it was read at
+            cache_key = ARecordImpl.record_cache_key(session, record_id)
+            assert (await ARecordImpl.get_cached_key(session, cache_key))["value"]
+            fresh = await ARecordImpl.retrieve_by_id(session, record_id)
+            assert fresh.a == "3"
+
+    async def test_retrieve_by_id_cached_shared(self):
+        # two agent instances sharing one cache, each with its own storage view
+        cache = InMemoryCache()
+        reader = InMemoryProfile.test_session({"cache.records": True})
+        writer = InMemoryProfile.test_session({"cache.records": True})
+        writer.context.injector.bind_instance(BaseStorage, reader.inject(BaseStorage))
+        for session in (reader, writer):
+            session.context.injector.bind_instance(BaseCache, cache)
+
+        with async_mock.patch.object(ARecordImpl, "CACHE_ENABLED", True):
+            record = ARecordImpl(a="1", b="2")
+            record_id = await record.save(writer)
+            assert (await ARecordImpl.retrieve_by_id(reader, record_id)).a == "1"
+
+            updated = await ARecordImpl.retrieve_by_id(writer, record_id)
+            updated.a = "2"
+            await updated.save(writer)
+            assert (await ARecordImpl.retrieve_by_id(reader, record_id)).a == "2"
+            assert (await ARecordImpl.retrieve_by_id(reader, record_id)).a == "2"
+
     async def test_retrieve_by_tag_filter_multi_x_delete(self):
         session = InMemoryProfile.test_session()
         records = []
@@ -235,6 +327,133 @@ class TestBaseRecord(AsyncTestCase):
         )
         assert not result
 
+    async def test_query_paged_count(self):
+        session = InMemoryProfile.test_session()
+        for i in range(5):
+            await ARecordImpl(a=str(i), b="even" if i % 2 == 0 else "odd").save(session)
+
+        all_recs = await ARecordImpl.query(session)
+        assert len(all_recs) == 5
+
+        page = await ARecordImpl.query(session, limit=2)
+        assert [rec.a for rec in page] == [rec.a for rec in all_recs[:2]]
+        page = await ARecordImpl.query(session, limit=2, offset=4)
+        assert [rec.a for rec in page] == [all_recs[4].a]
+        assert not await ARecordImpl.query(session, limit=2, offset=5)
+        assert not await ARecordImpl.query(session, limit=0)
+
+        page = await ARecordImpl.query(
+            session, post_filter_positive={"b": "even"}, limit=2, offset=1
+        )
+        assert [rec.b for rec in page] == ["even", "even"]
+
+        assert await ARecordImpl.count(session) == 5
+        assert await ARecordImpl.count(session, post_filter_positive={"b": "odd"}) == 2
+        assert await ARecordImpl.count(session, post_filter_negative={"b": "odd"}) == 3
+        assert await BaseRecordImpl.count(session) == 0
+
+    async def test_iter_query(self):
+        session = InMemoryProfile.test_session()
+        for i in range(5):
+            await ARecordImpl(a=str(i), b="even" if i % 2 == 0 else "odd").save(session)
+        storage = session.inject(BaseStorage)
+
+        with async_mock.patch.object(
+            storage, "search_records", wraps=storage.search_records
+        ) as mock_search:
+            found = [
+                rec
+                async for rec in ARecordImpl.iter_query(
+                    session, post_filter_positive={"b": "odd"}, page_size=2
+                )
+            ]
+            assert mock_search.call_args[0][2] == 2
+        assert sorted(rec.a for rec in found) == ["1", "3"]
+        assert all(isinstance(rec, ARecordImpl) for rec in found)
+
+        records = ARecordImpl.iter_query(session, page_size=2)
+        first = await records.__anext__()
+        assert isinstance(first, ARecordImpl)
+        await records.aclose()
+
+    def test_plan_query(self):
+        # nothing eligible: filters pass through untouched
+        tag_filter = {"code": "red"}
+        assert ARecordImpl.plan_query(tag_filter, {"a": "one"}, {"b": "two"}) == (
+            tag_filter,
+            {"a": "one"},
+            {"b": "two"},
+        )
+
+        # positive criteria on tags move into the tag filter
+        assert ARecordImpl.plan_query(None, {"code": "red", "a": "one"}) == (
+            {"code": "red"},
+            {"a": "one"},
+            None,
+        )
+        assert ARecordImpl.plan_query({"code": "blue"}, {"code": "red"}, None) == (
+            {"$and": [{"code": "blue"}, {"code": "red"}]},
+            None,
+            None,
+        )
+        assert ARecordImpl.plan_query(
+            None, {"code": ["red", "blue"], "a": ["one"]}, alt=True
+        ) == ({"code": {"$in": ["red", "blue"]}}, {"a": ["one"]}, None)
+
+        # non-string values stay in python
+        assert ARecordImpl.plan_query(None, {"code": 1}) == (None, {"code": 1}, None)
+
+        # negative criteria
+        assert ARecordImpl.plan_query(None, None, {"code": "red"}) == (
+            {"$not": {"code": "red"}},
+            None,
+            None,
+        )
+        assert ARecordImpl.plan_query(None, None, {"code": "red", "a": "one"}) == (
+            None,
+            None,
+            {"code": "red", "a": "one"},
+        )
+        assert ARecordImpl.plan_query(
+            None, None, {"code": ["red"], "a": ["one"]}, alt=True
+        ) == ({"$not": {"code": {"$in": ["red"]}}}, None, {"a": ["one"]})
+
+    async def test_query_post_filter_pushdown(self):
+        session = InMemoryProfile.test_session()
+        for code in ("red", "red", "blue", "green"):
+            await ARecordImpl(a="one", b=code, code=code).save(session)
+        await ARecordImpl(a="one", b="none").save(session)
+        storage = session.inject(BaseStorage)
+
+        with async_mock.patch.object(
+            storage, "search_records", wraps=storage.search_records
+        ) as mock_search:
+            found = await ARecordImpl.query(
+                session, post_filter_positive={"code": "red", "a": "one"}
+            )
+            assert mock_search.call_args[0][1] == {"code": "red"}
+        assert [rec.code for rec in found] == ["red", "red"]
+
+        found = await ARecordImpl.query(
+            session, post_filter_positive={"code": ["red", "blue"]}, alt=True
+        )
+        assert sorted(rec.code for rec in found) == ["blue", "red", "red"]
+
+        found = await ARecordImpl.query(
+            session, post_filter_negative={"code": ["red", "blue"]}, alt=True
+        )
+        assert sorted(str(rec.code) for rec in found) == ["None", "green"]
+
+        found = await ARecordImpl.query(session, post_filter_negative={"code": "red"})
+        assert len(found) == 3
+
+        assert (
+            await ARecordImpl.count(session, post_filter_positive={"code": "red"}) == 2
+        )
+
+        found = await ARecordImpl.retrieve_by_tag_filter(session, {}, {"code": "green"})
+        assert found.code == "green"
+
     @async_mock.patch("builtins.print")
     def test_log_state(self, mock_print):
         test_param = "test.log"
@@ -246,6 +465,50 @@ class TestBaseRecord(AsyncTestCase):
             record.log_state(session, msg="state", params={"a": "1", "b": "2"})
         mock_print.assert_called_once()
 
+    async def test_save_serializes_only_when_logging(self):
+        session = InMemoryProfile.test_session()
+        record = ARecordImpl(a="1", b="2")
+        with async_mock.patch.object(
+            record, "serialize", async_mock.MagicMock(return_value={})
+        ) as mock_serialize:
+            await record.save(session)
+            mock_serialize.assert_not_called()
+
+            with async_mock.patch("builtins.print") as mock_print:
+                await record.save(session, log_override=True)
+                mock_print.assert_called_once()
+            mock_serialize.assert_called_once()
+
+    def test_storage_record_tags(self):
+        record = ARecordImpl(ident="id", a="1", b="2", code="red")
+        assert ARecordImpl.get_tag_map() is ARecordImpl.get_tag_map()
+        assert ARecordImpl.get_tag_map() == {"code": "code"}
+        with async_mock.patch.object(ARecordImpl, "TAG_NAMES", {"~a"}):
+            assert ARecordImpl.get_tag_map() == {"a": "~a"}
+        assert ARecordImpl.get_tag_map() == {"code": "code"}
+
+        stored = record.storage_record
+        assert stored.tags == record.tags == {"code": "red"}
+        assert json.loads(stored.value) == record.value
+
+    def test_storage_values_cached(self):
+        record = ARecordImpl(ident="id", a="1", b="2", code="red")
+        with async_mock.patch.object(
+            ARecordImpl, "_value_with_tags", autospec=True, return_value={}
+        ) as mock_value:
+            record.value
+            record.tags
+            record.storage_record
+            assert mock_value.call_count == 1
+
+            record.a = "3"
+            record.tags["code"] = "blue"
+            assert record.tags == {"code": "red"}
+            assert mock_value.call_count == 2
+        record.b = "4"
+        assert (record.value["a"], record.value["b"]) == ("3", "4")
+        assert "_storage_values" not in repr(record)
+
     @async_mock.patch("builtins.print")
     def test_skip_log(self, mock_print):
         session = InMemoryProfile.test_session()
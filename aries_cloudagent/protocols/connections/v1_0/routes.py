@@ -14,9 +14,16 @@ from aiohttp_apispec import (
 from marshmallow import fields, validate, validates_schema
 
 from ....admin.request_context import AdminRequestContext
+from ....admin.streaming import ndjson_response
 from ....connections.models.conn_record import ConnRecord, ConnRecordSchema
 from ....messaging.models.base import BaseModelError
-from ....messaging.models.openapi import OpenAPISchema
+from ....messaging.models.openapi import (
+    OpenAPISchema,
+    PaginatedQuerySchema,
+    get_count_param,
+    get_paging_params,
+    get_stream_param,
+)
 from ....messaging.valid import (
     ENDPOINT,
     INDY_DID,
@@ -41,6 +48,9 @@ class ConnectionListSchema(OpenAPISchema):
         fields.Nested(ConnRecordSchema()),
         description="List of connection records",
     )
+    total = fields.Int(
+        description="Total number of matching records, if requested", required=False
+    )
 
 
 class ReceiveInvitationRequestSchema(ConnectionInvitationSchema):
@@ -118,7 +128,7 @@ class ConnectionStaticResultSchema(OpenAPISchema):
     record = fields.Nested(ConnRecordSchema, required=True)
 
 
-class ConnectionsListQueryStringSchema(OpenAPISchema):
+class ConnectionsListQueryStringSchema(PaginatedQuerySchema):
     """Parameters and validators for connections list request query string."""
 
     alias = fields.Str(
@@ -219,20 +229,6 @@ class ConnIdRefIdMatchInfoSchema(OpenAPISchema):
     )
 
 
-def connection_sort_key(conn):
-    """Get the sorting key for a particular connection."""
-
-    conn_rec_state = ConnRecord.State.get(conn["state"])
-    if conn_rec_state is ConnRecord.State.ABANDONED:
-        pfx = "2"
-    elif conn_rec_state is ConnRecord.State.INVITATION:
-        pfx = "1"
-    else:
-        pfx = "0"
-
-    return pfx + conn["created_at"]
-
-
 @docs(
     tags=["connection"],
     summary="Query agent-to-agent connections",
@@ -274,17 +270,38 @@ async def connections_list(request: web.BaseRequest):
             v for v in ConnRecord.Role.get(request.query["their_role"]).value
         ]
 
+    (limit, offset) = get_paging_params(request.query)
+
     session = await context.session()
+    if get_stream_param(request):
+        # sent in storage order as records are read, without the state grouping
+        # of the list response
+        records = ConnRecord.iter_query(
+            session, tag_filter, post_filter_positive=post_filter, alt=True
+        )
+        return await ndjson_response(
+            request, (record.serialize() async for record in records)
+        )
+
     try:
         records = await ConnRecord.query(
-            session, tag_filter, post_filter_positive=post_filter, alt=True
+            session,
+            tag_filter,
+            post_filter_positive=post_filter,
+            alt=True,
+            limit=limit,
+            offset=offset,
+            order_by_state=True,
         )
-        results = [record.serialize() for record in records]
-        results.sort(key=connection_sort_key)
+        response = {"results": [record.serialize() for record in records]}
+        if get_count_param(request):
+            response["total"] = await ConnRecord.count(
+                session, tag_filter, post_filter_positive=post_filter, alt=True
+            )
     except (StorageError, BaseModelError) as err:
         raise web.HTTPBadRequest(reason=err.roll_up) from err
 
-    return web.json_response({"results": results})
+    return web.json_response(response)
 
 
 @docs(tags=["connection"], summary="Fetch a single connection record")
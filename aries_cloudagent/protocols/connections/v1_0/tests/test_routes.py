@@ -1,5 +1,6 @@
 from asynctest import TestCase as AsyncTestCase
 from asynctest import mock as async_mock
+from marshmallow import ValidationError
 
 from .....admin.request_context import AdminRequestContext
 from .....connections.models.conn_record import ConnRecord
@@ -12,7 +13,7 @@ class TestConnectionRoutes(AsyncTestCase):
     async def setUp(self):
         self.session_inject = {}
         self.context = AdminRequestContext.test_context(self.session_inject)
-        self.request_dict = {"context": self.context}
+        self.request_dict = {"context": self.context, "data": {}}
         self.request = async_mock.MagicMock(
             app={"outbound_message_router": async_mock.CoroutineMock()},
             match_info={},
@@ -73,7 +74,7 @@ class TestConnectionRoutes(AsyncTestCase):
                     )
                 ),
             ]
-            mock_conn_rec.query.return_value = [conns[2], conns[0], conns[1]]  # jumbled
+            mock_conn_rec.query.return_value = conns  # ordered by state group
 
             with async_mock.patch.object(
                 test_module.web, "json_response"
@@ -88,8 +89,104 @@ class TestConnectionRoutes(AsyncTestCase):
                             }
                             for c in conns
                         ]
-                    }  # sorted
+                    }
                 )
+                mock_conn_rec.query.assert_awaited_once_with(
+                    async_mock.ANY,
+                    {"invitation_id": "dummy"},
+                    post_filter_positive=async_mock.ANY,
+                    alt=True,
+                    limit=None,
+                    offset=None,
+                    order_by_state=True,
+                )
+
+    async def test_connections_list_paged(self):
+        self.request.query = {"limit": "2", "offset": "1", "count": "true"}
+        self.request_dict["data"] = {"count": True}
+
+        conns = [
+            async_mock.MagicMock(
+                serialize=async_mock.MagicMock(
+                    return_value={
+                        "state": ConnRecord.State.COMPLETED.rfc23,
+                        "created_at": created_at,
+                    }
+                )
+            )
+            for created_at in ("2", "3")
+        ]
+        with async_mock.patch.object(
+            test_module, "ConnRecord", autospec=True
+        ) as mock_conn_rec, async_mock.patch.object(
+            test_module.web, "json_response"
+        ) as mock_response:
+            mock_conn_rec.State = ConnRecord.State
+            mock_conn_rec.query = async_mock.CoroutineMock(return_value=conns)
+            mock_conn_rec.count = async_mock.CoroutineMock(return_value=4)
+            await test_module.connections_list(self.request)
+            # the page is taken by the query, rather than from every match
+            mock_conn_rec.query.assert_awaited_once_with(
+                async_mock.ANY,
+                {},
+                post_filter_positive={},
+                alt=True,
+                limit=2,
+                offset=1,
+                order_by_state=True,
+            )
+            mock_conn_rec.count.assert_awaited_once_with(
+                async_mock.ANY, {}, post_filter_positive={}, alt=True
+            )
+            response = mock_response.call_args[0][0]
+            assert [result["created_at"] for result in response["results"]] == [
+                "2",
+                "3",
+            ]
+            assert response["total"] == 4
+
+    async def test_connections_list_stream(self):
+        self.request.query = {"stream": "True"}
+        self.request_dict["data"] = {"stream": True}
+
+        async def records():
+            for state, created_at in (
+                (ConnRecord.State.INVITATION.rfc23, "1"),
+                (ConnRecord.State.COMPLETED.rfc23, "3"),
+                (ConnRecord.State.COMPLETED.rfc23, "2"),
+            ):
+                yield async_mock.MagicMock(
+                    serialize=async_mock.MagicMock(
+                        return_value={"state": state, "created_at": created_at}
+                    )
+                )
+
+        with async_mock.patch.object(
+            test_module, "ConnRecord", autospec=True
+        ) as mock_conn_rec, async_mock.patch.object(
+            test_module, "ndjson_response", async_mock.CoroutineMock()
+        ) as mock_ndjson_response:
+            mock_conn_rec.State = ConnRecord.State
+            mock_conn_rec.iter_query = async_mock.MagicMock(return_value=records())
+            await test_module.connections_list(self.request)
+            mock_conn_rec.iter_query.assert_called_once_with(
+                async_mock.ANY, {}, post_filter_positive={}, alt=True
+            )
+            # in storage order, unsorted
+            items = mock_ndjson_response.call_args[0][1]
+            assert [item["created_at"] async for item in items] == ["1", "3", "2"]
+
+    async def test_connections_list_stream_schema(self):
+        schema = test_module.ConnectionsListQueryStringSchema()
+        assert schema.load({"stream": "True"}) == {"stream": True}
+        assert schema.load({"stream": "no", "limit": "10"}) == {
+            "stream": False,
+            "limit": "10",
+        }
+        with self.assertRaises(ValidationError):
+            schema.load({"stream": "maybe"})
+        with self.assertRaises(ValidationError):
+            schema.load({"stream": "yes", "offset": "0"})
 
     async def test_connections_list_x(self):
         self.request.query = {
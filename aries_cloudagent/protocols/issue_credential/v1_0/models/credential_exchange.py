@@ -24,6 +24,7 @@ class V10CredentialExchange(BaseExchangeRecord):
     RECORD_ID_NAME = "credential_exchange_id"
     WEBHOOK_TOPIC = "issue_credential"
     TAG_NAMES = {"~thread_id"} if unencrypted_tags else {"thread_id"}
+    CACHE_ENABLED = True
 
     INITIATOR_SELF = "self"
     INITIATOR_EXTERNAL = "external"
@@ -12,12 +12,19 @@ from json.decoder import JSONDecodeError
 from marshmallow import fields, validate
 
 from ....admin.request_context import AdminRequestContext
+from ....admin.streaming import ndjson_response
 from ....connections.models.conn_record import ConnRecord
 from ....core.profile import Profile
 from ....indy.issuer import IndyIssuerError
 from ....ledger.error import LedgerError
 from ....messaging.credential_definitions.util import CRED_DEF_TAGS
 from ....messaging.models.base import BaseModelError, OpenAPISchema
+from ....messaging.models.openapi import (
+    PaginatedQuerySchema,
+    get_count_param,
+    get_paging_params,
+    get_stream_param,
+)
 from ....messaging.valid import (
     INDY_CRED_DEF_ID,
     INDY_CRED_REV_ID,
@@ -52,7 +59,7 @@ from .models.credential_exchange import (
 )
 
 
-class V10CredentialExchangeListQueryStringSchema(OpenAPISchema):
+class V10CredentialExchangeListQueryStringSchema(PaginatedQuerySchema):
     """Parameters and validators for credential exchange list query."""
 
     connection_id = fields.UUID(
@@ -96,6 +103,9 @@ class V10CredentialExchangeListResultSchema(OpenAPISchema):
         fields.Nested(V10CredentialExchangeSchema),
         description="Aries#0036 v1.0 credential exchange records",
     )
+    total = fields.Int(
+        description="Total number of matching records, if requested", required=False
+    )
 
 
 class V10CredentialStoreRequestSchema(OpenAPISchema):
@@ -350,6 +360,16 @@ async def credential_exchange_list(request: web.BaseRequest):
         for k in ("connection_id", "role", "state")
         if request.query.get(k, "") != ""
     }
+    (limit, offset) = get_paging_params(request.query)
+
+    if get_stream_param(request):
+        async with context.session() as session:
+            records = V10CredentialExchange.iter_query(
+                session, tag_filter, post_filter_positive=post_filter
+            )
+            return await ndjson_response(
+                request, (record.serialize() async for record in records)
+            )
 
     try:
         async with context.session() as session:
@@ -357,12 +377,18 @@ async def credential_exchange_list(request: web.BaseRequest):
                 session=session,
                 tag_filter=tag_filter,
                 post_filter_positive=post_filter,
+                limit=limit,
+                offset=offset,
             )
-        results = [record.serialize() for record in records]
+            response = {"results": [record.serialize() for record in records]}
+            if get_count_param(request):
+                response["total"] = await V10CredentialExchange.count(
+                    session, tag_filter, post_filter_positive=post_filter
+                )
     except (StorageError, BaseModelError) as err:
         raise web.HTTPBadRequest(reason=err.roll_up) from err
 
-    return web.json_response({"results": results})
+    return web.json_response(response)
 
 
 @docs(tags=["issue-credential"], summary="Fetch a single credential exchange record")
@@ -11,7 +11,7 @@ class TestCredentialRoutes(AsyncTestCase):
     async def setUp(self):
         self.session_inject = {}
         self.context = AdminRequestContext.test_context(self.session_inject)
-        self.request_dict = {"context": self.context}
+        self.request_dict = {"context": self.context, "data": {}}
         self.request = async_mock.MagicMock(
             app={"outbound_message_router": async_mock.CoroutineMock()},
             match_info={},
@@ -43,6 +43,41 @@ class TestCredentialRoutes(AsyncTestCase):
                     {"results": [mock_cred_ex.serialize.return_value]}
                 )
 
+    async def test_credential_exchange_list_count(self):
+        self.request.query = {"limit": "1", "count": "true"}
+        self.request_dict["data"] = {"count": True}
+
+        with async_mock.patch.object(
+            test_module, "V10CredentialExchange", autospec=True
+        ) as mock_cred_ex, async_mock.patch.object(
+            test_module.web, "json_response"
+        ) as mock_response:
+            mock_cred_ex.query = async_mock.CoroutineMock(return_value=[])
+            mock_cred_ex.count = async_mock.CoroutineMock(return_value=3)
+            await test_module.credential_exchange_list(self.request)
+            mock_cred_ex.count.assert_awaited_once_with(
+                async_mock.ANY, {}, post_filter_positive={}
+            )
+            mock_response.assert_called_once_with({"results": [], "total": 3})
+
+    async def test_credential_exchange_list_stream(self):
+        self.request_dict["data"] = {"stream": True}
+
+        async def records():
+            yield async_mock.MagicMock(
+                serialize=async_mock.MagicMock(return_value={"hello": "world"})
+            )
+
+        with async_mock.patch.object(
+            test_module, "V10CredentialExchange", autospec=True
+        ) as mock_cred_ex, async_mock.patch.object(
+            test_module, "ndjson_response", async_mock.CoroutineMock()
+        ) as mock_ndjson_response:
+            mock_cred_ex.iter_query = async_mock.MagicMock(return_value=records())
+            await test_module.credential_exchange_list(self.request)
+            items = mock_ndjson_response.call_args[0][1]
+            assert [item async for item in items] == [{"hello": "world"}]
+
     async def test_credential_exchange_list_x(self):
         self.request.query = {
             "thread_id": "dummy",
@@ -1,9 +1,12 @@
 """Classes to manage presentations."""
 
+import asyncio
 import json
 import logging
 import time
 
+from typing import Awaitable, Callable, Iterable, Mapping
+
 from ....connections.models.conn_record import ConnRecord
 from ....core.error import BaseError
 from ....core.profile import ProfileSession
@@ -24,6 +27,14 @@ from .message_types import ATTACH_DECO_IDS, PRESENTATION, PRESENTATION_REQUEST
 LOGGER = logging.getLogger(__name__)
 
 
+async def _fetch_all(
+    fetch: Callable[[str], Awaitable], idents: Iterable[str]
+) -> Mapping[str, dict]:
+    """Fetch several ledger objects concurrently, by identifier."""
+    idents = list(dict.fromkeys(idents))
+    return dict(zip(idents, await asyncio.gather(*(fetch(ident) for ident in idents))))
+
+
 class PresentationManagerError(BaseError):
     """Presentation error."""
 
@@ -303,30 +314,31 @@ class PresentationManager:
 
         # Get all schema, credential definition, and revocation registry in use
         ledger = self._session.inject(BaseLedger)
-        schemas = {}
-        credential_definitions = {}
-        revocation_registries = {}
-
         async with ledger:
-            for credential in credentials.values():
-                schema_id = credential["schema_id"]
-                if schema_id not in schemas:
-                    schemas[schema_id] = await ledger.get_schema(schema_id)
-
-                credential_definition_id = credential["cred_def_id"]
-                if credential_definition_id not in credential_definitions:
-                    credential_definitions[
-                        credential_definition_id
-                    ] = await ledger.get_credential_definition(credential_definition_id)
-
-                if credential.get("rev_reg_id"):
-                    revocation_registry_id = credential["rev_reg_id"]
-                    if revocation_registry_id not in revocation_registries:
-                        revocation_registries[
-                            revocation_registry_id
-                        ] = RevocationRegistry.from_definition(
-                            await ledger.get_revoc_reg_def(revocation_registry_id), True
-                        )
+            (schemas, credential_definitions, rev_reg_defs) = await asyncio.gather(
+                _fetch_all(
+                    ledger.get_schema,
+                    (credential["schema_id"] for credential in credentials.values()),
+                ),
+                _fetch_all(
+                    ledger.get_credential_definition,
+                    (credential["cred_def_id"] for credential in credentials.values()),
+                ),
+                _fetch_all(
+                    ledger.get_revoc_reg_def,
+                    (
+                        credential["rev_reg_id"]
+                        for credential in credentials.values()
+                        if credential.get("rev_reg_id")
+                    ),
+                ),
+            )
+        revocation_registries = {
+            revocation_registry_id: RevocationRegistry.from_definition(
+                rev_reg_def, True
+            )
+            for revocation_registry_id, rev_reg_def in rev_reg_defs.items()
+        }
 
         # Get delta with non-revocation interval defined in "non_revoked"
         # of the presentation request or attributes
@@ -337,40 +349,52 @@ class PresentationManager:
             presentation_exchange_record.presentation_request.get("non_revoked") or {}
         )
 
-        revoc_reg_deltas = {}
-        async with ledger:
-            for precis in requested_referents.values():  # cred_id, non-revoc interval
-                credential_id = precis["cred_id"]
-                if not credentials[credential_id].get("rev_reg_id"):
-                    continue
-                if "timestamp" in precis:
-                    continue
-                rev_reg_id = credentials[credential_id]["rev_reg_id"]
-                referent_non_revoc_interval = precis.get(
-                    "non_revoked", non_revoc_interval
+        delta_requests = {}
+        delta_keys = {}  # often one cred satisfies many requested attrs/preds
+        for precis in requested_referents.values():  # cred_id, non-revoc interval
+            credential_id = precis["cred_id"]
+            if not credentials[credential_id].get("rev_reg_id"):
+                continue
+            if "timestamp" in precis or credential_id in delta_keys:
+                continue
+            rev_reg_id = credentials[credential_id]["rev_reg_id"]
+            referent_non_revoc_interval = precis.get("non_revoked", non_revoc_interval)
+
+            if referent_non_revoc_interval:
+                key = (
+                    f"{rev_reg_id}_{referent_non_revoc_interval.get('from', 0)}_"
+                    f"{referent_non_revoc_interval.get('to', epoch_now)}"
+                )
+                delta_requests.setdefault(
+                    key,
+                    (
+                        rev_reg_id,
+                        credential_id,
+                        referent_non_revoc_interval.get("from", 0),
+                        referent_non_revoc_interval.get("to", epoch_now),
+                    ),
                 )
+                delta_keys[credential_id] = key
 
-                if referent_non_revoc_interval:
-                    key = (
-                        f"{rev_reg_id}_{referent_non_revoc_interval.get('from', 0)}_"
-                        f"{referent_non_revoc_interval.get('to', epoch_now)}"
-                    )
-                    if key not in revoc_reg_deltas:
-                        (delta, delta_timestamp) = await ledger.get_revoc_reg_delta(
-                            rev_reg_id,
-                            referent_non_revoc_interval.get("from", 0),
-                            referent_non_revoc_interval.get("to", epoch_now),
-                        )
-                        revoc_reg_deltas[key] = (
-                            rev_reg_id,
-                            credential_id,
-                            delta,
-                            delta_timestamp,
-                        )
-                    for stamp_me in requested_referents.values():
-                        # often one cred satisfies many requested attrs/preds
-                        if stamp_me["cred_id"] == credential_id:
-                            stamp_me["timestamp"] = revoc_reg_deltas[key][3]
+        requests = list(delta_requests.values())
+        async with ledger:
+            deltas = await asyncio.gather(
+                *(
+                    ledger.get_revoc_reg_delta(rev_reg_id, timestamp_from, timestamp_to)
+                    for rev_reg_id, _, timestamp_from, timestamp_to in requests
+                )
+            )
+        revoc_reg_deltas = {
+            key: (rev_reg_id, credential_id, *delta)
+            for key, (rev_reg_id, credential_id, _, _), delta in zip(
+                delta_requests, requests, deltas
+            )
+        }
+        for stamp_me in requested_referents.values():
+            if stamp_me["cred_id"] in delta_keys:
+                stamp_me["timestamp"] = revoc_reg_deltas[
+                    delta_keys[stamp_me["cred_id"]]
+                ][3]
 
         # Get revocation states to prove non-revoked
         revocation_states = {}
@@ -524,56 +548,51 @@ class PresentationManager:
         indy_proof_request = presentation_exchange_record.presentation_request
         indy_proof = presentation_exchange_record.presentation
 
-        schema_ids = []
-        credential_definition_ids = []
-
-        schemas = {}
-        credential_definitions = {}
-        rev_reg_defs = {}
-        rev_reg_entries = {}
-
         identifiers = indy_proof["identifiers"]
+        entry_ids = list(
+            dict.fromkeys(
+                (identifier["rev_reg_id"], identifier["timestamp"])
+                for identifier in identifiers
+                if identifier.get("rev_reg_id") and identifier.get("timestamp")
+            )
+        )
         ledger = self._session.inject(BaseLedger)
         async with ledger:
-            for identifier in identifiers:
-                schema_ids.append(identifier["schema_id"])
-                credential_definition_ids.append(identifier["cred_def_id"])
-
-                # Build schemas for anoncreds
-                if identifier["schema_id"] not in schemas:
-                    schemas[identifier["schema_id"]] = await ledger.get_schema(
-                        identifier["schema_id"]
-                    )
-
-                if identifier["cred_def_id"] not in credential_definitions:
-                    credential_definitions[
-                        identifier["cred_def_id"]
-                    ] = await ledger.get_credential_definition(
-                        identifier["cred_def_id"]
+            (
+                schemas,
+                credential_definitions,
+                rev_reg_defs,
+                entries,
+            ) = await asyncio.gather(
+                _fetch_all(
+                    ledger.get_schema,
+                    (identifier["schema_id"] for identifier in identifiers),
+                ),
+                _fetch_all(
+                    ledger.get_credential_definition,
+                    (identifier["cred_def_id"] for identifier in identifiers),
+                ),
+                _fetch_all(
+                    ledger.get_revoc_reg_def,
+                    (
+                        identifier["rev_reg_id"]
+                        for identifier in identifiers
+                        if identifier.get("rev_reg_id")
+                    ),
+                ),
+                asyncio.gather(
+                    *(
+                        ledger.get_revoc_reg_entry(rev_reg_id, timestamp)
+                        for (rev_reg_id, timestamp) in entry_ids
                     )
+                ),
+            )
 
-                if identifier.get("rev_reg_id"):
-                    if identifier["rev_reg_id"] not in rev_reg_defs:
-                        rev_reg_defs[
-                            identifier["rev_reg_id"]
-                        ] = await ledger.get_revoc_reg_def(identifier["rev_reg_id"])
-
-                    if identifier.get("timestamp"):
-                        rev_reg_entries.setdefault(identifier["rev_reg_id"], {})
-
-                        if (
-                            identifier["timestamp"]
-                            not in rev_reg_entries[identifier["rev_reg_id"]]
-                        ):
-                            (
-                                found_rev_reg_entry,
-                                _found_timestamp,
-                            ) = await ledger.get_revoc_reg_entry(
-                                identifier["rev_reg_id"], identifier["timestamp"]
-                            )
-                            rev_reg_entries[identifier["rev_reg_id"]][
-                                identifier["timestamp"]
-                            ] = found_rev_reg_entry
+        rev_reg_entries = {}
+        for (rev_reg_id, timestamp), (found_rev_reg_entry, _found_timestamp) in zip(
+            entry_ids, entries
+        ):
+            rev_reg_entries.setdefault(rev_reg_id, {})[timestamp] = found_rev_reg_entry
 
         verifier = self._session.inject(IndyVerifier)
         presentation_exchange_record.verified = json.dumps(  # tag: needs string value
@@ -23,6 +23,7 @@ class V10PresentationExchange(BaseExchangeRecord):
     RECORD_ID_NAME = "presentation_exchange_id"
     WEBHOOK_TOPIC = "present_proof"
     TAG_NAMES = {"~thread_id"} if unencrypted_tags else {"thread_id"}
+    CACHE_ENABLED = True
 
     INITIATOR_SELF = "self"
     INITIATOR_EXTERNAL = "external"
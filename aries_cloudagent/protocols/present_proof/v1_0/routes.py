@@ -14,13 +14,20 @@ from marshmallow import fields, validate, validates_schema
 from marshmallow.exceptions import ValidationError
 
 from ....admin.request_context import AdminRequestContext
+from ....admin.streaming import ndjson_response
 from ....connections.models.conn_record import ConnRecord
 from ....indy.holder import IndyHolder, IndyHolderError
 from ....indy.util import generate_pr_nonce
 from ....ledger.error import LedgerError
 from ....messaging.decorators.attach_decorator import AttachDecorator
 from ....messaging.models.base import BaseModelError
-from ....messaging.models.openapi import OpenAPISchema
+from ....messaging.models.openapi import (
+    OpenAPISchema,
+    PaginatedQuerySchema,
+    get_count_param,
+    get_paging_params,
+    get_stream_param,
+)
 from ....messaging.valid import (
     INDY_CRED_DEF_ID,
     INDY_CRED_REV_ID,
@@ -56,7 +63,7 @@ from .models.presentation_exchange import (
 )
 
 
-class V10PresentationExchangeListQueryStringSchema(OpenAPISchema):
+class V10PresentationExchangeListQueryStringSchema(PaginatedQuerySchema):
     """Parameters and validators for presentation exchange list query."""
 
     connection_id = fields.UUID(
@@ -100,6 +107,9 @@ class V10PresentationExchangeListSchema(OpenAPISchema):
         fields.Nested(V10PresentationExchangeSchema()),
         description="Aries RFC 37 v1.0 presentation exchange records",
     )
+    total = fields.Int(
+        description="Total number of matching records, if requested", required=False
+    )
 
 
 class V10PresentationProposalRequestSchema(AdminAPIMessageTracingSchema):
@@ -509,18 +519,33 @@ async def presentation_exchange_list(request: web.BaseRequest):
         for k in ("connection_id", "role", "state")
         if request.query.get(k, "") != ""
     }
+    (limit, offset) = get_paging_params(request.query)
+
+    if get_stream_param(request):
+        records = V10PresentationExchange.iter_query(
+            session, tag_filter, post_filter_positive=post_filter
+        )
+        return await ndjson_response(
+            request, (record.serialize() async for record in records)
+        )
 
     try:
         records = await V10PresentationExchange.query(
             session=session,
             tag_filter=tag_filter,
             post_filter_positive=post_filter,
+            limit=limit,
+            offset=offset,
         )
-        results = [record.serialize() for record in records]
+        response = {"results": [record.serialize() for record in records]}
+        if get_count_param(request):
+            response["total"] = await V10PresentationExchange.count(
+                session, tag_filter, post_filter_positive=post_filter
+            )
     except (StorageError, BaseModelError) as err:
         raise web.HTTPBadRequest(reason=err.roll_up) from err
 
-    return web.json_response({"results": results})
+    return web.json_response(response)
 
 
 @docs(tags=["present-proof"], summary="Fetch a single presentation exchange record")
@@ -16,7 +16,7 @@ class TestProofRoutes(AsyncTestCase):
     def setUp(self):
         self.session_inject = {}
         self.context = AdminRequestContext.test_context(self.session_inject)
-        self.request_dict = {"context": self.context}
+        self.request_dict = {"context": self.context, "data": {}}
         self.request = async_mock.MagicMock(
             app={"outbound_message_router": async_mock.CoroutineMock()},
             match_info={},
@@ -86,6 +86,23 @@ class TestProofRoutes(AsyncTestCase):
                     {"results": [mock_presentation_exchange.serialize.return_value]}
                 )
 
+    async def test_presentation_exchange_list_count(self):
+        self.request.query = {"offset": "5", "count": "true"}
+        self.request_dict["data"] = {"count": True}
+
+        with async_mock.patch.object(
+            test_module, "V10PresentationExchange", autospec=True
+        ) as mock_pres_ex, async_mock.patch.object(
+            test_module.web, "json_response"
+        ) as mock_response:
+            mock_pres_ex.query = async_mock.CoroutineMock(return_value=[])
+            mock_pres_ex.count = async_mock.CoroutineMock(return_value=5)
+            await test_module.presentation_exchange_list(self.request)
+            mock_pres_ex.count.assert_awaited_once_with(
+                async_mock.ANY, {}, post_filter_positive={}
+            )
+            mock_response.assert_called_once_with({"results": [], "total": 5})
+
     async def test_presentation_exchange_list_x(self):
         self.request.query = {
             "thread_id": "thread_id_0",
@@ -1,7 +1,7 @@
 """Routing manager classes for tracking and inspecting routing records."""
 
 import json
-from typing import Coroutine, Sequence
+from typing import Coroutine, Mapping, Sequence
 
 from ....core.error import BaseError
 from ....core.profile import ProfileSession
@@ -121,7 +121,7 @@ class RoutingManager:
         async for record in storage.search_records(RoutingManager.RECORD_TYPE, filters):
             value = json.loads(record.value)
             value.update(record.tags)
-            results.append(RouteRecord(**value))
+            results.append(RouteRecord(record_id=record.id, **value))
         return results
 
     async def create_route_record(
@@ -137,35 +137,64 @@ class RoutingManager:
         Returns:
             The new routing record
 
+        """
+        routes = await self.create_route_records(client_connection_id, [recipient_key])
+        return routes[0]
+
+    async def delete_route_record(self, route: RouteRecord):
+        """Remove an existing route record."""
+        await self.delete_route_records([route])
+
+    async def create_route_records(
+        self, client_connection_id: str, recipient_keys: Sequence[str]
+    ) -> Sequence[RouteRecord]:
+        """
+        Create and store a batch of new RouteRecords for one connection.
+
+        Args:
+            client_connection_id: The ID of the connection record
+            recipient_keys: The recipient verkeys of the routes
+
+        Returns:
+            The new routing records
+
         """
         if not client_connection_id:
             raise RoutingManagerError("Missing client_connection_id")
-        if not recipient_key:
+        if not all(recipient_keys):
             raise RoutingManagerError("Missing recipient_key")
         value = {"created_at": time_now(), "updated_at": time_now()}
-        record = StorageRecord(
-            RoutingManager.RECORD_TYPE,
-            json.dumps(value),
-            {"connection_id": client_connection_id, "recipient_key": recipient_key},
-        )
+        records = [
+            StorageRecord(
+                RoutingManager.RECORD_TYPE,
+                json.dumps(value),
+                {"connection_id": client_connection_id, "recipient_key": recip_key},
+            )
+            for recip_key in recipient_keys
+        ]
         storage: BaseStorage = self._session.inject(BaseStorage)
-        await storage.add_record(record)
-        result = RouteRecord(
-            record_id=record.id,
-            connection_id=client_connection_id,
-            recipient_key=recipient_key,
-            created_at=value["created_at"],
-            updated_at=value["updated_at"],
-        )
-        return result
-
-    async def delete_route_record(self, route: RouteRecord):
-        """Remove an existing route record."""
-        if route and route.record_id:
-            storage: BaseStorage = self._session.inject(BaseStorage)
-            await storage.delete_record(
-                StorageRecord(RoutingManager.RECORD_TYPE, None, None, route.record_id)
+        await storage.add_records(records)
+        return [
+            RouteRecord(
+                record_id=record.id,
+                connection_id=client_connection_id,
+                recipient_key=record.tags["recipient_key"],
+                created_at=value["created_at"],
+                updated_at=value["updated_at"],
             )
+            for record in records
+        ]
+
+    async def delete_route_records(self, routes: Sequence[RouteRecord]):
+        """Remove a batch of existing route records."""
+        records = [
+            StorageRecord(RoutingManager.RECORD_TYPE, None, None, route.record_id)
+            for route in routes
+            if route and route.record_id
+        ]
+        if records:
+            storage: BaseStorage = self._session.inject(BaseStorage)
+            await storage.delete_records(records)
 
     async def update_routes(
         self, client_connection_id: str, updates: Sequence[RouteUpdate]
@@ -173,6 +202,10 @@ class RoutingManager:
         """
         Update routes associated with the current connection.
 
+        Creations and deletions are each applied to storage as one batch. When
+        a batch fails, its routes are retried one at a time so that each update
+        reports its own result.
+
         Args:
             client_connection_id: The ID of the connection record
             updates: The sequence of route updates (create/delete) to perform.
@@ -184,6 +217,8 @@ class RoutingManager:
             exist[route.recipient_key] = route
 
         updated = []
+        create = {}
+        delete = {}
         for update in updates:
             result = RouteUpdated(
                 recipient_key=update.recipient_key, action=update.action
@@ -192,30 +227,82 @@ class RoutingManager:
             if not recip_key:
                 result.result = RouteUpdated.RESULT_CLIENT_ERROR
             elif update.action == RouteUpdate.ACTION_CREATE:
-                if recip_key in exist:
+                if recip_key in exist or recip_key in create:
                     result.result = RouteUpdated.RESULT_NO_CHANGE
                 else:
-                    try:
-                        await self.create_route_record(client_connection_id, recip_key)
-                    except RoutingManagerError:
-                        result.result = RouteUpdated.RESULT_SERVER_ERROR
-                    else:
-                        result.result = RouteUpdated.RESULT_SUCCESS
+                    create[recip_key] = result
             elif update.action == RouteUpdate.ACTION_DELETE:
-                if recip_key in exist:
-                    try:
-                        await self.delete_route_record(exist[recip_key])
-                    except StorageError:
-                        result.result = RouteUpdated.RESULT_SERVER_ERROR
-                    else:
-                        result.result = RouteUpdated.RESULT_SUCCESS
+                if recip_key in exist and recip_key not in delete:
+                    delete[recip_key] = result
                 else:
                     result.result = RouteUpdated.RESULT_NO_CHANGE
             else:
                 result.result = RouteUpdated.RESULT_CLIENT_ERROR
             updated.append(result)
+
+        if create:
+            try:
+                await self.create_route_records(client_connection_id, list(create))
+                outcomes = dict.fromkeys(create, RouteUpdated.RESULT_SUCCESS)
+            except RoutingManagerError:
+                outcomes = dict.fromkeys(create, RouteUpdated.RESULT_SERVER_ERROR)
+            except StorageError:
+                outcomes = await self._create_routes_singly(
+                    client_connection_id, list(create)
+                )
+            for recip_key, result in create.items():
+                result.result = outcomes[recip_key]
+
+        if delete:
+            routes = [exist[recip_key] for recip_key in delete]
+            try:
+                await self.delete_route_records(routes)
+                outcomes = dict.fromkeys(delete, RouteUpdated.RESULT_SUCCESS)
+            except StorageError:
+                outcomes = await self._delete_routes_singly(routes)
+            for recip_key, result in delete.items():
+                result.result = outcomes[recip_key]
+
         return updated
 
+    async def _create_routes_singly(
+        self, client_connection_id: str, recipient_keys: Sequence[str]
+    ) -> Mapping[str, str]:
+        """Create the routes left out by a failed batch, reporting each result."""
+        try:
+            stored = {
+                route.recipient_key
+                for route in await self.get_routes(
+                    client_connection_id, {"recipient_key": list(recipient_keys)}
+                )
+            }
+        except StorageError:
+            stored = set()
+        outcomes = {}
+        for recip_key in recipient_keys:
+            outcomes[recip_key] = RouteUpdated.RESULT_SUCCESS
+            if recip_key not in stored:
+                try:
+                    await self.create_route_record(client_connection_id, recip_key)
+                except (RoutingManagerError, StorageError):
+                    outcomes[recip_key] = RouteUpdated.RESULT_SERVER_ERROR
+        return outcomes
+
+    async def _delete_routes_singly(
+        self, routes: Sequence[RouteRecord]
+    ) -> Mapping[str, str]:
+        """Delete the routes left over by a failed batch, reporting each result."""
+        outcomes = {}
+        for route in routes:
+            outcomes[route.recipient_key] = RouteUpdated.RESULT_SUCCESS
+            try:
+                await self.delete_route_record(route)
+            except StorageNotFoundError:
+                pass  # removed before the batch failed
+            except StorageError:
+                outcomes[route.recipient_key] = RouteUpdated.RESULT_SERVER_ERROR
+        return outcomes
+
     async def send_create_route(
         self, router_connection_id: str, recip_key: str, outbound_handler: Coroutine
     ):
@@ -2,6 +2,7 @@ from asynctest import TestCase as AsyncTestCase
 from asynctest import mock as async_mock
 
 from .....messaging.request_context import RequestContext
+from .....storage.base import BaseStorage
 from .....storage.error import (
     StorageDuplicateError,
     StorageError,
@@ -210,9 +211,9 @@ class TestRoutingManager(AsyncTestCase):
 
     async def test_update_routes_create_server_error(self):
         with async_mock.patch.object(
-            self.manager, "create_route_record", async_mock.CoroutineMock()
-        ) as mock_mgr_create_route_record:
-            mock_mgr_create_route_record.side_effect = RoutingManagerError()
+            self.manager, "create_route_records", async_mock.CoroutineMock()
+        ) as mock_mgr_create_route_records:
+            mock_mgr_create_route_records.side_effect = RoutingManagerError()
             results = await self.manager.update_routes(
                 client_connection_id=TEST_CONN_ID,
                 updates=[
@@ -244,9 +245,9 @@ class TestRoutingManager(AsyncTestCase):
     async def test_update_routes_delete_server_error(self):
         record = await self.manager.create_route_record(TEST_CONN_ID, TEST_ROUTE_VERKEY)
         with async_mock.patch.object(
-            self.manager, "delete_route_record", async_mock.CoroutineMock()
-        ) as mock_mgr_delete_route_record:
-            mock_mgr_delete_route_record.side_effect = StorageError()
+            self.manager, "delete_route_records", async_mock.CoroutineMock()
+        ) as mock_mgr_delete_route_records:
+            mock_mgr_delete_route_records.side_effect = StorageError()
             results = await self.manager.update_routes(
                 client_connection_id=TEST_CONN_ID,
                 updates=[
@@ -261,6 +262,104 @@ class TestRoutingManager(AsyncTestCase):
             assert results[0].action == RouteUpdate.ACTION_DELETE
             assert results[0].result == RouteUpdated.RESULT_SERVER_ERROR
 
+    async def test_update_routes_batch(self):
+        other_verkey = TEST_VERKEY
+        await self.manager.create_route_record(TEST_CONN_ID, TEST_ROUTE_VERKEY)
+        with async_mock.patch.object(
+            self.session.inject(BaseStorage),
+            "add_records",
+            async_mock.CoroutineMock(),
+        ) as mock_add_records:
+            results = await self.manager.update_routes(
+                client_connection_id=TEST_CONN_ID,
+                updates=[
+                    RouteUpdate(
+                        recipient_key=other_verkey, action=RouteUpdate.ACTION_CREATE
+                    ),
+                    RouteUpdate(
+                        recipient_key=other_verkey, action=RouteUpdate.ACTION_CREATE
+                    ),
+                    RouteUpdate(
+                        recipient_key=TEST_ROUTE_VERKEY,
+                        action=RouteUpdate.ACTION_DELETE,
+                    ),
+                ],
+            )
+            mock_add_records.assert_awaited_once()
+            assert len(mock_add_records.call_args[0][0]) == 1
+        assert [result.result for result in results] == [
+            RouteUpdated.RESULT_SUCCESS,
+            RouteUpdated.RESULT_NO_CHANGE,
+            RouteUpdated.RESULT_SUCCESS,
+        ]
+        assert not await self.manager.get_routes(TEST_CONN_ID)
+
+    async def test_update_routes_create_batch_error(self):
+        storage = self.session.inject(BaseStorage)
+        add_records = storage.add_records
+
+        async def add_some(records):
+            if len(records) > 1 or records[0].tags["recipient_key"] == TEST_VERKEY:
+                raise StorageError()
+            await add_records(records)
+
+        with async_mock.patch.object(
+            storage, "add_records", async_mock.CoroutineMock(side_effect=add_some)
+        ):
+            results = await self.manager.update_routes(
+                client_connection_id=TEST_CONN_ID,
+                updates=[
+                    RouteUpdate(
+                        recipient_key=TEST_VERKEY, action=RouteUpdate.ACTION_CREATE
+                    ),
+                    RouteUpdate(
+                        recipient_key=TEST_ROUTE_VERKEY,
+                        action=RouteUpdate.ACTION_CREATE,
+                    ),
+                ],
+            )
+        assert [result.result for result in results] == [
+            RouteUpdated.RESULT_SERVER_ERROR,
+            RouteUpdated.RESULT_SUCCESS,
+        ]
+        routes = await self.manager.get_routes(TEST_CONN_ID)
+        assert [route.recipient_key for route in routes] == [TEST_ROUTE_VERKEY]
+
+    async def test_update_routes_delete_batch_error(self):
+        await self.manager.create_route_records(
+            TEST_CONN_ID, [TEST_VERKEY, TEST_ROUTE_VERKEY]
+        )
+        storage = self.session.inject(BaseStorage)
+        delete_records = storage.delete_records
+
+        async def delete_first(records):
+            await delete_records(records[:1])
+            if len(records) > 1:
+                raise StorageError()
+
+        with async_mock.patch.object(
+            storage,
+            "delete_records",
+            async_mock.CoroutineMock(side_effect=delete_first),
+        ):
+            results = await self.manager.update_routes(
+                client_connection_id=TEST_CONN_ID,
+                updates=[
+                    RouteUpdate(
+                        recipient_key=TEST_VERKEY, action=RouteUpdate.ACTION_DELETE
+                    ),
+                    RouteUpdate(
+                        recipient_key=TEST_ROUTE_VERKEY,
+                        action=RouteUpdate.ACTION_DELETE,
+                    ),
+                ],
+            )
+        assert [result.result for result in results] == [
+            RouteUpdated.RESULT_SUCCESS,
+            RouteUpdated.RESULT_SUCCESS,
+        ]
+        assert not await self.manager.get_routes(TEST_CONN_ID)
+
     async def test_send_create_route(self):
         mock_outbound_handler = async_mock.CoroutineMock()
         await self.manager.send_create_route(
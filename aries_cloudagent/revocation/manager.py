@@ -7,6 +7,7 @@ from typing import Mapping, Sequence, Text
 from ..core.error import BaseError
 from ..core.profile import ProfileSession
 from ..indy.issuer import IndyIssuer
+from ..ledger.write_queue import LedgerWriteQueue
 from ..storage.error import StorageNotFoundError
 
 from .indy import IndyRevocation
@@ -97,13 +98,20 @@ class RevocationManager:
 
             # pick up pending revocations on input revocation registry
             crids = list(set(issuer_rr_rec.pending_pub + [cred_rev_id]))
-            (delta_json, _) = await issuer.revoke_credentials(
-                issuer_rr_rec.revoc_reg_id, issuer_rr_rec.tails_local_path, crids
-            )
-            if delta_json:
-                issuer_rr_rec.revoc_reg_entry = json.loads(delta_json)
-                await issuer_rr_rec.send_entry(self._session)
-                await issuer_rr_rec.clear_pending(self._session)
+            # revocations already queued for publication are applied to the wallet
+            queued = issuer_rr_rec.queued_crids
+            unapplied = [crid for crid in crids if crid not in queued]
+            delta_json = None
+            if unapplied:
+                (delta_json, _) = await issuer.revoke_credentials(
+                    issuer_rr_rec.revoc_reg_id,
+                    issuer_rr_rec.tails_local_path,
+                    unapplied,
+                )
+            if delta_json or queued:
+                await self._publish_entry(
+                    issuer_rr_rec, delta_json and json.loads(delta_json), crids
+                )
 
         else:
             await issuer_rr_rec.mark_pending(self._session, cred_rev_id)
@@ -150,19 +158,55 @@ class RevocationManager:
                     if crid in (rrid2crid[rrid] or []) or not rrid2crid[rrid]
                 ]
             if crids:
-                (delta_json, failed_crids) = await issuer.revoke_credentials(
-                    issuer_rr_rec.revoc_reg_id,
-                    issuer_rr_rec.tails_local_path,
-                    crids,
-                )
-                issuer_rr_rec.revoc_reg_entry = json.loads(delta_json)
-                await issuer_rr_rec.send_entry(self._session)
+                # revocations already queued for publication are applied to the
+                # wallet, and are published again with any new ones
+                queued = issuer_rr_rec.queued_crids
+                unapplied = [crid for crid in crids if crid not in queued]
+                delta_json = None
+                failed_crids = []
+                if unapplied:
+                    (delta_json, failed_crids) = await issuer.revoke_credentials(
+                        issuer_rr_rec.revoc_reg_id,
+                        issuer_rr_rec.tails_local_path,
+                        unapplied,
+                    )
                 published = [crid for crid in crids if crid not in failed_crids]
+                await self._publish_entry(
+                    issuer_rr_rec, delta_json and json.loads(delta_json), published
+                )
                 result[issuer_rr_rec.revoc_reg_id] = published
-                await issuer_rr_rec.clear_pending(self._session, published)
 
         return result
 
+    async def _publish_entry(
+        self,
+        issuer_rr_rec: IssuerRevRegRecord,
+        entry: dict,
+        cred_rev_ids: Sequence[str],
+    ):
+        """
+        Publish a revocation registry entry to the ledger and clear its revocations.
+
+        When a ledger write queue is configured, the entry is queued for publication
+        in the background instead of being sent before returning, and the pending
+        revocations are only cleared once the ledger write succeeds.
+
+        Args:
+            issuer_rr_rec: The issuer revocation registry record
+            entry: The registry entry to publish, if any
+            cred_rev_ids: The credential revocation identifiers it publishes
+
+        """
+        write_queue = self._session.inject(LedgerWriteQueue, required=False)
+        if write_queue:
+            await issuer_rr_rec.queue_entry(
+                self._session, write_queue, entry, cred_rev_ids
+            )
+        elif entry:
+            issuer_rr_rec.revoc_reg_entry = entry
+            await issuer_rr_rec.send_entry(self._session)
+            await issuer_rr_rec.clear_pending(self._session, cred_rev_ids)
+
     async def clear_pending_revocations(
         self, purge: Mapping[Text, Sequence[Text]] = None
     ) -> Mapping[Text, Sequence[Text]]:
@@ -8,13 +8,13 @@ from asyncio import shield
 from functools import total_ordering
 from os.path import join
 from shutil import move
-from typing import Any, Sequence
+from typing import Any, Sequence, Set
 from urllib.parse import urlparse
 
 from marshmallow import fields, validate
 
 from ...core.profile import ProfileSession
-from ...indy.util import indy_client_dir
+from ...indy.util import diff_rev_reg_deltas, indy_client_dir, merge_rev_reg_deltas
 from ...indy.issuer import IndyIssuer, IndyIssuerError
 from ...messaging.models.base_record import BaseRecord, BaseRecordSchema
 from ...messaging.valid import (
@@ -25,6 +25,8 @@ from ...messaging.valid import (
     UUIDFour,
 )
 from ...ledger.base import BaseLedger
+from ...ledger.cache import REV_REG_ENTRY
+from ...ledger.write_queue import LedgerWrite, LedgerWriteQueue
 from ...tails.base import BaseTailsServer
 
 from ..error import RevocationError
@@ -83,6 +85,7 @@ class IssuerRevRegRecord(BaseRecord):
         tails_local_path: str = None,
         tails_public_uri: str = None,
         pending_pub: Sequence[str] = None,
+        queued_entry: dict = None,
         **kwargs,
     ):
         """Initialize the issuer revocation registry record."""
@@ -104,6 +107,7 @@ class IssuerRevRegRecord(BaseRecord):
         self.pending_pub = (
             sorted(list(set(pending_pub))) if pending_pub else []
         )  # order for eq comparison between instances
+        self.queued_entry = queued_entry
 
     @property
     def record_id(self) -> str:
@@ -125,6 +129,7 @@ class IssuerRevRegRecord(BaseRecord):
                 "tails_public_uri",
                 "tails_local_path",
                 "pending_pub",
+                "queued_entry",
             )
         }
 
@@ -249,6 +254,112 @@ class IssuerRevRegRecord(BaseRecord):
 
     async def send_entry(self, session: ProfileSession):
         """Send a registry entry to the ledger."""
+        self._check_entry()
+
+        ledger: BaseLedger = session.inject(BaseLedger)
+        async with ledger:
+            await ledger.send_revoc_reg_entry(
+                self.revoc_reg_id,
+                self.revoc_def_type,
+                self.revoc_reg_entry,
+                self.issuer_did,
+            )
+        if self.state == IssuerRevRegRecord.STATE_POSTED:
+            self.state = IssuerRevRegRecord.STATE_ACTIVE  # initial entry activates
+            await self.save(
+                session, reason="Published initial revocation registry entry"
+            )
+
+    @property
+    def queued_crids(self) -> Set[str]:
+        """Accessor for the revocations in the entry queued for publication."""
+        if not self.queued_entry:
+            return set()
+        return {str(crid) for crid in self.queued_entry["value"].get("revoked") or []}
+
+    async def queue_entry(
+        self,
+        session: ProfileSession,
+        write_queue: LedgerWriteQueue,
+        entry: dict = None,
+        cred_rev_ids: Sequence[str] = (),
+    ) -> LedgerWrite:
+        """
+        Queue a registry entry for publication to the ledger.
+
+        The entry is merged into the queued entry saved on this record, which keeps
+        revocations applied to the wallet until the ledger has accepted them. The
+        revoked credentials stay pending, and are only cleared once the write
+        succeeds; after a failed or discarded write, queuing again (with or without
+        a new entry) publishes everything still outstanding.
+
+        Args:
+            session: The profile session to use
+            write_queue: The ledger write queue
+            entry: The registry delta to add to the queued entry, if any
+            cred_rev_ids: Credential revocation identifiers revoked by the entry
+
+        Returns:
+            The queued ledger write, or `None` if nothing is left to publish
+
+        """
+        self._check_entry()
+        if self._id:
+            # pick up a queued entry published or extended since this was loaded
+            latest = await IssuerRevRegRecord.retrieve_by_id(session, self._id)
+            self.queued_entry = latest.queued_entry
+            self.pending_pub = latest.pending_pub
+        if entry:
+            self.queued_entry = (
+                merge_rev_reg_deltas(self.queued_entry, entry)
+                if self.queued_entry
+                else entry
+            )
+        self.pending_pub = sorted(set(self.pending_pub) | set(cred_rev_ids))
+        await self.save(session, reason="Queued revocation registry entry")
+        if not self.queued_entry:
+            return None
+
+        return write_queue.enqueue(
+            REV_REG_ENTRY,
+            self.revoc_reg_id,
+            self._send_queued_entry,
+            merge=self._merge_queued_writes,
+        )
+
+    @staticmethod
+    def _merge_queued_writes(payload: Any, _later: Any) -> Any:
+        """Combine queued writes of one registry, which all send its queued entry."""
+        return payload
+
+    async def _send_queued_entry(self, session: ProfileSession, _payload=None):
+        """Publish the queued entry, clearing what it revoked once it is accepted."""
+        record = await IssuerRevRegRecord.retrieve_by_revoc_reg_id(
+            session, self.revoc_reg_id
+        )
+        entry = record.queued_entry
+        if not entry:
+            return  # published by an earlier write
+        record.revoc_reg_entry = entry
+        await record.send_entry(session)
+
+        # revocations queued while the entry was sent remain to be published
+        record = await IssuerRevRegRecord.retrieve_by_revoc_reg_id(
+            session, self.revoc_reg_id
+        )
+        published = {str(crid) for crid in entry["value"].get("revoked") or []}
+        if record.queued_entry and record.queued_entry != entry:
+            record.queued_entry = diff_rev_reg_deltas(entry, record.queued_entry)
+        else:
+            record.queued_entry = None
+        record.revoc_reg_entry = entry
+        record.pending_pub = [
+            crid for crid in record.pending_pub if crid not in published
+        ]
+        await record.save(session, reason="Published queued revocation registry entry")
+
+    def _check_entry(self):
+        """Check that the registry entry may be published."""
         if not (
             self.revoc_reg_id
             and self.revoc_def_type
@@ -270,20 +381,6 @@ class IssuerRevRegRecord(BaseRecord):
                 )
             )
 
-        ledger: BaseLedger = session.inject(BaseLedger)
-        async with ledger:
-            await ledger.send_revoc_reg_entry(
-                self.revoc_reg_id,
-                self.revoc_def_type,
-                self.revoc_reg_entry,
-                self.issuer_did,
-            )
-        if self.state == IssuerRevRegRecord.STATE_POSTED:
-            self.state = IssuerRevRegRecord.STATE_ACTIVE  # initial entry activates
-            await self.save(
-                session, reason="Published initial revocation registry entry"
-            )
-
     async def mark_pending(self, session: ProfileSession, cred_rev_id: str) -> None:
         """Mark a credential revocation id as revoked pending publication to ledger.
 
@@ -461,3 +558,10 @@ class IssuerRevRegRecordSchema(BaseRecordSchema):
         ),
         required=False,
     )
+    queued_entry = fields.Dict(
+        required=False,
+        description=(
+            "Revocation registry entry applied to the wallet and queued for "
+            "publication to ledger"
+        ),
+    )
@@ -8,6 +8,8 @@ from ....core.in_memory import InMemoryProfile
 from ....indy.issuer import IndyIssuer, IndyIssuerError
 from ....indy.util import indy_client_dir
 from ....ledger.base import BaseLedger
+from ....ledger.error import LedgerRejectedError
+from ....ledger.write_queue import STATE_COMPLETE, STATE_FAILED, LedgerWriteQueue
 from ....tails.base import BaseTailsServer
 from ....wallet.base import DIDInfo
 
@@ -177,6 +179,93 @@ class TestIssuerRevRegRecord(AsyncTestCase):
         found = await IssuerRevRegRecord.query_by_pending(self.session)
         assert not found
 
+    async def test_queue_entry(self):
+        profile = self.session.profile
+        profile.context.injector.bind_instance(BaseLedger, self.ledger)
+        write_queue = LedgerWriteQueue(profile)
+        rec = IssuerRevRegRecord(
+            issuer_did=TEST_DID,
+            revoc_reg_id=REV_REG_ID,
+            revoc_reg_entry={"ver": "1.0", "value": {"accum": "0"}},
+            tails_public_uri="http://1.2.3.4:8088/rev-reg",
+            state=IssuerRevRegRecord.STATE_ACTIVE,
+        )
+        await rec.save(self.session)
+
+        # a failed write leaves the revocation pending and queued
+        self.ledger.send_revoc_reg_entry.side_effect = LedgerRejectedError("no")
+        write = await rec.queue_entry(
+            self.session,
+            write_queue,
+            {"ver": "1.0", "value": {"prevAccum": "0", "accum": "1", "revoked": [1]}},
+            ["1"],
+        )
+        assert rec.pending_pub == ["1"]
+        assert (await write.done).state == STATE_FAILED
+        rec = await IssuerRevRegRecord.retrieve_by_id(self.session, rec.record_id)
+        assert rec.pending_pub == ["1"]
+        assert rec.queued_crids == {"1"}
+
+        # the next write publishes it along with the new revocation
+        self.ledger.send_revoc_reg_entry.side_effect = None
+        write = await rec.queue_entry(
+            self.session,
+            write_queue,
+            {"ver": "1.0", "value": {"prevAccum": "1", "accum": "2", "revoked": [2]}},
+            ["2"],
+        )
+        assert (await write.done).state == STATE_COMPLETE
+        entry = {
+            "ver": "1.0",
+            "value": {"prevAccum": "0", "accum": "2", "issued": [], "revoked": [1, 2]},
+        }
+        self.ledger.send_revoc_reg_entry.assert_awaited_with(
+            REV_REG_ID, "CL_ACCUM", entry, TEST_DID
+        )
+        rec = await IssuerRevRegRecord.retrieve_by_id(self.session, rec.record_id)
+        assert rec.pending_pub == []
+        assert rec.queued_entry is None
+        assert rec.revoc_reg_entry == entry
+
+        # nothing is left to publish
+        assert await rec.queue_entry(self.session, write_queue) is None
+
+        # a revocation queued while an entry is sent follows in the next write
+        later = []
+
+        async def send_revoc_reg_entry(*args):
+            if not later:
+                later.append(
+                    await rec.queue_entry(
+                        self.session,
+                        write_queue,
+                        {"ver": "1.0", "value": {"accum": "4", "revoked": [4]}},
+                        ["4"],
+                    )
+                )
+
+        self.ledger.send_revoc_reg_entry.side_effect = send_revoc_reg_entry
+        write = await rec.queue_entry(
+            self.session,
+            write_queue,
+            {"ver": "1.0", "value": {"prevAccum": "2", "accum": "3", "revoked": [3]}},
+            ["3"],
+        )
+        await write.done
+        assert (await later[0].done).state == STATE_COMPLETE
+        self.ledger.send_revoc_reg_entry.assert_awaited_with(
+            REV_REG_ID,
+            "CL_ACCUM",
+            {
+                "ver": "1.0",
+                "value": {"prevAccum": "3", "accum": "4", "issued": [], "revoked": [4]},
+            },
+            TEST_DID,
+        )
+        rec = await IssuerRevRegRecord.retrieve_by_id(self.session, rec.record_id)
+        assert rec.pending_pub == []
+        assert rec.queued_entry is None
+
     async def test_set_tails_file_public_uri_rev_reg_undef(self):
         rec = IssuerRevRegRecord()
         with self.assertRaises(RevocationError):
@@ -14,6 +14,7 @@ from ...protocols.issue_credential.v1_0.models.credential_exchange import (
     V10CredentialExchange,
 )
 from ...ledger.base import BaseLedger
+from ...ledger.write_queue import LedgerWriteQueue
 from ...storage.base import StorageRecord
 from ...storage.error import StorageNotFoundError
 
@@ -86,6 +87,71 @@ class TestRevocationManager(AsyncTestCase):
 
             await self.manager.revoke_credential_by_cred_ex_id(CRED_EX_ID, publish=True)
 
+    async def test_revoke_credential_publish_queued(self):
+        CRED_REV_ID = "1"
+        write_queue = async_mock.MagicMock(LedgerWriteQueue, autospec=True)
+        self.session.context.injector.bind_instance(LedgerWriteQueue, write_queue)
+        with async_mock.patch.object(
+            test_module, "IndyRevocation", autospec=True
+        ) as revoc:
+            mock_issuer_rev_reg_record = async_mock.MagicMock(
+                revoc_reg_id=REV_REG_ID,
+                tails_local_path=TAILS_LOCAL,
+                pending_pub=["2"],
+                queued_crids=set(),
+                send_entry=async_mock.CoroutineMock(),
+                queue_entry=async_mock.CoroutineMock(),
+                clear_pending=async_mock.CoroutineMock(),
+            )
+            revoc.return_value.get_issuer_rev_reg_record = async_mock.CoroutineMock(
+                return_value=mock_issuer_rev_reg_record
+            )
+            revoc.return_value.get_ledger_registry = async_mock.CoroutineMock(
+                return_value=async_mock.MagicMock(
+                    get_or_fetch_local_tails_path=async_mock.CoroutineMock()
+                )
+            )
+
+            issuer = async_mock.MagicMock(IndyIssuer, autospec=True)
+            issuer.revoke_credentials = async_mock.CoroutineMock(
+                return_value=(
+                    json.dumps(
+                        {
+                            "ver": "1.0",
+                            "value": {"prevAccum": "1 ...", "accum": "21 ..."},
+                        }
+                    ),
+                    [],
+                )
+            )
+            self.session.context.injector.bind_instance(IndyIssuer, issuer)
+
+            await self.manager.revoke_credential(REV_REG_ID, CRED_REV_ID, publish=True)
+
+            mock_issuer_rev_reg_record.queue_entry.assert_awaited_once_with(
+                self.session,
+                write_queue,
+                {"ver": "1.0", "value": {"prevAccum": "1 ...", "accum": "21 ..."}},
+                async_mock.ANY,
+            )
+            assert sorted(mock_issuer_rev_reg_record.queue_entry.call_args[0][3]) == [
+                "1",
+                "2",
+            ]
+            mock_issuer_rev_reg_record.send_entry.assert_not_called()
+            # pending revocations are cleared once the queued write succeeds
+            mock_issuer_rev_reg_record.clear_pending.assert_not_called()
+
+            # revocations already queued are published again, not revoked again
+            issuer.revoke_credentials.reset_mock()
+            mock_issuer_rev_reg_record.queue_entry.reset_mock()
+            mock_issuer_rev_reg_record.queued_crids = {"1", "2"}
+            await self.manager.revoke_credential(REV_REG_ID, CRED_REV_ID, publish=True)
+            issuer.revoke_credentials.assert_not_called()
+            mock_issuer_rev_reg_record.queue_entry.assert_awaited_once_with(
+                self.session, write_queue, None, async_mock.ANY
+            )
+
     async def test_revoke_cred_by_cxid_not_found(self):
         CRED_EX_ID = "dummy-cxid"
         CRED_REV_ID = "1"
@@ -74,6 +74,55 @@ class BaseStorage(ABC):
 
         """
 
+    async def add_records(self, records: Sequence[StorageRecord]):
+        """
+        Add a batch of new records to the store.
+
+        Args:
+            records: `StorageRecord` instances to be stored
+
+        """
+        for record in records:
+            await self.add_record(record)
+
+    async def update_records(self, records: Sequence[StorageRecord]):
+        """
+        Update a batch of existing stored records' values and tags.
+
+        Args:
+            records: `StorageRecord` instances holding the new values and tags
+
+        """
+        for record in records:
+            await self.update_record(record, record.value, record.tags)
+
+    async def delete_records(self, records: Sequence[StorageRecord]):
+        """
+        Delete a batch of existing records.
+
+        Args:
+            records: `StorageRecord` instances to delete
+
+        """
+        for record in records:
+            await self.delete_record(record)
+
+    async def delete_all_records(self, type_filter: str, tag_query: Mapping = None):
+        """
+        Delete all records matching a type filter and tag query.
+
+        Args:
+            type_filter: Filter string
+            tag_query: Tags to query
+
+        """
+        scan = self.search_records(
+            type_filter, tag_query, None, {"retrieveTags": False}
+        )
+        records = await scan.fetch_all()
+        if records:
+            await self.delete_records(records)
+
     async def find_record(
         self, type_filter: str, tag_query: Mapping = None, options: Mapping = None
     ) -> StorageRecord:
@@ -0,0 +1,207 @@
+"""Bulk import and export of storage records as newline-delimited JSON."""
+
+import asyncio
+import json
+import time
+
+from typing import AsyncIterator, Iterable, Sequence, TextIO
+
+from ..core.profile import Profile
+
+from .base import BaseStorage
+from .error import StorageError
+from .record import StorageRecord
+
+DEFAULT_BATCH_SIZE = 500
+DEFAULT_CONCURRENCY = 4
+
+
+class BulkStats:
+    """Counters for a bulk import or export run."""
+
+    def __init__(self):
+        """Initialize the counters."""
+        self.count = 0
+        self.by_type = {}
+        self.started = time.perf_counter()
+        self.stopped = None
+
+    def add(self, records: Sequence[StorageRecord]):
+        """Record a batch of processed records."""
+        self.count += len(records)
+        for record in records:
+            self.by_type[record.type] = self.by_type.get(record.type, 0) + 1
+
+    def stop(self):
+        """Stop the elapsed time counter."""
+        self.stopped = time.perf_counter()
+
+    @property
+    def elapsed(self) -> float:
+        """Accessor for the elapsed time in seconds."""
+        return (self.stopped or time.perf_counter()) - self.started
+
+    @property
+    def rate(self) -> float:
+        """Accessor for the number of records processed per second."""
+        elapsed = self.elapsed
+        return self.count / elapsed if elapsed > 0 else 0.0
+
+    def report(self, action: str) -> str:
+        """Format a human readable throughput summary."""
+        lines = [
+            f"{action} {self.count} records in {self.elapsed:.2f}s"
+            f" ({self.rate:.1f} records/s)"
+        ]
+        for record_type in sorted(self.by_type):
+            lines.append(f"  {record_type}: {self.by_type[record_type]}")
+        return "\n".join(lines)
+
+
+def record_from_json(line: str) -> StorageRecord:
+    """Parse a single NDJSON line into a storage record."""
+    try:
+        data = json.loads(line)
+        record_type = data["type"]
+        value = data["value"]
+    except (ValueError, TypeError, KeyError) as err:
+        raise StorageError(f"Invalid record line: {line[:80]!r}") from err
+    if not isinstance(value, str):
+        value = json.dumps(value)
+    return StorageRecord(record_type, value, data.get("tags"), data.get("id"))
+
+
+def record_to_json(record: StorageRecord) -> str:
+    """Format a storage record as a single NDJSON line."""
+    return json.dumps(
+        {
+            "type": record.type,
+            "id": record.id,
+            "value": record.value,
+            "tags": record.tags,
+        }
+    )
+
+
+def read_records(
+    lines: Iterable[str], type_filters: Sequence[str] = None
+) -> Iterable[StorageRecord]:
+    """Parse NDJSON lines into storage records, skipping blank lines."""
+    for line in lines:
+        line = line.strip()
+        if not line:
+            continue
+        record = record_from_json(line)
+        if not type_filters or record.type in type_filters:
+            yield record
+
+
+async def import_records(
+    profile: Profile,
+    records: Iterable[StorageRecord],
+    *,
+    batch_size: int = DEFAULT_BATCH_SIZE,
+    concurrency: int = DEFAULT_CONCURRENCY,
+) -> BulkStats:
+    """
+    Add records to profile storage using concurrent batched writes.
+
+    Args:
+        profile: The profile to import into
+        records: The records to add
+        batch_size: The number of records to add per storage call
+        concurrency: The maximum number of batches in flight
+
+    Returns:
+        The counters for the import
+
+    """
+    stats = BulkStats()
+    limit = asyncio.Semaphore(max(concurrency, 1))
+    pending = set()
+
+    async def write_batch(batch: Sequence[StorageRecord]):
+        try:
+            async with profile.session() as session:
+                await session.inject(BaseStorage).add_records(batch)
+            stats.add(batch)
+        finally:
+            limit.release()
+
+    async def dispatch(batch: Sequence[StorageRecord]):
+        await limit.acquire()
+        # surface errors from completed batches before queueing more work
+        for task in [task for task in pending if task.done()]:
+            pending.discard(task)
+            task.result()
+        pending.add(asyncio.ensure_future(write_batch(batch)))
+
+    try:
+        batch = []
+        for record in records:
+            batch.append(record)
+            if len(batch) >= batch_size:
+                await dispatch(batch)
+                batch = []
+        if batch:
+            await dispatch(batch)
+        if pending:
+            await asyncio.gather(*pending)
+    except BaseException:
+        for task in pending:
+            task.cancel()
+        raise
+    finally:
+        stats.stop()
+    return stats
+
+
+async def iter_records(
+    profile: Profile,
+    type_filters: Sequence[str],
+    *,
+    batch_size: int = DEFAULT_BATCH_SIZE,
+) -> AsyncIterator[Sequence[StorageRecord]]:
+    """Yield batches of stored records for each record type in turn."""
+    async with profile.session() as session:
+        storage = session.inject(BaseStorage)
+        for type_filter in type_filters:
+            search = storage.search_records(type_filter, page_size=batch_size)
+            try:
+                while True:
+                    batch = await search.fetch(batch_size)
+                    if not batch:
+                        break
+                    yield batch
+            finally:
+                await search.close()
+
+
+async def export_records(
+    profile: Profile,
+    type_filters: Sequence[str],
+    out: TextIO,
+    *,
+    batch_size: int = DEFAULT_BATCH_SIZE,
+) -> BulkStats:
+    """
+    Write stored records of the given types to a stream as NDJSON.
+
+    Args:
+        profile: The profile to export from
+        type_filters: The record types to export
+        out: The text stream to write to
+        batch_size: The number of records to fetch per storage call
+
+    Returns:
+        The counters for the export
+
+    """
+    stats = BulkStats()
+    try:
+        async for batch in iter_records(profile, type_filters, batch_size=batch_size):
+            out.write("".join(record_to_json(record) + "\n" for record in batch))
+            stats.add(batch)
+    finally:
+        stats.stop()
+    return stats
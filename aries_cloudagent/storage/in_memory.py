@@ -1,6 +1,6 @@
 """Basic in-memory storage implementation (non-wallet)."""
 
-from typing import Mapping, Sequence
+from typing import Mapping, Optional, Sequence
 
 from ..core.in_memory import InMemoryProfile
 
@@ -47,6 +47,7 @@ class InMemoryStorage(BaseStorage):
         if record.id in self.profile.records:
             raise StorageDuplicateError("Duplicate record")
         self.profile.records[record.id] = record
+        self._index_record(record)
 
     async def get_record(
         self, record_type: str, record_id: str, options: Mapping = None
@@ -89,7 +90,9 @@ class InMemoryStorage(BaseStorage):
         oldrec = self.profile.records.get(record.id)
         if not oldrec:
             raise StorageNotFoundError("Record not found: {}".format(record.id))
-        self.profile.records[record.id] = oldrec._replace(value=value, tags=tags)
+        newrec = oldrec._replace(value=value, tags=tags)
+        self.profile.records[record.id] = newrec
+        self._reindex_tags(oldrec, newrec)
 
     async def delete_record(self, record: StorageRecord):
         """
@@ -105,7 +108,118 @@ class InMemoryStorage(BaseStorage):
         validate_record(record, delete=True)
         if record.id not in self.profile.records:
             raise StorageNotFoundError("Record not found: {}".format(record.id))
-        del self.profile.records[record.id]
+        self._unindex_record(self.profile.records.pop(record.id))
+
+    async def add_records(self, records: Sequence[StorageRecord]):
+        """
+        Add a batch of new records to the store.
+
+        No records are added if any of them is invalid or already present.
+
+        Args:
+            records: `StorageRecord` instances to be stored
+
+        Raises:
+            StorageDuplicateError: If any record ID is already present
+
+        """
+        ids = set()
+        for record in records:
+            validate_record(record)
+            if record.id in self.profile.records or record.id in ids:
+                raise StorageDuplicateError("Duplicate record")
+            ids.add(record.id)
+        for record in records:
+            self.profile.records[record.id] = record
+            self._index_record(record)
+
+    async def update_records(self, records: Sequence[StorageRecord]):
+        """
+        Update a batch of existing stored records' values and tags.
+
+        No records are updated if any of them is invalid or missing.
+
+        Args:
+            records: `StorageRecord` instances holding the new values and tags
+
+        Raises:
+            StorageNotFoundError: If any record is not found
+
+        """
+        for record in records:
+            validate_record(record)
+            if record.id not in self.profile.records:
+                raise StorageNotFoundError("Record not found: {}".format(record.id))
+        for record in records:
+            oldrec = self.profile.records[record.id]
+            newrec = oldrec._replace(value=record.value, tags=record.tags)
+            self.profile.records[record.id] = newrec
+            self._reindex_tags(oldrec, newrec)
+
+    async def delete_records(self, records: Sequence[StorageRecord]):
+        """
+        Delete a batch of existing records.
+
+        No records are deleted if any of them is invalid or missing.
+
+        Args:
+            records: `StorageRecord` instances to delete
+
+        Raises:
+            StorageNotFoundError: If any record is not found
+
+        """
+        for record in records:
+            validate_record(record, delete=True)
+            if record.id not in self.profile.records:
+                raise StorageNotFoundError("Record not found: {}".format(record.id))
+        for record in records:
+            oldrec = self.profile.records.pop(record.id, None)
+            if oldrec:
+                self._unindex_record(oldrec)
+
+    async def delete_all_records(self, type_filter: str, tag_query: Mapping = None):
+        """
+        Delete all records matching a type filter and tag query.
+
+        Args:
+            type_filter: Filter string
+            tag_query: Tags to query
+
+        """
+        candidates = tag_query_candidates(self.profile, type_filter, tag_query)
+        if candidates is None:
+            candidates = self.profile.records_by_type.get(type_filter, {})
+        for record_id in list(candidates):
+            record = self.profile.records[record_id]
+            if tag_query_match(record.tags, tag_query):
+                del self.profile.records[record_id]
+                self._unindex_record(record)
+
+    def _index_record(self, record: StorageRecord):
+        """Add a stored record to the type and tag indexes."""
+        self.profile.records_by_type.setdefault(record.type, {})[record.id] = None
+        for name, value in (record.tags or {}).items():
+            if isinstance(value, str):
+                key = (record.type, name, value)
+                self.profile.records_by_tag.setdefault(key, {})[record.id] = None
+
+    def _unindex_record(self, record: StorageRecord):
+        """Remove a stored record from the type and tag indexes."""
+        _index_discard(self.profile.records_by_type, record.type, record.id)
+        for name, value in (record.tags or {}).items():
+            if isinstance(value, str):
+                key = (record.type, name, value)
+                _index_discard(self.profile.records_by_tag, key, record.id)
+
+    def _reindex_tags(self, oldrec: StorageRecord, newrec: StorageRecord):
+        """Update the tag indexes of a record in place, keeping its position."""
+        old_keys = _tag_keys(oldrec)
+        new_keys = _tag_keys(newrec)
+        for key in old_keys - new_keys:
+            _index_discard(self.profile.records_by_tag, key, oldrec.id)
+        for key in new_keys - old_keys:
+            self.profile.records_by_tag.setdefault(key, {})[newrec.id] = None
 
     def search_records(
         self,
@@ -132,6 +246,24 @@ class InMemoryStorage(BaseStorage):
         )
 
 
+def _tag_keys(record: StorageRecord) -> set:
+    """Get the tag index keys of a stored record."""
+    return {
+        (record.type, name, value)
+        for name, value in (record.tags or {}).items()
+        if isinstance(value, str)
+    }
+
+
+def _index_discard(index: dict, key, record_id: str):
+    """Remove a record ID from an index entry, dropping the entry once empty."""
+    ids = index.get(key)
+    if ids is not None:
+        ids.pop(record_id, None)
+        if not ids:
+            del index[key]
+
+
 def tag_value_match(value: str, match: dict) -> bool:
     """Match a single tag against a tag subquery.
 
@@ -181,11 +313,15 @@ def tag_query_match(tags: dict, tag_query: dict) -> bool:
                     if tag_query_match(tags, opt):
                         chk = True
                         break
+            elif k == "$and":
+                if not isinstance(v, list):
+                    raise StorageSearchError("Expected list for $and filter value")
+                chk = all(tag_query_match(tags, opt) for opt in v)
             elif k == "$not":
                 if not isinstance(v, dict):
                     raise StorageSearchError("Expected dict for $not filter value")
                 chk = not tag_query_match(tags, v)
-            elif k[0] == "$":
+            elif k.startswith("$"):
                 raise StorageSearchError("Unexpected filter operator: {}".format(k))
             elif isinstance(v, str):
                 chk = tags.get(k) == v
@@ -201,6 +337,62 @@ def tag_query_match(tags: dict, tag_query: dict) -> bool:
     return result
 
 
+def tag_query_candidates(
+    profile: InMemoryProfile, type_filter: str, tag_query: Mapping
+) -> Optional[dict]:
+    """Use the tag indexes to narrow the set of records matching a tag query.
+
+    Equality, `$in`, `$and` and `$or` clauses are resolved against the
+    `(type, name, value)` index. Returns `None` when the query cannot be
+    narrowed, in which case every record of the type must be checked.
+    The result may be a superset of the matching records.
+    """
+    if not tag_query or not isinstance(tag_query, dict):
+        return None
+
+    def lookup(name: str, value: str) -> dict:
+        return profile.records_by_tag.get((type_filter, name, value), {})
+
+    def union(sets: Sequence[Optional[dict]]) -> Optional[dict]:
+        if any(ids is None for ids in sets):
+            return None
+        result = {}
+        for ids in sets:
+            result.update(ids)
+        return result
+
+    clauses = []
+    for k, v in tag_query.items():
+        if k == "$or" and isinstance(v, list):
+            clauses.append(
+                union([tag_query_candidates(profile, type_filter, q) for q in v])
+            )
+        elif k == "$and" and isinstance(v, list):
+            clauses.extend(tag_query_candidates(profile, type_filter, q) for q in v)
+        elif k.startswith("$"):
+            continue
+        elif isinstance(v, str):
+            clauses.append(lookup(k, v))
+        elif (
+            isinstance(v, dict)
+            and list(v) == ["$in"]
+            and isinstance(v["$in"], list)
+            and all(isinstance(opt, str) for opt in v["$in"])
+        ):
+            clauses.append(union([lookup(k, opt) for opt in v["$in"]]))
+
+    clauses = [ids for ids in clauses if ids is not None]
+    if not clauses:
+        return None
+    clauses.sort(key=len)
+    smallest, others = clauses[0], clauses[1:]
+    return {
+        record_id: None
+        for record_id in smallest
+        if all(record_id in ids for ids in others)
+    }
+
+
 class InMemoryStorageRecordSearch(BaseStorageRecordSearch):
     """Represent an active stored records search."""
 
@@ -223,7 +415,12 @@ class InMemoryStorageRecordSearch(BaseStorageRecordSearch):
             options: Dictionary of backend-specific options
 
         """
-        self._cache = profile.records.copy()
+        candidates = tag_query_candidates(profile, type_filter, tag_query)
+        if candidates is None:
+            candidates = profile.records_by_type.get(type_filter, {})
+        self._cache = {
+            record_id: profile.records[record_id] for record_id in candidates
+        }
         self._iter = iter(self._cache)
         self.page_size = page_size or DEFAULT_PAGE_SIZE
         self.tag_query = tag_query
@@ -167,6 +167,53 @@ class IndySdkStorage(BaseStorage):
                 raise StorageNotFoundError(f"Record not found: {record.id}")
             raise StorageError(str(x_indy))
 
+    async def add_records(self, records: Sequence[StorageRecord]):
+        """
+        Add a batch of new records to the store.
+
+        The wallet calls are issued concurrently.
+
+        Args:
+            records: `StorageRecord` instances to be stored
+
+        """
+        for record in records:
+            validate_record(record)
+        await asyncio.gather(*(self.add_record(record) for record in records))
+
+    async def update_records(self, records: Sequence[StorageRecord]):
+        """
+        Update a batch of existing stored records' values and tags.
+
+        The wallet calls are issued concurrently.
+
+        Args:
+            records: `StorageRecord` instances holding the new values and tags
+
+        """
+        for record in records:
+            validate_record(record)
+        await asyncio.gather(
+            *(
+                self.update_record(record, record.value, record.tags)
+                for record in records
+            )
+        )
+
+    async def delete_records(self, records: Sequence[StorageRecord]):
+        """
+        Delete a batch of existing records.
+
+        The wallet calls are issued concurrently.
+
+        Args:
+            records: `StorageRecord` instances to delete
+
+        """
+        for record in records:
+            validate_record(record, delete=True)
+        await asyncio.gather(*(self.delete_record(record) for record in records))
+
     def search_records(
         self,
         type_filter: str,
@@ -0,0 +1,268 @@
+"""Storage wrapper collecting latency statistics per operation and record type."""
+
+import math
+import time
+
+from typing import Mapping, Sequence, Tuple
+
+from ..config.base import BaseProvider, BaseSettings, BaseInjector
+from ..utils.stats import Histogram
+
+from .base import BaseStorage, BaseStorageRecordSearch
+from .record import StorageRecord
+
+MIXED_RECORD_TYPES = "*"
+PROMETHEUS_CONTENT_TYPE = "text/plain; version=0.0.4"
+
+
+def _batch_type(records: Sequence[StorageRecord]) -> str:
+    """Get the shared record type of a batch, if any."""
+    types = {record.type for record in records if record}
+    return types.pop() if len(types) == 1 else MIXED_RECORD_TYPES
+
+
+def _label(value: str) -> str:
+    """Escape a Prometheus label value."""
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+class StorageMetrics:
+    """Latency histograms and result counts for storage operations."""
+
+    def __init__(self, buckets: Sequence[float] = None):
+        """Initialize the StorageMetrics instance."""
+        self.buckets = buckets
+        self.reset()
+
+    def reset(self):
+        """Clear all collected statistics."""
+        self.latency = {}
+        self.results = {}
+        self.errors = {}
+
+    def observe(
+        self,
+        operation: str,
+        record_type: str,
+        duration: float,
+        results: int = 0,
+        error: bool = False,
+    ):
+        """Log a completed storage operation."""
+        key = (operation, record_type or "")
+        hist = self.latency.get(key)
+        if not hist:
+            hist = self.latency[key] = Histogram(self.buckets)
+            self.results[key] = 0
+            self.errors[key] = 0
+        hist.observe(duration)
+        self.results[key] += results
+        if error:
+            self.errors[key] += 1
+
+    def extract(self) -> dict:
+        """Summarize the statistics by record type, then operation."""
+        result = {}
+        for (operation, record_type), hist in sorted(self.latency.items()):
+            stats = hist.extract()
+            stats["results"] = self.results[(operation, record_type)]
+            stats["errors"] = self.errors[(operation, record_type)]
+            result.setdefault(record_type, {})[operation] = stats
+        return result
+
+    def prometheus_text(self, prefix: str = "acapy_storage") -> str:
+        """Render the statistics in the Prometheus text exposition format."""
+        lines = [
+            f"# HELP {prefix}_operation_seconds Storage operation latency",
+            f"# TYPE {prefix}_operation_seconds histogram",
+        ]
+        for key, hist in sorted(self.latency.items()):
+            labels = self._labels(key)
+            for bound, total in hist.cumulative():
+                le = "+Inf" if math.isinf(bound) else repr(bound)
+                lines.append(
+                    f'{prefix}_operation_seconds_bucket{{{labels},le="{le}"}} {total}'
+                )
+            lines.append(f"{prefix}_operation_seconds_sum{{{labels}}} {hist.sum!r}")
+            lines.append(f"{prefix}_operation_seconds_count{{{labels}}} {hist.count}")
+        for name, values, desc in (
+            ("results", self.results, "Records returned or written"),
+            ("errors", self.errors, "Failed storage operations"),
+        ):
+            lines.append(f"# HELP {prefix}_operation_{name}_total {desc}")
+            lines.append(f"# TYPE {prefix}_operation_{name}_total counter")
+            for key, value in sorted(values.items()):
+                labels = self._labels(key)
+                lines.append(f"{prefix}_operation_{name}_total{{{labels}}} {value}")
+        return "\n".join(lines) + "\n"
+
+    @staticmethod
+    def _labels(key: Tuple[str, str]) -> str:
+        """Format the labels for an operation key."""
+        operation, record_type = key
+        return 'operation="{}",record_type="{}"'.format(
+            _label(operation), _label(record_type)
+        )
+
+
+class _Observe:
+    """Context manager timing a single storage operation."""
+
+    def __init__(self, metrics: StorageMetrics, operation: str, record_type: str):
+        """Initialize the operation timer."""
+        self.metrics = metrics
+        self.operation = operation
+        self.record_type = record_type
+        self.results = 0
+        self.start = None
+
+    def __enter__(self):
+        """Start timing the operation."""
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc_value, tb):
+        """Log the operation duration and outcome."""
+        self.metrics.observe(
+            self.operation,
+            self.record_type,
+            time.perf_counter() - self.start,
+            self.results,
+            exc_type is not None,
+        )
+
+
+class InstrumentedStorage(BaseStorage):
+    """Wrap a storage implementation to collect operation statistics."""
+
+    def __init__(self, storage: BaseStorage, metrics: StorageMetrics):
+        """
+        Initialize an `InstrumentedStorage` instance.
+
+        Args:
+            storage: The storage implementation to wrap
+            metrics: The statistics collector
+
+        """
+        self.storage = storage
+        self.metrics = metrics
+
+    def _observe(self, operation: str, record_type: str) -> _Observe:
+        """Start timing an operation on the wrapped storage."""
+        return _Observe(self.metrics, operation, record_type)
+
+    async def add_record(self, record: StorageRecord):
+        """Add a new record to the store."""
+        with self._observe("add", record and record.type) as obs:
+            await self.storage.add_record(record)
+            obs.results = 1
+
+    async def get_record(
+        self, record_type: str, record_id: str, options: Mapping = None
+    ) -> StorageRecord:
+        """Fetch a record from the store by type and ID."""
+        with self._observe("get", record_type) as obs:
+            result = await self.storage.get_record(record_type, record_id, options)
+            obs.results = 1
+        return result
+
+    async def update_record(self, record: StorageRecord, value: str, tags: Mapping):
+        """Update an existing stored record's value and tags."""
+        with self._observe("update", record and record.type) as obs:
+            await self.storage.update_record(record, value, tags)
+            obs.results = 1
+
+    async def delete_record(self, record: StorageRecord):
+        """Delete a record."""
+        with self._observe("delete", record and record.type) as obs:
+            await self.storage.delete_record(record)
+            obs.results = 1
+
+    async def add_records(self, records: Sequence[StorageRecord]):
+        """Add a batch of new records to the store."""
+        with self._observe("add_batch", _batch_type(records)) as obs:
+            await self.storage.add_records(records)
+            obs.results = len(records)
+
+    async def update_records(self, records: Sequence[StorageRecord]):
+        """Update a batch of existing stored records' values and tags."""
+        with self._observe("update_batch", _batch_type(records)) as obs:
+            await self.storage.update_records(records)
+            obs.results = len(records)
+
+    async def delete_records(self, records: Sequence[StorageRecord]):
+        """Delete a batch of existing records."""
+        with self._observe("delete_batch", _batch_type(records)) as obs:
+            await self.storage.delete_records(records)
+            obs.results = len(records)
+
+    async def delete_all_records(self, type_filter: str, tag_query: Mapping = None):
+        """Delete all records matching a type filter and tag query."""
+        with self._observe("delete_all", type_filter):
+            await self.storage.delete_all_records(type_filter, tag_query)
+
+    async def find_record(
+        self, type_filter: str, tag_query: Mapping, options: Mapping = None
+    ) -> StorageRecord:
+        """Find a record using a unique tag filter."""
+        with self._observe("find", type_filter) as obs:
+            result = await self.storage.find_record(type_filter, tag_query, options)
+            obs.results = 1
+        return result
+
+    def search_records(
+        self,
+        type_filter: str,
+        tag_query: Mapping = None,
+        page_size: int = None,
+        options: Mapping = None,
+    ) -> "InstrumentedStorageRecordSearch":
+        """Search stored records."""
+        return InstrumentedStorageRecordSearch(
+            self.storage.search_records(type_filter, tag_query, page_size, options),
+            self.metrics,
+            type_filter,
+        )
+
+    def __repr__(self) -> str:
+        """Human readable representation of the wrapped storage."""
+        return "<{}({!r})>".format(self.__class__.__name__, self.storage)
+
+
+class InstrumentedStorageRecordSearch(BaseStorageRecordSearch):
+    """Wrap a stored records search to time each page fetch."""
+
+    def __init__(
+        self, search: BaseStorageRecordSearch, metrics: StorageMetrics, record_type: str
+    ):
+        """Initialize an `InstrumentedStorageRecordSearch` instance."""
+        self.search = search
+        self.metrics = metrics
+        self.record_type = record_type
+
+    async def fetch(self, max_count: int = None) -> Sequence[StorageRecord]:
+        """Fetch the next list of results from the store."""
+        with _Observe(self.metrics, "search_fetch", self.record_type) as obs:
+            result = await self.search.fetch(max_count)
+            obs.results = len(result or ())
+        return result
+
+    async def close(self):
+        """Dispose of the search query."""
+        await self.search.close()
+
+
+class StorageMetricsProvider(BaseProvider):
+    """Wrap provided storage instances when storage metrics are enabled."""
+
+    def __init__(self, provider: BaseProvider):
+        """Initialize the provider instance."""
+        self._provider = provider
+
+    def provide(self, config: BaseSettings, injector: BaseInjector):
+        """Provide the storage instance given a config and injector."""
+        instance = self._provider.provide(config, injector)
+        metrics = injector.inject(StorageMetrics, required=False)
+        if metrics and instance:
+            instance = InstrumentedStorage(instance, metrics)
+        return instance
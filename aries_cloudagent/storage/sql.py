@@ -0,0 +1,805 @@
+"""SQL implementation of BaseStorage interface, backed by SQLite or PostgreSQL."""
+
+import asyncio
+import sqlite3
+
+from abc import ABC, abstractmethod
+from functools import lru_cache
+from typing import Callable, Generator, Mapping, Sequence, Tuple
+from uuid import uuid4
+
+from .base import (
+    DEFAULT_PAGE_SIZE,
+    BaseStorage,
+    BaseStorageRecordSearch,
+    validate_record,
+)
+from .error import (
+    StorageDuplicateError,
+    StorageError,
+    StorageNotFoundError,
+    StorageSearchError,
+)
+from .record import StorageRecord
+
+try:
+    import asyncpg
+except ImportError:
+    asyncpg = None
+
+DEFAULT_POOL_SIZE = 4
+
+# stay below the default SQLITE_MAX_VARIABLE_NUMBER of older SQLite releases
+MAX_PARAMS = 500
+
+SQLITE_SCHEMA = """
+CREATE TABLE IF NOT EXISTS items (
+    id INTEGER PRIMARY KEY,
+    type TEXT NOT NULL,
+    name TEXT NOT NULL,
+    value TEXT NOT NULL,
+    UNIQUE (type, name)
+);
+CREATE INDEX IF NOT EXISTS ix_items_type_id ON items (type, id);
+CREATE TABLE IF NOT EXISTS items_tags (
+    item_id INTEGER NOT NULL REFERENCES items (id) ON DELETE CASCADE,
+    name TEXT NOT NULL,
+    value TEXT,
+    PRIMARY KEY (item_id, name)
+);
+CREATE INDEX IF NOT EXISTS ix_items_tags_name_value ON items_tags (name, value, item_id);
+"""
+
+# the advisory lock serializes schema creation between agent instances
+POSTGRES_SCHEMA = """
+SELECT pg_advisory_xact_lock(4242);
+CREATE TABLE IF NOT EXISTS items (
+    id BIGSERIAL PRIMARY KEY,
+    type TEXT NOT NULL,
+    name TEXT NOT NULL,
+    value TEXT NOT NULL,
+    UNIQUE (type, name)
+);
+CREATE INDEX IF NOT EXISTS ix_items_type_id ON items (type, id);
+CREATE TABLE IF NOT EXISTS items_tags (
+    item_id BIGINT NOT NULL REFERENCES items (id) ON DELETE CASCADE,
+    name TEXT NOT NULL,
+    value TEXT,
+    PRIMARY KEY (item_id, name)
+);
+CREATE INDEX IF NOT EXISTS ix_items_tags_name_value ON items_tags (name, value, item_id);
+"""
+
+TAG_MATCH = "i.id IN (SELECT item_id FROM items_tags WHERE name = ? AND {})"
+
+COMPARE_OPS = {"$gt": ">", "$gte": ">=", "$lt": "<", "$lte": "<="}
+
+# boolean literals understood by every supported SQLite and PostgreSQL release
+SQL_FALSE = "1 = 0"
+SQL_TRUE = "1 = 1"
+
+# the kinds of statement yielded by storage operations, by the result returned
+FETCH_ALL = "fetch_all"
+FETCH_ONE = "fetch_one"
+EXECUTE = "execute"
+EXECUTE_MANY = "execute_many"
+INSERT = "insert"
+
+Statement = Tuple[str, str, Sequence]
+Operation = Generator[Statement, object, object]
+
+
+class SqlConnectionPool(ABC):
+    """
+    A pool of database connections which runs storage operations.
+
+    Storage operations are written once, as generators which yield
+    `(kind, sql, params)` statements using `?` placeholders and receive the
+    result of each in turn. The pool decides how they execute: SQLite runs a
+    whole operation on a connection in a worker thread, while PostgreSQL
+    awaits each statement on an asynchronous connection.
+    """
+
+    # whether the planner honours the unary plus used to skip an index
+    planner_hints = False
+
+    size: int
+
+    @abstractmethod
+    async def run(self, operation: Callable[..., Operation], *args, write=False):
+        """
+        Run a storage operation with a pooled connection.
+
+        Args:
+            operation: A generator function yielding the statements to execute
+            args: The arguments to the operation
+            write: Whether to run the operation inside a write transaction
+
+        Returns:
+            The value returned by the operation
+
+        Raises:
+            StorageDuplicateError: If a statement violates a unique constraint
+            StorageError: If a statement fails
+
+        """
+
+    @abstractmethod
+    async def close(self):
+        """Close the open connections."""
+
+
+class SqliteConnectionPool(SqlConnectionPool):
+    """A fixed-size pool of SQLite connections used from worker threads."""
+
+    planner_hints = True
+
+    def __init__(self, path: str = None, size: int = DEFAULT_POOL_SIZE):
+        """
+        Initialize a `SqliteConnectionPool` instance.
+
+        Args:
+            path: The database file path, or None for a private in-memory database
+            size: The maximum number of open connections
+
+        """
+        if not path or path == ":memory:":
+            # connections share one in-memory database, which only supports
+            # table-level locking: serialize access through one connection
+            self.path = f"file:acapy-{uuid4().hex}?mode=memory&cache=shared"
+            self.uri = True
+            self.size = 1
+        else:
+            self.path = path
+            self.uri = False
+            self.size = max(size or DEFAULT_POOL_SIZE, 1)
+        self._idle = []
+        self._limit = None
+        self._opened = 0
+
+    def _connect(self) -> sqlite3.Connection:
+        """Open a new database connection, creating the schema if needed."""
+        conn = sqlite3.connect(
+            self.path,
+            uri=self.uri,
+            timeout=30,
+            isolation_level=None,
+            check_same_thread=False,
+        )
+        conn.execute("PRAGMA foreign_keys = ON")
+        if not self.uri:
+            conn.execute("PRAGMA journal_mode = WAL")
+        if not self._opened:
+            conn.executescript(SQLITE_SCHEMA)
+        self._opened += 1
+        return conn
+
+    async def acquire(self) -> sqlite3.Connection:
+        """Wait for an available connection."""
+        if not self._limit:
+            self._limit = asyncio.Semaphore(self.size)
+        await self._limit.acquire()
+        if self._idle:
+            return self._idle.pop()
+        try:
+            return await asyncio.get_event_loop().run_in_executor(None, self._connect)
+        except Exception:
+            self._limit.release()
+            raise
+
+    def release(self, conn: sqlite3.Connection):
+        """Return a connection to the pool."""
+        self._idle.append(conn)
+        self._limit.release()
+
+    @staticmethod
+    def _execute(conn: sqlite3.Connection, kind: str, sql: str, params: Sequence):
+        """Execute a single statement, returning the result for its kind."""
+        try:
+            if kind == EXECUTE_MANY:
+                conn.executemany(sql, params)
+                return None
+            cursor = conn.execute(sql, params)
+        except sqlite3.IntegrityError as err:
+            raise StorageDuplicateError(str(err)) from err
+        except sqlite3.Error as err:
+            raise StorageError(str(err)) from err
+        if kind == FETCH_ALL:
+            return cursor.fetchall()
+        if kind == FETCH_ONE:
+            return cursor.fetchone()
+        if kind == INSERT:
+            return cursor.lastrowid
+        return cursor.rowcount
+
+    @classmethod
+    def _perform(cls, conn: sqlite3.Connection, operation: Operation, write: bool):
+        """Drive an operation to completion on a connection, in a worker thread."""
+        if write:
+            conn.execute("BEGIN IMMEDIATE")
+        try:
+            result = error = None
+            while True:
+                try:
+                    statement = (
+                        operation.throw(error) if error else operation.send(result)
+                    )
+                except StopIteration as stop:
+                    result = stop.value
+                    break
+                error = None
+                try:
+                    result = cls._execute(conn, *statement)
+                except StorageError as err:
+                    error = err
+        except BaseException:
+            if write:
+                conn.execute("ROLLBACK")
+            raise
+        if write:
+            conn.execute("COMMIT")
+        return result
+
+    async def run(self, operation: Callable[..., Operation], *args, write=False):
+        """Run a storage operation with a pooled connection in a worker thread."""
+        conn = await self.acquire()
+        task = asyncio.get_event_loop().run_in_executor(
+            None, self._perform, conn, operation(*args), write
+        )
+        try:
+            return await asyncio.shield(task)
+        except asyncio.CancelledError:
+            if not task.done():
+                # keep the connection out of the pool until the thread is done
+                task.add_done_callback(lambda _, conn=conn: self.release(conn))
+                conn = None
+            raise
+        except sqlite3.Error as err:
+            raise StorageError(str(err)) from err
+        finally:
+            if conn:
+                self.release(conn)
+
+    async def close(self):
+        """Close all idle connections."""
+        while self._idle:
+            self._idle.pop().close()
+
+
+@lru_cache(maxsize=1024)
+def numbered_params(sql: str) -> str:
+    """Replace `?` placeholders with the numbered placeholders used by PostgreSQL."""
+    parts = sql.split("?")
+    return parts[0] + "".join(f"${idx}{part}" for idx, part in enumerate(parts[1:], 1))
+
+
+class PostgresConnectionPool(SqlConnectionPool):
+    """A pool of asynchronous PostgreSQL connections, shared by agent instances."""
+
+    def __init__(self, url: str = None, size: int = DEFAULT_POOL_SIZE):
+        """
+        Initialize a `PostgresConnectionPool` instance.
+
+        Args:
+            url: The database connection URL, or None to use the PG* environment
+                variables
+            size: The maximum number of open connections
+
+        """
+        self.url = url
+        self.size = max(size or DEFAULT_POOL_SIZE, 1)
+        self._lock = None
+        self._pool = None
+
+    async def _open(self) -> "asyncpg.pool.Pool":
+        """Open the connection pool on first use, creating the schema if needed."""
+        if self._pool:
+            return self._pool
+        if not asyncpg:
+            raise StorageError("PostgreSQL storage requires the asyncpg package")
+        if not self._lock:
+            self._lock = asyncio.Lock()
+        async with self._lock:
+            if not self._pool:
+                pool = await asyncpg.create_pool(
+                    self.url, min_size=1, max_size=self.size
+                )
+                async with pool.acquire() as conn:
+                    async with conn.transaction():
+                        await conn.execute(POSTGRES_SCHEMA)
+                self._pool = pool
+        return self._pool
+
+    @staticmethod
+    async def _execute(
+        conn: "asyncpg.Connection", kind: str, sql: str, params: Sequence
+    ):
+        """Execute a single statement, returning the result for its kind."""
+        sql = numbered_params(sql)
+        try:
+            if kind == FETCH_ALL:
+                return await conn.fetch(sql, *params)
+            if kind == FETCH_ONE:
+                return await conn.fetchrow(sql, *params)
+            if kind == INSERT:
+                return await conn.fetchval(sql + " RETURNING id", *params)
+            if kind == EXECUTE_MANY:
+                await conn.executemany(sql, params)
+                return None
+            status = await conn.execute(sql, *params)
+        except asyncpg.UniqueViolationError as err:
+            raise StorageDuplicateError(str(err)) from err
+        except asyncpg.PostgresError as err:
+            raise StorageError(str(err)) from err
+        # the command status ends with the number of rows affected
+        return int(status.rsplit(" ", 1)[-1])
+
+    @classmethod
+    async def _perform(cls, conn: "asyncpg.Connection", operation: Operation):
+        """Drive an operation to completion, awaiting each statement."""
+        result = error = None
+        while True:
+            try:
+                statement = operation.throw(error) if error else operation.send(result)
+            except StopIteration as stop:
+                return stop.value
+            error = None
+            try:
+                result = await cls._execute(conn, *statement)
+            except StorageError as err:
+                error = err
+
+    async def run(self, operation: Callable[..., Operation], *args, write=False):
+        """Run a storage operation with a pooled connection."""
+        pool = await self._open()
+        try:
+            async with pool.acquire() as conn:
+                if not write:
+                    return await self._perform(conn, operation(*args))
+                async with conn.transaction():
+                    return await self._perform(conn, operation(*args))
+        except (asyncpg.PostgresError, asyncpg.InterfaceError, OSError) as err:
+            raise StorageError(str(err)) from err
+
+    async def close(self):
+        """Close the connection pool."""
+        if self._pool:
+            pool, self._pool = self._pool, None
+            await pool.close()
+
+
+def _insert_tags(item_id: int, tags: Mapping) -> Operation:
+    """Insert the tag rows for a stored item."""
+    if tags:
+        yield (
+            EXECUTE_MANY,
+            "INSERT INTO items_tags (item_id, name, value) VALUES (?, ?, ?)",
+            [(item_id, name, value) for name, value in tags.items()],
+        )
+
+
+def _add_records(records: Sequence[StorageRecord]) -> Operation:
+    """Insert new items and their tags."""
+    for record in records:
+        try:
+            item_id = yield (
+                INSERT,
+                "INSERT INTO items (type, name, value) VALUES (?, ?, ?)",
+                (record.type, record.id, record.value),
+            )
+        except StorageDuplicateError as err:
+            raise StorageDuplicateError(f"Duplicate record ID: {record.id}") from err
+        yield from _insert_tags(item_id, record.tags)
+
+
+def _update_records(records: Sequence[StorageRecord]) -> Operation:
+    """Replace the values and tags of existing items."""
+    for record in records:
+        row = yield (
+            FETCH_ONE,
+            "SELECT id FROM items WHERE type = ? AND name = ?",
+            (record.type, record.id),
+        )
+        if not row:
+            raise StorageNotFoundError(f"Record not found: {record.id}")
+        yield EXECUTE, "UPDATE items SET value = ? WHERE id = ?", (record.value, row[0])
+        yield EXECUTE, "DELETE FROM items_tags WHERE item_id = ?", (row[0],)
+        yield from _insert_tags(row[0], record.tags)
+
+
+def _delete_records(records: Sequence[StorageRecord]) -> Operation:
+    """Delete existing items, along with their tags."""
+    for record in records:
+        deleted = yield (
+            EXECUTE,
+            "DELETE FROM items WHERE type = ? AND name = ?",
+            (record.type, record.id),
+        )
+        if not deleted:
+            raise StorageNotFoundError(f"Record not found: {record.id}")
+
+
+def _fetch_tags(item_ids: Sequence[int]) -> Operation:
+    """Load the tags for a set of items, keyed by item row ID."""
+    tags = {item_id: {} for item_id in item_ids}
+    for start in range(0, len(item_ids), MAX_PARAMS):
+        chunk = tuple(item_ids[start:][:MAX_PARAMS])
+        rows = yield (
+            FETCH_ALL,
+            "SELECT item_id, name, value FROM items_tags WHERE item_id IN ({})".format(
+                ", ".join("?" * len(chunk))
+            ),
+            chunk,
+        )
+        for item_id, name, value in rows:
+            tags[item_id][name] = value
+    return tags
+
+
+def wql_to_sql(tag_query: Mapping, params: list) -> str:
+    """
+    Translate a WQL tag query into a SQL condition on the `items` table.
+
+    Args:
+        tag_query: The WQL tag query
+        params: A list to which the query parameters are appended
+
+    Returns:
+        The SQL condition, referencing the `items` table as `i`
+
+    Raises:
+        StorageSearchError: If the query is not valid WQL
+
+    """
+    clauses = []
+    for k, v in (tag_query or {}).items():
+        if k == "$or":
+            if not isinstance(v, list):
+                raise StorageSearchError("Expected list for $or filter value")
+            clauses.append(
+                "({})".format(
+                    " OR ".join(wql_to_sql(opt, params) for opt in v) or SQL_FALSE
+                )
+            )
+        elif k == "$and":
+            if not isinstance(v, list):
+                raise StorageSearchError("Expected list for $and filter value")
+            clauses.extend(wql_to_sql(opt, params) for opt in v)
+        elif k == "$not":
+            if not isinstance(v, dict):
+                raise StorageSearchError("Expected dict for $not filter value")
+            clauses.append("NOT {}".format(wql_to_sql(v, params)))
+        elif k.startswith("$"):
+            raise StorageSearchError("Unexpected filter operator: {}".format(k))
+        elif isinstance(v, str):
+            params.extend((k, v))
+            clauses.append(TAG_MATCH.format("value = ?"))
+        elif isinstance(v, dict):
+            clauses.append(_tag_value_to_sql(k, v, params))
+        else:
+            raise StorageSearchError(
+                "Expected string or dict for filter value, got {}".format(v)
+            )
+    return "({})".format(" AND ".join(clauses)) if clauses else SQL_TRUE
+
+
+def has_tag_match(tag_query: Mapping) -> bool:
+    """Check whether a WQL query requires a tag value from the tag index."""
+    for k, v in (tag_query or {}).items():
+        if k == "$and" and isinstance(v, list):
+            if any(has_tag_match(opt) for opt in v if isinstance(opt, dict)):
+                return True
+        elif k.startswith("$"):
+            continue
+        elif isinstance(v, str) or (isinstance(v, dict) and list(v) == ["$in"]):
+            return True
+    return False
+
+
+def type_match(tag_query: Mapping, planner_hints: bool = True) -> str:
+    """Build the record type condition for a search on the `items` table."""
+    # when the tag index narrows the search, stop the planner from scanning
+    # every item of the type (the unary + disables the type index in SQLite)
+    if planner_hints and has_tag_match(tag_query):
+        return "+i.type = ?"
+    return "i.type = ?"
+
+
+def _tag_value_to_sql(name: str, match: dict, params: list) -> str:
+    """Translate a single tag subquery into a SQL condition."""
+    if len(match) != 1:
+        raise StorageSearchError("Unsupported subquery: {}".format(match))
+    op, cmp_val = list(match.items())[0]
+    if op == "$in":
+        if not isinstance(cmp_val, list):
+            raise StorageSearchError("Expected list for $in value")
+        if not cmp_val:
+            return SQL_FALSE
+        params.append(name)
+        params.extend(cmp_val)
+        return TAG_MATCH.format("value IN ({})".format(", ".join("?" * len(cmp_val))))
+    if not isinstance(cmp_val, str):
+        raise StorageSearchError("Expected string for filter value")
+    if op == "$neq":
+        params.extend((name, cmp_val))
+        return TAG_MATCH.format("value != ?")
+    if op == "$like":
+        params.extend((name, cmp_val))
+        return TAG_MATCH.format("value LIKE ?")
+    if op in COMPARE_OPS:
+        try:
+            params.extend((name, float(cmp_val)))
+        except ValueError as err:
+            raise StorageSearchError(f"Expected number for {op} value") from err
+        return TAG_MATCH.format(f"CAST(value AS DOUBLE PRECISION) {COMPARE_OPS[op]} ?")
+    raise StorageSearchError(f"Unsupported match operator: {op}")
+
+
+class SqlStorage(BaseStorage):
+    """SQL storage class, with tags held in an indexed table."""
+
+    def __init__(self, pool: SqlConnectionPool):
+        """
+        Initialize a `SqlStorage` instance.
+
+        Args:
+            pool: The connection pool to use
+
+        """
+        self.pool = pool
+
+    async def add_record(self, record: StorageRecord):
+        """
+        Add a new record to the store.
+
+        Args:
+            record: `StorageRecord` to be stored
+
+        Raises:
+            StorageDuplicateError: If the record ID is already present
+
+        """
+        await self.add_records([record])
+
+    async def get_record(
+        self, record_type: str, record_id: str, options: Mapping = None
+    ) -> StorageRecord:
+        """
+        Fetch a record from the store by type and ID.
+
+        Args:
+            record_type: The record type
+            record_id: The record id
+            options: A dictionary of backend-specific options
+
+        Returns:
+            A `StorageRecord` instance
+
+        Raises:
+            StorageError: If the record type or ID is not provided
+            StorageNotFoundError: If the record is not found
+
+        """
+        if not record_type:
+            raise StorageError("Record type not provided")
+        if not record_id:
+            raise StorageError("Record ID not provided")
+        with_tags = (options or {}).get("retrieveTags", True)
+
+        def fetch():
+            row = yield (
+                FETCH_ONE,
+                "SELECT id, value FROM items WHERE type = ? AND name = ?",
+                (record_type, record_id),
+            )
+            if not row:
+                raise StorageNotFoundError(
+                    f"{record_type} record not found: {record_id}"
+                )
+            tags = (yield from _fetch_tags([row[0]]))[row[0]] if with_tags else {}
+            return StorageRecord(record_type, row[1], tags, record_id)
+
+        return await self.pool.run(fetch)
+
+    async def update_record(self, record: StorageRecord, value: str, tags: Mapping):
+        """
+        Update an existing stored record's value and tags.
+
+        Args:
+            record: `StorageRecord` to update
+            value: The new value
+            tags: The new tags
+
+        Raises:
+            StorageNotFoundError: If record not found
+
+        """
+        await self.update_records([record._replace(value=value, tags=tags)])
+
+    async def delete_record(self, record: StorageRecord):
+        """
+        Delete a record.
+
+        Args:
+            record: `StorageRecord` to delete
+
+        Raises:
+            StorageNotFoundError: If record not found
+
+        """
+        await self.delete_records([record])
+
+    async def add_records(self, records: Sequence[StorageRecord]):
+        """
+        Add a batch of new records to the store in a single transaction.
+
+        Args:
+            records: `StorageRecord` instances to be stored
+
+        Raises:
+            StorageDuplicateError: If any record ID is already present
+
+        """
+        for record in records:
+            validate_record(record)
+        await self.pool.run(_add_records, records, write=True)
+
+    async def update_records(self, records: Sequence[StorageRecord]):
+        """
+        Update a batch of existing stored records in a single transaction.
+
+        Args:
+            records: `StorageRecord` instances holding the new values and tags
+
+        Raises:
+            StorageNotFoundError: If any record is not found
+
+        """
+        for record in records:
+            validate_record(record)
+        await self.pool.run(_update_records, records, write=True)
+
+    async def delete_records(self, records: Sequence[StorageRecord]):
+        """
+        Delete a batch of existing records in a single transaction.
+
+        Args:
+            records: `StorageRecord` instances to delete
+
+        Raises:
+            StorageNotFoundError: If any record is not found
+
+        """
+        for record in records:
+            validate_record(record, delete=True)
+        await self.pool.run(_delete_records, records, write=True)
+
+    async def delete_all_records(self, type_filter: str, tag_query: Mapping = None):
+        """
+        Delete all records matching a type filter and tag query.
+
+        Args:
+            type_filter: Filter string
+            tag_query: Tags to query
+
+        """
+        params = [type_filter]
+        sql = "DELETE FROM items WHERE id IN (SELECT i.id FROM items i WHERE "
+        sql += "{} AND {})".format(
+            type_match(tag_query, self.pool.planner_hints),
+            wql_to_sql(tag_query, params),
+        )
+
+        def delete():
+            yield EXECUTE, sql, params
+
+        await self.pool.run(delete, write=True)
+
+    def search_records(
+        self,
+        type_filter: str,
+        tag_query: Mapping = None,
+        page_size: int = None,
+        options: Mapping = None,
+    ) -> "SqlStorageRecordSearch":
+        """
+        Search stored records.
+
+        Args:
+            type_filter: Filter string
+            tag_query: Tags to query
+            page_size: Page size
+            options: Dictionary of backend-specific options
+
+        Returns:
+            An instance of `SqlStorageRecordSearch`
+
+        """
+        return SqlStorageRecordSearch(self, type_filter, tag_query, page_size, options)
+
+
+class SqlStorageRecordSearch(BaseStorageRecordSearch):
+    """Represent an active stored records search."""
+
+    def __init__(
+        self,
+        store: SqlStorage,
+        type_filter: str,
+        tag_query: Mapping,
+        page_size: int = None,
+        options: Mapping = None,
+    ):
+        """
+        Initialize a `SqlStorageRecordSearch` instance.
+
+        Each fetch resumes after the last row returned, so no connection is
+        held between fetches.
+
+        Args:
+            store: `BaseStorage` to search
+            type_filter: Filter string
+            tag_query: Tags to search
+            page_size: Size of page to return
+            options: Dictionary of backend-specific options
+
+        """
+        params = [type_filter]
+        self._condition = "{} AND {}".format(
+            type_match(tag_query, store.pool.planner_hints),
+            wql_to_sql(tag_query, params),
+        )
+        self._params = params
+        self._last_id = 0
+        self._done = False
+        self.store = store
+        self.options = options or {}
+        self.page_size = page_size or DEFAULT_PAGE_SIZE
+        self.tag_query = tag_query
+        self.type_filter = type_filter
+
+    async def fetch(self, max_count: int = None) -> Sequence[StorageRecord]:
+        """
+        Fetch the next list of results from the store.
+
+        Args:
+            max_count: Max number of records to return. If not provided,
+              defaults to the backend's preferred page size
+
+        Returns:
+            A list of `StorageRecord` instances
+
+        Raises:
+            StorageSearchError: If the search query is complete
+
+        """
+        if self._done:
+            raise StorageSearchError("Search query is complete")
+
+        sql = (
+            "SELECT i.id, i.name, i.value FROM items i WHERE {}"
+            " AND i.id > ? ORDER BY i.id LIMIT ?"
+        ).format(self._condition)
+        params = self._params + [self._last_id, max_count or self.page_size]
+        with_tags = self.options.get("retrieveTags", True)
+
+        def fetch():
+            rows = yield FETCH_ALL, sql, params
+            tags = (
+                (yield from _fetch_tags([row[0] for row in rows])) if with_tags else {}
+            )
+            return rows, tags
+
+        rows, tags = await self.store.pool.run(fetch)
+        ret = [
+            StorageRecord(self.type_filter, value, tags.get(item_id), name)
+            for item_id, name, value in rows
+        ]
+        if rows:
+            self._last_id = rows[-1][0]
+        else:
+            await self.close()
+        return ret
+
+    async def close(self):
+        """Dispose of the search query."""
+        self._done = True
@@ -0,0 +1,84 @@
+import json
+
+from asynctest import TestCase as AsyncTestCase
+from asynctest import mock as async_mock
+from io import StringIO
+
+from ...core.in_memory import InMemoryProfile
+
+from ..base import BaseStorage
+from ..error import StorageDuplicateError, StorageError
+from ..record import StorageRecord
+
+from .. import bulk as test_module
+
+
+class TestBulk(AsyncTestCase):
+    def setUp(self):
+        self.profile = InMemoryProfile.test_profile()
+
+    def test_record_json(self):
+        record = StorageRecord("connection", '{"state": "active"}', {"a": "1"}, "id")
+        line = test_module.record_to_json(record)
+        assert test_module.record_from_json(line) == record
+
+        parsed = test_module.record_from_json(
+            json.dumps({"type": "connection", "value": {"state": "active"}})
+        )
+        assert parsed.type == "connection"
+        assert json.loads(parsed.value) == {"state": "active"}
+        assert parsed.tags == {} and parsed.id
+
+        for bad in ("{", "[]", json.dumps({"value": "x"})):
+            with self.assertRaises(StorageError):
+                test_module.record_from_json(bad)
+
+    def test_read_records(self):
+        lines = [
+            test_module.record_to_json(StorageRecord("a", "1", id="1")),
+            "  ",
+            test_module.record_to_json(StorageRecord("b", "2", id="2")),
+        ]
+        assert [rec.id for rec in test_module.read_records(lines)] == ["1", "2"]
+        assert [rec.id for rec in test_module.read_records(lines, ["b"])] == ["2"]
+
+    async def test_import_export(self):
+        records = [
+            StorageRecord("connection", f'{{"n": {n}}}', {"n": str(n)}, f"c{n}")
+            for n in range(25)
+        ] + [StorageRecord("forward_route", "{}", {}, "r1")]
+        stats = await test_module.import_records(
+            self.profile, iter(records), batch_size=4, concurrency=3
+        )
+        assert stats.count == 26
+        assert stats.by_type == {"connection": 25, "forward_route": 1}
+        assert stats.rate > 0
+        assert "Imported 26 records" in stats.report("Imported")
+
+        out = StringIO()
+        stats = await test_module.export_records(
+            self.profile, ["forward_route", "connection"], out, batch_size=10
+        )
+        assert stats.count == 26
+        exported = list(test_module.read_records(out.getvalue().splitlines()))
+        assert exported[0] == records[-1]
+        assert sorted(exported[1:], key=lambda rec: int(rec.tags["n"])) == records[:-1]
+
+    async def test_import_error(self):
+        records = [StorageRecord("connection", "{}", id=str(n)) for n in range(10)]
+        records.append(records[0])
+        with self.assertRaises(StorageDuplicateError):
+            await test_module.import_records(
+                self.profile, iter(records), batch_size=2, concurrency=2
+            )
+
+        async with self.profile.session() as session:
+            storage = session.inject(BaseStorage)
+            with async_mock.patch.object(
+                type(storage), "add_records", async_mock.CoroutineMock()
+            ) as mock_add:
+                mock_add.side_effect = StorageError()
+                with self.assertRaises(StorageError):
+                    await test_module.import_records(
+                        self.profile, iter(records), batch_size=1, concurrency=1
+                    )
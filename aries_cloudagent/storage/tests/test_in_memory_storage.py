@@ -11,6 +11,7 @@ from ...storage.error import (
 )
 from ...storage.in_memory import (
     InMemoryStorage,
+    tag_query_candidates,
     tag_value_match,
     tag_query_match,
 )
@@ -227,3 +228,161 @@ class TestInMemoryStorage:
         with pytest.raises(StorageSearchError) as excinfo:
             tag_query_match(TAGS, {"a": -1})
         assert "Expected string or dict for filter value" in str(excinfo.value)
+
+    @pytest.mark.asyncio
+    async def test_tag_query_match_and(self, store):
+        TAGS = {"a": "aardvark", "b": "bear", "z": "0"}
+
+        assert tag_query_match(TAGS, {"$and": [{"a": "aardvark"}, {"b": "bear"}]})
+        assert not tag_query_match(TAGS, {"$and": [{"a": "aardvark"}, {"b": "cat"}]})
+
+        with pytest.raises(StorageSearchError) as excinfo:
+            tag_query_match(TAGS, {"$and": {"a": "aardvark"}})
+        assert "Expected list for $and" in str(excinfo.value)
+
+    @pytest.mark.asyncio
+    async def test_batch_add_update_delete(self, store):
+        records = [test_record({"idx": str(i)}) for i in range(3)]
+        await store.add_records(records)
+        for record in records:
+            assert await store.get_record(record.type, record.id)
+
+        with pytest.raises(StorageDuplicateError):
+            await store.add_records([test_record(), records[0]])
+
+        await store.update_records(
+            [record._replace(value="UPDATED", tags={"upd": "1"}) for record in records]
+        )
+        rows = await store.search_records("TYPE", {"upd": "1"}).fetch_all()
+        assert len(rows) == 3
+        assert all(row.value == "UPDATED" for row in rows)
+
+        with pytest.raises(StorageNotFoundError):
+            await store.update_records([test_missing_record()])
+
+        await store.delete_records(records[:2])
+        rows = await store.search_records("TYPE", {}).fetch_all()
+        assert [row.id for row in rows] == [records[2].id]
+
+        with pytest.raises(StorageNotFoundError):
+            await store.delete_records([records[0]])
+
+    @pytest.mark.asyncio
+    async def test_delete_all_records(self, store):
+        await store.add_records(
+            [test_record({"parity": ("even", "odd")[i % 2]}) for i in range(6)]
+        )
+        other = StorageRecord(type="OTHER", value="TEST", tags={"parity": "odd"})
+        await store.add_record(other)
+
+        await store.delete_all_records("TYPE", {"parity": "odd"})
+        rows = await store.search_records("TYPE", {}).fetch_all()
+        assert len(rows) == 3
+        assert all(row.tags["parity"] == "even" for row in rows)
+        assert await store.get_record(other.type, other.id)
+
+        await store.delete_all_records("TYPE")
+        assert not await store.search_records("TYPE", {}).fetch_all()
+
+
+class TestInMemoryStorageIndex:
+    @pytest.mark.asyncio
+    async def test_tag_index_maintained(self, store):
+        record = test_record({"a": "aardvark", "b": "bear"})
+        await store.add_record(record)
+        profile = store.profile
+        assert record.id in profile.records_by_type[record.type]
+        assert record.id in profile.records_by_tag[(record.type, "a", "aardvark")]
+
+        await store.update_record(record, record.value, {"a": "alligator"})
+        assert (record.type, "a", "aardvark") not in profile.records_by_tag
+        assert (record.type, "b", "bear") not in profile.records_by_tag
+        assert record.id in profile.records_by_tag[(record.type, "a", "alligator")]
+
+        await store.delete_record(record)
+        assert not profile.records_by_type
+        assert not profile.records_by_tag
+
+    @pytest.mark.asyncio
+    async def test_update_keeps_order(self, store):
+        records = [test_record({"state": "active"}) for _ in range(3)]
+        for record in records:
+            await store.add_record(record)
+
+        await store.update_record(records[0], "new", {"state": "active", "": "x"})
+        await store.update_records([records[1]._replace(value="new")])
+        rows = await store.search_records("TYPE").fetch_all()
+        assert [row.id for row in rows] == [record.id for record in records]
+        rows = await store.search_records("TYPE", {"state": "active"}).fetch_all()
+        assert [row.id for row in rows] == [record.id for record in records]
+        rows = await store.search_records("TYPE", {"": "x"}).fetch_all()
+        assert [row.id for row in rows] == [records[0].id]
+
+    @pytest.mark.asyncio
+    async def test_tag_query_candidates(self, store):
+        for i in range(10):
+            await store.add_record(
+                test_record({"idx": str(i), "parity": ("even", "odd")[i % 2]})
+            )
+        other = StorageRecord(type="OTHER", value="TEST", tags={"idx": "1"})
+        await store.add_record(other)
+        profile = store.profile
+
+        assert tag_query_candidates(profile, "TYPE", None) is None
+        assert tag_query_candidates(profile, "TYPE", {"idx": {"$neq": "1"}}) is None
+        assert tag_query_candidates(profile, "TYPE", {"$not": {"idx": "1"}}) is None
+        assert len(tag_query_candidates(profile, "TYPE", {"idx": "1"})) == 1
+        assert not tag_query_candidates(profile, "TYPE", {"idx": "99"})
+        assert (
+            len(tag_query_candidates(profile, "TYPE", {"idx": {"$in": ["1", "2"]}}))
+            == 2
+        )
+        assert (
+            len(
+                tag_query_candidates(
+                    profile, "TYPE", {"$or": [{"idx": "1"}, {"parity": "even"}]}
+                )
+            )
+            == 6
+        )
+        assert (
+            tag_query_candidates(
+                profile, "TYPE", {"$or": [{"idx": "1"}, {"idx": {"$neq": "2"}}]}
+            )
+            is None
+        )
+        assert (
+            len(
+                tag_query_candidates(
+                    profile,
+                    "TYPE",
+                    {"$and": [{"parity": "odd"}, {"idx": {"$in": ["1", "2", "3"]}}]},
+                )
+            )
+            == 2
+        )
+        assert (
+            len(
+                tag_query_candidates(
+                    profile, "TYPE", {"parity": "odd", "idx": {"$lt": "5"}}
+                )
+            )
+            == 5
+        )
+
+        rows = await store.search_records(
+            "TYPE", {"parity": "odd", "idx": {"$lt": "5"}}
+        ).fetch_all()
+        assert sorted(row.tags["idx"] for row in rows) == ["1", "3"]
+
+    @pytest.mark.asyncio
+    async def test_search_scales_with_matches(self, store):
+        for count in (1000, 10000):
+            while len(store.profile.records) < count:
+                await store.add_record(
+                    test_record({"idx": str(len(store.profile.records))})
+                )
+            search = store.search_records("TYPE", {"idx": "500"})
+            assert len(search._cache) == 1
+            rows = await search.fetch_all()
+            assert len(rows) == 1
@@ -0,0 +1,100 @@
+import pytest
+
+from ...config.injection_context import InjectionContext
+from ...config.provider import InstanceProvider
+from ...core.in_memory import InMemoryProfile
+from ...storage.base import BaseStorage
+from ...storage.error import StorageNotFoundError
+from ...storage.in_memory import InMemoryStorage
+from ...storage.instrumented import (
+    InstrumentedStorage,
+    StorageMetrics,
+    StorageMetricsProvider,
+)
+from ...storage.record import StorageRecord
+
+from . import test_in_memory_storage
+from .test_in_memory_storage import test_record
+
+
+@pytest.fixture()
+def store():
+    profile = InMemoryProfile.test_profile()
+    yield InstrumentedStorage(InMemoryStorage(profile), StorageMetrics())
+
+
+class TestInstrumentedStorage(test_in_memory_storage.TestInMemoryStorage):
+    """Tests for instrumented storage."""
+
+    @pytest.mark.asyncio
+    async def test_metrics(self, store):
+        records = [test_record({"idx": str(i)}) for i in range(5)]
+        await store.add_records(records)
+        await store.add_record(StorageRecord("OTHER", "TEST"))
+        await store.get_record("TYPE", records[0].id)
+        with pytest.raises(StorageNotFoundError):
+            await store.get_record("TYPE", "missing")
+        await store.update_record(records[0], "UPDATED", {})
+        await store.find_record("TYPE", {"idx": "1"})
+        assert len(await store.search_records("TYPE", page_size=2).fetch_all()) == 5
+        await store.delete_record(records[0])
+        await store.delete_records(records[1:3])
+        await store.delete_all_records("TYPE")
+        await store.add_records(
+            [StorageRecord("OTHER", "TEST"), StorageRecord("THIRD", "TEST")]
+        )
+
+        stats = store.metrics.extract()
+        assert stats["TYPE"]["add_batch"]["results"] == 5
+        assert stats["TYPE"]["get"]["count"] == 2
+        assert stats["TYPE"]["get"]["errors"] == 1
+        assert stats["TYPE"]["get"]["results"] == 1
+        assert stats["TYPE"]["search_fetch"]["count"] == 4
+        assert stats["TYPE"]["search_fetch"]["results"] == 5
+        assert stats["TYPE"]["delete_batch"]["results"] == 2
+        assert set(stats["TYPE"]) == {
+            "add_batch",
+            "get",
+            "update",
+            "find",
+            "search_fetch",
+            "delete",
+            "delete_batch",
+            "delete_all",
+        }
+        assert stats["OTHER"]["add"]["count"] == 1
+        assert stats["*"]["add_batch"]["results"] == 2
+
+        text = store.metrics.prometheus_text()
+        assert "# TYPE acapy_storage_operation_seconds histogram" in text
+        assert (
+            'acapy_storage_operation_seconds_bucket{operation="get",'
+            'record_type="TYPE",le="+Inf"} 2'
+        ) in text
+        assert (
+            'acapy_storage_operation_errors_total{operation="get",'
+            'record_type="TYPE"} 1'
+        ) in text
+
+        store.metrics.reset()
+        assert store.metrics.extract() == {}
+
+    def test_prometheus_labels(self):
+        metrics = StorageMetrics()
+        metrics.observe("get", 'a"b\\c\nd', 0.1)
+        assert 'record_type="a\\"b\\\\c\\nd"' in metrics.prometheus_text()
+
+    @pytest.mark.asyncio
+    async def test_provider(self):
+        storage = InMemoryStorage(InMemoryProfile.test_profile())
+        context = InjectionContext()
+        provider = StorageMetricsProvider(InstanceProvider(storage))
+        context.injector.bind_provider(BaseStorage, provider)
+        assert context.inject(BaseStorage) is storage
+
+        metrics = StorageMetrics()
+        context.injector.bind_instance(StorageMetrics, metrics)
+        wrapped = context.inject(BaseStorage)
+        assert isinstance(wrapped, InstrumentedStorage)
+        assert wrapped.storage is storage and wrapped.metrics is metrics
+        assert "InMemoryStorage" in repr(wrapped)
@@ -0,0 +1,201 @@
+import asyncio
+import pytest
+
+from asynctest import mock as async_mock
+
+from ...core.in_memory import InMemoryProfile
+from ...storage.base import BaseStorage
+from ...storage.error import StorageError, StorageSearchError
+from ...storage.in_memory import InMemoryStorage
+from ...storage.record import StorageRecord
+
+from .. import sql as test_module
+from ..sql import (
+    FETCH_ALL,
+    PostgresConnectionPool,
+    SqliteConnectionPool,
+    SqlStorage,
+    has_tag_match,
+    numbered_params,
+    type_match,
+    wql_to_sql,
+)
+from . import test_in_memory_storage
+from .test_in_memory_storage import test_record
+
+
+@pytest.fixture()
+def store(tmp_path):
+    yield SqlStorage(SqliteConnectionPool(str(tmp_path / "storage.db")))
+
+
+class TestSqlStorage(test_in_memory_storage.TestInMemoryStorage):
+    """Tests for SQL storage."""
+
+    @pytest.mark.asyncio
+    async def test_search_queries(self, store):
+        for i in range(10):
+            await store.add_record(
+                test_record({"idx": str(i), "parity": ("even", "odd")[i % 2]})
+            )
+        await store.add_record(
+            StorageRecord(type="OTHER", value="TEST", tags={"idx": "1"})
+        )
+
+        async def found(tag_query):
+            rows = await store.search_records("TYPE", tag_query).fetch_all()
+            return sorted(int(row.tags["idx"]) for row in rows)
+
+        assert await found({"idx": "1"}) == [1]
+        assert await found({"idx": {"$in": ["1", "2", "99"]}}) == [1, 2]
+        assert await found({"idx": {"$in": []}}) == []
+        assert await found({"parity": "odd", "idx": {"$lt": "5"}}) == [1, 3]
+        assert await found({"idx": {"$gte": "8"}}) == [8, 9]
+        assert await found({"idx": {"$neq": "0"}, "parity": "even"}) == [2, 4, 6, 8]
+        assert await found({"$not": {"parity": "even"}}) == [1, 3, 5, 7, 9]
+        assert await found({"$or": [{"idx": "1"}, {"idx": "2"}]}) == [1, 2]
+        assert await found({"$or": []}) == []
+        assert await found({"$and": [{"parity": "odd"}, {"idx": {"$gt": "6"}}]}) == [
+            7,
+            9,
+        ]
+        assert await found({"idx": {"$like": "1%"}}) == [1]
+        assert await found({"missing": {"$neq": "x"}}) == []
+        assert await found({"$not": {"missing": {"$neq": "x"}}}) == list(range(10))
+
+        for bad in (
+            {"$or": {"idx": "1"}},
+            {"$and": {"idx": "1"}},
+            {"$not": [{"idx": "1"}]},
+            {"$near": {"idx": "1"}},
+            {"idx": -1},
+            {"idx": {"$gt": "1", "$lt": "5"}},
+            {"idx": {"$in": "1"}},
+            {"idx": {"$gt": 1}},
+            {"idx": {"$gt": "one"}},
+            {"idx": {"$near": "1"}},
+        ):
+            with pytest.raises(StorageSearchError):
+                wql_to_sql(bad, [])
+
+    @pytest.mark.asyncio
+    async def test_matches_in_memory(self, store):
+        in_memory = InMemoryStorage(InMemoryProfile.test_profile())
+        records = [
+            test_record({"idx": str(i)} if i % 3 else {"idx": str(i), "flag": "x"})
+            for i in range(6)
+        ]
+        for backend in (store, in_memory):
+            await backend.add_records(records)
+
+        for tag_query in (
+            {"flag": {"$neq": "x"}},
+            {"flag": {"$neq": "y"}},
+            {"$not": {"flag": {"$neq": "x"}}},
+            {"$or": [{"flag": {"$neq": "x"}}, {"idx": "1"}]},
+            {"flag": {"$in": ["x"]}, "idx": {"$gt": "2"}},
+        ):
+            found = [
+                sorted(
+                    row.tags["idx"]
+                    for row in await backend.search_records(
+                        "TYPE", tag_query
+                    ).fetch_all()
+                )
+                for backend in (store, in_memory)
+            ]
+            assert found[0] == found[1], tag_query
+
+    def test_dialects(self):
+        assert numbered_params("a = ? AND b IN (?, ?)") == "a = $1 AND b IN ($2, $3)"
+        assert numbered_params("SELECT 1") == "SELECT 1"
+        assert type_match({"idx": "1"}) == "+i.type = ?"
+        assert type_match({"idx": "1"}, planner_hints=False) == "i.type = ?"
+        assert not PostgresConnectionPool.planner_hints
+
+    @pytest.mark.asyncio
+    async def test_postgres_driver_missing(self):
+        pool = PostgresConnectionPool("postgresql://localhost/acapy", 2)
+        assert pool.size == 2
+        with async_mock.patch.object(test_module, "asyncpg", None):
+            with pytest.raises(StorageError):
+                await SqlStorage(pool).get_record("TYPE", "id")
+        await pool.close()
+
+    def test_has_tag_match(self):
+        assert has_tag_match({"idx": "1"})
+        assert has_tag_match({"idx": {"$in": ["1"]}})
+        assert has_tag_match({"$and": [{"a": {"$neq": "1"}}, {"idx": "1"}]})
+        assert not has_tag_match(None)
+        assert not has_tag_match({"idx": {"$neq": "1"}})
+        assert not has_tag_match({"$not": {"idx": "1"}})
+        assert not has_tag_match({"$or": [{"idx": "1"}, {"idx": "2"}]})
+
+    @pytest.mark.asyncio
+    async def test_search_paging(self, store):
+        records = [test_record({"idx": str(i)}) for i in range(25)]
+        await store.add_records(records)
+        search = store.search_records("TYPE", page_size=10)
+        pages = []
+        while True:
+            rows = await search.fetch()
+            if not rows:
+                break
+            pages.append(rows)
+        assert [len(rows) for rows in pages] == [10, 10, 5]
+        assert [row for rows in pages for row in rows] == records
+
+        rows = await store.search_records(
+            "TYPE", {"idx": "3"}, options={"retrieveTags": False}
+        ).fetch_all()
+        assert rows[0].tags == {}
+        record = await store.get_record("TYPE", records[0].id, {"retrieveTags": False})
+        assert record.tags == {}
+
+    @pytest.mark.asyncio
+    async def test_batch_rollback(self, store):
+        record = test_record()
+        await store.add_record(record)
+        with pytest.raises(StorageError):
+            await store.add_records([test_record(), record])
+        assert len(await store.search_records("TYPE").fetch_all()) == 1
+
+    @pytest.mark.asyncio
+    async def test_concurrent_writers(self, store):
+        records = [test_record({"idx": str(i)}) for i in range(200)]
+        await asyncio.gather(
+            *(store.add_records(records[i : i + 20]) for i in range(0, 200, 20))
+        )
+        assert store.pool._opened == store.pool.size
+        assert len(await store.search_records("TYPE").fetch_all()) == 200
+        await store.pool.close()
+
+    @pytest.mark.asyncio
+    async def test_memory_pool(self):
+        pool = SqliteConnectionPool()
+        assert pool.size == 1
+        storage = SqlStorage(pool)
+        await storage.add_record(test_record())
+        assert len(await storage.search_records("TYPE").fetch_all()) == 1
+        assert len(await SqlStorage(pool).search_records("TYPE").fetch_all()) == 1
+        assert (
+            not await SqlStorage(SqliteConnectionPool())
+            .search_records("TYPE")
+            .fetch_all()
+        )
+
+    @pytest.mark.asyncio
+    async def test_sqlite_error(self, store):
+        def fail():
+            yield FETCH_ALL, "SELECT * FROM no_such_table", ()
+
+        with pytest.raises(StorageError):
+            await store.pool.run(fail)
+        assert len(store.pool._idle) == 1
+
+    @pytest.mark.asyncio
+    async def test_profile_binding(self, store):
+        profile = InMemoryProfile.test_profile()
+        profile.context.injector.bind_instance(BaseStorage, store)
+        async with profile.session() as session:
+            assert session.inject(BaseStorage) is store
@@ -7,7 +7,12 @@ been delivered to their intended destination.
 """
 import time
 
+from typing import Iterable
+from uuid import uuid4
+
+from ...connections.models.connection_target import ConnectionTarget
 from ..outbound.message import OutboundMessage
+from ..queue.store import BaseQueueStore, decode_payload, encode_payload
 
 
 class QueuedMessage:
@@ -17,13 +22,15 @@ class QueuedMessage:
     Allows tracking Metadata.
     """
 
-    def __init__(self, msg: OutboundMessage):
+    def __init__(self, msg: OutboundMessage, keys: Iterable[str] = ()):
         """
         Create Wrapper for queued message.
 
         Automatically sets timestamp on create.
         """
         self.msg = msg
+        self.keys = set(keys)
+        self.queue_id = str(uuid4())
         self.timestamp = time.time()
 
     def older_than(self, compare_timestamp: float) -> bool:
@@ -37,6 +44,46 @@ class QueuedMessage:
         """
         return self.timestamp < compare_timestamp
 
+    def serialize(self) -> dict:
+        """Represent the queued message for the durable queue store."""
+        msg = self.msg
+        record = {
+            "enc": encode_payload(msg.enc_payload),
+            "msg": encode_payload(msg.payload),
+            "keys": sorted(self.keys),
+            "timestamp": self.timestamp,
+            "connection_id": msg.connection_id,
+            "reply_thread_id": msg.reply_thread_id,
+            "reply_to_verkey": msg.reply_to_verkey,
+            "reply_from_verkey": msg.reply_from_verkey,
+        }
+        if msg.target:
+            record["target"] = {
+                "endpoint": msg.target.endpoint,
+                "recipient_keys": list(msg.target.recipient_keys or ()),
+                "routing_keys": list(msg.target.routing_keys or ()),
+                "sender_key": msg.target.sender_key,
+            }
+        return record
+
+    @classmethod
+    def deserialize(cls, queue_id: str, record: dict) -> "QueuedMessage":
+        """Restore a queued message from the durable queue store."""
+        target = record.get("target")
+        msg = OutboundMessage(
+            connection_id=record.get("connection_id"),
+            enc_payload=decode_payload(record["enc"]),
+            payload=decode_payload(record["msg"]),
+            reply_thread_id=record.get("reply_thread_id"),
+            reply_to_verkey=record.get("reply_to_verkey"),
+            reply_from_verkey=record.get("reply_from_verkey"),
+            target=ConnectionTarget(**target) if target else None,
+        )
+        queued = cls(msg, record["keys"])
+        queued.queue_id = queue_id
+        queued.timestamp = record["timestamp"]
+        return queued
+
 
 class DeliveryQueue:
     """
@@ -45,16 +92,51 @@ class DeliveryQueue:
     Manages undelivered messages.
     """
 
-    def __init__(self) -> None:
+    QUEUE_KIND = "undelivered"
+
+    def __init__(self, store: BaseQueueStore = None) -> None:
         """
         Initialize an instance of DeliveryQueue.
 
-        This uses an in memory structure to queue messages.
+        This uses an in memory structure to queue messages, which is also
+        written to the durable store if one is provided.
+
+        Args:
+            store: Optional. Keeps the queued messages across restarts
         """
 
         self.queue_by_key = {}
+        self.store = store
         self.ttl_seconds = 604800  # one week
 
+    async def restore(self) -> int:
+        """
+        Load the messages left in the durable store when the agent last stopped.
+
+        Returns:
+            The number of messages restored
+
+        """
+        if not self.store:
+            return 0
+        horizon = time.time() - self.ttl_seconds
+        restored = 0
+        for queue_id, record in await self.store.load(self.QUEUE_KIND):
+            wrapped_msg = QueuedMessage.deserialize(queue_id, record)
+            if wrapped_msg.older_than(horizon):
+                self.store.remove(queue_id)
+                continue
+            for recipient_key in wrapped_msg.keys:
+                self.queue_by_key.setdefault(recipient_key, []).append(wrapped_msg)
+            restored += 1
+        return restored
+
+    def _release(self, wrapped_msg: QueuedMessage, key: str):
+        """Drop a key from a message, removing it from the store if none are left."""
+        wrapped_msg.keys.discard(key)
+        if self.store and not wrapped_msg.keys:
+            self.store.remove(wrapped_msg.queue_id)
+
     def expire_messages(self, ttl=None):
         """
         Expire messages that are past the time limit.
@@ -66,9 +148,13 @@ class DeliveryQueue:
         ttl_seconds = ttl or self.ttl_seconds
         horizon = time.time() - ttl_seconds
         for key in self.queue_by_key.keys():
-            self.queue_by_key[key] = [
-                wm for wm in self.queue_by_key[key] if not wm.older_than(horizon)
-            ]
+            kept = []
+            for wm in self.queue_by_key[key]:
+                if wm.older_than(horizon):
+                    self._release(wm, key)
+                else:
+                    kept.append(wm)
+            self.queue_by_key[key] = kept
 
     def add_message(self, msg: OutboundMessage):
         """
@@ -84,7 +170,11 @@ class DeliveryQueue:
             keys.update(msg.target.recipient_keys)
         if msg.reply_to_verkey:
             keys.add(msg.reply_to_verkey)
-        wrapped_msg = QueuedMessage(msg)
+        wrapped_msg = QueuedMessage(msg, keys)
+        if self.store and keys:
+            self.store.put(
+                wrapped_msg.queue_id, self.QUEUE_KIND, wrapped_msg.serialize()
+            )
         for recipient_key in keys:
             if recipient_key not in self.queue_by_key:
                 self.queue_by_key[recipient_key] = []
@@ -121,7 +211,9 @@ class DeliveryQueue:
             key: The key to use for lookup
         """
         if key in self.queue_by_key:
-            return self.queue_by_key[key].pop(0).msg
+            wrapped_msg = self.queue_by_key[key].pop(0)
+            self._release(wrapped_msg, key)
+            return wrapped_msg.msg
 
     def inspect_all_messages_for_key(self, key: str):
         """
@@ -146,6 +238,7 @@ class DeliveryQueue:
             for wrapped_msg in self.queue_by_key[key]:
                 if wrapped_msg.msg == msg:
                     self.queue_by_key[key].remove(wrapped_msg)
+                    self._release(wrapped_msg, key)
                     if not self.queue_by_key[key]:
                         del self.queue_by_key[key]
                     break  # exit processing loop
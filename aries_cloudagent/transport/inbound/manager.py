@@ -11,6 +11,7 @@ from ...utils.classloader import ClassLoader, ModuleLoadError, ClassNotFoundErro
 from ...utils.task_queue import CompletedTask, TaskQueue
 
 from ..outbound.message import OutboundMessage
+from ..queue.store import BaseQueueStore
 from ..wire_format import BaseWireFormat
 
 from .base import (
@@ -66,7 +67,12 @@ class InboundTransportManager:
 
         # Setup queue for undelivered messages
         if self.profile.context.settings.get("transport.enable_undelivered_queue"):
-            self.undelivered_queue = DeliveryQueue()
+            self.undelivered_queue = DeliveryQueue(
+                self.profile.inject(BaseQueueStore, required=False)
+            )
+            restored = await self.undelivered_queue.restore()
+            if restored:
+                LOGGER.info("Restored %d undelivered messages", restored)
 
         # self.session_limit = asyncio.Semaphore(50)
 
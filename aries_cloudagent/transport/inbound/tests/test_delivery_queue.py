@@ -1,4 +1,6 @@
 import asyncio
+from os import path
+from tempfile import TemporaryDirectory
 from unittest import mock, TestCase
 
 from asynctest import TestCase as AsyncTestCase
@@ -6,6 +8,7 @@ from asynctest import mock as async_mock
 
 from ....connections.models.connection_target import ConnectionTarget
 from ....transport.outbound.message import OutboundMessage
+from ....transport.queue.sqlite_store import SqliteQueueStore
 
 from ..delivery_queue import DeliveryQueue
 
@@ -64,3 +67,30 @@ class TestDeliveryQueue(AsyncTestCase):
     async def test_count_zero_with_no_items(self):
         queue = DeliveryQueue()
         assert queue.message_count_for_key("aaa") == 0
+
+    async def test_store_restore(self):
+        with TemporaryDirectory() as tmp:
+            store = SqliteQueueStore(path.join(tmp, "queue.db"))
+            queue = DeliveryQueue(store)
+
+            t = ConnectionTarget(recipient_keys=["aaa"], endpoint="http://x")
+            queue.add_message(OutboundMessage(payload="x", target=t))
+            queue.add_message(
+                OutboundMessage(payload="y", enc_payload=b"y", reply_to_verkey="bbb")
+            )
+            queue.add_message(OutboundMessage(payload="z", reply_to_verkey="ccc"))
+            queue.get_one_message_for_key("ccc")
+            await store.close()
+
+            queue = DeliveryQueue(store)
+            assert await queue.restore() == 2
+            msg = queue.get_one_message_for_key("aaa")
+            assert msg.payload == "x"
+            assert msg.target.endpoint == "http://x"
+            assert queue.get_one_message_for_key("bbb").enc_payload == b"y"
+            assert not queue.has_message_for_key("ccc")
+            await store.close()
+
+            queue = DeliveryQueue(store)
+            assert await queue.restore() == 0
+            await store.close()
@@ -4,7 +4,9 @@ import asyncio
 from abc import ABC, abstractmethod
 from typing import Union
 
+from ...config.base import BaseSettings
 from ...config.injection_context import InjectionContext
+from ...config.settings import Settings
 from ...utils.stats import Collector
 
 from ..error import TransportError
@@ -17,6 +19,7 @@ class BaseOutboundTransport(ABC):
     def __init__(self, wire_format: BaseWireFormat = None) -> None:
         """Initialize a `BaseOutboundTransport` instance."""
         self._collector = None
+        self._settings = Settings()
         self._wire_format = wire_format
 
     @property
@@ -29,6 +32,16 @@ class BaseOutboundTransport(ABC):
         """Assign a new stats collector instance."""
         self._collector = coll
 
+    @property
+    def settings(self) -> BaseSettings:
+        """Accessor for the agent settings used to configure the transport."""
+        return self._settings
+
+    @settings.setter
+    def settings(self, settings: BaseSettings):
+        """Assign the agent settings used to configure the transport."""
+        self._settings = settings
+
     async def __aenter__(self):
         """Async context manager enter."""
         await self.start()
@@ -0,0 +1,232 @@
+"""Delivery health and circuit breakers for outbound endpoints."""
+
+import heapq
+
+from collections import OrderedDict
+from functools import lru_cache
+from typing import Any, Sequence
+from urllib.parse import urlparse
+
+DEFAULT_FAILURE_THRESHOLD = 5
+DEFAULT_RESET_TIMEOUT = 30.0
+DEFAULT_MAX_RESET_TIMEOUT = 600.0
+
+
+class EndpointCircuit:
+    """The delivery state of an outbound endpoint which has recently failed."""
+
+    STATE_CLOSED = "closed"
+    STATE_OPEN = "open"
+    STATE_HALF_OPEN = "half-open"
+
+    def __init__(self, origin: str):
+        """Initialize the `EndpointCircuit` instance."""
+        self.origin = origin
+        self.failures = 0
+        self.opened = 0
+        self.open_until: float = None
+        self.parked = OrderedDict()
+        self.probing = False
+        self.state = self.STATE_CLOSED
+
+    def serialize(self) -> dict:
+        """Summarize the circuit for the agent statistics."""
+        return {
+            "state": self.state,
+            "failures": self.failures,
+            "parked": len(self.parked),
+            "open_until": self.open_until,
+        }
+
+
+class EndpointHealth:
+    """
+    Track delivery failures by endpoint and stop sending to endpoints that are down.
+
+    After `threshold` consecutive failures the circuit for an endpoint opens, and
+    messages for it are parked rather than attempted. Once the reset timeout has
+    passed, the circuit is half-open and a single message is sent as a probe:
+    if it is delivered the circuit closes and parked messages are released,
+    otherwise the circuit opens again for twice as long. A message may be parked
+    with a deadline, after which it is returned by `expire` rather than waiting on
+    a circuit that does not close.
+    """
+
+    def __init__(
+        self,
+        threshold: int = DEFAULT_FAILURE_THRESHOLD,
+        reset_timeout: float = DEFAULT_RESET_TIMEOUT,
+        max_reset_timeout: float = DEFAULT_MAX_RESET_TIMEOUT,
+    ):
+        """
+        Initialize the `EndpointHealth` instance.
+
+        Args:
+            threshold: The number of consecutive failures which opens a circuit,
+                or 0 to never open one
+            reset_timeout: The time in seconds before an open circuit is probed
+            max_reset_timeout: The limit for the reset timeout as it is doubled
+
+        """
+        self.threshold = threshold
+        self.reset_timeout = reset_timeout
+        self.max_reset_timeout = max_reset_timeout
+        self.circuits = {}
+        self._parked = 0
+        self._timers = []
+        self._deadlines = []
+        self._seq = 0
+
+    @staticmethod
+    @lru_cache(maxsize=4096)
+    def origin(endpoint: str) -> str:
+        """Get the scheme and host of an endpoint, which share a circuit."""
+        parsed = urlparse(endpoint)
+        return f"{parsed.scheme}://{parsed.netloc}" if parsed.netloc else endpoint
+
+    def admit(self, endpoint: str) -> bool:
+        """Determine whether a message may be sent to an endpoint now."""
+        circuit = self.circuits.get(self.origin(endpoint))
+        if not circuit or circuit.state == EndpointCircuit.STATE_CLOSED:
+            return True
+        if circuit.state == EndpointCircuit.STATE_HALF_OPEN and not circuit.probing:
+            circuit.probing = True
+            return True
+        return False
+
+    def is_open(self, endpoint: str) -> bool:
+        """Determine whether messages for an endpoint are being held back."""
+        circuit = self.circuits.get(self.origin(endpoint))
+        return bool(circuit) and circuit.state != EndpointCircuit.STATE_CLOSED
+
+    def park(self, endpoint: str, queued: Any, deadline: float = None):
+        """
+        Hold a message until the circuit for its endpoint closes.
+
+        Args:
+            endpoint: The endpoint of the message
+            queued: The message to hold
+            deadline: The time after which the message is expired, if any
+
+        """
+        origin = self.origin(endpoint)
+        circuit = self.circuits.get(origin)
+        if not circuit:
+            circuit = self.circuits[origin] = EndpointCircuit(origin)
+        if queued not in circuit.parked:
+            self._parked += 1
+        circuit.parked[queued] = deadline
+        if deadline is not None:
+            self._seq += 1
+            heapq.heappush(self._deadlines, (deadline, self._seq, origin, queued))
+
+    def record(self, endpoint: str, delivered: bool, now: float) -> Sequence[Any]:
+        """
+        Record the outcome of an attempt to deliver to an endpoint.
+
+        Args:
+            endpoint: The endpoint delivered to
+            delivered: Whether the delivery succeeded
+            now: The current time
+
+        Returns:
+            The parked messages released by closing the circuit
+
+        """
+        origin = self.origin(endpoint)
+        if delivered:
+            circuit = self.circuits.pop(origin, None)
+            if not circuit:
+                return []
+            self._parked -= len(circuit.parked)
+            return list(circuit.parked)
+
+        if not self.threshold:
+            return []
+        circuit = self.circuits.get(origin)
+        if not circuit:
+            circuit = self.circuits[origin] = EndpointCircuit(origin)
+        circuit.failures += 1
+        if circuit.state == EndpointCircuit.STATE_HALF_OPEN or (
+            circuit.state == EndpointCircuit.STATE_CLOSED
+            and circuit.failures >= self.threshold
+        ):
+            circuit.state = EndpointCircuit.STATE_OPEN
+            circuit.open_until = now + min(
+                self.reset_timeout * 2 ** circuit.opened, self.max_reset_timeout
+            )
+            circuit.opened += 1
+            circuit.probing = False
+            heapq.heappush(self._timers, (circuit.open_until, origin))
+        return []
+
+    def release_due(self, now: float) -> Sequence[Any]:
+        """
+        Move open circuits past their reset timeout to half-open.
+
+        Returns:
+            A parked message to send as a probe for each circuit
+
+        """
+        probes = []
+        timers = self._timers
+        while timers and timers[0][0] <= now:
+            open_until, origin = heapq.heappop(timers)
+            circuit = self.circuits.get(origin)
+            if (
+                circuit
+                and circuit.state == EndpointCircuit.STATE_OPEN
+                and circuit.open_until == open_until
+            ):
+                circuit.state = EndpointCircuit.STATE_HALF_OPEN
+                circuit.open_until = None
+                if circuit.parked:
+                    probes.append(circuit.parked.popitem(last=False)[0])
+                    self._parked -= 1
+        return probes
+
+    def expire(self, now: float) -> Sequence[Any]:
+        """
+        Remove the parked messages which have passed their deadline.
+
+        Returns:
+            The expired messages
+
+        """
+        expired = []
+        deadlines = self._deadlines
+        while deadlines and deadlines[0][0] <= now:
+            deadline, _, origin, queued = heapq.heappop(deadlines)
+            circuit = self.circuits.get(origin)
+            if (
+                circuit
+                and queued in circuit.parked
+                and circuit.parked[queued] == deadline
+            ):
+                del circuit.parked[queued]
+                self._parked -= 1
+                expired.append(queued)
+        return expired
+
+    @property
+    def next_probe_at(self) -> float:
+        """Accessor for the time at which the next open circuit may be probed."""
+        return self._timers[0][0] if self._timers else None
+
+    @property
+    def next_expiry_at(self) -> float:
+        """Accessor for the time at which the next parked message may expire."""
+        return self._deadlines[0][0] if self._deadlines else None
+
+    @property
+    def parked(self) -> int:
+        """Accessor for the number of parked messages."""
+        return self._parked
+
+    def stats(self) -> dict:
+        """Summarize the circuits which are not closed."""
+        return {
+            origin: circuit.serialize()
+            for origin, circuit in self.circuits.items()
+            if circuit.state != EndpointCircuit.STATE_CLOSED
+        }
@@ -1,16 +1,29 @@
 """Http outbound transport."""
 
+import asyncio
 import logging
+from collections import Counter
 from typing import Union
 
-from aiohttp import ClientSession, DummyCookieJar, TCPConnector
+from aiohttp import ClientSession, ClientTimeout, DummyCookieJar, TCPConnector
 
 from ...config.injection_context import InjectionContext
 
-from ..stats import StatsTracer
+from ..stats import Http2StatsTracer, StatsTracer
 
 from .base import BaseOutboundTransport, OutboundTransportError
 
+try:
+    import httpx
+except ImportError:
+    httpx = None
+
+DEFAULT_LIMIT = 200
+DEFAULT_HOST_LIMIT = 50
+DEFAULT_DNS_TTL = 10
+DEFAULT_KEEPALIVE_TIMEOUT = 15
+DEFAULT_TIMEOUT = 300
+
 
 class HttpTransport(BaseOutboundTransport):
     """Http outbound transport class."""
@@ -22,26 +35,147 @@ class HttpTransport(BaseOutboundTransport):
         super().__init__()
         self.client_session: ClientSession = None
         self.connector: TCPConnector = None
+        self.http2_client: "httpx.AsyncClient" = None
+        self.http2_tracer: Http2StatsTracer = None
+        self.keepalive_timeout: float = DEFAULT_KEEPALIVE_TIMEOUT
+        self.prewarm = 0
+        self.endpoint_use = Counter()
+        self.endpoint_last = {}
+        self.prewarmed = 0
+        self._prewarm_task: asyncio.Future = None
         self.logger = logging.getLogger(__name__)
 
+    def _setting(self, name: str, default: float = None) -> float:
+        """Fetch a numeric transport setting."""
+        value = self.settings.get_value(name)
+        return default if value is None else float(value)
+
     async def start(self):
         """Start the transport."""
+        limit = int(self._setting("transport.http_limit", DEFAULT_LIMIT))
+        host_limit = int(self._setting("transport.http_host_limit", DEFAULT_HOST_LIMIT))
+        dns_ttl = self._setting("transport.http_dns_ttl", DEFAULT_DNS_TTL)
+        self.keepalive_timeout = self._setting(
+            "transport.http_keepalive_timeout", DEFAULT_KEEPALIVE_TIMEOUT
+        )
+        timeout = self._setting("transport.http_timeout", DEFAULT_TIMEOUT)
+        connect_timeout = self._setting("transport.http_connect_timeout")
+        self.prewarm = int(self._setting("transport.http_prewarm", 0))
+
+        connector_args = {"limit": limit, "limit_per_host": host_limit}
+        if dns_ttl:
+            connector_args["ttl_dns_cache"] = dns_ttl
+        else:
+            connector_args["use_dns_cache"] = False
+        if self.keepalive_timeout:
+            connector_args["keepalive_timeout"] = self.keepalive_timeout
+        else:
+            connector_args["force_close"] = True
+
+        if self.settings.get_bool("transport.http2"):
+            self.http2_client = self._create_http2_client(
+                limit, host_limit, timeout, connect_timeout
+            )
+            if self.collector:
+                self.http2_tracer = Http2StatsTracer(self.collector, "outbound-http2:")
+
         session_args = {}
-        self.connector = TCPConnector(limit=200, limit_per_host=50)
+        self.connector = TCPConnector(**connector_args)
         if self.collector:
             session_args["trace_configs"] = [
                 StatsTracer(self.collector, "outbound-http:")
             ]
+        session_args["timeout"] = ClientTimeout(
+            total=timeout, sock_connect=connect_timeout
+        )
         session_args["cookie_jar"] = DummyCookieJar()
         session_args["connector"] = self.connector
         self.client_session = ClientSession(**session_args)
+
+        if self.prewarm and self.keepalive_timeout:
+            self._prewarm_task = asyncio.ensure_future(self._prewarm_loop())
         return self
 
+    def _create_http2_client(
+        self, limit: int, host_limit: int, timeout: float, connect_timeout: float
+    ) -> "httpx.AsyncClient":
+        """Create the client used to deliver over HTTP/2."""
+        if not httpx:
+            raise OutboundTransportError(
+                "HTTP/2 delivery requires the httpx[http2] package"
+            )
+        try:
+            return httpx.AsyncClient(
+                http2=True,
+                limits=httpx.Limits(
+                    max_connections=limit,
+                    max_keepalive_connections=host_limit,
+                    keepalive_expiry=self.keepalive_timeout or 0,
+                ),
+                timeout=httpx.Timeout(timeout, connect=connect_timeout or timeout),
+            )
+        except ImportError as err:
+            raise OutboundTransportError(
+                "HTTP/2 delivery requires the httpx[http2] package"
+            ) from err
+
     async def stop(self):
         """Stop the transport."""
+        if self._prewarm_task:
+            self._prewarm_task.cancel()
+            self._prewarm_task = None
+        if self.http2_client:
+            await self.http2_client.aclose()
+            self.http2_client = None
+            self.http2_tracer = None
         await self.client_session.close()
         self.client_session = None
 
+    async def _prewarm_loop(self):
+        """Keep connections open to the endpoints used most often."""
+        # refresh often enough that an idle connection never reaches the timeout
+        interval = self.keepalive_timeout / 3
+        loop = asyncio.get_event_loop()
+        while True:
+            await asyncio.sleep(interval)
+            now = loop.time()
+            idle = [
+                endpoint
+                for endpoint, _ in self.endpoint_use.most_common(self.prewarm)
+                if now - self.endpoint_last.get(endpoint, 0) >= interval
+            ]
+            for endpoint in idle:
+                self.endpoint_last[endpoint] = now
+            await asyncio.gather(*(self.warm(endpoint) for endpoint in idle))
+            # halve the counts, so an endpoint no longer in use drops out
+            for endpoint, used in list(self.endpoint_use.items()):
+                if used > 1:
+                    self.endpoint_use[endpoint] = used // 2
+                else:
+                    del self.endpoint_use[endpoint]
+                    self.endpoint_last.pop(endpoint, None)
+
+    async def warm(self, endpoint: str):
+        """
+        Open or refresh a pooled connection to an endpoint.
+
+        The response is discarded; the request only keeps the connection, and
+        the cached address of its host, ready for the next message.
+
+        Args:
+            endpoint: URI endpoint to connect to
+        """
+        try:
+            if self.http2_client and endpoint.startswith("https:"):
+                await self.http2_client.options(endpoint)
+            else:
+                async with self.client_session.options(endpoint) as response:
+                    await response.read()
+        except Exception as err:
+            self.logger.debug("Could not pre-warm connection to %s: %s", endpoint, err)
+        else:
+            self.prewarmed += 1
+
     async def handle_message(
         self, context: InjectionContext, payload: Union[str, bytes], endpoint: str
     ):
@@ -63,13 +197,38 @@ class HttpTransport(BaseOutboundTransport):
         self.logger.debug(
             "Posting to %s; Data: %s; Headers: %s", endpoint, payload, headers
         )
-        async with self.client_session.post(
-            endpoint, data=payload, headers=headers
-        ) as response:
-            if response.status < 200 or response.status > 299:
-                raise OutboundTransportError(
-                    (
-                        f"Unexpected response status {response.status}, "
-                        f"caused by: {response.reason}"
+        if self.prewarm:
+            self.endpoint_use[endpoint] += 1
+            self.endpoint_last[endpoint] = asyncio.get_event_loop().time()
+        if self.http2_client and endpoint.startswith("https:"):
+            # HTTP/2 is negotiated during the TLS handshake, falling back to
+            # HTTP/1.1 for peers without support
+            status, reason = await self._post_http2(endpoint, payload, headers)
+        else:
+            async with self.client_session.post(
+                endpoint, data=payload, headers=headers
+            ) as response:
+                status, reason = response.status, response.reason
+        if status < 200 or status > 299:
+            raise OutboundTransportError(
+                f"Unexpected response status {status}, caused by: {reason}"
+            )
+
+    async def _post_http2(self, endpoint: str, payload: Union[str, bytes], headers):
+        """Post a message using the HTTP/2 client."""
+        try:
+            if self.http2_tracer:
+                with self.collector.timer("outbound-http2:POST"):
+                    response = await self.http2_client.post(
+                        endpoint,
+                        content=payload,
+                        headers=headers,
+                        extensions={"trace": self.http2_tracer.trace()},
                     )
+            else:
+                response = await self.http2_client.post(
+                    endpoint, content=payload, headers=headers
                 )
+        except httpx.HTTPError as err:
+            raise OutboundTransportError(f"HTTP/2 delivery failed: {err}") from err
+        return response.status_code, response.reason_phrase
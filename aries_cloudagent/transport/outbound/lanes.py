@@ -0,0 +1,182 @@
+"""Fair sharing of outbound delivery slots between endpoints."""
+
+import heapq
+import time
+
+from collections import deque
+from itertools import count
+from typing import Any, Callable, Mapping
+
+LANE_MESSAGE = "message"
+LANE_WEBHOOK = "webhook"
+
+DEFAULT_LANE_LIMITS = {LANE_MESSAGE: 150, LANE_WEBHOOK: 50}
+DEFAULT_HOST_LIMIT = 50
+
+
+class EndpointFlow:
+    """The deliveries waiting for, or in progress to, one endpoint origin."""
+
+    def __init__(self, origin: str, weight: float = 1.0):
+        """Initialize the `EndpointFlow` instance."""
+        self.origin = origin
+        self.weight = weight
+        self.queue = deque()
+        self.active = 0
+        self.tag = 0.0
+        self.scheduled = False
+
+
+class DeliveryLane:
+    """
+    A pool of delivery slots shared fairly between the endpoints using it.
+
+    Endpoints are served by start-time fair queuing: the endpoint with the lowest
+    virtual start tag is served next, and each delivery advances its tag by the
+    inverse of its weight. While several endpoints have messages waiting, one
+    with weight 2 is therefore sent twice as many as one with weight 1, however
+    many each has queued. An endpoint which has been idle starts again from the
+    current virtual time, so it cannot save up a share it did not use.
+
+    An endpoint with `host_limit` deliveries in progress is passed over until
+    one of them finishes, so a slow endpoint cannot hold every slot.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        limit: int,
+        host_limit: int = DEFAULT_HOST_LIMIT,
+        weights: Mapping[str, float] = None,
+    ):
+        """
+        Initialize the `DeliveryLane` instance.
+
+        Args:
+            name: The name of the lane
+            limit: The maximum number of deliveries in progress, or 0 for no limit
+            host_limit: The maximum number of deliveries in progress to a single
+                endpoint origin, or 0 for no limit
+            weights: The share of the lane given to particular endpoint origins,
+                relative to the default of 1
+
+        """
+        self.name = name
+        self.limit = limit or 0
+        self.host_limit = host_limit or 0
+        self.weights = weights or {}
+        self.flows = {}
+        self.active = 0
+        self.ready = 0
+        self.ready_peak = 0
+        self.dispatched = 0
+        self.delivered = 0
+        self.failed = 0
+        self.wait_total = 0.0
+        self.wait_max = 0.0
+        self.vtime = 0.0
+        self._heap = []
+        self._sequence = count()
+
+    def push(self, origin: str, item: Any):
+        """Queue an item for delivery to an endpoint origin."""
+        flow = self.flows.get(origin)
+        if not flow:
+            flow = self.flows[origin] = EndpointFlow(
+                origin, self.weights.get(origin, 1.0)
+            )
+        flow.queue.append((time.perf_counter(), item))
+        self.ready += 1
+        if self.ready > self.ready_peak:
+            self.ready_peak = self.ready
+        self._schedule(flow)
+
+    def _schedule(self, flow: EndpointFlow):
+        """Make a flow eligible to be served, if it has messages and free slots."""
+        if (
+            flow.scheduled
+            or not flow.queue
+            or (self.host_limit and flow.active >= self.host_limit)
+        ):
+            return
+        flow.tag = max(flow.tag, self.vtime)
+        flow.scheduled = True
+        heapq.heappush(self._heap, (flow.tag, next(self._sequence), flow))
+
+    @property
+    def available(self) -> bool:
+        """Determine whether an item may be taken for delivery now."""
+        return bool(self._heap) and (not self.limit or self.active < self.limit)
+
+    def pop(self, admit: Callable[[Any], bool] = None) -> Any:
+        """
+        Take the next item to deliver, if a slot is free.
+
+        Args:
+            admit: Called with each candidate item; a rejected item is dropped
+                from the lane without using a slot
+
+        Returns:
+            The item to deliver, or None
+
+        """
+        while self.available:
+            tag, _, flow = heapq.heappop(self._heap)
+            flow.scheduled = False
+            queued_at, item = flow.queue.popleft()
+            self.ready -= 1
+            if admit and not admit(item):
+                self._schedule(flow)
+                self._discard(flow)
+                continue
+            self.vtime = tag
+            flow.tag = tag + 1 / flow.weight
+            flow.active += 1
+            self.active += 1
+            self.dispatched += 1
+            wait = time.perf_counter() - queued_at
+            self.wait_total += wait
+            if wait > self.wait_max:
+                self.wait_max = wait
+            self._schedule(flow)
+            return item
+
+    def done(self, origin: str, delivered: bool):
+        """Release the slot held by a delivery to an endpoint origin."""
+        self.active -= 1
+        if delivered:
+            self.delivered += 1
+        else:
+            self.failed += 1
+        flow = self.flows.get(origin)
+        if flow:
+            flow.active -= 1
+            self._schedule(flow)
+            self._discard(flow)
+
+    def _discard(self, flow: EndpointFlow):
+        """Forget a flow with nothing queued or in progress."""
+        if not flow.queue and not flow.active:
+            del self.flows[flow.origin]
+
+    def serialize(self) -> dict:
+        """Summarize the lane for the agent statistics."""
+        return {
+            "limit": self.limit,
+            "host_limit": self.host_limit,
+            "active": self.active,
+            "ready": self.ready,
+            "ready_peak": self.ready_peak,
+            "endpoints": len(self.flows),
+            "dispatched": self.dispatched,
+            "delivered": self.delivered,
+            "failed": self.failed,
+            "wait_avg": self.wait_total / self.dispatched if self.dispatched else 0.0,
+            "wait_max": self.wait_max,
+        }
+
+    def __repr__(self) -> str:
+        """Human readable representation of `DeliveryLane`."""
+        return "<{}(name={}, active={}, ready={})>".format(
+            self.__class__.__name__, self.name, self.active, self.ready
+        )
@@ -1,12 +1,17 @@
 """Outbound transport manager."""
 
 import asyncio
+import heapq
 import json
 import logging
+import random
 import time
 
-from typing import Callable, Type, Union
+from collections import deque
+from itertools import count
+from typing import Callable, Mapping, Sequence, Type, Union
 from urllib.parse import urlparse
+from uuid import uuid4
 
 from ...connections.models.connection_target import ConnectionTarget
 from ...config.injection_context import InjectionContext
@@ -17,6 +22,7 @@ from ...utils.task_queue import CompletedTask, TaskQueue, task_exc_info
 
 from ...utils.tracing import trace_event, get_timer
 
+from ..queue.store import BaseQueueStore, decode_payload, encode_payload
 from ..wire_format import BaseWireFormat
 
 from .base import (
@@ -24,6 +30,14 @@ from .base import (
     OutboundDeliveryError,
     OutboundTransportRegistrationError,
 )
+from .health import DEFAULT_FAILURE_THRESHOLD, DEFAULT_RESET_TIMEOUT, EndpointHealth
+from .lanes import (
+    DEFAULT_HOST_LIMIT,
+    DEFAULT_LANE_LIMITS,
+    LANE_MESSAGE,
+    LANE_WEBHOOK,
+    DeliveryLane,
+)
 from .message import OutboundMessage
 
 LOGGER = logging.getLogger(__name__)
@@ -38,6 +52,7 @@ class QueuedOutboundMessage:
     STATE_ENCODE = "encode"
     STATE_DELIVER = "deliver"
     STATE_RETRY = "retry"
+    STATE_PARKED = "parked"
     STATE_DONE = "done"
 
     def __init__(
@@ -53,6 +68,9 @@ class QueuedOutboundMessage:
         self.error: Exception = None
         self.message = message
         self.payload: Union[str, bytes] = None
+        self.attempts = 0
+        self.lane = LANE_MESSAGE
+        self.queue_id: str = None
         self.retries = None
         self.retry_at: float = None
         self.state = self.STATE_NEW
@@ -61,10 +79,215 @@ class QueuedOutboundMessage:
         self.transport_id: str = transport_id
 
 
+class OutboundScheduler:
+    """
+    Track outbound messages between the stages of encoding and delivery.
+
+    Messages waiting to be encoded are kept in a ready queue, and messages
+    waiting to be retried in a heap ordered on `retry_at`. Messages ready to be
+    delivered are queued in a lane, webhooks separately from DIDComm messages,
+    and each lane shares its own delivery slots fairly between endpoints.
+    Messages for endpoints whose circuit is open are parked until it closes, or
+    until the time they would have waited for a retry has passed.
+    """
+
+    def __init__(
+        self,
+        health: EndpointHealth = None,
+        lanes: Mapping[str, DeliveryLane] = None,
+        park_timeout: Callable[[int], float] = None,
+    ):
+        """
+        Initialize the `OutboundScheduler` instance.
+
+        Args:
+            health: The circuit breakers for each endpoint
+            lanes: The delivery lanes by name
+            park_timeout: Get the time a message may stay parked from its
+                number of attempts, or None to park messages without a deadline
+
+        """
+        self.health = health or EndpointHealth()
+        self.park_timeout = park_timeout
+        self.lanes = lanes or {
+            name: DeliveryLane(name, limit)
+            for name, limit in DEFAULT_LANE_LIMITS.items()
+        }
+        self.encode_ready = deque()
+        self.finished = deque()
+        self.retry_timers = []
+        self.encoding = 0
+        self._lane_order = deque(self.lanes.values())
+        self._sequence = count()
+
+    def lane_for(self, queued: QueuedOutboundMessage) -> DeliveryLane:
+        """Get the delivery lane for a message, by default the DIDComm lane."""
+        return self.lanes.get(queued.lane) or self.lanes[LANE_MESSAGE]
+
+    def push(self, queued: QueuedOutboundMessage):
+        """Add a message to the queue for its current state."""
+        state = queued.state
+        if state == QueuedOutboundMessage.STATE_NEW:
+            self.encode_ready.append(queued)
+        elif state == QueuedOutboundMessage.STATE_PENDING:
+            self.lane_for(queued).push(self.health.origin(queued.endpoint), queued)
+        elif state == QueuedOutboundMessage.STATE_RETRY:
+            heapq.heappush(
+                self.retry_timers, (queued.retry_at, next(self._sequence), queued)
+            )
+        elif state == QueuedOutboundMessage.STATE_PARKED:
+            self._park(queued)
+        elif state == QueuedOutboundMessage.STATE_DONE:
+            self.finished.append(queued)
+        else:
+            raise ValueError(f"Cannot schedule outbound message in state {state}")
+
+    def pop_encode(self) -> QueuedOutboundMessage:
+        """Take the next message to be encoded."""
+        self.encoding += 1
+        return self.encode_ready.popleft()
+
+    def _park(self, queued: QueuedOutboundMessage):
+        """Park a message until its circuit closes or its deadline passes."""
+        if queued.retry_at is None and self.park_timeout:
+            queued.retry_at = get_timer() + self.park_timeout(max(queued.attempts, 1))
+        self.health.park(queued.endpoint, queued, queued.retry_at)
+
+    def _admit(self, queued: QueuedOutboundMessage) -> bool:
+        """Check the circuit for the endpoint of a message, parking it if open."""
+        if self.health.admit(queued.endpoint):
+            return True
+        queued.state = QueuedOutboundMessage.STATE_PARKED
+        self._park(queued)
+        return False
+
+    def pop_deliver(self) -> QueuedOutboundMessage:
+        """
+        Take the next message to be delivered, parking any held back.
+
+        The lanes take turns, so that each is served while it has free slots
+        whatever the others have queued.
+        """
+        lanes = self._lane_order
+        for _ in range(len(lanes)):
+            lane = lanes[0]
+            lanes.rotate(-1)
+            queued = lane.pop(self._admit)
+            if queued:
+                return queued
+
+    def encoded(self, queued: QueuedOutboundMessage):
+        """Reschedule a message once its encoding has finished."""
+        self.encoding -= 1
+        self.push(queued)
+
+    def delivered(self, queued: QueuedOutboundMessage):
+        """Reschedule a message once an attempt to deliver it has finished."""
+        self.lane_for(queued).done(
+            self.health.origin(queued.endpoint), not queued.error
+        )
+        self.push(queued)
+
+    def release(self, queued: QueuedOutboundMessage):
+        """Queue a message for delivery once its wait is over."""
+        queued.retry_at = None
+        queued.state = QueuedOutboundMessage.STATE_PENDING
+        self.push(queued)
+
+    def release_due(self, now: float) -> int:
+        """
+        Move messages whose retry time has passed to the delivery queue.
+
+        A parked message is also released to probe each circuit which has been
+        open for long enough.
+        """
+        released = 0
+        timers = self.retry_timers
+        while timers and timers[0][0] <= now:
+            _, _, queued = heapq.heappop(timers)
+            self.release(queued)
+            released += 1
+        for queued in self.health.release_due(now):
+            self.release(queued)
+            released += 1
+        return released
+
+    def expire_parked(self, now: float) -> Sequence[QueuedOutboundMessage]:
+        """
+        Take the parked messages whose deadline has passed.
+
+        Returns:
+            The expired messages, which must be rescheduled by the caller
+
+        """
+        expired = self.health.expire(now)
+        for queued in expired:
+            queued.retry_at = None
+        return expired
+
+    @property
+    def deliver_ready(self) -> int:
+        """Accessor for the number of messages waiting in the delivery lanes."""
+        return sum(lane.ready for lane in self.lanes.values())
+
+    @property
+    def delivering(self) -> int:
+        """Accessor for the number of deliveries in progress."""
+        return sum(lane.active for lane in self.lanes.values())
+
+    @property
+    def next_retry_at(self) -> float:
+        """Accessor for the time at which the next retry, probe or expiry is due."""
+        times = [
+            self.retry_timers[0][0] if self.retry_timers else None,
+            self.health.next_probe_at,
+            self.health.next_expiry_at,
+        ]
+        return min((at for at in times if at is not None), default=None)
+
+    @property
+    def depths(self) -> dict:
+        """Accessor for the number of messages at each stage."""
+        return {
+            "encode_ready": len(self.encode_ready),
+            "encoding": self.encoding,
+            "deliver_ready": self.deliver_ready,
+            "delivering": self.delivering,
+            "retry_wait": len(self.retry_timers),
+            "parked": self.health.parked,
+        }
+
+    def __len__(self) -> int:
+        """Count the messages which have not finished processing."""
+        return (
+            len(self.encode_ready)
+            + self.deliver_ready
+            + len(self.finished)
+            + len(self.retry_timers)
+            + self.health.parked
+            + self.encoding
+            + self.delivering
+        )
+
+    def lane_stats(self) -> dict:
+        """Summarize each delivery lane."""
+        return {name: lane.serialize() for name, lane in self.lanes.items()}
+
+    def __repr__(self) -> str:
+        """Human readable representation of `OutboundScheduler`."""
+        return "<{}({})>".format(
+            self.__class__.__name__,
+            ", ".join(f"{key}={value}" for key, value in self.depths.items()),
+        )
+
+
 class OutboundTransportManager:
     """Outbound transport manager class."""
 
     MAX_RETRY_COUNT = 4
+    QUEUE_KIND = "outbound"
+    RETRY_BACKOFF = 10.0
+    RETRY_MAX_DELAY = 600.0
 
     def __init__(
         self, context: InjectionContext, handle_not_delivered: Callable = None
@@ -80,16 +303,55 @@ class OutboundTransportManager:
         self.context = context
         self.loop = asyncio.get_event_loop()
         self.handle_not_delivered = handle_not_delivered
-        self.outbound_buffer = []
         self.outbound_event = asyncio.Event()
-        self.outbound_new = []
         self.registered_schemes = {}
         self.registered_transports = {}
         self.running_transports = {}
         self.task_queue = TaskQueue(max_active=200)
+        self.store: BaseQueueStore = None
+        # cheaper than a UUID per message, and still unique across restarts
+        self._queue_prefix = uuid4().hex
+        self._queue_ids = count()
         self._process_task: asyncio.Task = None
         if self.context.settings.get("transport.max_outbound_retry"):
             self.MAX_RETRY_COUNT = self.context.settings["transport.max_outbound_retry"]
+        if self.context.settings.get("transport.outbound_retry_backoff"):
+            self.RETRY_BACKOFF = self.context.settings[
+                "transport.outbound_retry_backoff"
+            ]
+        if self.context.settings.get("transport.outbound_retry_max_delay"):
+            self.RETRY_MAX_DELAY = self.context.settings[
+                "transport.outbound_retry_max_delay"
+            ]
+        settings = self.context.settings
+        host_limit = settings.get("transport.outbound_host_limit", DEFAULT_HOST_LIMIT)
+        weights = {
+            EndpointHealth.origin(endpoint): weight
+            for endpoint, weight in (
+                settings.get("transport.outbound_endpoint_weights") or {}
+            ).items()
+        }
+        self.scheduler = OutboundScheduler(
+            EndpointHealth(
+                settings.get(
+                    "transport.outbound_circuit_threshold", DEFAULT_FAILURE_THRESHOLD
+                ),
+                settings.get(
+                    "transport.outbound_circuit_timeout", DEFAULT_RESET_TIMEOUT
+                ),
+                self.RETRY_MAX_DELAY,
+            ),
+            {
+                name: DeliveryLane(
+                    name,
+                    settings.get(f"transport.outbound_{name}_limit", limit),
+                    host_limit,
+                    weights,
+                )
+                for name, limit in DEFAULT_LANE_LIMITS.items()
+            },
+            self.retry_delay,
+        )
 
     async def setup(self):
         """Perform setup operations."""
@@ -98,6 +360,7 @@ class OutboundTransportManager:
         )
         for outbound_transport in outbound_transports:
             self.register(outbound_transport)
+        self.store = self.context.inject(BaseQueueStore, required=False)
 
     def register(self, module: str) -> str:
         """
@@ -172,13 +435,21 @@ class OutboundTransportManager:
         """Start a registered transport."""
         transport = self.registered_transports[transport_id]()
         transport.collector = self.context.inject(Collector, required=False)
+        transport.settings = self.context.settings
         await transport.start()
         self.running_transports[transport_id] = transport
 
     async def start(self):
         """Start all transports and feed messages from the queue."""
-        for transport_id in self.registered_transports:
+        started = [
             self.task_queue.run(self.start_transport(transport_id))
+            for transport_id in self.registered_transports
+        ]
+        if started:
+            # surface a transport that failed to start to the caller
+            await asyncio.gather(*started)
+        if self.store:
+            await self.restore_queued()
 
     async def stop(self, wait: bool = True):
         """Stop all running transports."""
@@ -188,6 +459,8 @@ class OutboundTransportManager:
         for transport in self.running_transports.values():
             await transport.stop()
         self.running_transports = {}
+        if self.store:
+            await self.store.flush()
 
     def get_registered_transport_for_scheme(self, scheme: str) -> str:
         """Find the registered transport ID for a given scheme."""
@@ -255,7 +528,11 @@ class OutboundTransportManager:
 
         queued = QueuedOutboundMessage(profile, outbound, target, transport_id)
         queued.retries = self.MAX_RETRY_COUNT
-        self.outbound_new.append(queued)
+        if outbound.enc_payload:
+            queued.payload = outbound.enc_payload
+            queued.state = QueuedOutboundMessage.STATE_PENDING
+            self.persist_queued(queued)
+        self.scheduler.push(queued)
         self.process_queued()
 
     def enqueue_webhook(
@@ -277,12 +554,78 @@ class OutboundTransportManager:
         transport_id = self.get_running_transport_for_endpoint(endpoint)
         queued = QueuedOutboundMessage(None, None, None, transport_id)
         queued.endpoint = f"{endpoint}/topic/{topic}/"
+        queued.lane = LANE_WEBHOOK
         queued.payload = json.dumps(payload)
         queued.state = QueuedOutboundMessage.STATE_PENDING
         queued.retries = 4 if max_attempts is None else max_attempts - 1
-        self.outbound_new.append(queued)
+        self.persist_queued(queued)
+        self.scheduler.push(queued)
         self.process_queued()
 
+    def persist_queued(self, queued: QueuedOutboundMessage):
+        """Record an encoded message and its retry state in the durable store."""
+        if not self.store:
+            return
+        if not queued.queue_id:
+            queued.queue_id = f"{self._queue_prefix}-{next(self._queue_ids)}"
+        record = encode_payload(queued.payload)
+        record.update(
+            endpoint=queued.endpoint,
+            attempts=queued.attempts,
+            retries=queued.retries,
+            webhook=queued.message is None,
+        )
+        if queued.target:
+            record["recipient_keys"] = list(queued.target.recipient_keys or ())
+        self.store.put(queued.queue_id, self.QUEUE_KIND, record)
+
+    def forget_queued(self, queued: QueuedOutboundMessage):
+        """Remove a message which has been handled from the durable store."""
+        if self.store and queued.queue_id:
+            self.store.remove(queued.queue_id)
+            queued.queue_id = None
+
+    async def restore_queued(self) -> int:
+        """
+        Queue the messages left undelivered when the agent last stopped.
+
+        Returns:
+            The number of messages queued for delivery
+
+        """
+        restored = 0
+        for queue_id, record in await self.store.load(self.QUEUE_KIND):
+            endpoint = record["endpoint"]
+            try:
+                transport_id = self.get_running_transport_for_endpoint(endpoint)
+            except OutboundDeliveryError as err:
+                LOGGER.warning("Cannot restore queued outbound message: %s", err)
+                continue
+            payload = decode_payload(record)
+            if record.get("webhook"):
+                queued = QueuedOutboundMessage(None, None, None, transport_id)
+                queued.endpoint = endpoint
+                queued.lane = LANE_WEBHOOK
+            else:
+                target = ConnectionTarget(
+                    endpoint=endpoint, recipient_keys=record.get("recipient_keys")
+                )
+                message = OutboundMessage(
+                    payload=None, enc_payload=payload, target=target
+                )
+                queued = QueuedOutboundMessage(None, message, target, transport_id)
+            queued.queue_id = queue_id
+            queued.payload = payload
+            queued.attempts = record.get("attempts", 0)
+            queued.retries = record.get("retries", self.MAX_RETRY_COUNT)
+            queued.state = QueuedOutboundMessage.STATE_PENDING
+            self.scheduler.push(queued)
+            restored += 1
+        if restored:
+            LOGGER.info("Restored %d queued outbound messages", restored)
+            self.process_queued()
+        return restored
+
     def process_queued(self) -> asyncio.Task:
         """
         Start the process to deliver queued messages if necessary.
@@ -292,7 +635,7 @@ class OutboundTransportManager:
         """
         if self._process_task and not self._process_task.done():
             self.outbound_event.set()
-        elif self.outbound_new or self.outbound_buffer:
+        elif self.scheduler:
             self._process_task = self.loop.create_task(self._process_loop())
             self._process_task.add_done_callback(lambda task: self._process_done(task))
         return self._process_task
@@ -307,98 +650,96 @@ class OutboundTransportManager:
         if self._process_task and self._process_task.done():
             self._process_task = None
 
+    @property
+    def queue_depths(self) -> dict:
+        """Accessor for the number of outbound messages at each stage."""
+        return self.scheduler.depths
+
+    @property
+    def lane_stats(self) -> dict:
+        """Accessor for the delivery metrics of each lane."""
+        return self.scheduler.lane_stats()
+
+    @property
+    def endpoint_circuits(self) -> dict:
+        """Accessor for the state of each endpoint whose circuit is not closed."""
+        return self.scheduler.health.stats()
+
+    def retry_delay(self, attempts: int) -> float:
+        """Get the delay before retrying a delivery, with exponential backoff."""
+        delay = min(self.RETRY_BACKOFF * 2 ** (attempts - 1), self.RETRY_MAX_DELAY)
+        return delay / 2 + random.uniform(0, delay / 2)
+
     async def _process_loop(self):
-        """Continually kick off encoding and delivery on outbound messages."""
+        """Kick off encoding and delivery of outbound messages as they become ready."""
         # Note: this method should not call async methods apart from
         # waiting for the updated event, to avoid yielding to other queue methods
+        scheduler = self.scheduler
 
         while True:
             self.outbound_event.clear()
-            loop_time = get_timer()
-            upd_buffer = []
-            retry_count = 0
-
-            for queued in self.outbound_buffer:
-                if queued.state == QueuedOutboundMessage.STATE_DONE:
-                    if queued.error:
-                        LOGGER.exception(
-                            "Outbound message could not be delivered to %s",
-                            queued.endpoint,
-                            exc_info=queued.error,
-                        )
-                        if self.handle_not_delivered:
-                            self.handle_not_delivered(queued.profile, queued.message)
-                    continue  # remove from buffer
-
-                deliver = False
-
-                if queued.state == QueuedOutboundMessage.STATE_PENDING:
-                    deliver = True
-                elif queued.state == QueuedOutboundMessage.STATE_RETRY:
-                    if queued.retry_at < loop_time:
-                        queued.retry_at = None
-                        deliver = True
-                    else:
-                        retry_count += 1
-
-                if deliver:
-                    queued.state = QueuedOutboundMessage.STATE_DELIVER
-                    p_time = trace_event(
-                        self.context.settings,
-                        queued.message if queued.message else queued.payload,
-                        outcome="OutboundTransportManager.DELIVER.START."
-                        + queued.endpoint,
-                    )
-                    self.deliver_queued_message(queued)
-                    trace_event(
-                        self.context.settings,
-                        queued.message if queued.message else queued.payload,
-                        outcome="OutboundTransportManager.DELIVER.END."
-                        + queued.endpoint,
-                        perf_counter=p_time,
+            now = get_timer()
+            scheduler.release_due(now)
+            for queued in scheduler.expire_parked(now):
+                self.parked_expired(queued)
+
+            while scheduler.finished:
+                queued = scheduler.finished.popleft()
+                if queued.error:
+                    LOGGER.exception(
+                        "Outbound message could not be delivered to %s",
+                        queued.endpoint,
+                        exc_info=queued.error,
                     )
+                    if self.handle_not_delivered:
+                        self.handle_not_delivered(queued.profile, queued.message)
+
+            while scheduler.encode_ready and self.task_queue.ready:
+                queued = scheduler.pop_encode()
+                queued.state = QueuedOutboundMessage.STATE_ENCODE
+                p_time = trace_event(
+                    self.context.settings,
+                    queued.message if queued.message else queued.payload,
+                    outcome="OutboundTransportManager.ENCODE.START",
+                )
+                self.encode_queued_message(queued)
+                trace_event(
+                    self.context.settings,
+                    queued.message if queued.message else queued.payload,
+                    outcome="OutboundTransportManager.ENCODE.END",
+                    perf_counter=p_time,
+                )
 
-                upd_buffer.append(queued)
-
-            new_pending = 0
-            new_messages = self.outbound_new
-            self.outbound_new = []
-
-            for queued in new_messages:
-                if queued.state == QueuedOutboundMessage.STATE_NEW:
-                    if queued.message and queued.message.enc_payload:
-                        queued.payload = queued.message.enc_payload
-                        queued.state = QueuedOutboundMessage.STATE_PENDING
-                        new_pending += 1
-                    else:
-                        queued.state = QueuedOutboundMessage.STATE_ENCODE
-                        p_time = trace_event(
-                            self.context.settings,
-                            queued.message if queued.message else queued.payload,
-                            outcome="OutboundTransportManager.ENCODE.START",
-                        )
-                        self.encode_queued_message(queued)
-                        trace_event(
-                            self.context.settings,
-                            queued.message if queued.message else queued.payload,
-                            outcome="OutboundTransportManager.ENCODE.END",
-                            perf_counter=p_time,
-                        )
-                else:
-                    new_pending += 1
-
-                upd_buffer.append(queued)
+            # deliveries are limited by the free slots in each lane
+            while True:
+                queued = scheduler.pop_deliver()
+                if not queued:
+                    break
+                queued.state = QueuedOutboundMessage.STATE_DELIVER
+                p_time = trace_event(
+                    self.context.settings,
+                    queued.message if queued.message else queued.payload,
+                    outcome="OutboundTransportManager.DELIVER.START." + queued.endpoint,
+                )
+                self.deliver_queued_message(queued)
+                trace_event(
+                    self.context.settings,
+                    queued.message if queued.message else queued.payload,
+                    outcome="OutboundTransportManager.DELIVER.END." + queued.endpoint,
+                    perf_counter=p_time,
+                )
 
-            self.outbound_buffer = upd_buffer
-            if self.outbound_buffer:
-                if (not new_pending) and (not retry_count):
-                    await self.outbound_event.wait()
-                elif retry_count:
-                    # only retries - yield here so we don't hog resources
-                    await asyncio.sleep(0.05)
-            else:
+            if not scheduler:
                 break
 
+            # sleep until a message changes state or the next retry or probe is due
+            retry_at = scheduler.next_retry_at
+            timeout = None if retry_at is None else max(retry_at - get_timer(), 0)
+            try:
+                await asyncio.wait_for(self.outbound_event.wait(), timeout)
+            except asyncio.TimeoutError:
+                pass
+
     def encode_queued_message(self, queued: QueuedOutboundMessage) -> asyncio.Task:
         """Kick off encoding of a queued message."""
         queued.task = self.task_queue.run(
@@ -427,7 +768,9 @@ class OutboundTransportManager:
             queued.state = QueuedOutboundMessage.STATE_DONE
         else:
             queued.state = QueuedOutboundMessage.STATE_PENDING
+            self.persist_queued(queued)
         queued.task = None
+        self.scheduler.encoded(queued)
         self.process_queued()
 
     def deliver_queued_message(self, queued: QueuedOutboundMessage) -> asyncio.Task:
@@ -439,10 +782,38 @@ class OutboundTransportManager:
         )
         return queued.task
 
+    def parked_expired(self, queued: QueuedOutboundMessage):
+        """
+        Count the wait of a message parked behind an open circuit as an attempt.
+
+        The message is parked again while it has retries left, otherwise it is
+        not delivered.
+        """
+        queued.attempts += 1
+        if queued.retries:
+            queued.retries -= 1
+            self.persist_queued(queued)
+        else:
+            LOGGER.error(
+                ">>> Outbound message parked for %s until out of retries",
+                queued.endpoint,
+            )
+            queued.error = (
+                OutboundDeliveryError,
+                OutboundDeliveryError(f"Endpoint circuit open: {queued.endpoint}"),
+                None,
+            )
+            queued.state = QueuedOutboundMessage.STATE_DONE
+            self.forget_queued(queued)
+        self.scheduler.push(queued)
+
     def finished_deliver(self, queued: QueuedOutboundMessage, completed: CompletedTask):
         """Handle completion of queued message delivery."""
+        health = self.scheduler.health
         if completed.exc_info:
             queued.error = completed.exc_info
+            queued.attempts += 1
+            health.record(queued.endpoint, False, time.perf_counter())
 
             if queued.retries:
                 if LOGGER.isEnabledFor(logging.DEBUG):
@@ -466,8 +837,14 @@ class OutboundTransportManager:
                         queued.error,
                     )
                 queued.retries -= 1
-                queued.state = QueuedOutboundMessage.STATE_RETRY
-                queued.retry_at = time.perf_counter() + 10
+                if health.is_open(queued.endpoint):
+                    queued.state = QueuedOutboundMessage.STATE_PARKED
+                else:
+                    queued.state = QueuedOutboundMessage.STATE_RETRY
+                    queued.retry_at = time.perf_counter() + self.retry_delay(
+                        queued.attempts
+                    )
+                self.persist_queued(queued)
             else:
                 LOGGER.exception(
                     ">>> Outbound message failed to deliver, NOT Re-queued.",
@@ -477,7 +854,12 @@ class OutboundTransportManager:
         else:
             queued.error = None
             queued.state = QueuedOutboundMessage.STATE_DONE
+            for parked in health.record(queued.endpoint, True, time.perf_counter()):
+                self.scheduler.release(parked)
+        if queued.state == QueuedOutboundMessage.STATE_DONE:
+            self.forget_queued(queued)
         queued.task = None
+        self.scheduler.delivered(queued)
         self.process_queued()
 
     async def flush(self):
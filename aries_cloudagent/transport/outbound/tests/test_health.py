@@ -0,0 +1,80 @@
+from unittest import TestCase
+
+from ..health import EndpointCircuit, EndpointHealth
+
+
+class TestEndpointHealth(TestCase):
+    def test_origin(self):
+        assert EndpointHealth.origin("http://host:8020/topic/x/") == "http://host:8020"
+        assert EndpointHealth.origin("ws://host") == "ws://host"
+        assert EndpointHealth.origin("localhost") == "localhost"
+
+    def test_open_and_close(self):
+        health = EndpointHealth(threshold=2, reset_timeout=10, max_reset_timeout=25)
+        endpoint = "http://host/a"
+
+        assert health.record(endpoint, False, 0) == []
+        assert health.admit(endpoint)
+        assert not health.is_open(endpoint)
+        health.record("http://host/b", False, 1)
+        assert health.is_open(endpoint)
+        assert not health.admit(endpoint)
+        assert health.next_probe_at == 11
+
+        health.park(endpoint, "m1")
+        health.park(endpoint, "m2")
+        assert health.parked == 2
+        assert health.release_due(10) == []
+        assert health.release_due(11) == ["m1"]
+        assert health.parked == 1
+        assert health.stats()["http://host"]["state"] == EndpointCircuit.STATE_HALF_OPEN
+
+        # a single probe is admitted while half-open
+        assert health.admit(endpoint)
+        assert not health.admit(endpoint)
+
+        # a failed probe reopens the circuit for longer, up to the limit
+        health.record(endpoint, False, 20)
+        assert health.next_probe_at == 40
+        assert health.release_due(40) == ["m2"]
+        assert health.admit(endpoint)
+        health.record(endpoint, False, 50)
+        assert health.next_probe_at == 75
+
+        # closing the circuit releases the messages parked behind the probe
+        health.park(endpoint, "m2")
+        health.park(endpoint, "m3")
+        assert health.release_due(75) == ["m2"]
+        assert health.admit(endpoint)
+        assert health.record(endpoint, True, 80) == ["m3"]
+        assert health.parked == 0
+        assert health.stats() == {}
+        assert health.admit(endpoint)
+
+    def test_expire(self):
+        health = EndpointHealth(threshold=1, reset_timeout=10)
+        endpoint = "http://host/a"
+        health.record(endpoint, False, 0)
+
+        health.park(endpoint, "m1", 5)
+        health.park(endpoint, "m2", 8)
+        health.park(endpoint, "m3")
+        assert health.next_expiry_at == 5
+        assert health.expire(4) == []
+        assert health.expire(5) == ["m1"]
+        assert health.parked == 2
+
+        # a message parked again keeps only its latest deadline
+        health.park(endpoint, "m2", 12)
+        assert health.parked == 2
+        assert health.expire(10) == []
+        assert health.release_due(10) == ["m2"]
+        assert health.expire(12) == []
+        assert health.parked == 1
+
+    def test_disabled(self):
+        health = EndpointHealth(threshold=0)
+        for _ in range(10):
+            health.record("http://host", False, 0)
+        assert health.admit("http://host")
+        assert health.circuits == {}
@@ -6,6 +6,7 @@ from aiohttp import web
 from asynctest import mock as async_mock
 
 from ....config.injection_context import InjectionContext
+from ....config.settings import Settings
 from ....utils.stats import Collector
 
 from ...outbound.message import OutboundMessage
@@ -13,24 +14,35 @@ from ...wire_format import JsonWireFormat
 
 from ..base import OutboundTransportError
 from ..http import HttpTransport
+from .. import http as test_module
 
 
 class TestHttpTransport(AioHTTPTestCase):
     async def setUpAsync(self):
         self.context = InjectionContext()
         self.message_results = []
+        self.options_count = 0
 
     async def receive_message(self, request):
         payload = await request.json()
         self.message_results.append(payload)
         raise web.HTTPOk()
 
+    async def receive_options(self, request):
+        self.options_count += 1
+        raise web.HTTPOk()
+
     async def get_application(self):
         """
         Override the get_app method to return your application.
         """
         app = web.Application()
-        app.add_routes([web.post("/", self.receive_message)])
+        app.add_routes(
+            [
+                web.post("/", self.receive_message),
+                web.options("/", self.receive_options),
+            ]
+        )
         return app
 
     @unittest_run_loop
@@ -67,6 +79,80 @@ class TestHttpTransport(AioHTTPTestCase):
             "outbound-http:POST": 1,
         }
 
+        transport.collector.reset()
+        async with transport:
+            for _ in range(3):
+                await transport.handle_message(self.context, b"{}", server_addr)
+        results = transport.collector.extract()
+        assert results["count"] == {
+            "outbound-http:dns_resolve": 1,
+            "outbound-http:connect": 1,
+            "outbound-http:connection_reused": 2,
+            "outbound-http:POST": 3,
+        }
+
+    @unittest_run_loop
+    async def test_settings(self):
+        transport = HttpTransport()
+        transport.settings = Settings(
+            {
+                "transport.http_limit": 10,
+                "transport.http_host_limit": 2,
+                "transport.http_dns_ttl": 0,
+                "transport.http_keepalive_timeout": 0,
+                "transport.http_timeout": 30,
+                "transport.http_connect_timeout": 5,
+            }
+        )
+        with async_mock.patch.object(
+            test_module, "ClientSession", async_mock.MagicMock()
+        ) as mock_session:
+            mock_session.return_value.close = async_mock.CoroutineMock()
+            await transport.start()
+            timeout = mock_session.call_args[1]["timeout"]
+            assert timeout.total == 30
+            assert timeout.sock_connect == 5
+            assert transport.connector.limit == 10
+            assert transport.connector.limit_per_host == 2
+            assert not transport.connector.use_dns_cache
+            assert transport.connector.force_close
+            assert transport.http2_client is None
+            await transport.stop()
+
+            # the total timeout keeps its default when only connecting is limited
+            transport.settings = Settings({"transport.http_connect_timeout": 5})
+            await transport.start()
+            timeout = mock_session.call_args[1]["timeout"]
+            assert timeout.total == test_module.DEFAULT_TIMEOUT
+            assert timeout.sock_connect == 5
+            await transport.stop()
+
+        transport.settings = Settings({"transport.http2": True})
+        with async_mock.patch.object(test_module, "httpx", None):
+            with pytest.raises(OutboundTransportError):
+                await transport.start()
+
+    @unittest_run_loop
+    async def test_prewarm(self):
+        server_addr = f"http://localhost:{self.server.port}"
+        transport = HttpTransport()
+        transport.collector = Collector()
+        transport.settings = Settings(
+            {"transport.http_keepalive_timeout": 0.3, "transport.http_prewarm": 1}
+        )
+        async with transport:
+            for _ in range(8):
+                await transport.handle_message(self.context, "{}", server_addr)
+            await asyncio.sleep(0.5)
+            await transport.handle_message(self.context, "{}", server_addr)
+
+            assert transport.prewarmed == self.options_count > 0
+            results = transport.collector.extract()
+            # the idle connection was kept open for the last message
+            assert results["count"]["outbound-http:connect"] == 1
+            await transport.warm("http://localhost:1")
+            assert transport.prewarmed == self.options_count
+
     @unittest_run_loop
     async def test_transport_coverage(self):
         transport = HttpTransport()
@@ -0,0 +1,85 @@
+from unittest import TestCase
+
+from ..lanes import DeliveryLane
+
+
+class TestDeliveryLane(TestCase):
+    def test_fair_share(self):
+        lane = DeliveryLane("message", limit=0, host_limit=0)
+        for n in range(6):
+            lane.push("http://busy", f"busy{n}")
+        lane.push("http://quiet", "quiet0")
+        lane.push("http://quiet", "quiet1")
+
+        # the quiet endpoint is not held up behind the backlog of the busy one
+        order = [lane.pop() for _ in range(8)]
+        assert order[:4] == ["busy0", "quiet0", "busy1", "quiet1"]
+        assert order[4:] == ["busy2", "busy3", "busy4", "busy5"]
+        assert lane.pop() is None
+
+    def test_weights(self):
+        lane = DeliveryLane(
+            "message", limit=0, host_limit=0, weights={"http://heavy": 2}
+        )
+        for n in range(6):
+            lane.push("http://heavy", "heavy")
+            lane.push("http://light", "light")
+        order = [lane.pop() for _ in range(6)]
+        assert order.count("heavy") == 4
+        assert order.count("light") == 2
+
+    def test_idle_flow_gets_no_credit(self):
+        lane = DeliveryLane("message", limit=0, host_limit=0)
+        for n in range(4):
+            lane.push("http://busy", f"busy{n}")
+        assert [lane.pop() for _ in range(3)] == ["busy0", "busy1", "busy2"]
+        lane.push("http://late", "late0")
+        lane.push("http://late", "late1")
+        # starting from the current virtual time, not from zero, the late
+        # endpoint takes turns with the busy one rather than sending twice
+        assert [lane.pop() for _ in range(3)] == ["late0", "busy3", "late1"]
+
+    def test_limits(self):
+        lane = DeliveryLane("webhook", limit=3, host_limit=2)
+        for n in range(3):
+            lane.push("http://slow", f"slow{n}")
+        lane.push("http://fast", "fast0")
+        lane.push("http://fast", "fast1")
+
+        assert [lane.pop() for _ in range(4)] == ["slow0", "fast0", "slow1", None]
+        assert lane.active == 3
+        lane.done("http://fast", True)
+        # the slow endpoint is at its limit, so the free slot goes to the other
+        assert lane.pop() == "fast1"
+        lane.done("http://fast", True)
+        assert lane.pop() is None
+        lane.done("http://slow", False)
+        assert lane.pop() == "slow2"
+
+        stats = lane.serialize()
+        assert stats["dispatched"] == 5
+        assert stats["delivered"] == 2
+        assert stats["failed"] == 1
+        assert stats["active"] == 2
+        assert stats["ready"] == 0
+        assert stats["ready_peak"] == 5
+        assert stats["endpoints"] == 1
+        assert stats["wait_max"] >= stats["wait_avg"] >= 0
+
+    def test_admit(self):
+        lane = DeliveryLane("message", limit=1)
+        lane.push("http://down", "down")
+        lane.push("http://up", "up")
+        rejected = []
+
+        def admit(item):
+            if item == "down":
+                rejected.append(item)
+                return False
+            return True
+
+        assert lane.pop(admit) == "up"
+        assert rejected == ["down"]
+        assert lane.active == 1
+        assert "http://down" not in lane.flows
+        assert repr(lane) == "<DeliveryLane(name=message, active=1, ready=0)>"
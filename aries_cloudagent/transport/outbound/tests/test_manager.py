@@ -1,15 +1,22 @@
+import asyncio
 import json
 
+from os import path
+from tempfile import TemporaryDirectory
+
 from asynctest import TestCase as AsyncTestCase, mock as async_mock
 
 from ....config.injection_context import InjectionContext
 from ....connections.models.connection_target import ConnectionTarget
 from ....core.in_memory import InMemoryProfile
+from ...queue.sqlite_store import SqliteQueueStore
+from ...queue.store import BaseQueueStore
 
 from .. import manager as test_module
 from ..manager import (
     OutboundDeliveryError,
     OutboundTransportManager,
+    OutboundScheduler,
     OutboundTransportRegistrationError,
     QueuedOutboundMessage,
 )
@@ -46,6 +53,19 @@ class TestOutboundTransportManager(AsyncTestCase):
             await mgr.setup()
             mock_register.assert_called_once_with("http")
 
+    async def test_start_transport_error(self):
+        mgr = OutboundTransportManager(InjectionContext())
+        transport = async_mock.MagicMock(schemes=["http"])
+        transport.start = async_mock.CoroutineMock(side_effect=OSError("no sockets"))
+        transport.stop = async_mock.CoroutineMock()
+        transport_cls = async_mock.MagicMock(schemes=["http"], return_value=transport)
+        mgr.register_class(transport_cls, "transport_cls")
+
+        with self.assertRaises(OSError):
+            await mgr.start()
+        transport.start.assert_awaited_once_with()
+        assert mgr.get_running_transport_for_scheme("http") is None
+
     async def test_send_message(self):
         context = InjectionContext()
         mgr = OutboundTransportManager(context)
@@ -151,14 +171,17 @@ class TestOutboundTransportManager(AsyncTestCase):
         transport_cls.return_value.start = async_mock.CoroutineMock()
         tid = mgr.register_class(transport_cls, "transport_cls")
         await mgr.start_transport(tid)
+        assert transport_cls.return_value.settings is context.settings
 
         with async_mock.patch.object(mgr, "process_queued") as mock_process:
             mgr.enqueue_webhook(
                 test_topic, test_payload, test_endpoint, max_attempts=test_attempts
             )
             mock_process.assert_called_once_with()
-            assert len(mgr.outbound_new) == 1
-            queued = mgr.outbound_new[0]
+            assert mgr.scheduler.deliver_ready == 1
+            assert mgr.lane_stats["webhook"]["ready"] == 1
+            queued = mgr.scheduler.pop_deliver()
+            assert queued.lane == "webhook"
             assert queued.endpoint == f"{test_endpoint}/topic/{test_topic}/"
             assert json.loads(queued.payload) == test_payload
             assert queued.retries == test_attempts - 1
@@ -179,7 +202,9 @@ class TestOutboundTransportManager(AsyncTestCase):
             mgr._process_done(mock_task)
 
     async def test_process_finished_x(self):
-        mock_queued = async_mock.MagicMock(retries=1)
+        mock_queued = async_mock.MagicMock(
+            retries=1, attempts=0, endpoint="http://1.2.3.4:8081"
+        )
         mock_task = async_mock.MagicMock(
             exc_info=(KeyError, KeyError("nope"), None),
         )
@@ -197,12 +222,13 @@ class TestOutboundTransportManager(AsyncTestCase):
         mock_queued = async_mock.MagicMock(
             state=QueuedOutboundMessage.STATE_RETRY,
             retry_at=test_module.get_timer() - 1,
+            endpoint="http://1.2.3.4:8081",
         )
 
         context = InjectionContext()
         mock_handle_not_delivered = async_mock.MagicMock()
         mgr = OutboundTransportManager(context, mock_handle_not_delivered)
-        mgr.outbound_buffer.append(mock_queued)
+        mgr.scheduler.push(mock_queued)
 
         with async_mock.patch.object(
             test_module, "trace_event", async_mock.MagicMock()
@@ -211,6 +237,7 @@ class TestOutboundTransportManager(AsyncTestCase):
             with self.assertRaises(KeyError):  # cover retry logic and bail
                 await mgr._process_loop()
             assert mock_queued.retry_at is None
+            assert mock_queued.state == QueuedOutboundMessage.STATE_DELIVER
 
     async def test_process_loop_retry_later(self):
         mock_queued = async_mock.MagicMock(
@@ -221,30 +248,31 @@ class TestOutboundTransportManager(AsyncTestCase):
         context = InjectionContext()
         mock_handle_not_delivered = async_mock.MagicMock()
         mgr = OutboundTransportManager(context, mock_handle_not_delivered)
-        mgr.outbound_buffer.append(mock_queued)
+        mgr.scheduler.push(mock_queued)
 
         with async_mock.patch.object(
-            test_module.asyncio, "sleep", async_mock.CoroutineMock()
-        ) as mock_sleep_x:
-            mock_sleep_x.side_effect = KeyError()
+            test_module.asyncio, "wait_for", async_mock.CoroutineMock()
+        ) as mock_wait_for:
+            mock_wait_for.side_effect = KeyError()
             with self.assertRaises(KeyError):  # cover retry logic and bail
                 await mgr._process_loop()
             assert mock_queued.retry_at is not None
+            assert 3500 < mock_wait_for.call_args[0][1] <= 3600
+        assert mgr.queue_depths["retry_wait"] == 1
 
     async def test_process_loop_new(self):
         context = InjectionContext()
         mock_handle_not_delivered = async_mock.MagicMock()
         mgr = OutboundTransportManager(context, mock_handle_not_delivered)
 
-        mgr.outbound_new = [
-            async_mock.MagicMock(
-                state=test_module.QueuedOutboundMessage.STATE_NEW,
-                message=async_mock.MagicMock(enc_payload=b"encr"),
-            )
-        ]
+        mock_queued = async_mock.MagicMock(
+            state=test_module.QueuedOutboundMessage.STATE_NEW,
+            message=async_mock.MagicMock(enc_payload=None),
+        )
+        mgr.scheduler.push(mock_queued)
         with async_mock.patch.object(
-            mgr, "deliver_queued_message", async_mock.MagicMock()
-        ) as mock_deliver, async_mock.patch.object(
+            mgr, "encode_queued_message", async_mock.MagicMock()
+        ) as mock_encode, async_mock.patch.object(
             mgr.outbound_event, "wait", async_mock.CoroutineMock()
         ) as mock_wait, async_mock.patch.object(
             test_module, "trace_event", async_mock.MagicMock()
@@ -253,18 +281,21 @@ class TestOutboundTransportManager(AsyncTestCase):
 
             with self.assertRaises(KeyError):
                 await mgr._process_loop()
+            mock_encode.assert_called_once_with(mock_queued)
+            assert mock_queued.state == QueuedOutboundMessage.STATE_ENCODE
+            assert mgr.queue_depths["encoding"] == 1
 
     async def test_process_loop_new_deliver(self):
         context = InjectionContext()
         mock_handle_not_delivered = async_mock.MagicMock()
         mgr = OutboundTransportManager(context, mock_handle_not_delivered)
 
-        mgr.outbound_new = [
-            async_mock.MagicMock(
-                state=test_module.QueuedOutboundMessage.STATE_DELIVER,
-                message=async_mock.MagicMock(enc_payload=b"encr"),
-            )
-        ]
+        mock_queued = async_mock.MagicMock(
+            state=test_module.QueuedOutboundMessage.STATE_PENDING,
+            message=async_mock.MagicMock(enc_payload=b"encr"),
+            endpoint="http://1.2.3.4:8081",
+        )
+        mgr.scheduler.push(mock_queued)
         with async_mock.patch.object(
             mgr, "deliver_queued_message", async_mock.MagicMock()
         ) as mock_deliver, async_mock.patch.object(
@@ -272,10 +303,13 @@ class TestOutboundTransportManager(AsyncTestCase):
         ) as mock_wait, async_mock.patch.object(
             test_module, "trace_event", async_mock.MagicMock()
         ) as mock_trace:
-            mock_wait.side_effect = KeyError()  # cover state=DELIVER logic and bail
+            mock_wait.side_effect = KeyError()  # cover state=PENDING logic and bail
 
             with self.assertRaises(KeyError):
                 await mgr._process_loop()
+            mock_deliver.assert_called_once_with(mock_queued)
+            assert mock_queued.state == QueuedOutboundMessage.STATE_DELIVER
+            assert mgr.queue_depths["delivering"] == 1
 
     async def test_process_loop_x(self):
         mock_queued = async_mock.MagicMock(
@@ -288,20 +322,25 @@ class TestOutboundTransportManager(AsyncTestCase):
         context = InjectionContext()
         mock_handle_not_delivered = async_mock.MagicMock()
         mgr = OutboundTransportManager(context, mock_handle_not_delivered)
-        mgr.outbound_buffer.append(mock_queued)
+        mgr.scheduler.push(mock_queued)
 
         await mgr._process_loop()
+        mock_handle_not_delivered.assert_called_once_with(
+            mock_queued.profile, mock_queued.message
+        )
 
     async def test_finished_deliver_x_log_debug(self):
         mock_queued = async_mock.MagicMock(
-            state=QueuedOutboundMessage.STATE_DONE, retries=1
+            state=QueuedOutboundMessage.STATE_DONE,
+            retries=1,
+            attempts=0,
+            endpoint="http://1.2.3.4:8081",
         )
         mock_completed_x = async_mock.MagicMock(exc_info=KeyError("an error occurred"))
 
         context = InjectionContext()
         mock_handle_not_delivered = async_mock.MagicMock()
         mgr = OutboundTransportManager(context, mock_handle_not_delivered)
-        mgr.outbound_buffer.append(mock_queued)
         with async_mock.patch.object(
             test_module.LOGGER, "exception", async_mock.MagicMock()
         ) as mock_logger_exception, async_mock.patch.object(
@@ -313,3 +352,252 @@ class TestOutboundTransportManager(AsyncTestCase):
         ) as mock_process:
             mock_logger_enabled.return_value = True  # cover debug logging
             mgr.finished_deliver(mock_queued, mock_completed_x)
+
+    async def test_retry_backoff(self):
+        context = InjectionContext()
+        context.update_settings(
+            {
+                "transport.outbound_retry_backoff": 2,
+                "transport.outbound_retry_max_delay": 10,
+            }
+        )
+        mgr = OutboundTransportManager(context)
+        for attempts, low, high in ((1, 1, 2), (2, 2, 4), (3, 4, 8), (5, 5, 10)):
+            for _ in range(10):
+                assert low <= mgr.retry_delay(attempts) <= high
+
+    async def test_circuit_open_parks_messages(self):
+        context = InjectionContext()
+        context.update_settings(
+            {
+                "transport.outbound_circuit_threshold": 2,
+                "transport.outbound_retry_backoff": 3600,
+            }
+        )
+        mgr = OutboundTransportManager(context)
+        endpoint = "http://down.example/topic/test/"
+        failed = async_mock.MagicMock(exc_info=(KeyError, KeyError("nope"), None))
+
+        queued = [
+            QueuedOutboundMessage(None, None, None, "transport_cls") for _ in range(3)
+        ]
+        for message in queued:
+            message.endpoint = endpoint
+            message.retries = 4
+            message.state = QueuedOutboundMessage.STATE_PENDING
+            mgr.scheduler.push(message)
+
+        with async_mock.patch.object(mgr, "process_queued", async_mock.MagicMock()):
+            first = mgr.scheduler.pop_deliver()
+            second = mgr.scheduler.pop_deliver()
+            mgr.finished_deliver(first, failed)
+            assert first.state == QueuedOutboundMessage.STATE_RETRY
+            mgr.finished_deliver(second, failed)
+            assert second.state == QueuedOutboundMessage.STATE_PARKED
+
+            # the circuit is now open: the remaining message is parked too
+            assert mgr.scheduler.pop_deliver() is None
+            assert queued[2].state == QueuedOutboundMessage.STATE_PARKED
+            assert mgr.queue_depths["parked"] == 2
+            circuit = mgr.endpoint_circuits["http://down.example"]
+            assert circuit["state"] == "open"
+            assert circuit["parked"] == 2
+
+            # once the reset timeout passes, one parked message probes the endpoint
+            assert mgr.scheduler.release_due(circuit["open_until"]) == 1
+            probe = mgr.scheduler.pop_deliver()
+            assert probe is second
+            assert mgr.endpoint_circuits["http://down.example"]["state"] == "half-open"
+
+            mgr.finished_deliver(probe, async_mock.MagicMock(exc_info=None))
+            assert not mgr.endpoint_circuits
+            assert mgr.queue_depths["parked"] == 0
+            assert mgr.scheduler.deliver_ready == 1
+            assert mgr.scheduler.pop_deliver() is queued[2]
+
+    async def test_circuit_never_closes(self):
+        context = InjectionContext()
+        context.update_settings(
+            {
+                "transport.outbound_circuit_threshold": 1,
+                "transport.outbound_circuit_timeout": 3600,
+                "transport.outbound_retry_backoff": 0.01,
+                "transport.max_outbound_retry": 2,
+            }
+        )
+        handle_not_delivered = async_mock.MagicMock()
+        mgr = OutboundTransportManager(context, handle_not_delivered)
+        endpoint = "http://down.example/topic/test/"
+
+        queued = [
+            QueuedOutboundMessage(None, None, None, "transport_cls") for _ in range(2)
+        ]
+        for message in queued:
+            message.endpoint = endpoint
+            message.retries = mgr.MAX_RETRY_COUNT
+            message.state = QueuedOutboundMessage.STATE_PENDING
+            mgr.scheduler.push(message)
+
+        with async_mock.patch.object(mgr, "process_queued", async_mock.MagicMock()):
+            mgr.finished_deliver(
+                mgr.scheduler.pop_deliver(),
+                async_mock.MagicMock(exc_info=(KeyError, KeyError("nope"), None)),
+            )
+            assert mgr.scheduler.pop_deliver() is None
+        assert mgr.queue_depths["parked"] == 2
+
+        # the time spent parked uses up the retries of each message
+        await asyncio.wait_for(mgr._process_loop(), 5)
+        assert handle_not_delivered.call_count == 2
+        assert not mgr.scheduler
+        for message in queued:
+            assert message.state == QueuedOutboundMessage.STATE_DONE
+            assert message.retries == 0
+            assert message.attempts == 3
+            assert isinstance(message.error[1], OutboundDeliveryError)
+
+    async def test_lanes(self):
+        context = InjectionContext()
+        context.update_settings(
+            {
+                "transport.outbound_message_limit": 1,
+                "transport.outbound_webhook_limit": 1,
+                "transport.outbound_endpoint_weights": {"http://hooks/": 2},
+            }
+        )
+        mgr = OutboundTransportManager(context)
+        assert mgr.scheduler.lanes["webhook"].weights == {"http://hooks": 2}
+
+        webhooks = []
+        for _ in range(2):
+            queued = QueuedOutboundMessage(None, None, None, "transport_cls")
+            queued.endpoint = "http://hooks/topic/test/"
+            queued.lane = "webhook"
+            queued.state = QueuedOutboundMessage.STATE_PENDING
+            mgr.scheduler.push(queued)
+            webhooks.append(queued)
+        message = QueuedOutboundMessage(None, None, None, "transport_cls")
+        message.endpoint = "http://peer"
+        message.state = QueuedOutboundMessage.STATE_PENDING
+        mgr.scheduler.push(message)
+
+        # the backlog of webhooks does not hold up the message, nor the reverse
+        assert mgr.scheduler.pop_deliver() is message
+        assert mgr.scheduler.pop_deliver() is webhooks[0]
+        assert mgr.scheduler.pop_deliver() is None
+        assert mgr.lane_stats["webhook"]["ready"] == 1
+        assert mgr.lane_stats["message"]["active"] == 1
+
+        with async_mock.patch.object(mgr, "process_queued", async_mock.MagicMock()):
+            mgr.finished_deliver(webhooks[0], async_mock.MagicMock(exc_info=None))
+        assert mgr.scheduler.pop_deliver() is webhooks[1]
+        assert mgr.lane_stats["webhook"]["delivered"] == 1
+
+    async def test_restore_queued(self):
+        with TemporaryDirectory() as tmp:
+            store = SqliteQueueStore(path.join(tmp, "queue.db"))
+            context = InjectionContext()
+            context.update_settings({"transport.outbound_retry_backoff": 3600})
+            context.injector.bind_instance(BaseQueueStore, store)
+
+            transport = async_mock.MagicMock(schemes=["http"])
+            transport.start = async_mock.CoroutineMock()
+            transport.stop = async_mock.CoroutineMock()
+            transport.handle_message = async_mock.CoroutineMock(
+                side_effect=KeyError("nope")
+            )
+            transport_cls = async_mock.MagicMock(
+                schemes=["http"], return_value=transport
+            )
+
+            mgr = OutboundTransportManager(context)
+            await mgr.setup()
+            mgr.register_class(transport_cls, "transport_cls")
+            await mgr.start()
+            target = ConnectionTarget(endpoint="http://localhost", recipient_keys=["a"])
+            mgr.enqueue_message(
+                None, OutboundMessage(payload="{}", enc_payload=b"{}", target=target)
+            )
+            mgr.enqueue_webhook("topic", {"x": 1}, "http://hooks", max_attempts=1)
+            while transport.handle_message.await_count < 2:
+                await asyncio.sleep(0.01)
+            await mgr.stop(wait=False)
+
+            # the failed webhook is forgotten; the message remains to be retried
+            records = await store.load(OutboundTransportManager.QUEUE_KIND)
+            assert len(records) == 1
+            assert records[0][1]["attempts"] == 1
+            assert records[0][1]["retries"] == mgr.MAX_RETRY_COUNT - 1
+
+            transport.handle_message = async_mock.CoroutineMock()
+            mgr = OutboundTransportManager(context)
+            await mgr.setup()
+            mgr.register_class(transport_cls, "transport_cls")
+            await mgr.start()
+            await mgr.flush()
+            transport.handle_message.assert_awaited_once_with(
+                None, b"{}", "http://localhost"
+            )
+            await mgr.stop()
+            assert await store.load(OutboundTransportManager.QUEUE_KIND) == []
+            await store.close()
+
+
+class TestOutboundScheduler(AsyncTestCase):
+    def test_schedule(self):
+        scheduler = OutboundScheduler()
+        assert not scheduler
+
+        new = async_mock.MagicMock(
+            state=QueuedOutboundMessage.STATE_NEW, endpoint="http://host"
+        )
+        pending = async_mock.MagicMock(
+            state=QueuedOutboundMessage.STATE_PENDING, endpoint="http://host"
+        )
+        retries = [
+            async_mock.MagicMock(
+                state=QueuedOutboundMessage.STATE_RETRY,
+                retry_at=at,
+                endpoint="http://host",
+            )
+            for at in (30.0, 10.0, 20.0)
+        ]
+        for queued in [new, pending] + retries:
+            scheduler.push(queued)
+        assert len(scheduler) == 5
+        assert scheduler.next_retry_at == 10.0
+
+        assert scheduler.pop_encode() is new
+        assert scheduler.pop_deliver() is pending
+        assert scheduler.depths == {
+            "encode_ready": 0,
+            "encoding": 1,
+            "deliver_ready": 0,
+            "delivering": 1,
+            "retry_wait": 3,
+            "parked": 0,
+        }
+
+        assert scheduler.release_due(25.0) == 2
+        assert scheduler.deliver_ready == 2
+        assert retries[1].state == QueuedOutboundMessage.STATE_PENDING
+        assert retries[1].retry_at is None
+        assert scheduler.next_retry_at == 30.0
+
+        new.state = QueuedOutboundMessage.STATE_PENDING
+        scheduler.encoded(new)
+        pending.state = QueuedOutboundMessage.STATE_DONE
+        scheduler.delivered(pending)
+        assert list(scheduler.finished) == [pending]
+        assert scheduler.encoding == scheduler.delivering == 0
+        assert [scheduler.pop_deliver() for _ in range(4)] == [
+            retries[1],
+            retries[2],
+            new,
+            None,
+        ]
+
+        with self.assertRaises(ValueError):
+            scheduler.push(
+                async_mock.MagicMock(state=QueuedOutboundMessage.STATE_DELIVER)
+            )
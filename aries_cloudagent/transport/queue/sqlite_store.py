@@ -0,0 +1,217 @@
+"""Durable store for queued messages, backed by SQLite."""
+
+import asyncio
+import json
+import logging
+import sqlite3
+import time
+
+from os import makedirs, path
+from typing import Mapping, Sequence, Tuple
+
+from .store import BaseQueueStore
+
+LOGGER = logging.getLogger(__name__)
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS queued (
+    seq INTEGER PRIMARY KEY AUTOINCREMENT,
+    id TEXT NOT NULL UNIQUE,
+    kind TEXT NOT NULL,
+    record TEXT NOT NULL,
+    updated REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS queued_kind ON queued (kind, seq);
+"""
+
+
+class SqliteQueueStore(BaseQueueStore):
+    """
+    Queue store writing entries to a local SQLite file with group commit.
+
+    Writes are collected in memory while the previous batch is being committed,
+    then committed together in a single transaction, so that the cost of syncing
+    to disk is shared by every message queued in the meantime. Entries are only
+    serialized when their batch is committed, and an entry removed before then
+    is never written at all. Once the queue has
+    drained the file is compacted, so it does not keep the space used by
+    delivered messages.
+
+    Errors are logged and otherwise ignored: the messages are still delivered,
+    but may not survive a restart.
+    """
+
+    def __init__(self, db_path: str, commit_delay: float = 0):
+        """
+        Initialize a `SqliteQueueStore` instance.
+
+        Args:
+            db_path: The path of the SQLite database file
+            commit_delay: The time in seconds to wait for more writes before
+                committing a batch
+
+        """
+        self.db_path = path.expanduser(db_path)
+        self.commit_delay = commit_delay or 0
+        self.commits = 0
+        self._conn: sqlite3.Connection = None
+        self._lock: asyncio.Lock = None
+        self._pending = {}
+        self._committing = {}
+        self._stored = set()
+        self._removed = False
+        self._task: asyncio.Future = None
+
+    def _connect(self) -> sqlite3.Connection:
+        """Open the database, creating it if needed."""
+        parent = path.dirname(self.db_path)
+        if parent:
+            makedirs(parent, exist_ok=True)
+        conn = sqlite3.connect(
+            self.db_path, timeout=30, isolation_level=None, check_same_thread=False
+        )
+        # only takes effect when the database is created
+        conn.execute("PRAGMA auto_vacuum = INCREMENTAL")
+        conn.execute("PRAGMA journal_mode = WAL")
+        conn.executescript(SCHEMA)
+        return conn
+
+    async def _run(self, fn, *args):
+        """Run a blocking database function in a worker thread."""
+        if not self._lock:
+            self._lock = asyncio.Lock()
+        loop = asyncio.get_event_loop()
+        async with self._lock:
+            if not self._conn:
+                self._conn = await loop.run_in_executor(None, self._connect)
+            return await loop.run_in_executor(None, fn, self._conn, *args)
+
+    @property
+    def pending(self) -> int:
+        """Accessor for the number of writes waiting to be committed."""
+        return len(self._pending)
+
+    def put(self, entry_id: str, kind: str, record: dict):
+        """Record a new or updated queue entry."""
+        self._pending[entry_id] = (kind, record)
+        self._schedule()
+
+    def remove(self, entry_id: str):
+        """Remove a queue entry once it is no longer needed."""
+        if entry_id in self._stored or self._committing.get(entry_id):
+            self._pending[entry_id] = None
+            self._schedule()
+        else:
+            self._pending.pop(entry_id, None)
+
+    def _schedule(self):
+        """Start committing writes if not already doing so."""
+        if not self._task or self._task.done():
+            self._task = asyncio.ensure_future(self._commit_loop())
+
+    async def _commit_loop(self):
+        """Commit batches of writes until none are left."""
+        if self.commit_delay:
+            await asyncio.sleep(self.commit_delay)
+        while True:
+            if self._pending:
+                batch = self._committing = self._pending
+                self._pending = {}
+                try:
+                    await self._run(_commit, batch, self._stored)
+                except (OSError, sqlite3.Error) as err:
+                    LOGGER.warning("Could not persist queued messages: %s", err)
+                    continue
+                finally:
+                    self._committing = {}
+                self.commits += 1
+                for entry_id, entry in batch.items():
+                    if entry:
+                        self._stored.add(entry_id)
+                    else:
+                        self._stored.discard(entry_id)
+                        self._removed = True
+            elif self._removed and not self._stored:
+                self._removed = False
+                try:
+                    await self._run(_compact)
+                except (OSError, sqlite3.Error) as err:
+                    LOGGER.warning("Could not compact queued message store: %s", err)
+            else:
+                break
+
+    async def load(self, kind: str) -> Sequence[Tuple[str, dict]]:
+        """Load the entries left in a queue, in the order they were added."""
+        try:
+            rows = await self._run(_select, kind)
+        except (OSError, sqlite3.Error) as err:
+            LOGGER.warning("Could not load queued messages: %s", err)
+            return []
+        entries = []
+        for entry_id, record in rows:
+            self._stored.add(entry_id)
+            entries.append((entry_id, json.loads(record)))
+        return entries
+
+    async def flush(self):
+        """Wait until every recorded write has been committed."""
+        while self._task and not self._task.done():
+            await asyncio.shield(self._task)
+
+    async def close(self):
+        """Commit any outstanding writes and close the database."""
+        await self.flush()
+        if self._conn:
+            self._conn.close()
+            self._conn = None
+
+    def __repr__(self) -> str:
+        """Human readable representation of `SqliteQueueStore`."""
+        return "<{}(db_path={}, pending={})>".format(
+            self.__class__.__name__, self.db_path, self.pending
+        )
+
+
+def _commit(conn: sqlite3.Connection, batch: Mapping[str, tuple], stored: set):
+    """Write a batch of entries in a single transaction."""
+    now = time.time()
+    inserts, updates, deletes = [], [], []
+    for entry_id, entry in batch.items():
+        if entry is None:
+            deletes.append((entry_id,))
+        elif entry_id in stored:
+            updates.append((json.dumps(entry[1]), now, entry_id))
+        else:
+            inserts.append((entry_id, entry[0], json.dumps(entry[1]), now))
+    conn.execute("BEGIN IMMEDIATE")
+    try:
+        if inserts:
+            conn.executemany(
+                "INSERT OR REPLACE INTO queued (id, kind, record, updated) "
+                "VALUES (?, ?, ?, ?)",
+                inserts,
+            )
+        if updates:
+            conn.executemany(
+                "UPDATE queued SET record = ?, updated = ? WHERE id = ?", updates
+            )
+        if deletes:
+            conn.executemany("DELETE FROM queued WHERE id = ?", deletes)
+    except BaseException:
+        conn.execute("ROLLBACK")
+        raise
+    conn.execute("COMMIT")
+
+
+def _select(conn: sqlite3.Connection, kind: str) -> list:
+    """Fetch the entries of a queue."""
+    return conn.execute(
+        "SELECT id, record FROM queued WHERE kind = ? ORDER BY seq", (kind,)
+    ).fetchall()
+
+
+def _compact(conn: sqlite3.Connection):
+    """Release the space held by deleted entries."""
+    # executescript steps the pragma to completion, freeing every page
+    conn.executescript("PRAGMA incremental_vacuum;")
+    conn.execute("PRAGMA wal_checkpoint(TRUNCATE)")
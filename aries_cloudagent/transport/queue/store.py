@@ -0,0 +1,72 @@
+"""Abstract durable store for messages awaiting delivery."""
+
+from abc import ABC, abstractmethod
+from base64 import b64decode, b64encode
+from typing import Sequence, Tuple, Union
+
+
+class BaseQueueStore(ABC):
+    """
+    Abstract store keeping queued messages across restarts.
+
+    Writes are recorded without waiting, so that queueing a message never blocks
+    its delivery, and are committed to durable storage in the background.
+    """
+
+    @abstractmethod
+    def put(self, entry_id: str, kind: str, record: dict):
+        """
+        Record a new or updated queue entry.
+
+        Args:
+            entry_id: The unique identifier of the entry
+            kind: The queue the entry belongs to
+            record: The JSON-serializable content of the entry
+
+        """
+
+    @abstractmethod
+    def remove(self, entry_id: str):
+        """
+        Remove a queue entry once it is no longer needed.
+
+        Args:
+            entry_id: The unique identifier of the entry
+
+        """
+
+    @abstractmethod
+    async def load(self, kind: str) -> Sequence[Tuple[str, dict]]:
+        """
+        Load the entries left in a queue, in the order they were added.
+
+        Args:
+            kind: The queue to load
+
+        Returns:
+            A list of (entry_id, record) pairs
+
+        """
+
+    @abstractmethod
+    async def flush(self):
+        """Wait until every recorded write has been committed."""
+
+    @abstractmethod
+    async def close(self):
+        """Commit any outstanding writes and release the store."""
+
+
+def encode_payload(payload: Union[str, bytes]) -> dict:
+    """Represent a message payload as JSON-serializable values."""
+    if isinstance(payload, bytes):
+        return {"payload": b64encode(payload).decode("ascii"), "binary": True}
+    return {"payload": payload, "binary": False}
+
+
+def decode_payload(record: dict) -> Union[str, bytes]:
+    """Restore a message payload from its stored representation."""
+    payload = record.get("payload")
+    if payload is not None and record.get("binary"):
+        return b64decode(payload)
+    return payload
@@ -0,0 +1,93 @@
+from asyncio import sleep
+
+import pytest
+
+from ..sqlite_store import SqliteQueueStore
+from ..store import decode_payload, encode_payload
+
+
+@pytest.fixture
+def db_path(tmp_path):
+    yield str(tmp_path / "queue" / "outbound.db")
+
+
+class TestSqliteQueueStore:
+    def test_payload(self):
+        for payload in ("text", b"\x00binary", None):
+            assert decode_payload(encode_payload(payload)) == payload
+
+    @pytest.mark.asyncio
+    async def test_put_load(self, db_path):
+        store = SqliteQueueStore(db_path)
+        store.put("a", "outbound", {"n": 1})
+        store.put("b", "outbound", {"n": 2})
+        store.put("c", "undelivered", {"n": 3})
+        store.put("a", "outbound", {"n": 4})
+        await store.close()
+
+        reopened = SqliteQueueStore(db_path)
+        assert await reopened.load("outbound") == [("a", {"n": 4}), ("b", {"n": 2})]
+        assert await reopened.load("undelivered") == [("c", {"n": 3})]
+        reopened.put("b", "outbound", {"n": 5})
+        reopened.remove("a")
+        await reopened.close()
+
+        reopened = SqliteQueueStore(db_path)
+        assert await reopened.load("outbound") == [("b", {"n": 5})]
+        assert repr(reopened).startswith("<SqliteQueueStore(db_path=")
+        await reopened.close()
+
+    @pytest.mark.asyncio
+    async def test_group_commit(self, db_path):
+        store = SqliteQueueStore(db_path)
+        for n in range(1000):
+            store.put(str(n), "outbound", {"n": n})
+        await store.flush()
+        assert store.commits == 1
+        assert len(await store.load("outbound")) == 1000
+
+        # removed before being written, so never written at all
+        store.put("new", "outbound", {})
+        store.remove("new")
+        assert store.pending == 0
+        await store.close()
+
+    @pytest.mark.asyncio
+    async def test_remove_while_committing(self, db_path):
+        store = SqliteQueueStore(db_path)
+        store.put("a", "outbound", {})
+        await sleep(0)
+        assert "a" in store._committing
+        store.remove("a")
+        assert store.pending == 1
+        await store.close()
+
+        reopened = SqliteQueueStore(db_path)
+        assert await reopened.load("outbound") == []
+        await reopened.close()
+
+    @pytest.mark.asyncio
+    async def test_compact(self, db_path):
+        store = SqliteQueueStore(db_path)
+        for n in range(100):
+            store.put(str(n), "outbound", {"payload": "x" * 1000})
+        await store.flush()
+        for n in range(100):
+            store.remove(str(n))
+        await store.flush()
+        assert not store._stored
+        assert not store._removed
+        pages = store._conn.execute("PRAGMA freelist_count").fetchone()[0]
+        assert pages == 0
+        await store.close()
+
+    @pytest.mark.asyncio
+    async def test_unavailable(self, tmp_path):
+        blocker = tmp_path / "file"
+        blocker.write_text("")
+        store = SqliteQueueStore(str(blocker / "outbound.db"))
+        store.put("a", "outbound", {})
+        await store.flush()
+        assert store.commits == 0
+        assert await store.load("outbound") == []
+        await store.close()
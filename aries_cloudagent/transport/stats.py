@@ -1,4 +1,6 @@
-"""aiohttp stats collector support."""
+"""HTTP client stats collector support."""
+
+from typing import Awaitable, Callable
 
 import aiohttp
 
@@ -21,6 +23,8 @@ class StatsTracer(aiohttp.TraceConfig):
         self.on_connection_create_start.append(self.socket_connect_start)
         self.on_dns_cache_hit.append(self.socket_connect_start)  # restart timer
         self.on_dns_cache_miss.append(self.socket_connect_start)  # restart timer
+        self.on_dns_cache_hit.append(self.dns_cache_hit)
+        self.on_connection_reuseconn.append(self.connection_reused)
         self.on_connection_reuseconn.append(self.connection_ready)
         self.on_connection_create_end.append(self.connection_ready)
         self.on_request_end.append(self.request_end)
@@ -45,10 +49,18 @@ class StatsTracer(aiohttp.TraceConfig):
         """Handle the end of a DNS resolution."""
         context.dns_timer.stop()
 
+    async def dns_cache_hit(self, session, context, params):
+        """Count a host address found in the DNS cache, saving a lookup."""
+        self.collector.log(self.prefix + "dns_cache_hit", 0.0)
+
     async def socket_connect_start(self, session, context, params):
         """Handle the start of a socket connection."""
         context.socket_timer = self.collector.timer(self.prefix + "connect").start()
 
+    async def connection_reused(self, session, context, params):
+        """Count a request sent on an open connection, saving its setup."""
+        self.collector.log(self.prefix + "connection_reused", 0.0)
+
     async def connection_ready(self, session, context, params):
         """Handle the end of connection acquisition."""
         try:
@@ -60,3 +72,30 @@ class StatsTracer(aiohttp.TraceConfig):
     async def request_end(self, session, context, params):
         """Handle the end of request."""
         context.fetch_timer.stop()
+
+
+class Http2StatsTracer:
+    """Report statistics from the trace events of requests sent with httpx."""
+
+    def __init__(self, collector: Collector, prefix: str):
+        """Initialize the `Http2StatsTracer` instance."""
+        self.collector = collector
+        self.prefix = prefix
+
+    def trace(self) -> Callable[[str, dict], Awaitable]:
+        """Create the callback for the `trace` extension of a single request."""
+        timers = {}
+
+        async def trace(event_name: str, info: dict):
+            if event_name == "connection.connect_tcp.started":
+                timers["connect"] = self.collector.timer(self.prefix + "connect")
+                timers["connect"].start()
+            elif event_name.endswith(".send_request_headers.started"):
+                # the first request on a new connection follows its setup,
+                # any other request shares an open connection
+                if "connect" in timers:
+                    timers.pop("connect").stop()
+                else:
+                    self.collector.log(self.prefix + "connection_reused", 0.0)
+
+        return trace
@@ -20,3 +20,28 @@ class TestStatsTracer(AsyncTestCase):
 
     async def test_connection_ready_error_pass(self):
         await self.tracer.connection_ready(None, self.context, None)
+
+    async def test_setup_saved(self):
+        await self.tracer.dns_cache_hit(None, self.context, None)
+        await self.tracer.connection_reused(None, self.context, None)
+        await self.tracer.connection_reused(None, self.context, None)
+        results = self.tracer.collector.extract()
+        assert results["count"] == {"testdns_cache_hit": 1, "testconnection_reused": 2}
+
+
+class TestHttp2StatsTracer(AsyncTestCase):
+    async def test_connection_reused(self):
+        tracer = test_module.Http2StatsTracer(test_module.Collector(), "test")
+
+        trace = tracer.trace()
+        await trace("connection.connect_tcp.started", {})
+        await trace("connection.connect_tcp.complete", {})
+        await trace("http2.send_connection_init.complete", {})
+        await trace("http2.send_request_headers.started", {})
+        for _ in range(2):
+            trace = tracer.trace()
+            await trace("http2.send_request_headers.started", {})
+            await trace("http2.receive_response_headers.complete", {})
+
+        results = tracer.collector.extract()
+        assert results["count"] == {"testconnect": 1, "testconnection_reused": 2}
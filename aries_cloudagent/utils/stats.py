@@ -1,9 +1,11 @@
 """Classes for tracking performance and timing."""
 
+import bisect
 import functools
 import inspect
+import math
 import time
-from typing import Sequence, TextIO, Union
+from typing import Sequence, TextIO, Tuple, Union
 
 
 class Stats:
@@ -208,3 +210,76 @@ class Collector:
     def extract(self, groups: Sequence[str] = None) -> dict:
         """Extract statistics for a specific set of groups."""
         return self._stats.extract(groups)
+
+
+DEFAULT_LATENCY_BUCKETS = (
+    0.0005,
+    0.001,
+    0.0025,
+    0.005,
+    0.01,
+    0.025,
+    0.05,
+    0.1,
+    0.25,
+    0.5,
+    1.0,
+    2.5,
+    5.0,
+    10.0,
+)
+
+
+class Histogram:
+    """A histogram of observed values over fixed bucket upper bounds."""
+
+    def __init__(self, buckets: Sequence[float] = None):
+        """Initialize the Histogram instance."""
+        self.buckets = tuple(sorted(buckets or DEFAULT_LATENCY_BUCKETS))
+        self.counts = [0] * (len(self.buckets) + 1)
+        self.count = 0
+        self.sum = 0.0
+        self.max = None
+
+    def observe(self, value: float):
+        """Add an observed value to the histogram."""
+        self.counts[bisect.bisect_left(self.buckets, value)] += 1
+        self.count += 1
+        self.sum += value
+        if self.max is None or value > self.max:
+            self.max = value
+
+    def cumulative(self) -> Sequence[Tuple[float, int]]:
+        """Get the cumulative count for each bucket bound, ending with +Inf."""
+        result = []
+        total = 0
+        for bound, count in zip(self.buckets + (math.inf,), self.counts):
+            total += count
+            result.append((bound, total))
+        return result
+
+    def quantile(self, q: float) -> float:
+        """Estimate a quantile as the upper bound of the bucket containing it."""
+        if not self.count:
+            return None
+        rank = q * self.count
+        for bound, total in self.cumulative():
+            if total >= rank:
+                return self.max if math.isinf(bound) else min(bound, self.max)
+        return self.max
+
+    def extract(self) -> dict:
+        """Summarize the histogram in a dictionary."""
+        return {
+            "count": self.count,
+            "total": self.sum,
+            "avg": self.sum / self.count if self.count else None,
+            "max": self.max,
+            "p50": self.quantile(0.5),
+            "p95": self.quantile(0.95),
+            "p99": self.quantile(0.99),
+            "buckets": {
+                ("+Inf" if math.isinf(bound) else str(bound)): total
+                for bound, total in self.cumulative()
+            },
+        }
@@ -1,9 +1,11 @@
+import math
+
 from tempfile import NamedTemporaryFile
 
 from asynctest import TestCase as AsyncTestCase
 from asynctest import mock as async_mock
 
-from ..stats import Collector
+from ..stats import Collector, Histogram
 
 
 class TestStats(AsyncTestCase):
@@ -98,3 +100,21 @@ class TestStats(AsyncTestCase):
 
         stats.reset()
         assert not stats.results["avg"]
+
+
+class TestHistogram(AsyncTestCase):
+    def test_observe(self):
+        hist = Histogram((0.1, 1.0))
+        assert hist.quantile(0.5) is None
+        for value in (0.05, 0.1, 0.5, 2.0):
+            hist.observe(value)
+        assert hist.cumulative() == [(0.1, 2), (1.0, 3), (math.inf, 4)]
+        assert hist.quantile(0.5) == 0.1
+        assert hist.quantile(0.75) == 1.0
+        assert hist.quantile(1.0) == 2.0
+
+        stats = hist.extract()
+        assert stats["count"] == 4
+        assert stats["total"] == 2.65
+        assert stats["max"] == 2.0
+        assert stats["buckets"] == {"0.1": 2, "1.0": 3, "+Inf": 4}
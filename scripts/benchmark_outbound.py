@@ -0,0 +1,125 @@
+"""
+Benchmark the outbound transport manager with a large backlog of messages.
+
+Queues pre-encoded messages for delivery through an in-process transport, of
+which a fraction are addressed to endpoints that always fail. Reports the time
+taken to attempt or park every message, then the CPU time spent by the agent
+while the failed messages wait to be retried.
+
+With --queue-path, messages are also written to a durable queue store.
+
+Usage: python scripts/benchmark_outbound.py [--messages 100000] [--failing 0.1]
+    [--queue-path outbound.db]
+"""
+
+import argparse
+import asyncio
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from aries_cloudagent.config.injection_context import InjectionContext  # noqa
+from aries_cloudagent.connections.models.connection_target import (  # noqa
+    ConnectionTarget,
+)
+from aries_cloudagent.transport.outbound.base import (  # noqa
+    BaseOutboundTransport,
+    OutboundTransportError,
+)
+from aries_cloudagent.transport.outbound.manager import (  # noqa
+    OutboundTransportManager,
+)
+from aries_cloudagent.transport.outbound.message import OutboundMessage  # noqa
+from aries_cloudagent.transport.queue.sqlite_store import SqliteQueueStore  # noqa
+from aries_cloudagent.transport.queue.store import BaseQueueStore  # noqa
+
+
+class BenchmarkTransport(BaseOutboundTransport):
+    """Transport delivering in process, failing for unavailable endpoints."""
+
+    schemes = ("http",)
+
+    def __init__(self):
+        """Initialize the transport."""
+        super().__init__()
+        self.attempts = 0
+
+    async def start(self):
+        """Start the transport."""
+
+    async def stop(self):
+        """Stop the transport."""
+
+    async def handle_message(self, profile, payload, endpoint: str):
+        """Deliver a message."""
+        self.attempts += 1
+        if endpoint.startswith("http://unavailable"):
+            raise OutboundTransportError("Endpoint unavailable")
+
+
+async def run(messages: int, failing: float, idle: float, queue_path: str = None):
+    """Queue the messages and measure their processing."""
+    context = InjectionContext()
+    store = None
+    if queue_path:
+        store = SqliteQueueStore(queue_path)
+        context.injector.bind_instance(BaseQueueStore, store)
+    manager = OutboundTransportManager(context)
+    await manager.setup()
+    transport_id = manager.register_class(BenchmarkTransport)
+    await manager.start_transport(transport_id)
+    transport = manager.get_transport_instance(transport_id)
+
+    fail_every = int(1 / failing) if failing else 0
+    start = time.perf_counter()
+    for index in range(messages):
+        host = "unavailable" if fail_every and not index % fail_every else "ok"
+        outbound = OutboundMessage(
+            payload="{}",
+            enc_payload=b"{}",
+            target=ConnectionTarget(endpoint=f"http://{host}-{index % 100}/"),
+        )
+        manager.enqueue_message(None, outbound)
+    queued = time.perf_counter() - start
+    print(f"Queued {messages} messages in {queued:.2f}s")
+
+    # messages for endpoints found to be down are parked without an attempt
+    while transport.attempts + manager.queue_depths["parked"] < messages:
+        await asyncio.sleep(0.01)
+    first_pass = time.perf_counter() - start
+    print(
+        f"Attempted or parked every message in {first_pass:.2f}s "
+        f"({messages / first_pass:.0f} msg/s)"
+    )
+    print(f"Queue depths: {manager.queue_depths}")
+    if store:
+        await store.flush()
+        print(f"Durable queue commits: {store.commits}")
+
+    cpu_start = time.process_time()
+    await asyncio.sleep(idle)
+    cpu = time.process_time() - cpu_start
+    print(f"CPU time used over {idle:.0f}s while waiting on retries: {cpu:.3f}s")
+
+    await manager.stop(wait=False)
+    if store:
+        await store.close()
+
+
+def main():
+    """Parse the arguments and run the benchmark."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--messages", type=int, default=100000)
+    parser.add_argument("--failing", type=float, default=0.1)
+    parser.add_argument("--idle", type=float, default=5.0)
+    parser.add_argument("--queue-path")
+    args = parser.parse_args()
+    asyncio.get_event_loop().run_until_complete(
+        run(args.messages, args.failing, args.idle, args.queue_path)
+    )
+
+
+if __name__ == "__main__":
+    main()
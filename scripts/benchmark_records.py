@@ -0,0 +1,80 @@
+"""
+Benchmark the memory footprint and save time of connection records.
+
+Saves connection records to in-memory storage, then reports the bytes
+allocated per 100,000 records for the stored representation and for the
+record instances loaded back from storage, along with the time taken to save
+each record twice.
+
+Usage: python scripts/benchmark_records.py [--records 100000]
+"""
+
+import argparse
+import asyncio
+import gc
+import os
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from aries_cloudagent.connections.models.conn_record import ConnRecord  # noqa
+from aries_cloudagent.core.in_memory import InMemoryProfile  # noqa
+
+PER_RECORDS = 100000
+
+
+def allocated() -> int:
+    """Measure the memory currently allocated by Python objects."""
+    gc.collect()
+    return tracemalloc.get_traced_memory()[0]
+
+
+def report(label: str, size: int, records: int):
+    """Print a memory measurement scaled to the reference record count."""
+    print(f"{label}: {size * PER_RECORDS / records / 2**20:.1f} MiB per 100k records")
+
+
+async def run(records: int):
+    """Save and load the records and measure their footprint."""
+    session = InMemoryProfile.test_session()
+    tracemalloc.start()
+
+    base = allocated()
+    start = time.perf_counter()
+    for index in range(records):
+        record = ConnRecord(
+            my_did=f"did:sov:{index:022d}",
+            their_did=f"did:sov:{index + records:022d}",
+            their_label=f"Peer {index}",
+            their_role=ConnRecord.Role.REQUESTER.rfc160,
+            state=ConnRecord.State.INVITATION.rfc160,
+            invitation_key=f"{index:044d}",
+        )
+        await record.save(session)
+        record.state = ConnRecord.State.COMPLETED.rfc160
+        await record.save(session)
+    elapsed = time.perf_counter() - start
+    del record
+    stored = allocated() - base
+    print(f"Saved {records} records twice in {elapsed:.2f}s")
+    report("Stored records", stored, records)
+
+    base = allocated()
+    loaded = await ConnRecord.query(session)
+    report("Loaded record instances", allocated() - base, len(loaded))
+
+    tracemalloc.stop()
+
+
+def main():
+    """Parse the arguments and run the benchmark."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--records", type=int, default=PER_RECORDS)
+    args = parser.parse_args()
+    asyncio.get_event_loop().run_until_complete(run(args.records))
+
+
+if __name__ == "__main__":
+    main()
@@ -38,6 +38,8 @@ if __name__ == "__main__":
         extras_require={
             "indy": parse_requirements("requirements.indy.txt"),
             "uvloop": {"uvloop": "^=0.14.0"},
+            "http2": ["httpx[http2]>=0.21"],
+            "postgres": ["asyncpg>=0.21"],
         },
         python_requires=">=3.6.3",
         classifiers=[